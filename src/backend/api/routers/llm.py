@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
 from typing import Any, AsyncGenerator, Dict, List
 
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
@@ -19,7 +20,7 @@ router = APIRouter(prefix="/api/v1", tags=["llm"])
 
 tenant_isolation = EnterpriseTenantIsolation()
 failover_router = MultiCloudFailoverRouter()
-audit_trail = EncryptedAuditTrail()
+audit_trail = EncryptedAuditTrail(directory=os.getenv("RYUZEN_AUDIT_DIR"))
 safety_orchestrator = SafetyOrchestrator(
     router=failover_router,
     audit_trail=audit_trail,
@@ -0,0 +1,315 @@
+"""Background writer that batches audit entries into encrypted on-disk frames.
+
+Callers only enqueue. A writer thread collects up to ``batch_size`` entries
+or whatever arrived within ``flush_interval_ms`` of the first one, encrypts
+the batch as a single AES-256-GCM frame (one nonce, one tag) and appends it
+to the current segment file, rolling over to a new segment once it passes
+``segment_bytes``.
+
+Frame layout::
+
+    b"RZA1" | u32 header length | u32 ciphertext length | header JSON | ciphertext
+
+The header (key id, wrapped data key, nonce, sequence number, entry count)
+is authenticated as GCM associated data; the plaintext is one JSON document
+per line.
+
+Frames are encrypted with a random data key per segment, which is wrapped
+under the persistent audit key (``audit_key`` or the base64 value of
+``RYUZEN_AUDIT_KEY``) and stored in every frame header. A ``KeyManager``
+loaded with the same key material can therefore read segments written by
+any earlier process.
+"""
+from __future__ import annotations
+
+import atexit
+import base64
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from src.backend.security.KeyManager import KeyManager
+from src.backend.utils.ErrorTypes import SecurityError
+from src.backend.utils.Logging import SafeLogger
+
+FRAME_MAGIC = b"RZA1"
+_PREFIX = struct.Struct(">4sII")
+SEGMENT_PATTERN = "segment-{:08d}.aud"
+_WRAP_AAD = b"ryuzen-audit-dek:"
+
+_STOP = object()
+
+
+class AuditBackpressureError(RuntimeError):
+    """Raised when an entry arrives while the audit queue is full."""
+
+
+def _audit_key(key: Union[bytes, str, None]) -> bytes:
+    if key is None:
+        key = os.getenv("RYUZEN_AUDIT_KEY")
+    if not key:
+        raise SecurityError("Audit key missing: set RYUZEN_AUDIT_KEY to a base64 32-byte key")
+    return base64.b64decode(key) if isinstance(key, str) else key
+
+
+def _wrap(kek: bytes, kid: str, data_key: bytes) -> str:
+    nonce = os.urandom(12)
+    return (nonce + AESGCM(kek).encrypt(nonce, data_key, _WRAP_AAD + kid.encode("utf-8"))).hex()
+
+
+def _unwrap(kek: bytes, kid: str, wrapped: str) -> bytes:
+    blob = bytes.fromhex(wrapped)
+    return AESGCM(kek).decrypt(blob[:12], blob[12:], _WRAP_AAD + kid.encode("utf-8"))
+
+
+class AuditWriter:
+    """Bounded queue plus a single writer thread appending encrypted frames."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        key_manager: Optional[KeyManager] = None,
+        serialize: Optional[Callable[[Any], Dict[str, Any]]] = None,
+        batch_size: int = 128,
+        flush_interval_ms: float = 50.0,
+        max_queue: int = 10_000,
+        audit_key: Union[bytes, str, None] = None,
+        segment_bytes: int = 64 * 1024 * 1024,
+        max_segments: Optional[int] = None,
+        fsync: bool = True,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.key_manager = key_manager or KeyManager(_audit_key(audit_key))
+        self.serialize = serialize or (lambda item: item)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.fsync = fsync
+        self.logger = SafeLogger("ryuzen-audit")
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._sequence = 0
+        # (data key, wrapping key id, wrapped data key); replaced per segment
+        self._data_key: Optional[Tuple[bytes, str, str]] = None
+        self._stats = {"written": 0, "frames": 0, "segments": 0, "rejected": 0, "lost": 0}
+
+        existing = self.segments()
+        self._segment_index = self._index_of(existing[-1]) + 1 if existing else 0
+        self._file = None
+        self._open_segment()
+
+        self._thread = threading.Thread(target=self._run, name="ryuzen-audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------ request path
+    def enqueue(self, item: Any) -> None:
+        """Queue one entry without blocking.
+
+        Raises ``AuditBackpressureError`` when the queue is full and
+        ``SecurityError`` once the writer has failed, so no entry is accepted
+        that will never reach disk.
+        """
+        if self._closed:
+            raise RuntimeError("audit writer is closed")
+        self._raise_if_failed()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._stats["rejected"] += 1
+            raise AuditBackpressureError(f"audit queue full ({self._queue.maxsize} entries)") from None
+
+    # ------------------------------------------------------------------ control
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every entry queued before this call is written (and fsynced)."""
+        if self._closed:
+            return not self._thread.is_alive()
+        done = threading.Event()
+        self._queue.put(done, timeout=timeout)
+        flushed = done.wait(timeout)
+        self._raise_if_failed()
+        return flushed
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting entries, write everything still queued and close the segment.
+
+        Registered with ``atexit`` so a normal interpreter shutdown drains the
+        queue; entries accepted by ``enqueue`` are on disk once this returns.
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._raise_if_failed()
+
+    def rotate_data_key(self) -> None:
+        """Encrypt subsequent frames under a fresh data key."""
+        self._data_key = None
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, queued=self._queue.qsize(), segment=self._segment_index)
+
+    def segments(self) -> List[Path]:
+        return sorted(self.directory.glob(SEGMENT_PATTERN.replace("{:08d}", "*")))
+
+    # ------------------------------------------------------------------ writer thread
+    def _run(self) -> None:
+        batch: List[Any] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._write(batch)
+                self._close_segment()
+                return
+            if isinstance(item, threading.Event):
+                self._write(batch)
+                batch = []
+                item.set()
+                continue
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+            self._write(batch)
+            batch = []
+
+    def _write(self, batch: List[Any]) -> None:
+        if not batch:
+            return
+        if self._error is not None:
+            self._stats["lost"] += len(batch)
+            return
+        try:
+            frame = self._encrypt(batch)
+            if self._file.tell() and self._file.tell() + len(frame) > self.segment_bytes:
+                self._close_segment()
+                self._segment_index += 1
+                self._open_segment()
+            self._file.write(frame)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except Exception as exc:  # pragma: no cover - disk failures
+            self._error = exc
+            self._stats["lost"] += len(batch)
+            self.logger.error("audit-write-failed", error=type(exc).__name__, lost=len(batch))
+            return
+        self._stats["written"] += len(batch)
+        self._stats["frames"] += 1
+        self.logger.info("audit-frame", sequence=self._sequence - 1, entries=len(batch), segment=self._segment_index)
+
+    def _encrypt(self, batch: List[Any]) -> bytes:
+        lines = [json.dumps(self.serialize(item), separators=(",", ":"), default=str) for item in batch]
+        data_key, kid, wrapped = self._current_data_key()
+        nonce = os.urandom(12)
+        header = json.dumps(
+            {
+                "kid": kid,
+                "dek": wrapped,
+                "nonce": nonce.hex(),
+                "seq": self._sequence,
+                "count": len(batch),
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        ciphertext = AESGCM(data_key).encrypt(nonce, "\n".join(lines).encode("utf-8"), header)
+        self._sequence += 1
+        return _PREFIX.pack(FRAME_MAGIC, len(header), len(ciphertext)) + header + ciphertext
+
+    def _current_data_key(self) -> Tuple[bytes, str, str]:
+        current = self._data_key
+        kid = self.key_manager.active_key_id
+        if current is None or current[1] != kid:
+            data_key = AESGCM.generate_key(bit_length=256)
+            current = (data_key, kid, _wrap(self.key_manager.get_key(kid), kid, data_key))
+            self._data_key = current
+        return current
+
+    def _open_segment(self) -> None:
+        self._data_key = None
+        self._file = open(self.directory / SEGMENT_PATTERN.format(self._segment_index), "ab")
+        self._stats["segments"] += 1
+        if self.max_segments:
+            for stale in self.segments()[: -self.max_segments]:
+                stale.unlink()
+
+    def _close_segment(self) -> None:
+        if self._file is None or self._file.closed:
+            return
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise SecurityError("Audit writer failed") from self._error
+
+    @staticmethod
+    def _index_of(path: Path) -> int:
+        return int(path.stem.split("-")[-1])
+
+
+def read_frames(path: Union[str, Path], key_manager: KeyManager) -> Iterator[List[Dict[str, Any]]]:
+    """Decrypt the frames of one segment, yielding each batch of entries.
+
+    A frame cut short by a crash is ignored; a frame that fails
+    authentication raises ``SecurityError``.
+    """
+    data = Path(path).read_bytes()
+    data_keys: Dict[str, bytes] = {}
+    pos = 0
+    while pos + _PREFIX.size <= len(data):
+        magic, header_len, body_len = _PREFIX.unpack_from(data, pos)
+        if magic != FRAME_MAGIC:
+            raise SecurityError("Malformed audit frame")
+        start = pos + _PREFIX.size
+        end = start + header_len + body_len
+        if end > len(data):
+            return
+        header = data[start : start + header_len]
+        meta = json.loads(header)
+        try:
+            data_key = data_keys.get(meta["dek"])
+            if data_key is None:
+                data_key = _unwrap(key_manager.get_key(meta["kid"]), meta["kid"], meta["dek"])
+                data_keys[meta["dek"]] = data_key
+            plaintext = AESGCM(data_key).decrypt(bytes.fromhex(meta["nonce"]), data[start + header_len : end], header)
+        except SecurityError:
+            raise
+        except Exception as exc:
+            raise SecurityError("Integrity check failed") from exc
+        yield [json.loads(line) for line in plaintext.decode("utf-8").split("\n")]
+        pos = end
+
+
+def read_segments(directory: Union[str, Path], key_manager: KeyManager) -> Iterator[Dict[str, Any]]:
+    """Every entry in ``directory``, oldest segment first."""
+    for path in sorted(Path(directory).glob(SEGMENT_PATTERN.replace("{:08d}", "*"))):
+        for batch in read_frames(path, key_manager):
+            yield from batch
+
+
+__all__ = ["AuditWriter", "AuditBackpressureError", "read_frames", "read_segments", "FRAME_MAGIC"]
@@ -2,12 +2,16 @@
 from __future__ import annotations
 
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
 
 from src.backend.security.CrypterAES256 import CrypterAES256
 from src.backend.utils.Logging import SafeLogger
 
+from .AuditWriter import AuditWriter
+
 
 @dataclass
 class AuditEvent:
@@ -20,24 +24,59 @@ class AuditEvent:
     route_taken: List[str]
 
 
-class EncryptedAuditTrail:
-    """Appends encrypted audit entries with AES-256-GCM and key rotation."""
+def event_payload(event: AuditEvent) -> Dict[str, object]:
+    """The metadata fields persisted for one event."""
+    return {
+        "ts": event.timestamp,
+        "model": event.model,
+        "latency_ms": round(event.latency_ms, 3),
+        "risk": round(event.risk_score, 3),
+        "drift": round(event.drift_score, 3),
+        "tenant_id": event.tenant_id,
+        "route": list(event.route_taken),
+    }
 
-    def __init__(self, crypter: Optional[CrypterAES256] = None) -> None:
+
+class EncryptedAuditTrail:
+    """Appends encrypted audit entries with AES-256-GCM and key rotation.
+
+    ``record`` encrypts one event inline and keeps the last ``max_in_memory``
+    entries. Given a ``directory``, ``submit`` hands events to a background
+    ``AuditWriter`` instead, which batches them into encrypted frames on
+    disk under the persistent audit key (``audit_key`` or
+    ``RYUZEN_AUDIT_KEY``); without one ``submit`` falls back to ``record``.
+    """
+
+    def __init__(
+        self,
+        crypter: Optional[CrypterAES256] = None,
+        directory: Optional[Union[str, Path]] = None,
+        max_in_memory: int = 1024,
+        **writer_options: Any,
+    ) -> None:
         self.crypter = crypter or CrypterAES256()
         self.logger = SafeLogger("ryuzen-audit")
-        self._log: List[bytes] = []
+        self._log: Deque[bytes] = deque(maxlen=max_in_memory)
+        self.writer: Optional[AuditWriter] = None
+        if directory:
+            self.writer = AuditWriter(directory, serialize=event_payload, **writer_options)
+
+    def submit(self, event: AuditEvent) -> None:
+        """Request-path entry point: only an enqueue when a writer is configured."""
+        if self.writer is None:
+            self.record(event)
+        else:
+            self.writer.enqueue(event)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return True if self.writer is None else self.writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        if self.writer is not None:
+            self.writer.close(timeout)
 
     def record(self, event: AuditEvent) -> bytes:
-        payload: Dict[str, object] = {
-            "ts": event.timestamp,
-            "model": event.model,
-            "latency_ms": round(event.latency_ms, 3),
-            "risk": round(event.risk_score, 3),
-            "drift": round(event.drift_score, 3),
-            "tenant_id": event.tenant_id,
-            "route": list(event.route_taken),
-        }
+        payload = event_payload(event)
         encrypted = self.crypter.encrypt(payload, metadata={"tenant_id": event.tenant_id})
         self._log.append(encrypted)
         self.logger.info(
@@ -51,12 +90,14 @@ class EncryptedAuditTrail:
         return encrypted
 
     def latest(self, limit: int = 10) -> List[bytes]:
-        return list(self._log[-limit:])
+        return list(self._log)[-limit:]
 
     def rotate_key(self) -> None:
         """Rotate encryption key for forward secrecy."""
 
         self.crypter.key_manager.rotate_key()
+        if self.writer is not None:
+            self.writer.rotate_data_key()
 
     def export_for_offline_review(self) -> List[bytes]:
         """Provide encrypted records for downstream SIEM without decryption."""
@@ -79,4 +120,4 @@ class EncryptedAuditTrail:
         self.record(heartbeat_event)
 
 
-__all__ = ["EncryptedAuditTrail", "AuditEvent"]
+__all__ = ["EncryptedAuditTrail", "AuditEvent", "event_payload"]
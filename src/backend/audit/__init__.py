@@ -1,3 +1,12 @@
-from .EncryptedAuditTrail import AuditEvent, EncryptedAuditTrail
+from .AuditWriter import AuditBackpressureError, AuditWriter, read_frames, read_segments
+from .EncryptedAuditTrail import AuditEvent, EncryptedAuditTrail, event_payload
 
-__all__ = ["AuditEvent", "EncryptedAuditTrail"]
+__all__ = [
+    "AuditBackpressureError",
+    "AuditEvent",
+    "AuditWriter",
+    "EncryptedAuditTrail",
+    "event_payload",
+    "read_frames",
+    "read_segments",
+]
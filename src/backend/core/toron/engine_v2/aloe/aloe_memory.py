@@ -7,40 +7,259 @@ Features:
   ▸ cross-session coherence
   ▸ memory retrieval heuristics
   ▸ ALOE: user owns memory; Toron cannot store without consent
+
+Storage is DynamoDB via one long-lived async client per event loop. Item layout:
+
+  user_id      S   partition key
+  memory_json  S   memory minus preferences
+  preferences  M   preference name -> JSON-encoded value
+  version      N   bumped on every write
+
+Preferences live in their own map so ``update_preferences`` is a single
+``UpdateItem`` on just the changed keys. Reads go through a per-user cache:
+fresh entries are served locally and stale ones are fetched again in full
+(a projected read is billed on the whole item, so checking the version
+first would never be cheaper). Point
+``TORON_DYNAMODB_ENDPOINT`` at DynamoDB Local to run against a stand-in.
 """
 
+import asyncio
+import copy
 import json
 import os
-import boto3
+import time
+from collections import OrderedDict
+
+import aioboto3
+
+from ..bootstrap.client_registry import LoopLocal
+
 
 class ALOEMemory:
-    def __init__(self, table_name=None):
+    BATCH_GET_LIMIT = 100
+
+    def __init__(
+        self,
+        table_name=None,
+        client=None,
+        endpoint_url=None,
+        region=None,
+        cache_ttl_seconds=None,
+        cache_size=10_000,
+    ):
         self.table = table_name or os.getenv("TORON_MEMORY_TABLE")
-        self.db = boto3.client("dynamodb")
+        self.endpoint_url = endpoint_url or os.getenv("TORON_DYNAMODB_ENDPOINT")
+        self.region = region or os.getenv("AWS_REGION", "us-east-1")
+        self.cache_ttl_seconds = (
+            cache_ttl_seconds
+            if cache_ttl_seconds is not None
+            else float(os.getenv("TORON_MEMORY_CACHE_TTL", "30"))
+        )
+        self.cache_size = cache_size
 
-    def save(self, user_id, memory):
-        self.db.put_item(
-            TableName=self.table,
-            Item={
-                "user_id": {"S": user_id},
-                "memory_json": {"S": json.dumps(memory)}
-            }
+        self.session = aioboto3.Session()
+        self._client = client
+        self._clients = LoopLocal(
+            lambda: self.session.client(
+                "dynamodb",
+                region_name=self.region,
+                endpoint_url=self.endpoint_url,
+            )
+        )
+
+        # user_id -> (memory, version, fetched_at)
+        self._cache = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    # -----------------------------
+    # CLIENT
+    # -----------------------------
+    async def _db(self):
+        # Long-lived per loop so the connection pool survives across calls.
+        if self._client is not None:
+            return self._client
+        return await self._clients.get()
+
+    async def aclose(self):
+        await self._clients.aclose()
+
+    # -----------------------------
+    # ITEM (DE)SERIALIZATION
+    # -----------------------------
+    @staticmethod
+    def _from_item(item):
+        memory = json.loads(item.get("memory_json", {}).get("S", "{}"))
+        # Items written before preferences moved to their own map keep them inline.
+        prefs = memory.pop("preferences", {})
+        prefs.update(
+            {k: json.loads(v["S"]) for k, v in item.get("preferences", {}).get("M", {}).items()}
         )
+        if prefs:
+            memory["preferences"] = prefs
+        return memory, int(item.get("version", {}).get("N", "0"))
+
+    @staticmethod
+    def _prefs_map(prefs):
+        return {"M": {k: {"S": json.dumps(v)} for k, v in prefs.items()}}
+
+    @staticmethod
+    def _is_condition_failure(exc):
+        response = getattr(exc, "response", None) or {}
+        code = response.get("Error", {}).get("Code", "")
+        return type(exc).__name__ == "ConditionalCheckFailedException" or code == "ConditionalCheckFailedException"
 
-    def load(self, user_id):
-        item = self.db.get_item(
+    # -----------------------------
+    # CACHE
+    # -----------------------------
+    def _cache_put(self, user_id, memory, version):
+        self._cache[user_id] = (memory, version, time.monotonic())
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _cache_fresh(self, user_id):
+        entry = self._cache.get(user_id)
+        if entry is None or time.monotonic() - entry[2] > self.cache_ttl_seconds:
+            return None
+        self._cache.move_to_end(user_id)
+        return copy.deepcopy(entry[0])
+
+    def invalidate(self, user_id):
+        self._cache.pop(user_id, None)
+
+    # -----------------------------
+    # READ
+    # -----------------------------
+    async def load(self, user_id):
+        fresh = self._cache_fresh(user_id)
+        if fresh is not None:
+            self.stats["hits"] += 1
+            return fresh
+
+        db = await self._db()
+        self.stats["misses"] += 1
+        item = await db.get_item(
             TableName=self.table,
-            Key={"user_id":{"S":user_id}}
+            Key={"user_id": {"S": user_id}},
         )
-        if "Item" not in item: 
+        if "Item" not in item:
+            self.invalidate(user_id)
             return {}
-        return json.loads(item["Item"]["memory_json"]["S"])
-
-    def update_preferences(self, user_id, new_preferences):
-        mem = self.load(user_id)
-        mem["preferences"] = {
-            **mem.get("preferences", {}),
-            **new_preferences
-        }
-        self.save(user_id, mem)
-        return mem
+        memory, version = self._from_item(item["Item"])
+        self._cache_put(user_id, memory, version)
+        return copy.deepcopy(memory)
+
+    async def load_many(self, user_ids):
+        """Load several users' memory with BatchGetItem; missing users map to {}."""
+        out = {}
+        pending = []
+        for uid in dict.fromkeys(user_ids):
+            fresh = self._cache_fresh(uid)
+            if fresh is not None:
+                self.stats["hits"] += 1
+                out[uid] = fresh
+            else:
+                pending.append(uid)
+
+        db = await self._db()
+        for i in range(0, len(pending), self.BATCH_GET_LIMIT):
+            keys = [{"user_id": {"S": uid}} for uid in pending[i:i + self.BATCH_GET_LIMIT]]
+            request = {self.table: {"Keys": keys}}
+            attempt = 0
+            while request:
+                resp = await db.batch_get_item(RequestItems=request)
+                for item in resp.get("Responses", {}).get(self.table, []):
+                    uid = item["user_id"]["S"]
+                    memory, version = self._from_item(item)
+                    self._cache_put(uid, memory, version)
+                    out[uid] = copy.deepcopy(memory)
+                request = resp.get("UnprocessedKeys") or None
+                if request:
+                    attempt += 1
+                    await asyncio.sleep(min(0.05 * 2 ** attempt, 1.0))
+
+        self.stats["misses"] += len(pending)
+        for uid in pending:
+            out.setdefault(uid, {})
+        return out
+
+    # -----------------------------
+    # WRITE
+    # -----------------------------
+    async def save(self, user_id, memory):
+        memory = copy.deepcopy(memory)
+        prefs = memory.pop("preferences", {})
+        db = await self._db()
+        resp = await db.update_item(
+            TableName=self.table,
+            Key={"user_id": {"S": user_id}},
+            UpdateExpression="SET memory_json = :m, preferences = :p ADD version :one",
+            ExpressionAttributeValues={
+                ":m": {"S": json.dumps(memory)},
+                ":p": self._prefs_map(prefs),
+                ":one": {"N": "1"},
+            },
+            ReturnValues="UPDATED_NEW",
+        )
+        if prefs:
+            memory["preferences"] = prefs
+        self._cache_put(user_id, memory, int(resp["Attributes"]["version"]["N"]))
+
+    async def update_preferences(self, user_id, new_preferences):
+        if not new_preferences:
+            return await self.load(user_id)
+
+        db = await self._db()
+        names = {"#p": "preferences"}
+        values = {":one": {"N": "1"}}
+        sets = []
+        for i, (k, v) in enumerate(new_preferences.items()):
+            names[f"#k{i}"] = k
+            values[f":v{i}"] = {"S": json.dumps(v)}
+            sets.append(f"#p.#k{i} = :v{i}")
+
+        try:
+            resp = await db.update_item(
+                TableName=self.table,
+                Key={"user_id": {"S": user_id}},
+                UpdateExpression="SET " + ", ".join(sets) + " ADD version :one",
+                ConditionExpression="attribute_exists(#p)",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues="ALL_NEW",
+            )
+        except Exception as exc:
+            if not self._is_condition_failure(exc):
+                raise
+            resp = await self._create_preferences(db, user_id, new_preferences)
+            if resp is None:
+                # Another writer created the map first; the partial update now applies.
+                return await self.update_preferences(user_id, new_preferences)
+
+        memory, version = self._from_item(resp["Attributes"])
+        self._cache_put(user_id, memory, version)
+        return copy.deepcopy(memory)
+
+    async def _create_preferences(self, db, user_id, new_preferences):
+        """First preference write for a user: create the map, keeping legacy inline prefs."""
+        item = await db.get_item(TableName=self.table, Key={"user_id": {"S": user_id}})
+        memory, _ = self._from_item(item.get("Item", {}))
+        prefs = {**memory.pop("preferences", {}), **new_preferences}
+        try:
+            return await db.update_item(
+                TableName=self.table,
+                Key={"user_id": {"S": user_id}},
+                UpdateExpression="SET #p = :p, memory_json = :m ADD version :one",
+                ConditionExpression="attribute_not_exists(#p)",
+                ExpressionAttributeNames={"#p": "preferences"},
+                ExpressionAttributeValues={
+                    ":p": self._prefs_map(prefs),
+                    ":m": {"S": json.dumps(memory)},
+                    ":one": {"N": "1"},
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except Exception as exc:
+            if self._is_condition_failure(exc):
+                return None
+            raise
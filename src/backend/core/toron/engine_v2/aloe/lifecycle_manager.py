@@ -16,9 +16,10 @@ from ..core.consensus_integrator import ConsensusIntegrator
 
 
 class LifecycleManager:
-    def __init__(self, config, adapter):
+    def __init__(self, config, adapter, clients=None):
         self.config = config
         self.adapter = adapter
+        self.clients = clients
 
         self.consent = ConsentManager()
         self.state = StateManager()
@@ -47,7 +48,7 @@ class LifecycleManager:
         # 4. Prepare sub-engines
         context["debate_engine"] = DebateEngine(self.adapter)
         context["fact_extractor"] = FactExtractor(self.adapter)
-        context["web_search"] = WebSearch()
+        context["web_search"] = WebSearch(clients=self.clients)
         context["validator"] = WebValidator(self.adapter)
         context["consensus_engine"] = ConsensusIntegrator()
 
@@ -1,23 +1,82 @@
 """
 State Manager — stores user preferences and model reliability scores.
+
+Backed by SQLite in WAL mode: one row per user / model, so an update writes
+only its own key and concurrent workers do not clobber each other. Updates
+are batched as dirty keys and flushed off the event loop; user preferences
+are loaded lazily per user into a bounded cache. Existing JSON state files
+are imported once on first open.
 """
 
-import os
+import asyncio
+import atexit
 import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
 
 
 class StateManager:
-    def __init__(self):
+    def __init__(
+        self,
+        db_path=None,
+        flush_interval_seconds=None,
+        flush_batch=64,
+        user_cache_size=10_000,
+    ):
         self.model_state_file = os.getenv(
             "TORON_MODEL_STATE", "./model_reliability.json"
         )
         self.user_pref_file = os.getenv(
             "TORON_USER_PREFS", "./user_preferences.json"
         )
+        self.db_path = db_path or os.getenv(
+            "TORON_STATE_DB",
+            os.path.join(os.path.dirname(self.model_state_file) or ".", "toron_state.db"),
+        )
+        self.flush_interval_seconds = (
+            flush_interval_seconds
+            if flush_interval_seconds is not None
+            else float(os.getenv("TORON_STATE_FLUSH_INTERVAL", "1.0"))
+        )
+        self.flush_batch = flush_batch
+        self.user_cache_size = user_cache_size
 
-        # Load or create
-        self.model_state = self._load_json(self.model_state_file)
-        self.user_prefs = self._load_json(self.user_pref_file)
+        self._db_lock = Lock()
+        self._state_lock = Lock()
+        self._db = self._connect()
+        self._import_legacy_json()
+
+        # Model scores are few; keep them all. Users load on demand.
+        self.model_state = dict(self._db.execute("SELECT model, score FROM model_reliability"))
+        # uid -> canonical JSON, so callers get fresh copies and in-place
+        # edits to a context's prefs are still detected as changes.
+        self._user_cache = OrderedDict()
+
+        self._dirty_prefs = {}
+        self._pending_scores = {}
+        self._last_flush = time.monotonic()
+        self._flush_future = None
+        atexit.register(self.close)
+
+    # -----------------------------
+    # STORAGE
+    # -----------------------------
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS model_reliability ("
+            "model TEXT PRIMARY KEY, score REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS user_preferences ("
+            "user_id TEXT PRIMARY KEY, prefs TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        return db
 
     def _load_json(self, path):
         try:
@@ -28,19 +87,68 @@ class StateManager:
             pass
         return {}
 
-    def _save_json(self, path, data):
-        try:
-            with open(path, "w") as f:
-                json.dump(data, f, indent=2)
-        except Exception:
-            pass
+    def _import_legacy_json(self):
+        """One-time migration from the JSON files this store replaces."""
+        with self._db_lock:
+            has_rows = self._db.execute(
+                "SELECT EXISTS(SELECT 1 FROM model_reliability) OR EXISTS(SELECT 1 FROM user_preferences)"
+            ).fetchone()[0]
+            if has_rows:
+                return
+            models = self._load_json(self.model_state_file)
+            prefs = self._load_json(self.user_pref_file)
+            if not models and not prefs:
+                return
+            now = time.time()
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO model_reliability VALUES (?, ?, ?)",
+                    [(m, float(s), now) for m, s in models.items()],
+                )
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO user_preferences VALUES (?, ?, ?)",
+                    [(u, json.dumps(p), now) for u, p in prefs.items()],
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+
+    @staticmethod
+    def _canonical(prefs):
+        return json.dumps(prefs, sort_keys=True, separators=(",", ":"), default=str)
+
+    def _load_user(self, uid):
+        with self._state_lock:
+            cached = self._user_cache.get(uid)
+            if cached is not None:
+                self._user_cache.move_to_end(uid)
+                return json.loads(cached)
+
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT prefs FROM user_preferences WHERE user_id = ?", (uid,)
+            ).fetchone()
+        encoded = self._canonical(json.loads(row[0])) if row else "{}"
+        self._cache_user(uid, encoded)
+        return json.loads(encoded)
+
+    def _cache_user(self, uid, encoded):
+        with self._state_lock:
+            # A dirty entry is always newer than what the database returned.
+            if uid in self._dirty_prefs:
+                encoded = self._dirty_prefs[uid]
+            self._user_cache[uid] = encoded
+            self._user_cache.move_to_end(uid)
+            while len(self._user_cache) > self.user_cache_size:
+                self._user_cache.popitem(last=False)
 
     # -----------------------------
     # USER PREFERENCE MANAGEMENT
     # -----------------------------
     def attach_user_preferences(self, context):
         uid = context.get("user_id", "anonymous")
-        prefs = self.user_prefs.get(uid, {})
+        prefs = self._load_user(uid)
         context["user_prefs"] = prefs
         return context
 
@@ -49,9 +157,13 @@ class StateManager:
         if not uid:
             return
 
-        prefs = context.get("user_prefs", {})
-        self.user_prefs[uid] = prefs
-        self._save_json(self.user_pref_file, self.user_prefs)
+        encoded = self._canonical(context.get("user_prefs", {}))
+        with self._state_lock:
+            if self._user_cache.get(uid) == encoded:
+                return  # unchanged; nothing to write
+            self._dirty_prefs[uid] = encoded
+        self._cache_user(uid, encoded)
+        self._maybe_flush()
 
     # -----------------------------
     # MODEL RELIABILITY UPDATES
@@ -63,9 +175,98 @@ class StateManager:
 
         score = final_result.get("confidence", 0.5)
 
-        # Reliability grows slowly
-        prev = self.model_state.get(model, 0.5)
-        new_score = (prev * 0.8) + (score * 0.2)
+        with self._state_lock:
+            # Reliability grows slowly
+            prev = self.model_state.get(model, 0.5)
+            new_score = (prev * 0.8) + (score * 0.2)
+
+            self.model_state[model] = round(new_score, 4)
+            self._pending_scores.setdefault(model, []).append(score)
+        self._maybe_flush()
+
+    # -----------------------------
+    # FLUSHING
+    # -----------------------------
+    def dirty_count(self):
+        with self._state_lock:
+            return len(self._dirty_prefs) + len(self._pending_scores)
+
+    def _maybe_flush(self):
+        due = (
+            self.dirty_count() >= self.flush_batch
+            or time.monotonic() - self._last_flush >= self.flush_interval_seconds
+        )
+        if not due:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_future is None or self._flush_future.done():
+            self._flush_future = loop.run_in_executor(None, self.flush)
+
+    def flush(self):
+        """Write every dirty key in one transaction."""
+        with self._state_lock:
+            prefs, self._dirty_prefs = self._dirty_prefs, {}
+            scores, self._pending_scores = self._pending_scores, {}
+            self._last_flush = time.monotonic()
+        if not prefs and not scores:
+            return
+
+        now = time.time()
+        with self._db_lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.executemany(
+                    "INSERT INTO user_preferences VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET prefs = excluded.prefs, updated_at = excluded.updated_at",
+                    [(uid, encoded, now) for uid, encoded in prefs.items()],
+                )
+                # Re-apply this worker's observations to the stored score so
+                # updates from other workers are folded in, not overwritten.
+                merged = {}
+                for model, observed in scores.items():
+                    row = self._db.execute(
+                        "SELECT score FROM model_reliability WHERE model = ?", (model,)
+                    ).fetchone()
+                    value = row[0] if row else 0.5
+                    for s in observed:
+                        value = (value * 0.8) + (s * 0.2)
+                    merged[model] = round(value, 4)
+                self._db.executemany(
+                    "INSERT INTO model_reliability VALUES (?, ?, ?) "
+                    "ON CONFLICT(model) DO UPDATE SET score = excluded.score, updated_at = excluded.updated_at",
+                    [(m, v, now) for m, v in merged.items()],
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                try:
+                    self._db.execute("ROLLBACK")
+                except Exception:
+                    pass
+                # Keep the batch for the next attempt without dropping newer writes.
+                with self._state_lock:
+                    for uid, p in prefs.items():
+                        self._dirty_prefs.setdefault(uid, p)
+                    for model, observed in scores.items():
+                        self._pending_scores[model] = observed + self._pending_scores.get(model, [])
+                return
+
+        with self._state_lock:
+            self.model_state.update(merged)
 
-        self.model_state[model] = round(new_score, 4)
-        self._save_json(self.model_state_file, self.model_state)
+    async def aflush(self):
+        if self._flush_future is not None:
+            await self._flush_future
+        await asyncio.to_thread(self.flush)
+
+    def close(self):
+        try:
+            self.flush()
+            with self._db_lock:
+                self._db.close()
+        except Exception:
+            pass
+        atexit.unregister(self.close)
@@ -6,6 +6,8 @@ import asyncio
 import logging
 import time
 
+from opentelemetry.trace import Status, StatusCode
+
 from ..bootstrap.engine_bootstrap import EngineBootstrap
 from ..bootstrap.env_config import EngineConfig
 from ..runtime.response_builder import ResponseBuilder
@@ -17,6 +19,7 @@ from ..runtime.alert_manager import AlertManager
 from ..runtime.tracing_manager import TracingManager
 from ..runtime.replay_store import ReplayStore
 from ..runtime.execution_policy import ExecutionPolicy
+from ..runtime.stream_executor import StreamExecutor
 from ..core.connectors.connector_factory import ConnectorFactory
 from ..core.cloud_provider_adapter import CloudProviderAdapter
 from ..core.debate_engine import DebateEngine
@@ -30,6 +33,7 @@ from ..core.consensus_integrator import ConsensusIntegrator
 from ..aloe.lifecycle_manager import LifecycleManager
 from ..runtime.cloudwatch_telemetry import CloudWatchTelemetry
 from ..performance.cache.multi_layer_cache import MultiLayerCache
+from ..routing.model_selector import ModelSelector
 from ..routing.query_optimizer import QueryOptimizer
 from ..routing.router import Router
 from ..tracing.tracer import ToronTracer
@@ -64,14 +68,16 @@ class ToronEngine:
         # b. run bootstrap
         bootstrap = EngineBootstrap()
         self.providers = bootstrap.initialize()
+        self.clients = bootstrap.build_clients(self.providers)
+        self.clients.schedule_warm()
         self.telemetry = CloudWatchTelemetry()
 
-        self.cache = MultiLayerCache()
+        self.cache = MultiLayerCache(clients=self.clients)
+        self.cache.schedule_start()
         self.tracer = ToronTracer()
-        self.query_optimizer = QueryOptimizer()
 
         # c. discover connectors
-        connectors = ConnectorFactory.discover(self.providers)
+        connectors = ConnectorFactory.discover(self.providers, clients=self.clients)
         if not connectors:
             raise RuntimeError("No model providers available.")
 
@@ -80,9 +86,16 @@ class ToronEngine:
 
         # e. init runtime systems
         self.slo = SLOManager()
-        self.cost = CostGuardrails()
+        self.cost = CostGuardrails(stats=self.provider_adapter.model_stats)
+        self.query_optimizer = QueryOptimizer(
+            selector=ModelSelector(self.provider_adapter.model_stats, guardrails=self.cost),
+            max_models=self.config.max_parallel_models,
+        )
         self.alerts = AlertManager()
-        self.replay = ReplayStore()
+        self.replay = ReplayStore(
+            sample_rate=getattr(self.config, "replay_sample_rate", None),
+            directory=getattr(self.config, "replay_dir", None),
+        )
         self.trace = TracingManager()
         self.health = HealthCheck(self.provider_adapter)
 
@@ -92,7 +105,7 @@ class ToronEngine:
         self.search_connector = SearchConnector()
         self.evidence_injector = EvidenceInjector()
         self.fact_extractor = FactExtractor(self.provider_adapter)
-        self.web_search = WebSearch()
+        self.web_search = WebSearch(clients=self.clients)
         self.validator = WebValidator(self.provider_adapter)
         self.consensus = ConsensusIntegrator()
 
@@ -103,6 +116,7 @@ class ToronEngine:
             debate_engine=self.debate_engine,
             consensus_integrator=self.consensus,
             provider_adapter=self.provider_adapter,
+            guardrails=self.cost,
         )
 
         # g. init execution policy
@@ -111,7 +125,8 @@ class ToronEngine:
         # h. init ALOE lifecycle
         self.builder = ResponseBuilder()
         self.errors = ErrorShaper()
-        self.lifecycle = LifecycleManager(self.config, self.provider_adapter)
+        self.lifecycle = LifecycleManager(self.config, self.provider_adapter, clients=self.clients)
+        self.stream_executor = StreamExecutor(self.provider_adapter, self.lifecycle)
 
     async def process(self, request_dict: dict):
         """
@@ -121,8 +136,10 @@ class ToronEngine:
 
         start = time.time()
         request = None
+        context = None
+        settled = False
         try:
-            with self.tracer.span("toron.engine.process", {"request_id": request_dict.get("request_id") } ):
+            with self.tracer.span("toron.engine.process", lambda: {"request_id": request_dict.get("request_id")}) as span:
                 request = ToronRequest(**request_dict)
 
                 context = SessionContext(request_dict).as_dict()
@@ -136,8 +153,21 @@ class ToronEngine:
                 latency_ms = (time.time() - start) * 1000
                 self.slo.record_latency(latency_ms)
 
-                req_cost = result.get("usage_cost", 0.0)
-                self.cost.register_cost(req_cost)
+                # Swap the admission reservation for the actual cost when reported;
+                # raises (shaped below) on the per-request cap or an emergency stop.
+                # A failed request with no reported cost gives its reservation back.
+                actual_cost = result.get("usage_cost")
+                if actual_cost is None and result.get("status") == "error":
+                    actual_cost = 0.0
+                settled = True
+                await self.cost.settle(context.get("admission"), actual_cost)
+
+                if span.is_recording():
+                    # Feeds the tail sampler: failed and low-confidence traces are kept.
+                    if result.get("status") == "error":
+                        span.set_status(Status(StatusCode.ERROR, str(result.get("error", ""))[:200]))
+                    elif result.get("confidence") is not None:
+                        span.set_attribute("confidence", result["confidence"])
 
                 if result.get("status") == "error":
                     self.slo.record_failure()
@@ -146,7 +176,9 @@ class ToronEngine:
                     if not check["slo_pass"]:
                         self.alerts.alert("Toron SLO Violation", check)
 
-                    return self.errors.shape(result)
+                    shaped = self.errors.shape(result)
+                    self.replay.record(request_dict, shaped)
+                    return shaped
 
                 self.slo.record_success()
 
@@ -158,6 +190,7 @@ class ToronEngine:
                 resp["session_id"] = context["session_id"]
                 resp["timestamp"] = str(time.time())
 
+                self.replay.record(request_dict, resp)
                 return resp
 
         except Exception as e:
@@ -170,6 +203,22 @@ class ToronEngine:
             )
             return self.errors.shape(e)
 
+        finally:
+            if not settled and context is not None:
+                await self.cost.release(context.get("admission"))
+
+
+    async def stream(self, request_dict: dict):
+        """
+        Streaming request handler.
+        Yields SSE frames: live tokens first, then validation/consensus metadata.
+        """
+
+        self.policy.validate(request_dict)
+        context = SessionContext(request_dict).as_dict()
+
+        async for frame in self.stream_executor.run(request_dict, context):
+            yield frame
 
     def run_sync(self, request):
         return asyncio.run(self.process(request))
@@ -178,6 +227,10 @@ class ToronEngine:
     async def health_check(self):
         return await self.provider_adapter.health_check_all()
 
+    async def warm_up(self):
+        """Pre-open provider and cache connections (call from the server's startup hook)."""
+        await asyncio.gather(self.clients.warm(), self.cache.start())
+
     async def run_with_verification(self, query: str, models=None) -> dict:
         """Run debate → evidence scrubbing → verification → consensus.
 
@@ -0,0 +1,314 @@
+"""
+ClientRegistry — process-wide, long-lived HTTP connection pools for Toron.
+
+One ``httpx.AsyncClient`` is kept per upstream origin (scheme + host + port)
+so provider SDKs, the raw-HTTP connectors and WebSearch all reuse warm
+keep-alive connections instead of paying a TLS handshake per request.
+HTTP/2 is enabled automatically when the optional ``h2`` package is present.
+
+Connection pools are bound to the event loop that opened them, so each
+client routes requests to a pool owned by the running loop (``LoopLocal``).
+A process that calls ``asyncio.run`` per request gets a fresh pool per loop,
+and every pool is closed while its loop shuts down.
+
+New vs. reused connection counts are tracked per origin and published to
+CloudWatch as ``HTTPConnectionsNew`` / ``HTTPConnectionsReused``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib.util
+import os
+import time
+from contextlib import AsyncExitStack
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from ..runtime.cloudwatch_telemetry import CloudWatchTelemetry
+
+
+# Upstream origins per provider key returned by EngineBootstrap.initialize().
+PROVIDER_ORIGINS = {
+    "openai": ["https://api.openai.com"],
+    "anthropic": ["https://api.anthropic.com"],
+    "mistral": ["https://api.mistral.ai"],
+    "groq": ["https://api.groq.com"],
+}
+
+WEB_SEARCH_ORIGIN = "https://api.duckduckgo.com"
+
+
+def origin_of(url: str) -> str:
+    parsed = httpx.URL(url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    return f"{parsed.scheme}://{parsed.host}:{port}"
+
+
+# loop -> (sentinel task, closers run while that loop shuts down)
+_loop_closers: Dict[asyncio.AbstractEventLoop, Tuple[asyncio.Task, List[Callable[[], Awaitable[Any]]]]] = {}
+
+
+async def _close_on_shutdown(loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        await asyncio.Event().wait()
+    finally:
+        # asyncio.run cancels pending tasks before closing the loop, so this
+        # still runs on a live loop. Closers run newest first; one registered
+        # while draining (a client reopened to flush writes) runs after it.
+        _, closers = _loop_closers.get(loop, (None, []))
+        while closers:
+            with contextlib.suppress(Exception):
+                await closers.pop()()
+        _loop_closers.pop(loop, None)
+
+
+def on_loop_shutdown(close: Callable[[], Awaitable[Any]]) -> None:
+    """Await ``close`` when the running loop is shut down by ``asyncio.run``."""
+    loop = asyncio.get_running_loop()
+    for stale in [l for l in _loop_closers if l.is_closed()]:
+        # Loops closed without cancelling their tasks; their sockets die with them.
+        del _loop_closers[stale]
+    entry = _loop_closers.get(loop)
+    if entry is None:
+        entry = _loop_closers[loop] = (loop.create_task(_close_on_shutdown(loop)), [])
+    entry[1].append(close)
+
+
+class LoopLocal:
+    """One instance of a loop-bound async resource per running event loop.
+
+    ``open_context`` returns an async context manager (an httpx transport,
+    an aioboto3 client); it is entered on first use in each loop and exited
+    by ``aclose`` or when that loop shuts down.
+    """
+
+    def __init__(self, open_context: Callable[[], AsyncContextManager[Any]]):
+        self._open = open_context
+        self._entries: Dict[asyncio.AbstractEventLoop, Tuple[Any, AsyncExitStack]] = {}
+        self._locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+
+    async def get(self) -> Any:
+        loop = asyncio.get_running_loop()
+        entry = self._entries.get(loop)
+        if entry is not None:
+            return entry[0]
+        self._prune()
+        lock = self._locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(loop)
+            if entry is None:
+                stack = AsyncExitStack()
+                value = await stack.enter_async_context(self._open())
+                entry = self._entries[loop] = (value, stack)
+                on_loop_shutdown(lambda: self._close(loop))
+        return entry[0]
+
+    def loops(self) -> int:
+        """Number of loops currently holding an open instance."""
+        self._prune()
+        return len(self._entries)
+
+    async def aclose(self) -> None:
+        """Close the running loop's instance; it is reopened on the next ``get``."""
+        await self._close(asyncio.get_running_loop())
+
+    async def _close(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._locks.pop(loop, None)
+        entry = self._entries.pop(loop, None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    def _prune(self) -> None:
+        for loop in [l for l in self._entries if l.is_closed()]:
+            del self._entries[loop]
+            self._locks.pop(loop, None)
+
+
+class _ConnectionStats:
+    def __init__(self):
+        self.new = 0
+        self.reused = 0
+        self._reported_new = 0
+        self._reported_reused = 0
+
+    def pending(self):
+        delta = (self.new - self._reported_new, self.reused - self._reported_reused)
+        self._reported_new, self._reported_reused = self.new, self.reused
+        return delta
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Routes to the running loop's pool and records whether each request opened a socket."""
+
+    def __init__(self, pools: LoopLocal, registry: "ClientRegistry"):
+        self.pools = pools
+        self.registry = registry
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        opened = False
+        upstream_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict):
+            nonlocal opened
+            if event.endswith("connect_tcp.complete"):
+                opened = True
+            if upstream_trace is not None:
+                await upstream_trace(event, info)
+
+        request.extensions["trace"] = trace
+        inner = await self.pools.get()
+        response = await inner.handle_async_request(request)
+        self.registry._record(origin_of(str(request.url)), opened)
+        return response
+
+    async def aclose(self) -> None:
+        await self.pools.aclose()
+
+
+class ClientRegistry:
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        timeout: float = 30.0,
+        http2: bool | None = None,
+        report_interval_seconds: float = 60.0,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections
+            or int(os.getenv("TORON_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=max_keepalive_connections
+            or int(os.getenv("TORON_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=keepalive_expiry
+            or float(os.getenv("TORON_HTTP_KEEPALIVE_EXPIRY", "90")),
+        )
+        self.timeout = timeout
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        self.report_interval_seconds = report_interval_seconds
+
+        self.telemetry = CloudWatchTelemetry()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, _ConnectionStats] = {}
+        self._last_report = time.time()
+
+    # ---------------------------
+    # CLIENTS
+    # ---------------------------
+    def client(self, url: str) -> httpx.AsyncClient:
+        """Return the shared pooled client for ``url``'s origin."""
+        origin = origin_of(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            pools = LoopLocal(lambda: httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2))
+            client = httpx.AsyncClient(
+                transport=_CountingTransport(pools, self),
+                timeout=self.timeout,
+            )
+            self._clients[origin] = client
+            self._stats.setdefault(origin, _ConnectionStats())
+        return client
+
+    def register_providers(self, providers: dict) -> None:
+        """Create pools for every origin used by the detected providers."""
+        for provider, enabled in providers.items():
+            if enabled:
+                for origin in PROVIDER_ORIGINS.get(provider, []):
+                    self.client(origin)
+
+        azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+        if providers.get("azure") and azure_endpoint:
+            self.client(azure_endpoint)
+
+        self.client(WEB_SEARCH_ORIGIN)
+
+    def botocore_config(self):
+        """Keep-alive policy for the aioboto3 clients (Bedrock, S3)."""
+        from botocore.config import Config
+
+        return Config(
+            max_pool_connections=self.limits.max_connections,
+            tcp_keepalive=True,
+        )
+
+    # ---------------------------
+    # WARM-UP
+    # ---------------------------
+    async def warm(self, origins: Optional[Iterable[str]] = None, connections_per_origin: int = 2):
+        """Open ``connections_per_origin`` connections to each origin ahead of traffic."""
+        targets = list(origins) if origins is not None else list(self._clients.keys())
+
+        async def ping(origin: str):
+            try:
+                await self.client(origin).head(origin, timeout=5.0)
+            except Exception:
+                # A 4xx/connection error still leaves the TLS session warm (or
+                # tells us nothing useful); warming is best-effort either way.
+                pass
+
+        await asyncio.gather(
+            *(ping(o) for o in targets for _ in range(connections_per_origin))
+        )
+        self.telemetry.log(
+            "HTTPPoolsWarmed",
+            {"origins": targets, "http2": self.http2, "stats": self.stats()},
+        )
+
+    def schedule_warm(self) -> Optional[asyncio.Task]:
+        """Warm in the background when called from inside a running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        return loop.create_task(self.warm())
+
+    # ---------------------------
+    # TELEMETRY
+    # ---------------------------
+    def _record(self, origin: str, opened: bool) -> None:
+        stats = self._stats.setdefault(origin, _ConnectionStats())
+        if opened:
+            stats.new += 1
+        else:
+            stats.reused += 1
+
+        if time.time() - self._last_report >= self.report_interval_seconds:
+            self.report()
+
+    def report(self) -> None:
+        self._last_report = time.time()
+        for origin, stats in self._stats.items():
+            new, reused = stats.pending()
+            if not new and not reused:
+                continue
+            dims = [{"Name": "Origin", "Value": origin}]
+            self.telemetry.metric("HTTPConnectionsNew", new, unit="Count", dims=dims)
+            self.telemetry.metric("HTTPConnectionsReused", reused, unit="Count", dims=dims)
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            origin: {"new": s.new, "reused": s.reused}
+            for origin, s in self._stats.items()
+        }
+
+    async def aclose(self) -> None:
+        """Close the running loop's pools; pools of other loops close with their loop."""
+        self.report()
+        await asyncio.gather(
+            *(c.aclose() for c in self._clients.values()), return_exceptions=True
+        )
+        self._clients.clear()
+
+
+_shared_registry: ClientRegistry | None = None
+
+
+def get_client_registry() -> ClientRegistry:
+    """Process-wide registry shared by every engine instance."""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = ClientRegistry()
+    return _shared_registry
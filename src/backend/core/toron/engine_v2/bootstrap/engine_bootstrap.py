@@ -9,6 +9,8 @@ Checks credentials for:
 - Anthropic
 - Mistral
 - Groq
+
+and builds the shared, pre-warmable HTTP client pools for them.
 """
 
 import os
@@ -16,8 +18,16 @@ import boto3
 from google.auth import default as gcp_default
 from azure.identity import DefaultAzureCredential
 
+from .client_registry import get_client_registry
+
 
 class EngineBootstrap:
+    def build_clients(self, providers):
+        """Register long-lived connection pools for every detected provider."""
+        clients = get_client_registry()
+        clients.register_providers(providers)
+        return clients
+
     def initialize(self):
         providers = {
             "aws": False,
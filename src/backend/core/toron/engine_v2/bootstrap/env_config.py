@@ -25,6 +25,19 @@ class EngineConfig:
         )
         self.provider_priority = [p.strip() for p in priority_raw.split(",")]
 
+        # Dispatch-level response cache (deterministic calls only by default)
+        self.response_cache_ttl_seconds = int(os.getenv("TORON_LLM_CACHE_TTL", "900"))
+        self.response_cache_max_entries = int(os.getenv("TORON_LLM_CACHE_MAX_ENTRIES", "4096"))
+        self.response_cache_max_temperature = float(
+            os.getenv("TORON_LLM_CACHE_MAX_TEMPERATURE", "0.0")
+        )
+
+        # Replay capture (sampled; spills to a rotating on-disk log when a dir is set).
+        # The log is encrypted with TORON_REPLAY_KEY and stays off without one
+        # unless TORON_REPLAY_PLAINTEXT=1 (the directory then holds raw prompts).
+        self.replay_sample_rate = float(os.getenv("TORON_REPLAY_SAMPLE_RATE", "0.01"))
+        self.replay_dir = os.getenv("TORON_REPLAY_DIR")
+
         # Enterprise level model set (full power)
         self.enterprise_model_list = [
             "gpt-4o",
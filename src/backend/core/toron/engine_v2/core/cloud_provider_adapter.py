@@ -6,24 +6,85 @@ from __future__ import annotations
 
 import asyncio
 import time
-from typing import Any, Dict, Iterable
+from typing import Any, AsyncIterator, Dict, Iterable
 
 from .health_monitor import HealthMonitor
+from .model_stats import ModelStats
+from .response_cache import ResponseCache
 from ..runtime.cloudwatch_telemetry import CloudWatchTelemetry
 from .message_normalizer import MessageNormalizer
 
 
 class CloudProviderAdapter:
-    def __init__(self, connectors: Dict[str, Any], config, health_monitor: HealthMonitor | None = None):
+    def __init__(
+        self,
+        connectors: Dict[str, Any],
+        config,
+        health_monitor: HealthMonitor | None = None,
+        response_cache: ResponseCache | None = None,
+        model_stats: ModelStats | None = None,
+    ):
         self.connectors = connectors
         self.config = config
         self.health_monitor = health_monitor or HealthMonitor(
             list(connectors.keys()), failure_threshold=3, cooldown_seconds=60
         )
+        self.response_cache = response_cache or ResponseCache(
+            ttl_seconds=getattr(config, "response_cache_ttl_seconds", None),
+            max_entries=getattr(config, "response_cache_max_entries", None),
+            max_temperature=getattr(config, "response_cache_max_temperature", None),
+        )
+        self.model_stats = model_stats or ModelStats()
         self.telemetry = CloudWatchTelemetry()
 
-    async def dispatch(self, messages: Iterable[dict], model: str):
+    async def dispatch(
+        self,
+        messages: Iterable[dict],
+        model: str,
+        call_site: str = "unknown",
+        cache: bool | None = None,
+        **kwargs,
+    ):
+        """Run one completion with provider failover.
+
+        Deterministic calls (temperature at or below the cache threshold) are
+        served from the response cache, and concurrent identical calls share a
+        single provider round-trip. A result is only stored when the provider
+        that served it honours ``temperature``; the others sample regardless.
+        ``cache`` forces caching on or off (forcing, like replay mode, also
+        stores results from providers that ignore temperature) and
+        ``call_site`` labels the caller for per-stage hit rates.
+        """
+        messages = list(messages)
+        if not self.response_cache.cacheable(kwargs, cache):
+            self.response_cache.record_bypass(call_site)
+            return await self._dispatch_uncached(messages, model, **kwargs)
+
+        key = self.response_cache.make_key(messages, model, kwargs)
+        served = []
+        (response, metadata), outcome = await self.response_cache.get_or_call(
+            key,
+            lambda: self._dispatch_uncached(messages, model, served=served, **kwargs),
+            call_site=call_site,
+            store=None if cache or self.response_cache.cache_nondeterministic
+            else lambda _: self._honours_temperature(served),
+        )
+        self.telemetry.metric(
+            "DispatchCacheLookup",
+            1,
+            unit="Count",
+            dims=[
+                {"Name": "CallSite", "Value": call_site},
+                {"Name": "Result", "Value": outcome},
+            ],
+        )
+        if outcome == "miss":
+            return response, metadata
+        return response, {**metadata, "cache": outcome}
+
+    async def _dispatch_uncached(self, messages: Iterable[dict], model: str, served: list | None = None, **kwargs):
         errors = []
+        started = time.time()
 
         for provider in self.config.provider_priority:
             if provider not in self.connectors:
@@ -42,12 +103,20 @@ class CloudProviderAdapter:
             try:
                 normalized = MessageNormalizer.normalize_for_provider(messages, provider)
                 response, metadata = await asyncio.wait_for(
-                    connector.infer(normalized, model),
+                    connector.infer(normalized, model, **kwargs),
                     timeout=self.config.model_timeout_seconds,
                 )
 
                 latency = (time.time() - start) * 1000
                 self.health_monitor.mark_success(provider)
+                self.model_stats.record_call(
+                    model,
+                    latency,
+                    True,
+                    metadata.get("usage") if isinstance(metadata, dict) else None,
+                )
+                if served is not None:
+                    served.append(provider)
 
                 self.telemetry.metric(
                     "ProviderSuccess",
@@ -96,8 +165,125 @@ class CloudProviderAdapter:
                 errors.append(f"{provider}: {str(e)}")
                 continue
 
+        self._record_model_failure(model, started, errors)
+        raise Exception(f"All providers failed. Errors: {'; '.join(errors)}")
+
+    async def stream(self, messages: Iterable[dict], model: str, **kwargs) -> AsyncIterator[str]:
+        """Stream tokens for ``model`` with the same failover order as ``dispatch``.
+
+        Failover is only possible until the first token has been yielded; once a
+        provider has started emitting text, a mid-stream error is recorded and
+        re-raised because the partial answer has already reached the caller.
+        """
+        errors = []
+        started = time.time()
+
+        for provider in self.config.provider_priority:
+            if provider not in self.connectors:
+                continue
+
+            if not self.health_monitor.can_use(provider):
+                self.telemetry.log(
+                    "ProviderSkippedUnhealthy",
+                    {"provider": provider},
+                )
+                continue
+
+            connector = self.connectors[provider]
+            start = time.time()
+            first_token_ms = None
+            chunks = 0
+            iterator = None
+
+            try:
+                normalized = MessageNormalizer.normalize_for_provider(messages, provider)
+                iterator = connector.stream(normalized, model, **kwargs).__aiter__()
+
+                # Only the wait for the first token is bounded; long answers may
+                # legitimately stream for longer than the per-call timeout.
+                token = await asyncio.wait_for(
+                    iterator.__anext__(),
+                    timeout=self.config.model_timeout_seconds,
+                )
+                first_token_ms = (time.time() - start) * 1000
+
+                while True:
+                    if token:
+                        chunks += 1
+                        yield token
+                    try:
+                        token = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        break
+
+            except StopAsyncIteration:
+                # Provider closed the stream without emitting anything.
+                pass
+
+            except asyncio.TimeoutError:
+                latency = (time.time() - start) * 1000
+                self.health_monitor.mark_failure(provider, "timeout")
+
+                self._record_failure(provider, latency, "timeout")
+                errors.append(f"{provider}: timeout")
+                continue
+
+            except Exception as e:
+                latency = (time.time() - start) * 1000
+                self.health_monitor.mark_failure(provider, str(e))
+
+                self._record_failure(provider, latency, str(e))
+                if chunks:
+                    self.model_stats.record_call(model, (time.time() - started) * 1000, False)
+                    raise
+                errors.append(f"{provider}: {str(e)}")
+                continue
+
+            finally:
+                await self._close_stream(iterator)
+
+            latency = (time.time() - start) * 1000
+            self.health_monitor.mark_success(provider)
+            self.model_stats.record_call(model, latency, True)
+
+            self.telemetry.metric(
+                "ProviderSuccess",
+                1,
+                unit="Count",
+                dims=[{"Name": "Provider", "Value": provider}],
+            )
+            self.telemetry.metric(
+                "ProviderLatency",
+                latency,
+                dims=[{"Name": "Provider", "Value": provider}],
+            )
+            if first_token_ms is not None:
+                self.telemetry.metric(
+                    "ProviderTimeToFirstToken",
+                    first_token_ms,
+                    dims=[{"Name": "Provider", "Value": provider}],
+                )
+            self.telemetry.log(
+                "ProviderStreamCompleted",
+                {
+                    "provider": provider,
+                    "model": model,
+                    "latency_ms": latency,
+                    "first_token_ms": first_token_ms,
+                    "chunks": chunks,
+                },
+            )
+            return
+
+        self._record_model_failure(model, started, errors)
         raise Exception(f"All providers failed. Errors: {'; '.join(errors)}")
 
+    def _record_model_failure(self, model: str, started: float, errors: list) -> None:
+        # Provider failures are tracked by the health monitor; the model only
+        # counts as failing when no provider in the priority list served it.
+        if errors:
+            self.model_stats.record_call(model, (time.time() - started) * 1000, False)
+
     async def list_all_models(self):
         out = []
         tasks = [c.list_models() for c in self.connectors.values()]
@@ -131,6 +317,11 @@ class CloudProviderAdapter:
     # ---------------------------
     # Internal helpers
     # ---------------------------
+    def _honours_temperature(self, served: list) -> bool:
+        return bool(served) and all(
+            getattr(self.connectors[p], "honours_temperature", False) for p in served
+        )
+
     def _record_failure(self, provider: str, latency: float, error: str) -> None:
         self.telemetry.metric(
             "ProviderFailure",
@@ -151,3 +342,14 @@ class CloudProviderAdapter:
                 "latency_ms": latency,
             },
         )
+
+    @staticmethod
+    async def _close_stream(iterator) -> None:
+        # Release the provider's HTTP stream even when we abandon it mid-way.
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is None:
+            return
+        try:
+            await aclose()
+        except Exception:
+            pass
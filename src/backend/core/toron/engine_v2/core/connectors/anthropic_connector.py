@@ -11,8 +11,19 @@ from ..message_normalizer import MessageNormalizer
 
 
 class AnthropicConnector(BaseConnector):
-    def __init__(self):
-        self.client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    honours_temperature = True
+
+    def __init__(self, clients=None):
+        http_client = clients.client("https://api.anthropic.com") if clients else None
+        try:
+            self.client = AsyncAnthropic(
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                http_client=http_client
+            )
+        except TypeError:
+            # SDK builds that vendor their own HTTP stack reject a plain
+            # httpx client; fall back to the SDK's internal pool.
+            self.client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
 
     async def infer(self, messages, model, **kwargs):
         retries = 3
@@ -43,10 +54,13 @@ class AnthropicConnector(BaseConnector):
                 await asyncio.sleep(2 ** attempt)
 
     async def stream(self, messages, model, **kwargs):
+        system, normalized = MessageNormalizer.to_anthropic_format(messages)
         async with self.client.messages.stream(
             model=model,
-            messages=messages,
-            max_tokens=kwargs.get("max_tokens", 2048)
+            system=system,
+            messages=normalized,
+            max_tokens=kwargs.get("max_tokens", 2048),
+            temperature=kwargs.get("temperature", 0.7),
         ) as s:
             async for t in s.text_stream:
                 yield t
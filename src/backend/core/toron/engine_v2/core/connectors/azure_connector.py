@@ -10,11 +10,13 @@ from ..message_normalizer import MessageNormalizer
 
 
 class AzureConnector(BaseConnector):
-    def __init__(self):
+    def __init__(self, clients=None):
+        endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
         self.client = AsyncAzureOpenAI(
             api_key=os.getenv("AZURE_OPENAI_KEY"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01")
+            azure_endpoint=endpoint,
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+            http_client=clients.client(endpoint) if clients and endpoint else None
         )
         self.deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
 
@@ -47,15 +49,17 @@ class AzureConnector(BaseConnector):
                 await asyncio.sleep(2 ** attempt)
 
     async def stream(self, messages, model, **kwargs):
+        normalized = MessageNormalizer.normalize_for_provider(messages, "azure")
         stream = await self.client.chat.completions.create(
             model=self.deployment,
-            messages=messages,
+            messages=normalized,
             stream=True,
             max_tokens=kwargs.get("max_tokens", 2048)
         )
 
         async for chunk in stream:
-            if chunk.choices[0].delta.content:
+            # Azure emits a leading content-filter chunk with no choices.
+            if chunk.choices and chunk.choices[0].delta.content:
                 yield chunk.choices[0].delta.content
 
     async def list_models(self):
@@ -3,6 +3,10 @@ Base Connector — required interface for all model providers.
 """
 
 class BaseConnector:
+    # True when infer() forwards ``temperature`` to the provider, so a
+    # temperature-0 answer is reproducible and may be cached.
+    honours_temperature = False
+
     async def infer(self, messages, model, **kwargs):
         raise NotImplementedError
 
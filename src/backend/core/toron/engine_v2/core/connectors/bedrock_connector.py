@@ -8,12 +8,31 @@ import json
 import asyncio
 from .base_connector import BaseConnector
 from ..message_normalizer import MessageNormalizer
+from ...bootstrap.client_registry import LoopLocal
 
 
 class BedrockConnector(BaseConnector):
-    def __init__(self, region="us-east-1"):
+    honours_temperature = True
+
+    def __init__(self, region="us-east-1", clients=None):
         self.region = region
         self.session = aioboto3.Session()
+        self.client_config = clients.botocore_config() if clients else None
+        # One long-lived bedrock-runtime client per event loop so its
+        # connection pool (and TLS sessions) survive across requests.
+        self._runtimes = LoopLocal(
+            lambda: self.session.client(
+                "bedrock-runtime",
+                region_name=self.region,
+                config=self.client_config
+            )
+        )
+
+    async def _runtime(self):
+        return await self._runtimes.get()
+
+    async def aclose(self):
+        await self._runtimes.aclose()
 
     async def infer(self, messages, model, **kwargs):
         retries = 3
@@ -21,30 +40,27 @@ class BedrockConnector(BaseConnector):
 
         for attempt in range(retries):
             try:
-                async with self.session.client(
-                    "bedrock-runtime",
-                    region_name=self.region
-                ) as c:
-
-                    body = {
-                        "anthropic_version": "bedrock-2023-05-31",
-                        "system": system,
-                        "messages": normalized,
-                        "max_tokens": kwargs.get("max_tokens", 2048),
-                        "temperature": kwargs.get("temperature", 0.7)
-                    }
-
-                    resp = await c.invoke_model(
-                        modelId=model, body=json.dumps(body)
-                    )
-
-                    data = await resp["body"].read()
-                    data = json.loads(data.decode())
-
-                    return data, {
-                        "provider": "aws-bedrock",
-                        "model": model
-                    }
+                c = await self._runtime()
+
+                body = {
+                    "anthropic_version": "bedrock-2023-05-31",
+                    "system": system,
+                    "messages": normalized,
+                    "max_tokens": kwargs.get("max_tokens", 2048),
+                    "temperature": kwargs.get("temperature", 0.7)
+                }
+
+                resp = await c.invoke_model(
+                    modelId=model, body=json.dumps(body)
+                )
+
+                data = await resp["body"].read()
+                data = json.loads(data.decode())
+
+                return data, {
+                    "provider": "aws-bedrock",
+                    "model": model
+                }
 
             except Exception as e:
                 if attempt == retries - 1:
@@ -53,26 +69,24 @@ class BedrockConnector(BaseConnector):
 
     async def stream(self, messages, model, **kwargs):
         system, normalized = MessageNormalizer.to_anthropic_format(messages)
-        async with self.session.client(
-            "bedrock-runtime",
-            region_name=self.region
-        ) as c:
-
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "system": system,
-                "messages": normalized,
-                "max_tokens": kwargs.get("max_tokens", 2048)
-            }
-
-            stream = await c.invoke_model_with_response_stream(
-                modelId=model, body=json.dumps(body)
-            )
+        c = await self._runtime()
+
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "system": system,
+            "messages": normalized,
+            "max_tokens": kwargs.get("max_tokens", 2048),
+            "temperature": kwargs.get("temperature", 0.7)
+        }
+
+        stream = await c.invoke_model_with_response_stream(
+            modelId=model, body=json.dumps(body)
+        )
 
-            async for event in stream.get("body"):
-                chunk = json.loads(event["chunk"]["bytes"])
-                if "delta" in chunk and "text" in chunk["delta"]:
-                    yield chunk["delta"]["text"]
+        async for event in stream.get("body"):
+            chunk = json.loads(event["chunk"]["bytes"])
+            if "delta" in chunk and "text" in chunk["delta"]:
+                yield chunk["delta"]["text"]
 
     async def list_models(self):
         return [
@@ -83,9 +97,7 @@ class BedrockConnector(BaseConnector):
 
     async def health_check(self):
         try:
-            async with self.session.client(
-                "bedrock-runtime", region_name=self.region
-            ):
-                return True
+            await self._runtime()
+            return True
         except Exception:
             return False
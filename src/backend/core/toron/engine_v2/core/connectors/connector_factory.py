@@ -15,28 +15,29 @@ from .groq_connector import GroqConnector
 
 class ConnectorFactory:
     @staticmethod
-    def discover(providers: dict):
+    def discover(providers: dict, clients=None):
+        """``clients`` is an optional ClientRegistry shared by all connectors."""
         connectors = {}
 
         if providers.get("aws"):
-            connectors["aws-bedrock"] = BedrockConnector()
+            connectors["aws-bedrock"] = BedrockConnector(clients=clients)
 
         if providers.get("openai"):
-            connectors["openai"] = OpenAIConnector()
+            connectors["openai"] = OpenAIConnector(clients=clients)
 
         if providers.get("anthropic"):
-            connectors["anthropic"] = AnthropicConnector()
+            connectors["anthropic"] = AnthropicConnector(clients=clients)
 
         if providers.get("azure"):
-            connectors["azure"] = AzureConnector()
+            connectors["azure"] = AzureConnector(clients=clients)
 
         if providers.get("gcp"):
             connectors["gcp-vertex"] = VertexConnector()
 
         if os.getenv("MISTRAL_API_KEY"):
-            connectors["mistral"] = MistralConnector()
+            connectors["mistral"] = MistralConnector(clients=clients)
 
         if os.getenv("GROQ_API_KEY"):
-            connectors["groq"] = GroqConnector()
+            connectors["groq"] = GroqConnector(clients=clients)
 
         return connectors
@@ -3,16 +3,29 @@ Mistral Connector — Mistral AI models.
 """
 
 import httpx
+import json
 import os
 import asyncio
+from contextlib import asynccontextmanager
 from .base_connector import BaseConnector
 from ..message_normalizer import MessageNormalizer
 
 
 class MistralConnector(BaseConnector):
-    def __init__(self):
+    def __init__(self, clients=None):
         self.api_key = os.getenv("MISTRAL_API_KEY")
         self.url = "https://api.mistral.ai/v1/chat/completions"
+        self.clients = clients
+
+    @asynccontextmanager
+    async def _client(self):
+        # Shared keep-alive pool when a registry is wired in; otherwise a
+        # short-lived client as before.
+        if self.clients is not None:
+            yield self.clients.client(self.url)
+            return
+        async with httpx.AsyncClient(timeout=30.0) as c:
+            yield c
 
     async def infer(self, messages, model, **kwargs):
         retries = 3
@@ -20,7 +33,7 @@ class MistralConnector(BaseConnector):
 
         for attempt in range(retries):
             try:
-                async with httpx.AsyncClient(timeout=30.0) as c:
+                async with self._client() as c:
                     r = await c.post(
                         self.url,
                         headers={"Authorization": f"Bearer {self.api_key}"},
@@ -43,7 +56,33 @@ class MistralConnector(BaseConnector):
                 await asyncio.sleep(2 ** attempt)
 
     async def stream(self, messages, model, **kwargs):
-        yield ""  # Placeholder for now (Mistral streaming can be added)
+        normalized = MessageNormalizer.normalize_for_provider(messages, "mistral")
+
+        async with self._client() as c:
+            async with c.stream(
+                "POST",
+                self.url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json={
+                    "model": model,
+                    "messages": normalized,
+                    "max_tokens": kwargs.get("max_tokens", 2048),
+                    "stream": True
+                }
+            ) as r:
+                r.raise_for_status()
+                # OpenAI-compatible SSE: "data: {...}" lines, ending with [DONE].
+                async for line in r.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    chunk = json.loads(payload)
+                    choices = chunk.get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
 
     async def list_models(self):
         return [{"model_id": "mistral-large-latest"}]
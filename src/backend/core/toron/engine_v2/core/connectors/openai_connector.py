@@ -11,8 +11,13 @@ from ..message_normalizer import MessageNormalizer
 
 
 class OpenAIConnector(BaseConnector):
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    honours_temperature = True
+
+    def __init__(self, clients=None):
+        self.client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=clients.client("https://api.openai.com") if clients else None
+        )
 
     async def infer(self, messages, model, **kwargs):
         retries = 3
@@ -46,15 +51,18 @@ class OpenAIConnector(BaseConnector):
                 await asyncio.sleep(2 ** attempt)
 
     async def stream(self, messages, model, **kwargs):
+        normalized = MessageNormalizer.normalize_for_provider(messages, "openai")
         stream = await self.client.chat.completions.create(
             model=model,
-            messages=messages,
+            messages=normalized,
             stream=True,
-            max_tokens=kwargs.get("max_tokens", 2048)
+            max_tokens=kwargs.get("max_tokens", 2048),
+            temperature=kwargs.get("temperature", 0.7),
+            timeout=kwargs.get("timeout", 30.0)
         )
 
         async for chunk in stream:
-            if chunk.choices[0].delta.content:
+            if chunk.choices and chunk.choices[0].delta.content:
                 yield chunk.choices[0].delta.content
 
     async def list_models(self):
@@ -36,15 +36,23 @@ class VertexConnector(BaseConnector):
             raise Exception(f"Vertex error: {str(e)}")
 
     async def stream(self, messages, model, **kwargs):
-        def sync_gen():
+        prompt = MessageNormalizer.normalize_for_provider(messages, "gcp-vertex")
+
+        def start():
             from vertexai.generative_models import GenerativeModel
             m = GenerativeModel(model)
-            prompt = messages[-1]["content"]
-            for chunk in m.generate_content(prompt, stream=True):
-                yield chunk.text
+            return iter(m.generate_content(prompt, stream=True))
 
-        for piece in await asyncio.to_thread(lambda: list(sync_gen())):
-            yield piece
+        # Pull one chunk at a time off the sync SDK iterator so tokens are
+        # forwarded as they arrive instead of after the whole answer.
+        done = object()
+        chunks = await asyncio.to_thread(start)
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, done)
+            if chunk is done:
+                break
+            if chunk.text:
+                yield chunk.text
 
     async def list_models(self):
         return [
@@ -1,17 +1,33 @@
 """
 Consensus — TF-IDF scoring + validation boost/penalty.
+
+Scoring is vectorized: all answers share one vocabulary, term counts are
+held as sparse (doc, term, count) triplets, and IDF is computed once per
+call. ``scoring="centroid"`` ranks answers by cosine similarity to the
+TF-IDF centroid so the winner is the answer the panel agrees with most,
+rather than the one with the rarest vocabulary.
 """
 
 from collections import Counter
 import math
+import os
 import time
 
+import numpy as np
+
 from ..runtime.cloudwatch_telemetry import CloudWatchTelemetry
 
 
+STOPWORDS = frozenset({
+    "the","a","an","and","or","in","on","of","at","to","is","are","was","were",
+    "be","been","being","have","has","had","for","but","by","with","from"
+})
+
+
 class ConsensusIntegrator:
-    def __init__(self):
+    def __init__(self, scoring: str | None = None):
         self.telemetry = CloudWatchTelemetry()
+        self.scoring = scoring or os.getenv("TORON_CONSENSUS_SCORING", "tfidf")
 
     async def integrate(self, context):
         start = time.time()
@@ -27,7 +43,10 @@ class ConsensusIntegrator:
                 "confidence": 0.0
             }
         else:
-            tfidf = self._tfidf(outputs)
+            if self.scoring == "centroid":
+                tfidf = self._centroid_scores(outputs)
+            else:
+                tfidf = self._tfidf(outputs)
             web_score = validation.get("confidence", 0.5)
 
             supported_sources = {
@@ -60,6 +79,7 @@ class ConsensusIntegrator:
                 "contradicting_models": list(contradicted_sources),
                 "evidence_used": validation.get("web_evidence", {}),
                 "reasoning_trace": {
+                    "scoring": self.scoring,
                     "tfidf_scores": {k: round(v, 4) for k, v in tfidf.items()},
                     "supported_facts": len(validation.get("supported", [])),
                     "contradicted_facts": len(validation.get("contradicted", [])),
@@ -80,7 +100,84 @@ class ConsensusIntegrator:
 
         return result
 
+    @staticmethod
+    def _term_counts(text):
+        """Scored-token counts and token total for one answer.
+
+        Same tokens as the original scorer (lowercased whitespace-split
+        tokens with ``len(t) > 3 and t.isalnum()`` that are not stopwords),
+        but counting happens in C and the filters run once per distinct token.
+        """
+        # ASCII lowercasing preserves length and alnum-ness, so lower once.
+        raw = Counter(text.lower().split()) if text.isascii() else Counter(text.split())
+        counts = {}
+        for t, c in raw.items():
+            if len(t) > 3 and t.isalnum():
+                lt = t.lower()
+                if lt not in STOPWORDS:
+                    counts[lt] = counts.get(lt, 0) + c
+        return counts, sum(counts.values())
+
+    def _term_matrix(self, outputs):
+        """Sparse term counts as parallel arrays: (doc, term, count) plus doc lengths."""
+        vocab = {}
+        doc_ids, term_ids, term_counts = [], [], []
+        lengths = np.zeros(len(outputs))
+
+        for d, text in enumerate(outputs.values()):
+            counts, lengths[d] = self._term_counts(text)
+            term_ids.extend(vocab.setdefault(t, len(vocab)) for t in counts)
+            term_counts.extend(counts.values())
+            doc_ids.extend([d] * len(counts))
+
+        return (
+            np.asarray(doc_ids, dtype=np.int64),
+            np.asarray(term_ids, dtype=np.int64),
+            np.asarray(term_counts, dtype=float),
+            lengths,
+            len(vocab),
+        )
+
     def _tfidf(self, outputs):
+        n_docs = len(outputs)
+        docs, terms, counts, lengths, vocab_size = self._term_matrix(outputs)
+
+        raw = np.zeros(n_docs)
+        if vocab_size:
+            df = np.bincount(terms, minlength=vocab_size)
+            idf = np.log((n_docs + 1) / (df + 1))
+            contrib = (counts / lengths[docs]) * idf[terms]
+            raw = np.bincount(docs, weights=contrib, minlength=n_docs)
+
+        nonempty = lengths > 0
+        scores = np.zeros(n_docs)
+        scores[nonempty] = raw[nonempty] / lengths[nonempty]
+
+        # Identical answers give every token an IDF of zero; avoid 0 / 0.
+        max_s = scores.max(initial=0.0) or 1
+        return {m: float(v / max_s) for m, v in zip(outputs.keys(), scores)}
+
+    def _centroid_scores(self, outputs):
+        """Cosine similarity of each answer's TF-IDF vector to the panel centroid."""
+        n_docs = len(outputs)
+        docs, terms, counts, lengths, vocab_size = self._term_matrix(outputs)
+        if not vocab_size:
+            return {m: 0.0 for m in outputs}
+
+        df = np.bincount(terms, minlength=vocab_size)
+        # Smoothed IDF (+1) so terms every model agrees on still carry weight.
+        idf = np.log((n_docs + 1) / (df + 1)) + 1
+        weights = (counts / lengths[docs]) * idf[terms]
+
+        norms = np.sqrt(np.bincount(docs, weights=weights ** 2, minlength=n_docs))
+        unit = weights / norms[docs]
+        centroid = np.bincount(terms, weights=unit, minlength=vocab_size) / n_docs
+        centroid_norm = np.linalg.norm(centroid) or 1
+        cosine = np.bincount(docs, weights=unit * centroid[terms], minlength=n_docs) / centroid_norm
+        return {m: float(v) for m, v in zip(outputs.keys(), cosine)}
+
+    def _tfidf_loop(self, outputs):
+        """Original per-token scorer; reference for equivalence tests and benchmarks."""
         tokens_all = []
         tokens_per = {}
 
@@ -113,5 +210,6 @@ class ConsensusIntegrator:
                 s += tf_score * idf
             scores[model] = s / len(toks)
 
-        max_s = max(scores.values()) if scores else 1
+        # Identical answers give every token an IDF of zero; avoid 0 / 0.
+        max_s = max(scores.values(), default=0) or 1
         return {m: v / max_s for m, v in scores.items()}
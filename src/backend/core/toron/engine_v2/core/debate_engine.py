@@ -31,7 +31,7 @@ class DebateEngine:
         # ROUND 1 — PARALLEL RESPONSES
         # -----------------------------
         tasks = [
-            self.adapter.dispatch(messages, model)
+            self.adapter.dispatch(messages, model, call_site="debate.round1")
             for model in models
         ]
 
@@ -74,7 +74,7 @@ Summarize your critique clearly.
 
             try:
                 critique_output, _ = await self.adapter.dispatch(
-                    critique_messages, model
+                    critique_messages, model, call_site="debate.critique"
                 )
                 critiques[model] = self._extract_text(critique_output)
             except Exception as e:
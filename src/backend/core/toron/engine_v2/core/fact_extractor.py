@@ -43,7 +43,9 @@ JSON:
         messages = [{"role": "user", "content": prompt}]
 
         try:
-            resp, _ = await self.adapter.dispatch(messages, "gpt-4o-mini")
+            resp, _ = await self.adapter.dispatch(
+                messages, "gpt-4o-mini", call_site="fact_extractor", temperature=0.0
+            )
             text = self._extract_text(resp).strip()
 
             # Strip markdown fences
@@ -0,0 +1,161 @@
+"""
+ModelStats — rolling per-model latency, failure, cost and quality estimates.
+
+Fed by CloudProviderAdapter on every call (latency, success, token usage)
+and by the router after consensus (per-model quality). Estimates are
+exponentially weighted so they follow provider drift without keeping
+history, and fall back to priors until a model has been observed. The
+failure rate also decays with wall time since the model was last observed,
+so a model the selector stopped using after an outage becomes eligible
+again and gets re-probed.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Dict, Optional
+
+
+# Approximate list prices in USD per 1M tokens: (input, output).
+MODEL_PRICING: Dict[str, tuple] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4-turbo": (10.00, 30.00),
+    "claude-3-5-sonnet-20241022": (3.00, 15.00),
+    "claude-3-5-haiku-20241022": (0.80, 4.00),
+    "claude-3-opus": (15.00, 75.00),
+    "claude-3-haiku": (0.25, 1.25),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-pro": (0.50, 1.50),
+    "llama3-70b-8192": (0.59, 0.79),
+    "mixtral-8x7b": (0.24, 0.24),
+    "mistral-large-latest": (2.00, 6.00),
+    "anthropic.claude-3-5-sonnet-20241022-v2:0": (3.00, 15.00),
+    "meta.llama3-70b-instruct-v1:0": (2.65, 3.50),
+    "mistral.mistral-large-v1:0": (4.00, 12.00),
+}
+DEFAULT_PRICING = (3.00, 15.00)
+
+
+def estimate_cost(model: str, input_tokens: float, output_tokens: float) -> float:
+    price_in, price_out = MODEL_PRICING.get(model, DEFAULT_PRICING)
+    return (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+
+def usage_tokens(usage: Optional[dict]) -> tuple:
+    """Return ``(input, output)`` tokens from OpenAI- or Anthropic-style usage."""
+    if not usage:
+        return 0, 0
+    inp = usage.get("prompt_tokens", usage.get("input_tokens", 0)) or 0
+    out = usage.get("completion_tokens", usage.get("output_tokens", 0)) or 0
+    return inp, out
+
+
+@dataclass
+class ModelEstimate:
+    latency_ms: float
+    latency_dev_ms: float
+    failure_rate: float
+    output_tokens: float
+    quality: float
+    samples: int = 0
+    updated_at: float = 0.0
+
+    @property
+    def latency_p95_ms(self) -> float:
+        # Mean + 2 x mean absolute deviation is a cheap, stable tail proxy.
+        return self.latency_ms + 2 * self.latency_dev_ms
+
+    def cost(self, model: str, prompt_tokens: float) -> float:
+        return estimate_cost(model, prompt_tokens, self.output_tokens)
+
+
+class ModelStats:
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        prior_latency_ms: float = 1500.0,
+        prior_output_tokens: float = 512.0,
+        prior_quality: float = 0.5,
+        failure_half_life_s: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.alpha = alpha
+        self.failure_half_life_s = failure_half_life_s
+        self.clock = clock
+        self.prior = ModelEstimate(
+            latency_ms=prior_latency_ms,
+            latency_dev_ms=prior_latency_ms * 0.25,
+            failure_rate=0.0,
+            output_tokens=prior_output_tokens,
+            quality=prior_quality,
+        )
+        self._lock = Lock()
+        self._models: Dict[str, ModelEstimate] = {}
+
+    def _get(self, model: str) -> ModelEstimate:
+        est = self._models.get(model)
+        if est is None:
+            est = ModelEstimate(**{**self.prior.__dict__, "samples": 0})
+            self._models[model] = est
+        return est
+
+    def _ewma(self, prev: float, value: float) -> float:
+        return prev + self.alpha * (value - prev)
+
+    def _failure_rate(self, est: ModelEstimate, now: float) -> float:
+        if not est.samples or self.failure_half_life_s <= 0:
+            return est.failure_rate
+        return est.failure_rate * 0.5 ** ((now - est.updated_at) / self.failure_half_life_s)
+
+    def record_call(self, model: str, latency_ms: float, success: bool, usage: Optional[dict] = None) -> float:
+        """Fold one provider call into the estimates; return its cost in USD."""
+        inp, out = usage_tokens(usage)
+        now = self.clock()
+        with self._lock:
+            est = self._get(model)
+            first = est.samples == 0
+            if success:
+                if first:
+                    est.latency_ms = latency_ms
+                    est.latency_dev_ms = latency_ms * 0.25
+                else:
+                    est.latency_dev_ms = self._ewma(est.latency_dev_ms, abs(latency_ms - est.latency_ms))
+                    est.latency_ms = self._ewma(est.latency_ms, latency_ms)
+                if out:
+                    est.output_tokens = out if first else self._ewma(est.output_tokens, out)
+            est.failure_rate = self._ewma(self._failure_rate(est, now), 0.0 if success else 1.0)
+            est.samples += 1
+            est.updated_at = now
+        return estimate_cost(model, inp, out)
+
+    def record_quality(self, model: str, score: float) -> None:
+        with self._lock:
+            est = self._get(model)
+            est.quality = self._ewma(est.quality, max(0.0, min(float(score), 1.0)))
+
+    def estimate(self, model: str) -> ModelEstimate:
+        now = self.clock()
+        with self._lock:
+            est = self._models.get(model)
+            if est is None:
+                return ModelEstimate(**self.prior.__dict__)
+            return ModelEstimate(**{**est.__dict__, "failure_rate": self._failure_rate(est, now)})
+
+    def snapshot(self) -> Dict[str, dict]:
+        now = self.clock()
+        with self._lock:
+            return {
+                m: {
+                    "latency_ms": round(e.latency_ms, 2),
+                    "latency_p95_ms": round(e.latency_p95_ms, 2),
+                    "failure_rate": round(self._failure_rate(e, now), 4),
+                    "output_tokens": round(e.output_tokens, 1),
+                    "quality": round(e.quality, 4),
+                    "samples": e.samples,
+                }
+                for m, e in self._models.items()
+            }
@@ -0,0 +1,196 @@
+"""
+Response Cache — content-addressed LLM response cache for CloudProviderAdapter.
+
+Keys are a SHA-256 of the normalized ``(messages, model, sampling params)``
+so the same claim re-verified against the same evidence, or a replayed debate
+prompt, is answered from memory. Concurrent identical calls are collapsed into
+a single provider call (single-flight). Hit/miss/coalesced counts are kept per
+call site so each pipeline stage's hit rate can be read independently.
+
+Every caller gets its own copy of a cached or shared response, so mutating a
+result downstream never changes what the next caller sees.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+# Connectors sample at 0.7 when no temperature is passed.
+DEFAULT_PROVIDER_TEMPERATURE = 0.7
+
+# Sampling parameters that change the answer and therefore belong in the key.
+KEYED_PARAMS = ("temperature", "max_tokens", "top_p")
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        max_temperature: float | None = None,
+        cache_nondeterministic: bool | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv("TORON_LLM_CACHE_TTL", "900")
+        )
+        self.max_entries = max_entries or int(os.getenv("TORON_LLM_CACHE_MAX_ENTRIES", "4096"))
+        # Calls sampled above this temperature are non-deterministic and are
+        # not cached unless the caller opts in (or replay mode is on).
+        self.max_temperature = max_temperature if max_temperature is not None else float(
+            os.getenv("TORON_LLM_CACHE_MAX_TEMPERATURE", "0.0")
+        )
+        self.cache_nondeterministic = (
+            cache_nondeterministic
+            if cache_nondeterministic is not None
+            else os.getenv("TORON_LLM_CACHE_ALL", "0") == "1"
+        )
+
+        self._store: OrderedDict[str, Tuple[Any, dict, float]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "coalesced": 0, "bypassed": 0}
+        )
+
+    # ---------------------------
+    # KEYING / POLICY
+    # ---------------------------
+    @staticmethod
+    def make_key(messages: Iterable[Any], model: str, params: Optional[dict] = None) -> str:
+        normalized = []
+        for m in messages if not isinstance(messages, str) else [messages]:
+            if isinstance(m, str):
+                normalized.append({"role": "user", "content": m.strip()})
+            elif isinstance(m, dict):
+                content = m.get("content", "")
+                normalized.append({
+                    "role": m.get("role", "user"),
+                    "content": content.strip() if isinstance(content, str) else content,
+                })
+        keyed = {k: (params or {}).get(k) for k in KEYED_PARAMS if (params or {}).get(k) is not None}
+        payload = json.dumps(
+            {"model": model, "messages": normalized, "params": keyed},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def cacheable(self, params: Optional[dict] = None, cache: bool | None = None) -> bool:
+        if cache is not None:
+            return cache
+        if self.cache_nondeterministic:
+            return True
+        temperature = (params or {}).get("temperature", DEFAULT_PROVIDER_TEMPERATURE)
+        return temperature is not None and temperature <= self.max_temperature
+
+    # ---------------------------
+    # LOOKUP
+    # ---------------------------
+    async def get_or_call(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Tuple[Any, dict]]],
+        call_site: str = "unknown",
+        store: Callable[[Tuple[Any, dict]], bool] | None = None,
+    ) -> Tuple[Tuple[Any, dict], str]:
+        """Return ``((response, metadata), outcome)`` where outcome is hit/miss/coalesced.
+
+        ``store`` decides from the result whether it may be kept for later
+        calls; concurrent callers share it either way.
+        """
+        stats = self._stats[call_site]
+
+        while True:
+            cached = self._get(key)
+            if cached is not None:
+                stats["hits"] += 1
+                return copy.deepcopy(cached), "hit"
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled() and not asyncio.current_task().cancelling():
+                    # The leading call was cancelled, not us: retry, or lead.
+                    continue
+                raise
+            stats["coalesced"] += 1
+            return copy.deepcopy(result), "coalesced"
+
+        stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            # Failures are never cached; waiters see the same error.
+            if not future.done():
+                future.set_exception(exc)
+                future.exception()  # mark retrieved when nobody is waiting
+            raise
+        else:
+            if store is None or store(result):
+                self._put(key, result)
+            future.set_result(result)
+            return result, "miss"
+        finally:
+            self._inflight.pop(key, None)
+
+    def record_bypass(self, call_site: str = "unknown") -> None:
+        self._stats[call_site]["bypassed"] += 1
+
+    def _get(self, key: str):
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        response, metadata, expires_at = entry
+        if expires_at < time.time():
+            self._store.pop(key, None)
+            return None
+        self._store.move_to_end(key)
+        return response, metadata
+
+    def _put(self, key: str, result: Tuple[Any, dict]) -> None:
+        # The caller keeps ``result``; the cache holds its own copy.
+        response, metadata = copy.deepcopy(result)
+        self._store[key] = (response, metadata, time.time() + self.ttl_seconds)
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+    # ---------------------------
+    # STATS
+    # ---------------------------
+    def stats(self) -> Dict[str, dict]:
+        out = {}
+        for site, counts in self._stats.items():
+            lookups = counts["hits"] + counts["misses"] + counts["coalesced"]
+            served = counts["hits"] + counts["coalesced"]
+            out[site] = {
+                **counts,
+                "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            }
+        return out
+
+    def snapshot(self) -> dict:
+        return {
+            "entries": len(self._store),
+            "capacity": self.max_entries,
+            "inflight": len(self._inflight),
+            "call_sites": self.stats(),
+        }
+
+    def clear(self) -> None:
+        self._store.clear()
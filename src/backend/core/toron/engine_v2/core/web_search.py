@@ -10,9 +10,13 @@ import time
 from ..runtime.cloudwatch_telemetry import CloudWatchTelemetry
 
 
+SEARCH_URL = "https://api.duckduckgo.com/"
+
+
 class WebSearch:
-    def __init__(self):
+    def __init__(self, clients=None):
         self.telemetry = CloudWatchTelemetry()
+        self.clients = clients
 
     async def run(self, context):
         start = time.time()
@@ -22,9 +26,15 @@ class WebSearch:
         else:
             queries = [f["claim"][:100] for f in facts[:3]]
 
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            if self.clients is not None:
+                # Shared keep-alive pool: no per-request TLS handshake.
+                client = self.clients.client(SEARCH_URL)
                 tasks = [self._search(q, client) for q in queries]
                 results = await asyncio.gather(*tasks, return_exceptions=True)
+            else:
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    tasks = [self._search(q, client) for q in queries]
+                    results = await asyncio.gather(*tasks, return_exceptions=True)
 
             combined = []
             for r in results:
@@ -47,9 +57,9 @@ class WebSearch:
 
     async def _search(self, query, client):
         try:
-            url = f"https://api.duckduckgo.com/?q={quote_plus(query)}&format=json&no_redirect=1&no_html=1"
+            url = f"{SEARCH_URL}?q={quote_plus(query)}&format=json&no_redirect=1&no_html=1"
 
-            r = await client.get(url)
+            r = await client.get(url, timeout=5.0)
             r.raise_for_status()
             data = r.json()
 
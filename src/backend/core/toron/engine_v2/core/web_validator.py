@@ -62,7 +62,9 @@ Answer one word: SUPPORT, CONTRADICT, UNKNOWN
                 try:
                     resp, _ = await self.adapter.dispatch(
                         messages,
-                        "claude-3-5-haiku-20241022"
+                        "claude-3-5-haiku-20241022",
+                        call_site="web_validator",
+                        temperature=0.0
                     )
                     verdict = self._extract(resp).upper()
 
@@ -0,0 +1,107 @@
+"""JSON benchmark baselines and the regression comparator used to gate releases."""
+
+from __future__ import annotations
+
+import json
+import platform
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+BASELINE_VERSION = 1
+
+# Metric -> True when a larger value is worse.
+GATED_METRICS: Dict[str, bool] = {
+    "p50_ms": True,
+    "p95_ms": True,
+    "p99_ms": True,
+    "ops_per_sec": False,
+    "peak_alloc_bytes": True,
+}
+
+# Absolute changes below these are treated as noise regardless of ratio.
+NOISE_FLOOR: Dict[str, float] = {
+    "p50_ms": 0.02,
+    "p95_ms": 0.05,
+    "p99_ms": 0.1,
+    "ops_per_sec": 0.0,
+    "peak_alloc_bytes": 4096,
+}
+
+
+@dataclass
+class Regression:
+    benchmark: str
+    metric: str
+    baseline: float
+    current: float
+    change: float  # relative, positive means worse
+
+    def __str__(self) -> str:
+        return (
+            f"{self.benchmark}.{self.metric}: {self.baseline:.4g} -> {self.current:.4g} "
+            f"({self.change:+.1%})"
+        )
+
+
+def save_baseline(path: str | Path, results: Dict[str, dict], meta: Optional[dict] = None) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": BASELINE_VERSION,
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "meta": meta or {},
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+    return path
+
+
+def load_baseline(path: str | Path) -> Dict[str, dict]:
+    payload = json.loads(Path(path).read_text())
+    if payload.get("version") != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version: {payload.get('version')}")
+    return payload["results"]
+
+
+def compare(
+    baseline: Dict[str, dict],
+    current: Dict[str, dict],
+    tolerance: float = 0.15,
+    overrides: Optional[Dict[str, float]] = None,
+) -> List[Regression]:
+    """Return every gated metric that got worse than ``tolerance`` allows.
+
+    ``overrides`` maps ``"<benchmark>.<metric>"`` or ``"<metric>"`` to a
+    per-metric tolerance. Benchmarks missing on either side are ignored so a
+    suite can grow without invalidating older baselines.
+    """
+    overrides = overrides or {}
+    regressions = []
+    for name, base in baseline.items():
+        cur = current.get(name)
+        if cur is None:
+            continue
+        for metric, higher_is_worse in GATED_METRICS.items():
+            if metric not in base or metric not in cur:
+                continue
+            before, after = float(base[metric]), float(cur[metric])
+            delta = after - before if higher_is_worse else before - after
+            if delta <= NOISE_FLOOR.get(metric, 0.0):
+                continue
+            change = delta / before if before else float("inf")
+            allowed = overrides.get(f"{name}.{metric}", overrides.get(metric, tolerance))
+            if change > allowed:
+                regressions.append(Regression(name, metric, before, after, change))
+    return regressions
+
+
+def report(regressions: List[Regression]) -> dict:
+    return {
+        "passed": not regressions,
+        "regressions": [asdict(r) for r in regressions],
+    }
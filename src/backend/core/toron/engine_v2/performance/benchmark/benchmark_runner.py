@@ -1,65 +1,387 @@
-"""Performance benchmark runner for Toron Engine v2."""
+"""Performance benchmark runner for Toron Engine v2.
+
+``run_suite`` times the engine's hot paths — consensus scoring, centroid
+clustering, fact extraction, cache get/set and router resolve — against
+fake connectors with configurable latency distributions (see ``fakes``),
+reporting percentiles, throughput and allocation peaks per benchmark.
+Results can be saved as a JSON baseline and later compared against it:
+
+    python -m src.backend.core.toron.engine_v2.performance.benchmark.benchmark_runner \\
+        --baseline perf/toron_v2.json [--update] [--tolerance 0.15]
+
+The command exits non-zero when a gated metric regressed past tolerance.
+"""
 
 from __future__ import annotations
 
+import argparse
 import asyncio
+import inspect
+import json
+import sys
 import time
+import tracemalloc
 from statistics import mean
-from typing import Callable, List
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+from ...core.cloud_provider_adapter import CloudProviderAdapter
 from ...core.debate_engine import DebateEngine
 from ...core.consensus_integrator import ConsensusIntegrator
 from ...core.fact_extractor import FactExtractor
 from ...core.web_search import WebSearch
+from ...performance.cache.cache_config import CacheConfig
 from ...performance.cache.multi_layer_cache import MultiLayerCache
+from ...routing.query_optimizer import QueryOptimizer
+from ...routing.router import Router
+from ...tracing.tracer import ToronTracer
+from . import baseline as baselines
+from .fakes import FakeConnector, FakeRedis, FakeS3Session, LatencyModel, NullTelemetry, default_responder
+
+
+SUITE = (
+    "consensus.integrate",
+    "consensus.clustering",
+    "fact_extractor.extract",
+    "cache.set",
+    "cache.get",
+    "cache.get_l2",
+    "router.resolve",
+    "router.resolve_cached",
+)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
 
 
 class BenchmarkRunner:
-    def __init__(self, adapter):
+    def __init__(self, adapter, cache: MultiLayerCache | None = None, quiet_telemetry: bool = False):
         self.adapter = adapter
-        self.cache = MultiLayerCache()
+        self.cache = cache or MultiLayerCache()
         self.debate = DebateEngine(adapter)
         self.consensus = ConsensusIntegrator()
         self.fact_extractor = FactExtractor(adapter)
         self.web_search = WebSearch()
+        if quiet_telemetry:
+            for component in (adapter, self.debate, self.consensus, self.fact_extractor, self.web_search):
+                if hasattr(component, "telemetry"):
+                    component.telemetry = NullTelemetry()
+
+    @classmethod
+    def with_fakes(
+        cls,
+        provider_latency: LatencyModel | None = None,
+        redis_latency: LatencyModel | None = None,
+        s3_latency: LatencyModel | None = None,
+        providers: Iterable[str] = ("openai", "anthropic", "aws-bedrock"),
+        models: Iterable[str] = ("model-a", "model-b", "model-c"),
+        responder: Callable[[List[dict], str], str] = default_responder,
+    ) -> "BenchmarkRunner":
+        """Runner wired to fake connectors and cache tiers; nothing leaves the process."""
+        providers, models = list(providers), list(models)
+        connectors = {
+            p: FakeConnector(p, models, provider_latency or LatencyModel(seed=i), responder)
+            for i, p in enumerate(providers)
+        }
+        config = SimpleNamespace(provider_priority=providers, model_timeout_seconds=30)
+        adapter = CloudProviderAdapter(connectors, config)
+        cache = MultiLayerCache(
+            config=CacheConfig(cold_storage_threshold_bytes=1 << 30, cold_storage_ttl_threshold=1 << 30),
+            redis_client=FakeRedis(redis_latency),
+            boto_session=FakeS3Session(s3_latency),
+        )
+        return cls(adapter, cache=cache, quiet_telemetry=True)
 
     async def throughput(self, request: dict, iterations: int = 50) -> float:
-        start = time.time()
+        start = time.perf_counter()
         await asyncio.gather(*(self.debate.run({"selected_models": request.get("models", []), "prompt": request.get("prompt", "")}) for _ in range(iterations)))
-        duration = time.time() - start
+        duration = time.perf_counter() - start
         return iterations / duration if duration else 0
 
     async def debate_stress(self, prompt: str, models: List[str], rounds: int = 10) -> List[float]:
         latencies = []
         for _ in range(rounds):
-            start = time.time()
+            start = time.perf_counter()
             await self.debate.run({"selected_models": models, "prompt": prompt})
-            latencies.append((time.time() - start) * 1000)
+            latencies.append((time.perf_counter() - start) * 1000)
         return latencies
 
     async def provider_rtt(self, provider_call: Callable, samples: int = 5) -> List[float]:
         latencies = []
         for _ in range(samples):
-            start = time.time()
+            start = time.perf_counter()
             await provider_call()
-            latencies.append((time.time() - start) * 1000)
+            latencies.append((time.perf_counter() - start) * 1000)
         return latencies
 
-    async def consensus_timing(self, debate_result: dict, validation: dict, runs: int = 5) -> float:
+    async def consensus_timing(self, debate_result: dict, validation: dict, runs: int = 5, scorer_runs: int = 1000) -> dict:
         durations = []
         for _ in range(runs):
-            start = time.time()
+            start = time.perf_counter()
             await self.consensus.integrate({"debate_result": debate_result, "validation": validation})
-            durations.append((time.time() - start) * 1000)
-        return mean(durations)
+            durations.append((time.perf_counter() - start) * 1000)
+
+        # Scorer-only timings (no telemetry) for the vectorized vs. loop TF-IDF.
+        outputs = debate_result.get("model_outputs", {})
+        scorers = {
+            "tfidf_vectorized_us": self.consensus._tfidf,
+            "tfidf_loop_us": self.consensus._tfidf_loop,
+            "centroid_us": self.consensus._centroid_scores,
+        }
+        timings = {}
+        for name, scorer in scorers.items():
+            start = time.perf_counter()
+            for _ in range(scorer_runs):
+                scorer(outputs)
+            timings[name] = (time.perf_counter() - start) * 1e6 / scorer_runs
+
+        return {
+            "integrate_ms": mean(durations),
+            **timings,
+            "tfidf_speedup": timings["tfidf_loop_us"] / timings["tfidf_vectorized_us"]
+            if timings["tfidf_vectorized_us"] else 0.0,
+        }
 
     async def cache_profile(self, request: dict, value: dict):
-        cold_start = time.time()
+        cold_start = time.perf_counter()
         await self.cache.set(request, value)
-        cold_latency = (time.time() - cold_start) * 1000
+        cold_latency = (time.perf_counter() - cold_start) * 1000
 
-        warm_start = time.time()
+        warm_start = time.perf_counter()
         await self.cache.get(request)
-        warm_latency = (time.time() - warm_start) * 1000
+        warm_latency = (time.perf_counter() - warm_start) * 1000
 
         return {"cold_write_ms": cold_latency, "warm_read_ms": warm_latency}
+
+    def tracer_overhead(self, configs: dict | None = None, requests: int = 2000) -> dict:
+        """Per-request tracing CPU (µs) for a router-shaped span tree per sampling config."""
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        configs = configs or {
+            "head_100": {"head_rate": 1.0, "tail_rate": 0.0},
+            "head_10_tail_90": {"head_rate": 0.1, "tail_rate": 0.9},
+            "head_10": {"head_rate": 0.1, "tail_rate": 0.0},
+            "drop_all": {"head_rate": 0.0, "tail_rate": 0.0},
+        }
+        results = {}
+        for name, rates in configs.items():
+            tracer = ToronTracer(
+                exporter=InMemorySpanExporter(),
+                instrument=False,
+                set_global=False,
+                **rates,
+            )
+            start = time.perf_counter()
+            for i in range(requests):
+                with tracer.span("toron.engine.process", lambda: {"request_id": f"req-{i}"}) as root:
+                    with tracer.span("toron.router", lambda: {"session_id": "bench"}) as span:
+                        if span.is_recording():
+                            span.set_attribute("intent", "general")
+                            span.set_attribute("models", "a,b,c")
+                    if root.is_recording():
+                        root.set_attribute("confidence", 0.9)
+            results[name] = (time.perf_counter() - start) * 1e6 / requests
+            tracer.shutdown()
+        return results
+
+    # ---------------------------
+    # SUITE
+    # ---------------------------
+    async def measure(
+        self,
+        op: Callable[[int], Any],
+        iterations: int = 200,
+        warmup: int = 10,
+        concurrency: int = 1,
+        alloc_samples: int = 50,
+    ) -> Dict[str, float]:
+        """Time ``op(i)`` (sync or async) and report percentiles, throughput and allocations.
+
+        ``concurrency`` workers share the iteration budget, so ``ops_per_sec``
+        is throughput under that load. Allocations are measured in a separate
+        pass so tracemalloc overhead never leaks into the latency numbers.
+        """
+
+        async def call(i: int):
+            result = op(i)
+            if inspect.isawaitable(result):
+                await result
+
+        for i in range(warmup):
+            await call(-1 - i)
+
+        latencies: List[float] = []
+        indices = iter(range(iterations))
+
+        async def worker():
+            for i in indices:
+                start = time.perf_counter()
+                await call(i)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        wall = time.perf_counter() - wall_start
+
+        peak = retained = 0.0
+        if alloc_samples:
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            for i in range(alloc_samples):
+                await call(iterations + i)
+            current, peak_total = tracemalloc.get_traced_memory()
+            if not was_tracing:
+                tracemalloc.stop()
+            peak = max(0, peak_total - base)
+            retained = max(0, current - base) / alloc_samples
+
+        latencies.sort()
+        return {
+            "iterations": iterations,
+            "concurrency": concurrency,
+            "mean_ms": mean(latencies) if latencies else 0.0,
+            "min_ms": latencies[0] if latencies else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p90_ms": percentile(latencies, 90),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+            "ops_per_sec": iterations / wall if wall else 0.0,
+            "peak_alloc_bytes": peak,
+            "retained_bytes_per_op": retained,
+        }
+
+    def _router(self) -> Router:
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        tracer = ToronTracer(exporter=InMemorySpanExporter(), instrument=False, set_global=False)
+        return Router(
+            cache=self.cache,
+            tracer=tracer,
+            query_optimizer=QueryOptimizer(),
+            debate_engine=self.debate,
+            consensus_integrator=self.consensus,
+            provider_adapter=self.adapter,
+        )
+
+    async def run_suite(
+        self,
+        iterations: int = 200,
+        concurrency: int = 16,
+        only: Optional[Iterable[str]] = None,
+        alloc_samples: int = 50,
+    ) -> Dict[str, Dict[str, float]]:
+        """Run the hot-path suite; latency-bound benchmarks use ``concurrency`` workers."""
+        selected = [name for name in SUITE if only is None or name in set(only)]
+        models = ["model-a", "model-b", "model-c"]
+        outputs = {m: default_responder([{"role": "user", "content": "bench"}], m) for m in models}
+        cache_value = await self.consensus.integrate({"debate_result": {"model_outputs": outputs}, "validation": {}})
+        cache_keys = max(1, min(iterations, 512))
+
+        def cache_request(i: int) -> dict:
+            return {"prompt": f"benchmark prompt {i % cache_keys}", "user_id": "bench-user"}
+
+        async def cache_get_l2(i: int):
+            request = cache_request(i)
+            # Drop the L1 copy so the read is served (and promoted) from Redis.
+            await self.cache.l1.invalidate_keys([self.cache._make_key(request)])
+            await self.cache.get(request)
+
+        router = self._router() if any(n.startswith("router.") for n in selected) else None
+
+        benchmarks: Dict[str, tuple] = {
+            "consensus.integrate": (
+                lambda i: self.consensus.integrate({"debate_result": {"model_outputs": outputs}, "validation": {}}),
+                1,
+            ),
+            "consensus.clustering": (lambda i: self.consensus._centroid_scores(outputs), 1),
+            "fact_extractor.extract": (
+                lambda i: self.fact_extractor.extract(
+                    {"debate_result": {"model_outputs": {m: f"{o} ({i})" for m, o in outputs.items()}}}
+                ),
+                concurrency,
+            ),
+            "cache.set": (lambda i: self.cache.set(cache_request(i), cache_value, ttl=600), 1),
+            "cache.get": (lambda i: self.cache.get(cache_request(i)), 1),
+            "cache.get_l2": (cache_get_l2, 1),
+            "router.resolve": (
+                lambda i: router.resolve({"prompt": f"Tell me about the Eiffel Tower, take {i}", "ttl": 600}),
+                concurrency,
+            ),
+            "router.resolve_cached": (
+                lambda i: router.resolve({"prompt": "Tell me about the Eiffel Tower", "ttl": 600}),
+                1,
+            ),
+        }
+
+        results = {}
+        try:
+            for name in selected:
+                op, workers = benchmarks[name]
+                if name.startswith("cache.get"):
+                    await self.cache.flush()
+                results[name] = await self.measure(
+                    op, iterations=iterations, concurrency=workers, alloc_samples=alloc_samples
+                )
+        finally:
+            if router is not None:
+                router.tracer.shutdown()
+            await self.cache.flush()
+        return results
+
+
+async def _run_cli(args) -> int:
+    latency = LatencyModel(kind=args.distribution, mean_ms=args.provider_latency_ms, spread=args.spread, seed=args.seed)
+    runner = BenchmarkRunner.with_fakes(
+        provider_latency=latency,
+        redis_latency=LatencyModel(kind="constant", mean_ms=args.redis_latency_ms),
+    )
+    results = await runner.run_suite(
+        iterations=args.iterations,
+        concurrency=args.concurrency,
+        only=args.only.split(",") if args.only else None,
+    )
+    await runner.cache.aclose()
+
+    out: Dict[str, Any] = {"results": results}
+    status = 0
+    if args.baseline:
+        if args.update:
+            baselines.save_baseline(args.baseline, results, meta=vars(args))
+            out["baseline"] = "updated"
+        else:
+            regressions = baselines.compare(baselines.load_baseline(args.baseline), results, tolerance=args.tolerance)
+            out["comparison"] = baselines.report(regressions)
+            status = 1 if regressions else 0
+    print(json.dumps(out, indent=2, default=str))
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Toron Engine v2 benchmark suite")
+    parser.add_argument("--baseline", help="JSON baseline to compare against (or write with --update)")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", help="comma-separated benchmark names")
+    parser.add_argument("--distribution", default="lognormal", choices=["constant", "uniform", "lognormal", "exponential"])
+    parser.add_argument("--provider-latency-ms", type=float, default=50.0)
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--redis-latency-ms", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1)
+    return asyncio.run(_run_cli(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""In-process stand-ins used by the benchmark suite.
+
+``FakeConnector`` implements the ``BaseConnector`` interface with latency
+drawn from a ``LatencyModel`` so the engine's hot paths can be measured
+under realistic provider timing without network calls. ``FakeRedis`` and
+``FakeS3Session`` do the same for the cache tiers, and ``NullTelemetry``
+replaces CloudWatch so telemetry I/O does not swamp the measurements.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from ...core.connectors.base_connector import BaseConnector
+
+
+# ---------------------------
+# LATENCY
+# ---------------------------
+@dataclass
+class LatencyModel:
+    """Latency distribution for a fake dependency.
+
+    ``kind`` is one of ``constant``, ``uniform`` (mean ± spread * mean),
+    ``lognormal`` (``spread`` is sigma; the distribution keeps ``mean_ms``)
+    or ``exponential``. ``error_rate`` of calls raise instead of returning.
+    """
+
+    kind: str = "lognormal"
+    mean_ms: float = 50.0
+    spread: float = 0.5
+    error_rate: float = 0.0
+    seed: Optional[int] = None
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.kind not in ("constant", "uniform", "lognormal", "exponential"):
+            raise ValueError(f"unknown latency distribution: {self.kind}")
+        self._rng = random.Random(self.seed)
+
+    def sample_ms(self) -> float:
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.kind == "constant":
+            return self.mean_ms
+        if self.kind == "uniform":
+            half = self.mean_ms * min(self.spread, 1.0)
+            return self._rng.uniform(self.mean_ms - half, self.mean_ms + half)
+        if self.kind == "exponential":
+            return self._rng.expovariate(1.0 / self.mean_ms)
+        mu = math.log(self.mean_ms) - self.spread ** 2 / 2
+        return self._rng.lognormvariate(mu, self.spread)
+
+    def fails(self) -> bool:
+        return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    async def wait(self):
+        delay = self.sample_ms()
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+
+# ---------------------------
+# CONNECTORS
+# ---------------------------
+_CORPUS = [
+    "The Eiffel Tower is located in Paris and was completed in 1889 for the World's Fair.",
+    "Paris hosts the Eiffel Tower, finished in 1889 as the entrance arch to the Exposition Universelle.",
+    "Completed in 1889, the wrought-iron Eiffel Tower in Paris was designed by Gustave Eiffel's company.",
+    "The tower stands about 330 metres tall and was the tallest man-made structure until 1930.",
+    "Gustave Eiffel's engineering firm built the tower on the Champ de Mars in Paris.",
+]
+
+
+def default_responder(messages: List[dict], model: str) -> str:
+    """Deterministic per-model answer; JSON claims for fact-extraction prompts."""
+    prompt = messages[-1].get("content", "") if messages else ""
+    if "Extract factual claims" in prompt:
+        return json.dumps([
+            {"claim": sentence, "source_model": model, "confidence": 0.8}
+            for sentence in _CORPUS[:3]
+        ])
+    idx = int(hashlib.sha1(model.encode()).hexdigest(), 16) % len(_CORPUS)
+    return " ".join(_CORPUS[idx:] + _CORPUS[:idx])
+
+
+class FakeConnector(BaseConnector):
+    # Responses are a pure function of the prompt, like a temperature-0 call.
+    honours_temperature = True
+
+    def __init__(
+        self,
+        provider: str,
+        models: List[str],
+        latency: Optional[LatencyModel] = None,
+        responder: Callable[[List[dict], str], str] = default_responder,
+        token_latency: Optional[LatencyModel] = None,
+    ):
+        self.provider = provider
+        self.models = models
+        self.latency = latency or LatencyModel()
+        self.responder = responder
+        self.token_latency = token_latency or LatencyModel(kind="constant", mean_ms=0.0)
+        self.calls = 0
+
+    async def infer(self, messages, model, **kwargs):
+        self.calls += 1
+        await self.latency.wait()
+        if self.latency.fails():
+            raise RuntimeError(f"{self.provider}: simulated failure")
+        text = self.responder(list(messages), model)
+        usage = {"input_tokens": sum(len(m.get("content", "")) // 4 for m in messages), "output_tokens": len(text) // 4}
+        return {"content": text}, {"provider": self.provider, "model": model, "usage": usage}
+
+    async def stream(self, messages, model, **kwargs):
+        self.calls += 1
+        await self.latency.wait()
+        if self.latency.fails():
+            raise RuntimeError(f"{self.provider}: simulated failure")
+        for token in self.responder(list(messages), model).split(" "):
+            await self.token_latency.wait()
+            yield token + " "
+
+    async def list_models(self):
+        return [{"model_id": m, "provider": self.provider} for m in self.models]
+
+
+# ---------------------------
+# CACHE TIERS
+# ---------------------------
+class _FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args))
+            return self
+
+        return queue
+
+    async def execute(self):
+        # One round trip for the whole batch, as with a real pipeline.
+        await self.redis.latency.wait()
+        return [self.redis._apply(name, *args) for name, args in self.ops]
+
+
+class FakeRedis:
+    """Async Redis subset used by MultiLayerCache; one latency sample per round trip."""
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.latency = latency or LatencyModel(kind="constant", mean_ms=0.0)
+        self.data: Dict[str, bytes] = {}
+        self.sets: Dict[str, set] = {}
+
+    def _apply(self, name, *args):
+        if name == "get":
+            return self.data.get(args[0])
+        if name == "set":
+            self.data[args[0]] = args[1]
+            return True
+        if name == "sadd":
+            self.sets.setdefault(args[0], set()).update(args[1:])
+            return len(args) - 1
+        if name == "srem":
+            self.sets.get(args[0], set()).difference_update(args[1:])
+            return len(args) - 1
+        if name == "smembers":
+            return set(self.sets.get(args[0], set()))
+        if name == "exists":
+            return int(args[0] in self.data)
+        if name == "delete":
+            for key in args:
+                self.data.pop(key, None)
+                self.sets.pop(key, None)
+            return len(args)
+        if name == "expire":
+            return True
+        raise AttributeError(name)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            await self.latency.wait()
+            return self._apply(name, *args)
+
+        return call
+
+
+class NoSuchKey(Exception):
+    pass
+
+
+class _FakeBody:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def read(self):
+        return self.data
+
+
+class FakeS3:
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+        self.objects: Dict[str, bytes] = {}
+
+    async def get_object(self, Bucket, Key):
+        await self.latency.wait()
+        if Key not in self.objects:
+            raise NoSuchKey(Key)
+        return {"Body": _FakeBody(self.objects[Key])}
+
+    async def put_object(self, Bucket, Key, Body, **kwargs):
+        await self.latency.wait()
+        self.objects[Key] = Body
+
+    async def delete_objects(self, Bucket, Delete):
+        await self.latency.wait()
+        for obj in Delete.get("Objects", []):
+            self.objects.pop(obj["Key"], None)
+        return {}
+
+
+class _ClientContext:
+    def __init__(self, client):
+        self.client = client
+
+    async def __aenter__(self):
+        return self.client
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeS3Session:
+    """Stands in for ``aioboto3.Session`` in MultiLayerCache."""
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.s3 = FakeS3(latency or LatencyModel(kind="constant", mean_ms=0.0))
+
+    def client(self, service_name, **kwargs):
+        return _ClientContext(self.s3)
+
+
+# ---------------------------
+# TELEMETRY
+# ---------------------------
+class NullTelemetry:
+    def metric(self, *args, **kwargs) -> None:
+        pass
+
+    def log(self, *args, **kwargs) -> None:
+        pass
@@ -0,0 +1,145 @@
+"""Serialize-once codec for cached values: compact encoding, compression, AES-GCM.
+
+Blob layout::
+
+    version (1 byte) | flags (1 byte) | nonce (12 bytes) | ciphertext
+
+``flags`` records the encoding (msgpack when installed, else JSON) and the
+compression applied (zstd when installed, else Brotli, only above the size
+threshold). The two header bytes are bound into the AES-GCM associated data
+together with the cache key, so a blob cannot be replayed under another key
+or have its header altered.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import brotli
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+try:  # optional: more compact than JSON and faster to encode
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+try:  # optional: faster than Brotli at similar ratios for small payloads
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+CODEC_VERSION = 1
+
+ENC_JSON = 0x00
+ENC_MSGPACK = 0x01
+COMP_NONE = 0x00
+COMP_BROTLI = 0x10
+COMP_ZSTD = 0x20
+_ENC_MASK = 0x0F
+_COMP_MASK = 0xF0
+
+
+@dataclass
+class EncodedValue:
+    blob: bytes
+    raw_bytes: int
+    stored_bytes: int
+    compressed: bool
+
+
+class CacheCodec:
+    def __init__(
+        self,
+        key: Optional[bytes] = None,
+        compress_threshold_bytes: Optional[int] = None,
+        compression: Optional[str] = None,
+        encoding: Optional[str] = None,
+    ):
+        key_env = os.getenv("TORON_AES_KEY")
+        self.key = key or (base64.b64decode(key_env) if key_env else os.urandom(32))
+        self.aes = AESGCM(self.key)
+        self.compress_threshold_bytes = (
+            compress_threshold_bytes
+            if compress_threshold_bytes is not None
+            else int(os.getenv("TORON_CACHE_COMPRESS_THRESHOLD", "1024"))
+        )
+
+        compression = compression or os.getenv("TORON_CACHE_COMPRESSION", "auto")
+        if compression == "auto":
+            compression = "zstd" if zstandard is not None else "brotli"
+        if compression == "zstd" and zstandard is None:
+            compression = "brotli"
+        self.compression = compression
+
+        encoding = encoding or ("msgpack" if msgpack is not None else "json")
+        if encoding == "msgpack" and msgpack is None:
+            encoding = "json"
+        self.encoding = encoding
+
+        self._zstd_c = zstandard.ZstdCompressor(level=3) if zstandard is not None else None
+        self._zstd_d = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    @staticmethod
+    def is_encoded(blob: Any) -> bool:
+        """True for blobs written by this codec (legacy base64 text starts with an ASCII letter)."""
+        return isinstance(blob, (bytes, bytearray)) and len(blob) > 14 and blob[0] == CODEC_VERSION
+
+    # ---------------------------
+    # ENCODE
+    # ---------------------------
+    def encode(self, value: Any, aad: str) -> EncodedValue:
+        if self.encoding == "msgpack":
+            raw = msgpack.packb(value, use_bin_type=True, default=str)
+            flags = ENC_MSGPACK
+        else:
+            raw = json.dumps(value, separators=(",", ":"), default=str).encode()
+            flags = ENC_JSON
+
+        body = raw
+        if self.compression != "none" and len(raw) >= self.compress_threshold_bytes:
+            if self.compression == "zstd":
+                candidate, comp = self._zstd_c.compress(raw), COMP_ZSTD
+            else:
+                candidate, comp = brotli.compress(raw, quality=5), COMP_BROTLI
+            # Incompressible payloads are stored as-is.
+            if len(candidate) < len(raw):
+                body, flags = candidate, flags | comp
+
+        header = bytes((CODEC_VERSION, flags))
+        nonce = os.urandom(12)
+        blob = header + nonce + self.aes.encrypt(nonce, body, header + aad.encode())
+        return EncodedValue(
+            blob=blob,
+            raw_bytes=len(raw),
+            stored_bytes=len(blob),
+            compressed=bool(flags & _COMP_MASK),
+        )
+
+    # ---------------------------
+    # DECODE
+    # ---------------------------
+    def decode(self, blob: bytes, aad: str) -> Any:
+        header, nonce, ciphertext = bytes(blob[:2]), blob[2:14], blob[14:]
+        if header[0] != CODEC_VERSION:
+            raise ValueError(f"unsupported cache codec version {header[0]}")
+        body = self.aes.decrypt(nonce, ciphertext, header + aad.encode())
+
+        flags = header[1]
+        comp = flags & _COMP_MASK
+        if comp == COMP_ZSTD:
+            if self._zstd_d is None:
+                raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+            body = self._zstd_d.decompress(body)
+        elif comp == COMP_BROTLI:
+            body = brotli.decompress(body)
+
+        if flags & _ENC_MASK == ENC_MSGPACK:
+            if msgpack is None:
+                raise ValueError("msgpack-encoded cache entry but msgpack is not installed")
+            return msgpack.unpackb(body, raw=False, strict_map_key=False)
+        return json.loads(body)
@@ -15,6 +15,13 @@ class CacheConfig:
     redis_url: str = "redis://localhost:6379/0"
     s3_bucket: str = "toron-cache-bucket"
     s3_prefix: str = "toron/cache/"
+    s3_region: str | None = None
+    negative_cache_size: int = 10_000
+    negative_cache_ttl: int = 300
+    l3_write_queue_size: int = 1024
+    l2_write_queue_size: int = 4096
+    l2_pipeline_batch: int = 64
+    compress_threshold_bytes: int = 1024
 
     def clamp_ttl(self, ttl: int) -> int:
         lower, upper = self.ttl_range
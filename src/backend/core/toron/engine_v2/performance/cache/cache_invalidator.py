@@ -14,34 +14,27 @@ class CacheInvalidator:
         self.cache = cache or MultiLayerCache(self.config)
         self.redis = self.cache.redis if cache else aioredis.from_url(self.config.redis_url, encoding="utf-8", decode_responses=True)
 
-    async def invalidate_user(self, user_id: str):
-        prefix = f"toron:cache:user:{user_id}"
-        await self._invalidate_prefix(prefix)
+    async def invalidate_user(self, user_id: str) -> int:
+        return await self.cache.invalidate_tag(f"user:{user_id}")
 
-    async def invalidate_model(self, model: str):
-        prefix = f"toron:cache:model:{model}"
-        await self._invalidate_prefix(prefix)
+    async def invalidate_model(self, model: str) -> int:
+        return await self.cache.invalidate_tag(f"model:{model}")
 
     async def invalidate_prefix(self, prefix: str):
         await self._invalidate_prefix(prefix)
 
-    async def invalidate_stale(self):
-        async for key in self.redis.scan_iter(match="toron:cache:*"):
-            ttl = await self.redis.ttl(key)
-            if ttl == -2:
-                continue
-            if ttl == -1 or ttl <= 0:
-                await self.redis.delete(key)
-                await self.cache.l1.invalidate_prefix(key)
+    async def invalidate_stale(self) -> int:
+        # Entries expire on their own Redis TTL; only the tag indexes can hold
+        # dangling members, and they are walked from the tag registry (no SCAN).
+        return await self.cache.prune_tags()
 
     async def _invalidate_prefix(self, prefix: str):
-        async for key in self.redis.scan_iter(match=f"{prefix}*"):
-            await self.redis.delete(key)
+        # Ad-hoc prefixes have no index, so this one still has to SCAN.
+        keys = [key async for key in self.redis.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await self.redis.delete(*keys)
         await self.cache.l1.invalidate_prefix(prefix)
+        self.cache.invalidate_l3(keys)
 
     async def bulk_delete(self, keys: Iterable[str]):
-        if not keys:
-            return
-        await self.redis.delete(*keys)
-        for key in keys:
-            await self.cache.l1.invalidate_prefix(key)
+        await self.cache.invalidate_keys(keys)
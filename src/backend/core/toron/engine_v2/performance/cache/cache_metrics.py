@@ -27,6 +27,29 @@ class CacheMetrics:
             self._counters["promotions"] += 1
             self._counters[f"promotion_{src}_to_{dst}"] += 1
 
+    def record_negative_hit(self):
+        with self._lock:
+            self._counters["l3_negative_hits"] += 1
+
+    def record_l3_write(self, outcome: str):
+        with self._lock:
+            self._counters[f"l3_writes_{outcome}"] += 1
+
+    def record_l2_write(self, outcome: str, count: int = 1):
+        with self._lock:
+            self._counters[f"l2_writes_{outcome}"] += count
+
+    def record_serialized(self, raw_bytes: int, stored_bytes: int, compressed: bool):
+        with self._lock:
+            self._counters["serialized_values"] += 1
+            self._counters["serialized_bytes"] += raw_bytes
+            self._counters["stored_bytes"] += stored_bytes
+            if compressed:
+                self._counters["compressed_values"] += 1
+
     def snapshot(self) -> dict:
         with self._lock:
-            return dict(self._counters)
+            snapshot = dict(self._counters)
+        if snapshot.get("stored_bytes"):
+            snapshot["compression_ratio"] = round(snapshot["serialized_bytes"] / snapshot["stored_bytes"], 4)
+        return snapshot
@@ -1,16 +1,33 @@
-"""Multi-layer cache implementation with L1/L2/L3 tiers."""
+"""Multi-layer cache implementation with L1/L2/L3 tiers.
+
+L3 (S3) uses one long-lived client per event loop, a bounded negative
+cache so keys recently confirmed absent skip the GET, and a write-behind
+queue so S3 uploads never sit on the response path.
+
+Values are serialized once per write by ``CacheCodec`` (compact encoding,
+compression above a size threshold, AES-GCM) and the same blob is stored
+in Redis and S3. Redis writes are batched into background pipelines; L1 is
+updated synchronously so the writing process reads its own writes.
+
+Every entry is indexed under tags (``user:<id>``, ``model:<name>``) held as
+Redis sets next to the data, so invalidating a user or model is one
+SMEMBERS plus one pipelined delete instead of a keyspace SCAN.
+"""
 
 import asyncio
+import contextlib
 import json
 import time
 import hashlib
 from collections import OrderedDict
-from typing import Optional, Tuple
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import aioboto3
 from redis import asyncio as aioredis
 
 from ...api.encryption import ToronEncryptor
+from ...bootstrap.client_registry import LoopLocal, on_loop_shutdown
+from .cache_codec import CacheCodec
 from .cache_config import CacheConfig
 from .cache_metrics import CacheMetrics
 
@@ -19,6 +36,8 @@ class _LRUCache:
     def __init__(self, max_size: int):
         self.max_size = max_size
         self._store: OrderedDict[str, Tuple[dict, float]] = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Tuple[str, ...]] = {}
         self._lock = asyncio.Lock()
 
     async def get(self, key: str) -> Optional[dict]:
@@ -27,50 +46,272 @@ class _LRUCache:
                 return None
             value, expires_at = self._store[key]
             if expires_at and expires_at < time.time():
-                self._store.pop(key, None)
+                self._drop(key)
                 return None
             self._store.move_to_end(key)
             return value
 
-    async def set(self, key: str, value: dict, ttl: int):
+    async def set(self, key: str, value: dict, ttl: int, tags: Iterable[str] = ()):
         async with self._lock:
             expires_at = time.time() + ttl if ttl else None
+            self._untag(key)
             self._store[key] = (value, expires_at)
             self._store.move_to_end(key)
+            self._key_tags[key] = tuple(tags)
+            for tag in self._key_tags[key]:
+                self._tags.setdefault(tag, set()).add(key)
             await self._evict_if_needed()
 
+    async def invalidate_tag(self, tag: str) -> int:
+        async with self._lock:
+            keys = self._tags.pop(tag, set())
+            for k in keys:
+                self._drop(k)
+            return len(keys)
+
+    async def invalidate_keys(self, keys: Iterable[str]):
+        async with self._lock:
+            for k in keys:
+                self._drop(k)
+
     async def invalidate_prefix(self, prefix: str):
         async with self._lock:
             for k in list(self._store.keys()):
                 if k.startswith(prefix):
-                    self._store.pop(k, None)
+                    self._drop(k)
+
+    def _drop(self, key: str):
+        self._store.pop(key, None)
+        self._untag(key)
+
+    def _untag(self, key: str):
+        for tag in self._key_tags.pop(key, ()):
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    self._tags.pop(tag, None)
 
     async def _evict_if_needed(self):
         while len(self._store) > self.max_size:
-            self._store.popitem(last=False)
+            key, _ = self._store.popitem(last=False)
+            self._untag(key)
 
     async def stats(self):
         async with self._lock:
             return {"size": len(self._store), "capacity": self.max_size}
 
     def snapshot(self) -> dict:
-        return {"size": len(self._store), "capacity": self.max_size}
+        return {"size": len(self._store), "capacity": self.max_size, "tags": len(self._tags)}
+
+
+class _NegativeCache:
+    """Bounded set of keys recently confirmed absent from L3, with TTL."""
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._misses: OrderedDict[str, float] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        expires_at = self._misses.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.time():
+            self._misses.pop(key, None)
+            return False
+        return True
+
+    def add(self, key: str):
+        self._misses[key] = time.time() + self.ttl
+        self._misses.move_to_end(key)
+        while len(self._misses) > self.max_size:
+            self._misses.popitem(last=False)
+
+    def discard(self, key: str):
+        self._misses.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._misses)
+
+
+class _WriteBehind:
+    """Bounded queue drained in batches by one background task.
+
+    The worker is bound to the loop that started it. When that loop is shut
+    down (``asyncio.run`` per request), ``drain`` writes the batch the worker
+    was interrupted in and everything still queued before the loop closes.
+    """
+
+    def __init__(self, handler: Callable[[List[tuple]], Awaitable[None]], maxsize: int, batch_size: int = 64):
+        self.handler = handler
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._inflight: List[tuple] = []
+
+    def submit(self, item: tuple) -> bool:
+        """Queue ``item``; False if the queue is full or no loop is running."""
+        if not self._ensure_worker():
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> bool:
+        return self._ensure_worker()
+
+    async def flush(self):
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def aclose(self):
+        await self.flush()
+        await self.drain()
+
+    async def drain(self):
+        """Stop the worker, then write its interrupted batch and the rest of the queue inline."""
+        task, self._task = self._task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        batch, self._inflight = self._inflight, []
+        while self._queue is not None and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+            self._queue.task_done()
+        for i in range(0, len(batch), self.batch_size):
+            with contextlib.suppress(Exception):
+                await self.handler(batch[i:i + self.batch_size])
+
+    def _ensure_worker(self) -> bool:
+        if self._task is not None and not self._task.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        # A fresh queue per worker keeps it bound to the running loop; carry
+        # over anything a previous (finished) worker left behind.
+        previous, self._queue = self._queue, asyncio.Queue(maxsize=self.maxsize)
+        while previous is not None and not previous.empty() and not self._queue.full():
+            self._queue.put_nowait(previous.get_nowait())
+        self._task = loop.create_task(self._run())
+        on_loop_shutdown(self.drain)
+        return True
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._inflight = batch
+            try:
+                await self.handler(batch)
+            except asyncio.CancelledError:
+                # Leave the batch in _inflight for drain() to rewrite.
+                raise
+            except Exception:
+                # Handlers record their own failures; keep the worker alive.
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            self._inflight = []
 
 
 class MultiLayerCache:
-    def __init__(self, config: CacheConfig | None = None, redis_client=None, boto_session=None):
+    def __init__(
+        self,
+        config: CacheConfig | None = None,
+        redis_client=None,
+        boto_session=None,
+        clients=None,
+        codec: CacheCodec | None = None,
+    ):
         self.config = config or CacheConfig()
         self.metrics = CacheMetrics()
         self.encryptor = ToronEncryptor()
+        self.codec = codec or CacheCodec(self.encryptor.key, self.config.compress_threshold_bytes)
         self.l1 = _LRUCache(self.config.l1_max_size)
-        self.redis = redis_client or aioredis.from_url(self.config.redis_url, encoding="utf-8", decode_responses=True)
+        # Blobs are binary; keys and tag members come back as bytes and are decoded.
+        self.redis = redis_client or aioredis.from_url(self.config.redis_url, decode_responses=False)
         self.boto_session = boto_session or aioboto3.Session()
+        self.s3_client_config = clients.botocore_config() if clients else None
+
+        self.l3_negative = _NegativeCache(self.config.negative_cache_size, self.config.negative_cache_ttl)
+        self._s3_clients = LoopLocal(
+            lambda: self.boto_session.client(
+                "s3",
+                region_name=self.config.s3_region,
+                config=self.s3_client_config,
+            )
+        )
+        self._l2_writes = _WriteBehind(self._l2_write_batch, self.config.l2_write_queue_size, self.config.l2_pipeline_batch)
+        self._l3_writes = _WriteBehind(self._l3_write_batch, self.config.l3_write_queue_size)
+
+    KEY_PREFIX = "toron:cache:"
+    TAG_PREFIX = "toron:cache:tag:"
+    TAG_REGISTRY = "toron:cache:tags"
 
     def _make_key(self, request_dict: dict) -> str:
         serialized = json.dumps(request_dict, sort_keys=True, separators=(",", ":"))
         digest = hashlib.sha256(serialized.encode()).hexdigest()
-        return f"toron:cache:{digest}"
+        return f"{self.KEY_PREFIX}{digest}"
+
+    @staticmethod
+    def _tags_for(request_dict: dict, value: Optional[dict]) -> Tuple[str, ...]:
+        """Tags an entry is indexed under: its user and every model that shaped it."""
+        tags = []
+        user_id = (request_dict or {}).get("user_id")
+        if user_id:
+            tags.append(f"user:{user_id}")
+        value = value or {}
+        models = [value.get("model_used"), *value.get("models_considered", [])]
+        tags.extend(f"model:{m}" for m in dict.fromkeys(models) if m)
+        return tuple(tags)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.TAG_PREFIX}{tag}"
+
+    @staticmethod
+    def _as_str(key) -> str:
+        return key.decode() if isinstance(key, (bytes, bytearray)) else key
+
+    def _write_l2(self, pipe, key: str, payload, ttl: int, tags: Tuple[str, ...]):
+        """Queue the entry and its tag-index updates on ``pipe``."""
+        pipe.set(key, payload, ex=ttl)
+        tag_ttl = self.config.ttl_range[1]
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, tag_ttl)
+        if tags:
+            pipe.sadd(self.TAG_REGISTRY, *(self._tag_key(t) for t in tags))
+
+    # ---------------------------
+    # SERIALIZATION
+    # ---------------------------
+    def _encode(self, value: dict, key: str):
+        encoded = self.codec.encode(value, key)
+        self.metrics.record_serialized(encoded.raw_bytes, encoded.stored_bytes, encoded.compressed)
+        return encoded
 
+    def _decode(self, blob, key: str) -> dict:
+        if self.codec.is_encoded(blob):
+            return self.codec.decode(blob, key)
+        # Entries written before the codec: base64 JSON from ToronEncryptor.
+        return self.encryptor.decrypt(self._as_str(blob), key)
+
+    # ---------------------------
+    # GET / SET
+    # ---------------------------
     async def get(self, request_dict) -> Optional[dict]:
         key = self._make_key(request_dict)
 
@@ -82,20 +323,26 @@ class MultiLayerCache:
         blob = await self.redis.get(key)
         if blob:
             try:
-                decrypted = self.encryptor.decrypt(blob, key)
+                decoded = self._decode(blob, key)
                 self.metrics.record_hit("l2")
-                await self.l1.set(key, decrypted, self.config.cold_storage_ttl_threshold)
+                await self.l1.set(
+                    key, decoded, self.config.cold_storage_ttl_threshold, self._tags_for(request_dict, decoded)
+                )
                 self.metrics.record_promotion("l2", "l1")
-                return decrypted
+                return decoded
             except Exception:
                 await self.redis.delete(key)
 
-        s3_value = await self._get_from_s3(key)
-        if s3_value is not None:
+        s3_result = await self._get_from_s3(key)
+        if s3_result is not None:
+            s3_value, s3_blob = s3_result
             self.metrics.record_hit("l3")
-            await self.redis.set(key, self.encryptor.encrypt(s3_value, key), ex=self.config.cold_storage_ttl_threshold)
+            tags = self._tags_for(request_dict, s3_value)
+            if not self.codec.is_encoded(s3_blob):
+                s3_blob = self._encode(s3_value, key).blob
+            self._l2_writes.submit(("set", key, s3_blob, self.config.cold_storage_ttl_threshold, tags))
             self.metrics.record_promotion("l3", "l2")
-            await self.l1.set(key, s3_value, self.config.cold_storage_ttl_threshold)
+            await self.l1.set(key, s3_value, self.config.cold_storage_ttl_threshold, tags)
             self.metrics.record_promotion("l2", "l1")
             return s3_value
 
@@ -106,44 +353,209 @@ class MultiLayerCache:
         key = self._make_key(request_dict)
         ttl = self.config.clamp_ttl(ttl)
 
-        await self.l1.set(key, value, ttl)
+        tags = self._tags_for(request_dict, value)
+        await self.l1.set(key, value, ttl, tags)
+
+        encoded = self._encode(value, key)
+        if not self._l2_writes.submit(("set", key, encoded.blob, ttl, tags)):
+            # Queue full: write inline rather than lose the shared copy.
+            await self._l2_write_batch([("set", key, encoded.blob, ttl, tags)])
 
-        payload = self.encryptor.encrypt(value, key)
-        await self.redis.set(key, payload, ex=ttl)
+        if encoded.raw_bytes >= self.config.cold_storage_threshold_bytes or ttl >= self.config.cold_storage_ttl_threshold:
+            self._enqueue_l3_write(key, encoded.blob, ttl)
 
-        serialized = json.dumps(value, separators=(",", ":")).encode()
-        if len(serialized) >= self.config.cold_storage_threshold_bytes or ttl >= self.config.cold_storage_ttl_threshold:
-            await self._put_to_s3(key, serialized, ttl)
+    async def _l2_write_batch(self, batch: List[tuple]):
+        pipe = self.redis.pipeline(transaction=False)
+        for _, key, blob, ttl, tags in batch:
+            self._write_l2(pipe, key, blob, ttl, tags)
+        try:
+            await pipe.execute()
+            self.metrics.record_l2_write("written", len(batch))
+        except Exception:
+            self.metrics.record_l2_write("failed", len(batch))
 
     def stats(self) -> dict:
         snapshot = self.metrics.snapshot()
-        snapshot.update({"l1": self.l1.snapshot()})
+        snapshot.update({
+            "l1": self.l1.snapshot(),
+            "l2": {"pending_writes": self._l2_writes.pending()},
+            "l3": {
+                "negative_keys": len(self.l3_negative),
+                "pending_writes": self._l3_writes.pending(),
+            },
+        })
         return snapshot
 
+    # ---------------------------
+    # INVALIDATION
+    # ---------------------------
+    async def invalidate_tag(self, tag: str) -> int:
+        """Drop every entry indexed under ``tag`` from all layers; return the L2 count."""
+        # Pending writes must land first or they would re-create the entries.
+        await self._l2_writes.flush()
+        tag_key = self._tag_key(tag)
+        keys = [self._as_str(k) for k in await self.redis.smembers(tag_key) or []]
+
+        pipe = self.redis.pipeline(transaction=False)
+        if keys:
+            pipe.delete(*keys)
+        pipe.delete(tag_key)
+        pipe.srem(self.TAG_REGISTRY, tag_key)
+        await pipe.execute()
+
+        await self.l1.invalidate_tag(tag)
+        await self.l1.invalidate_keys(keys)
+        self.invalidate_l3(keys)
+        return len(keys)
+
+    async def invalidate_keys(self, keys: Iterable[str]):
+        keys = [self._as_str(k) for k in keys]
+        if not keys:
+            return
+        await self._l2_writes.flush()
+        await self.redis.delete(*keys)
+        await self.l1.invalidate_keys(keys)
+        self.invalidate_l3(keys)
+
+    def invalidate_l3(self, keys: Iterable[str]):
+        """Mark keys absent locally and delete their cold copies in the background."""
+        keys = [self._as_str(k) for k in keys]
+        for key in keys:
+            self.l3_negative.add(key)
+        if keys and not self._l3_writes.submit(("delete", keys, None, 0)):
+            self.metrics.record_l3_write("dropped")
+
+    async def prune_tags(self) -> int:
+        """Remove tag-index members whose entries have expired; return how many."""
+        await self._l2_writes.flush()
+        tag_keys = [self._as_str(t) for t in await self.redis.smembers(self.TAG_REGISTRY) or []]
+        if not tag_keys:
+            return 0
+
+        pipe = self.redis.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        memberships = await pipe.execute()
+
+        pairs = [(t, k) for t, members in zip(tag_keys, memberships) for k in (members or ())]
+        pipe = self.redis.pipeline(transaction=False)
+        for _, key in pairs:
+            pipe.exists(key)
+        alive = await pipe.execute() if pairs else []
+
+        pipe = self.redis.pipeline(transaction=False)
+        removed = 0
+        for (tag_key, key), exists in zip(pairs, alive):
+            if not exists:
+                pipe.srem(tag_key, key)
+                removed += 1
+        empty = [t for t, members in zip(tag_keys, memberships) if not members]
+        if empty:
+            pipe.srem(self.TAG_REGISTRY, *empty)
+        if removed or empty:
+            await pipe.execute()
+        return removed
+
     async def warm(self, items: list):
         tasks = [self.set(req, val, ttl=item.get("ttl", 3600)) for item in items for req, val in [(item.get("request"), item.get("value"))]]
         if tasks:
             await asyncio.gather(*tasks)
 
-    async def _get_from_s3(self, key: str) -> Optional[dict]:
-        async with self.boto_session.client("s3") as client:
+    # ---------------------------
+    # LIFECYCLE
+    # ---------------------------
+    async def start(self):
+        """Open the pooled S3 client and the write-behind workers (server startup hook)."""
+        try:
+            await self._s3()
+        except Exception:
+            # L3 is optional; reads and writes retry the client lazily.
+            pass
+        self._l2_writes.start()
+        self._l3_writes.start()
+
+    def schedule_start(self) -> Optional[asyncio.Task]:
+        """Start in the background when called from inside a running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        return loop.create_task(self.start())
+
+    async def flush(self):
+        """Wait until every queued Redis and S3 write has been attempted."""
+        await self._l2_writes.flush()
+        await self._l3_writes.flush()
+
+    async def aclose(self):
+        await self._l2_writes.aclose()
+        await self._l3_writes.aclose()
+        await self._s3_clients.aclose()
+
+    async def _s3(self):
+        # Long-lived per loop so the connection pool survives across calls.
+        return await self._s3_clients.get()
+
+    # ---------------------------
+    # L3 READ / WRITE-BEHIND
+    # ---------------------------
+    async def _get_from_s3(self, key: str) -> Optional[Tuple[dict, bytes]]:
+        if key in self.l3_negative:
+            self.metrics.record_negative_hit()
+            return None
+        try:
+            client = await self._s3()
+            obj = await client.get_object(Bucket=self.config.s3_bucket, Key=f"{self.config.s3_prefix}{key}")
+            body = await obj["Body"].read()
+            return self._decode(body, key), body
+        except Exception as exc:
+            # Only a definite "absent" is remembered; transient errors are not.
+            if self._is_missing(exc):
+                self.l3_negative.add(key)
+            return None
+
+    @staticmethod
+    def _is_missing(exc: Exception) -> bool:
+        response = getattr(exc, "response", None) or {}
+        code = str(response.get("Error", {}).get("Code", ""))
+        return type(exc).__name__ == "NoSuchKey" or code in ("NoSuchKey", "404")
+
+    def _enqueue_l3_write(self, key: str, blob: bytes, ttl: int):
+        self.l3_negative.discard(key)
+        if not self._l3_writes.submit(("put", key, blob, ttl)):
+            # L2 still holds the value; dropping the cold copy is safe.
+            self.metrics.record_l3_write("dropped")
+
+    async def _l3_write_batch(self, batch: List[tuple]):
+        for op, key, blob, ttl in batch:
             try:
-                obj = await client.get_object(Bucket=self.config.s3_bucket, Key=f"{self.config.s3_prefix}{key}")
-                body = await obj["Body"].read()
-                decrypted = self.encryptor.decrypt(body.decode(), key)
-                return decrypted
-            except client.exceptions.NoSuchKey:
-                return None
+                if op == "delete":
+                    await self._delete_from_s3(key)
+                    self.metrics.record_l3_write("deleted")
+                else:
+                    await self._put_to_s3(key, blob, ttl)
+                    self.metrics.record_l3_write("written")
             except Exception:
-                return None
+                self.metrics.record_l3_write("failed")
 
-    async def _put_to_s3(self, key: str, payload: bytes, ttl: int):
+    async def _put_to_s3(self, key: str, blob: bytes, ttl: int):
         expires = int(time.time() + ttl)
-        async with self.boto_session.client("s3") as client:
-            blob = self.encryptor.encrypt(json.loads(payload.decode()), key)
-            await client.put_object(
+        client = await self._s3()
+        await client.put_object(
+            Bucket=self.config.s3_bucket,
+            Key=f"{self.config.s3_prefix}{key}",
+            Body=blob,
+            Expires=expires,
+        )
+
+    async def _delete_from_s3(self, keys: list):
+        client = await self._s3()
+        # DeleteObjects accepts at most 1000 keys per call.
+        for i in range(0, len(keys), 1000):
+            await client.delete_objects(
                 Bucket=self.config.s3_bucket,
-                Key=f"{self.config.s3_prefix}{key}",
-                Body=blob.encode(),
-                Expires=expires,
+                Delete={
+                    "Objects": [{"Key": f"{self.config.s3_prefix}{k}"} for k in keys[i:i + 1000]],
+                    "Quiet": True,
+                },
             )
@@ -1,6 +1,6 @@
 """Prometheus-compatible engine metrics."""
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 
 REQUEST_TOTAL = Counter("toron_requests_total", "Total requests processed")
@@ -16,6 +16,13 @@ LATENCY = Histogram(
     "Latency histogram in milliseconds",
     buckets=(5, 10, 25, 50, 75, 100, 250, 500, 750, 1000, 2500, 5000),
 )
+SLO_LATENCY = Gauge(
+    "toron_slo_latency_ms",
+    "Streaming latency quantiles per SLO window in milliseconds",
+    ["window", "quantile"],
+)
+SLO_SUCCESS_RATE = Gauge("toron_slo_success_rate", "Success rate per SLO window", ["window"])
+SLO_BURN_RATE = Gauge("toron_slo_error_budget_burn_rate", "Error budget burn rate per SLO window", ["window"])
 
 
 def record_request(latency_ms: float, cache_layer: str | None = None):
@@ -43,3 +50,13 @@ def record_provider_failure():
 
 def record_circuit_open():
     CIRCUIT_OPEN.inc()
+
+
+def record_slo(reports: dict):
+    """Publish ``SLOManager`` window reports keyed by window length in seconds."""
+    for window, report in reports.items():
+        label = f"{window}s"
+        for quantile in ("p50", "p95", "p99"):
+            SLO_LATENCY.labels(window=label, quantile=quantile).set(report[f"{quantile}_latency"])
+        SLO_SUCCESS_RATE.labels(window=label).set(report["success_rate"])
+        SLO_BURN_RATE.labels(window=label).set(report["burn_rate"])
@@ -0,0 +1,124 @@
+"""Streaming latency quantiles and success counts over rolling time windows.
+
+Latencies land in fixed log-scale buckets (relative error ``~relative_error``)
+so recording is O(1) and a quantile is a cumulative sum over a few hundred
+buckets, independent of traffic. Counts are kept per time slot in a ring;
+each window keeps running totals that slots are subtracted from as they age
+out, so rotation never rescans history.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from threading import Lock
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+
+class WindowedHistogram:
+    def __init__(
+        self,
+        windows: Sequence[int] = (300, 3600),
+        slot_seconds: int = 10,
+        min_ms: float = 0.1,
+        max_ms: float = 600_000.0,
+        relative_error: float = 0.02,
+        clock=time.monotonic,
+    ):
+        self.windows = tuple(sorted(windows))
+        self.slot_seconds = slot_seconds
+        self.clock = clock
+
+        self.min_ms = min_ms
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self.n_buckets = int(math.ceil(math.log(max_ms / min_ms) / self._log_gamma)) + 1
+        # Bucket i covers (min * gamma^(i-1), min * gamma^i]; report its midpoint.
+        self._values = min_ms * self._gamma ** np.arange(self.n_buckets) * 2 / (1 + self._gamma)
+        self._values[0] = min_ms
+
+        self._slots_per_window = {w: max(1, w // slot_seconds) for w in self.windows}
+        self._ring_size = max(self._slots_per_window.values())
+        self._latency = np.zeros((self._ring_size, self.n_buckets), dtype=np.int64)
+        self._outcomes = np.zeros((self._ring_size, 2), dtype=np.int64)  # [success, failure]
+        self._window_latency = {w: np.zeros(self.n_buckets, dtype=np.int64) for w in self.windows}
+        self._window_outcomes = {w: np.zeros(2, dtype=np.int64) for w in self.windows}
+
+        self._lock = Lock()
+        self._slot = int(self.clock() // slot_seconds)
+
+    # ---------------------------
+    # RECORD
+    # ---------------------------
+    def _bucket(self, ms: float) -> int:
+        if ms <= self.min_ms:
+            return 0
+        return min(int(math.ceil(math.log(ms / self.min_ms) / self._log_gamma)), self.n_buckets - 1)
+
+    def record_latency(self, ms: float) -> None:
+        b = self._bucket(ms)
+        with self._lock:
+            self._advance()
+            self._latency[self._slot % self._ring_size, b] += 1
+            for totals in self._window_latency.values():
+                totals[b] += 1
+
+    def record_outcome(self, success: bool) -> None:
+        col = 0 if success else 1
+        with self._lock:
+            self._advance()
+            self._outcomes[self._slot % self._ring_size, col] += 1
+            for totals in self._window_outcomes.values():
+                totals[col] += 1
+
+    def _advance(self) -> None:
+        now = int(self.clock() // self.slot_seconds)
+        steps = now - self._slot
+        if steps <= 0:
+            return
+        if steps >= self._ring_size:
+            self._latency[:] = 0
+            self._outcomes[:] = 0
+            for w in self.windows:
+                self._window_latency[w][:] = 0
+                self._window_outcomes[w][:] = 0
+            self._slot = now
+            return
+        for t in range(self._slot + 1, now + 1):
+            for w, n in self._slots_per_window.items():
+                old = (t - n) % self._ring_size
+                self._window_latency[w] -= self._latency[old]
+                self._window_outcomes[w] -= self._outcomes[old]
+            self._latency[t % self._ring_size] = 0
+            self._outcomes[t % self._ring_size] = 0
+        self._slot = now
+
+    # ---------------------------
+    # QUERY
+    # ---------------------------
+    def quantiles(self, qs: Iterable[float], window: Optional[int] = None) -> Dict[float, float]:
+        qs = list(qs)
+        with self._lock:
+            self._advance()
+            cumulative = np.cumsum(self._window_latency[window or self.windows[0]])
+        total = int(cumulative[-1])
+        if not total:
+            return {q: 0.0 for q in qs}
+        # Nearest-rank: the smallest bucket holding at least ceil(q * n) samples.
+        ranks = np.maximum(np.ceil(np.asarray(qs) * total), 1)
+        idx = np.searchsorted(cumulative, ranks)
+        return {q: float(self._values[i]) for q, i in zip(qs, idx)}
+
+    def outcomes(self, window: Optional[int] = None) -> tuple:
+        """``(successes, failures)`` inside ``window`` seconds."""
+        with self._lock:
+            self._advance()
+            ok, bad = self._window_outcomes[window or self.windows[0]]
+        return int(ok), int(bad)
+
+    def count(self, window: Optional[int] = None) -> int:
+        with self._lock:
+            self._advance()
+            return int(self._window_latency[window or self.windows[0]].sum())
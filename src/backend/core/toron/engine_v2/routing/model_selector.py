@@ -0,0 +1,125 @@
+"""Constraint-aware model selection from live provider statistics."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from ..core.model_stats import ModelStats
+
+
+@dataclass
+class Candidate:
+    model: str
+    latency_p95_ms: float
+    cost_usd: float
+    failure_rate: float
+    quality: float
+    score: float
+
+
+class ModelSelector:
+    """
+    Chooses a model set that fits a request's latency SLO and budget.
+
+    Models are scored on rolling quality discounted by failure rate, with a
+    bonus for the optimizer's intent-based preferences. Candidates whose
+    estimated p95 latency breaks the SLO or that are failing most calls are
+    dropped, then the best-scoring models are added greedily while the
+    combined estimated spend stays within budget (debate models run in
+    parallel, so latency is a per-model constraint and cost is additive).
+    """
+
+    def __init__(
+        self,
+        stats: ModelStats,
+        guardrails=None,
+        preference_bonus: float = 0.15,
+        max_failure_rate: float = 0.5,
+    ):
+        self.stats = stats
+        self.guardrails = guardrails
+        self.preference_bonus = preference_bonus
+        self.max_failure_rate = max_failure_rate
+
+    def rank(
+        self,
+        available: Sequence[str],
+        prompt_tokens: int,
+        preferred: Sequence[str] = (),
+    ) -> List[Candidate]:
+        out = []
+        for model in dict.fromkeys(available):
+            est = self.stats.estimate(model)
+            bonus = self.preference_bonus if model in preferred else 0.0
+            out.append(
+                Candidate(
+                    model=model,
+                    latency_p95_ms=est.latency_p95_ms,
+                    cost_usd=est.cost(model, prompt_tokens),
+                    failure_rate=est.failure_rate,
+                    quality=est.quality,
+                    score=est.quality * (1 - est.failure_rate) + bonus,
+                )
+            )
+        out.sort(key=lambda c: (-c.score, c.cost_usd, c.latency_p95_ms))
+        return out
+
+    def select(
+        self,
+        available: Sequence[str],
+        prompt_tokens: int,
+        latency_slo_ms: Optional[float] = None,
+        budget_usd: Optional[float] = None,
+        max_models: int = 1,
+        preferred: Sequence[str] = (),
+    ) -> List[str]:
+        if not available:
+            return []
+
+        budget = self._effective_budget(budget_usd)
+        ranked = self.rank(available, prompt_tokens, preferred)
+
+        feasible = [
+            c for c in ranked
+            if c.failure_rate < self.max_failure_rate
+            and (latency_slo_ms is None or c.latency_p95_ms <= latency_slo_ms)
+        ]
+
+        chosen: List[str] = []
+        spend = 0.0
+        for c in feasible:
+            if len(chosen) >= max_models:
+                break
+            if budget is not None and spend + c.cost_usd > budget:
+                continue
+            chosen.append(c.model)
+            spend += c.cost_usd
+
+        if chosen:
+            return chosen
+
+        # Nothing satisfies every constraint: degrade to the single cheapest
+        # model that meets the SLO, else the fastest one overall.
+        pool = feasible or ranked
+        fallback = min(pool, key=lambda c: (c.cost_usd, c.latency_p95_ms)) if feasible else min(
+            pool, key=lambda c: (c.latency_p95_ms, c.cost_usd)
+        )
+        return [fallback.model]
+
+    def _effective_budget(self, budget_usd: Optional[float]) -> Optional[float]:
+        remaining = self.guardrails.remaining() if self.guardrails is not None else None
+        limits = [b for b in (budget_usd, remaining) if b is not None]
+        return min(limits) if limits else None
+
+    def explain(self, available: Sequence[str], prompt_tokens: int) -> Dict[str, dict]:
+        return {
+            c.model: {
+                "latency_p95_ms": round(c.latency_p95_ms, 2),
+                "cost_usd": round(c.cost_usd, 6),
+                "failure_rate": round(c.failure_rate, 4),
+                "quality": round(c.quality, 4),
+                "score": round(c.score, 4),
+            }
+            for c in self.rank(available, prompt_tokens)
+        }
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from .model_selector import ModelSelector
 
 
 @dataclass
@@ -20,9 +22,16 @@ class QueryOptimizer:
     """
     Heuristic query optimizer that normalizes prompts, classifies
     complexity, and proposes provider/model selections.
+
+    When a ``ModelSelector`` is supplied, the heuristic preferences become a
+    ranking bonus and the final model set is chosen from live latency, cost
+    and quality estimates under the request's ``latency_slo_ms`` and
+    ``max_cost`` constraints.
     """
 
-    def __init__(self):
+    def __init__(self, selector: Optional[ModelSelector] = None, max_models: int = 1):
+        self.selector = selector
+        self.max_models = max_models
         self.fast_intents = {
             "math": re.compile(r"^[-+*/0-9 ().]+$"),
             "translation": re.compile(r"translate|in (spanish|french|german|japanese)", re.I),
@@ -62,11 +71,25 @@ class QueryOptimizer:
 
     def select_models(self, request: Dict, available: List[str]) -> List[str]:
         optimized = self.optimize(request)
+        if self.selector is not None and available:
+            return self.selector.select(
+                available,
+                prompt_tokens=self._estimate_tokens(optimized.tokens),
+                latency_slo_ms=request.get("latency_slo_ms"),
+                budget_usd=request.get("max_cost"),
+                max_models=request.get("max_models", self.max_models),
+                preferred=optimized.preferred_models,
+            )
         for candidate in optimized.preferred_models:
             if candidate in available:
                 return [candidate]
         return available[:2] if available else ["gpt-4o-mini"]
 
+    @staticmethod
+    def _estimate_tokens(words: int) -> int:
+        # ~0.75 words per token for English text.
+        return int(words * 4 / 3) + 1
+
     def classify(self, request: Dict) -> Dict:
         optimized = self.optimize(request)
         return {
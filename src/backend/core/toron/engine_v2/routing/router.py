@@ -22,6 +22,8 @@ class Router:
         consensus_integrator,
         provider_adapter,
         fast_path_executor: Optional[FastPathExecutor] = None,
+        catalogue_ttl_seconds: float = 300.0,
+        guardrails=None,
     ):
         self.cache = cache
         self.tracer = tracer
@@ -30,18 +32,23 @@ class Router:
         self.consensus_integrator = consensus_integrator
         self.provider_adapter = provider_adapter
         self.fast_path_executor = fast_path_executor or FastPathExecutor()
+        self.catalogue_ttl_seconds = catalogue_ttl_seconds
+        self.guardrails = guardrails
         self._cached_models: List[str] | None = None
+        self._catalogue_loaded_at = 0.0
 
     async def resolve(self, request_dict: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         context = context or {}
         start = time.time()
         prompt = request_dict.get("prompt", "")
 
-        with self.tracer.span("toron.router", attributes={"session_id": context.get("session_id")}) as span:
+        with self.tracer.span("toron.router", attributes=lambda: {"session_id": context.get("session_id")}) as span:
+            recording = span.is_recording()
             classification = self.query_optimizer.classify(request_dict)
             context.update(classification)
-            span.set_attribute("intent", classification["intent"])
-            span.set_attribute("complexity", classification["complexity"])
+            if recording:
+                span.set_attribute("intent", classification["intent"])
+                span.set_attribute("complexity", classification["complexity"])
 
             fast_path_result = await self.fast_path_executor.try_fast_path(prompt)
             if fast_path_result:
@@ -54,8 +61,28 @@ class Router:
                 return cached
 
             models = await self._select_models(request_dict)
+            if self.guardrails is not None:
+                # Reserve the projected spend before any provider is called.
+                admission = await self.guardrails.admit(
+                    request_dict,
+                    models,
+                    available=self._cached_models,
+                    tenant=request_dict.get("tenant_id") or context.get("tenant_id") or request_dict.get("user_id"),
+                )
+                context["admission"] = admission
+                if recording:
+                    span.set_attribute("admission", admission.action)
+                if not admission.admitted:
+                    return {
+                        "status": "error",
+                        "error": "budget_exceeded",
+                        "error_message": f"Request shed: {admission.reason} would be exceeded.",
+                        "admission": admission.as_dict(),
+                    }
+                models = admission.models
             context["selected_models"] = models
-            span.set_attribute("models", ",".join(models))
+            if recording:
+                span.set_attribute("models", ",".join(models))
 
             debate_context = {
                 "selected_models": models,
@@ -67,16 +94,37 @@ class Router:
             context["debate_result"] = debate_result
 
             consensus_result = await self.consensus_integrator.integrate({"debate_result": debate_result, "validation": {}})
-            TraceContext.annotate_request(span, model_used=consensus_result.get("model_used"), cache_hit=False, latency_ms=(time.time() - start) * 1000)
+            self._record_quality(consensus_result)
+            TraceContext.annotate_request(
+                span,
+                model_used=consensus_result.get("model_used"),
+                cache_hit=False,
+                latency_ms=(time.time() - start) * 1000,
+                confidence=consensus_result.get("confidence"),
+            )
 
             ttl = request_dict.get("ttl", 3600)
             await self.cache.set(request_dict, consensus_result, ttl=ttl)
             return consensus_result
 
     async def _select_models(self, request_dict: Dict[str, Any]) -> List[str]:
-        if self._cached_models is None:
+        stale = time.time() - self._catalogue_loaded_at >= self.catalogue_ttl_seconds
+        if self._cached_models is None or stale:
             try:
-                self._cached_models = await self.provider_adapter.list_all_models()
+                listed = await self.provider_adapter.list_all_models()
+                models = [m.get("model_id") if isinstance(m, dict) else m for m in listed]
+                self._cached_models = [m for m in dict.fromkeys(models) if m]
             except Exception:
-                self._cached_models = list(self.provider_adapter.connectors.keys())
+                # Keep serving the last good catalogue if the refresh fails.
+                if self._cached_models is None:
+                    self._cached_models = list(self.provider_adapter.connectors.keys())
+            self._catalogue_loaded_at = time.time()
         return self.query_optimizer.select_models(request_dict, self._cached_models)
+
+    def _record_quality(self, consensus_result: Dict[str, Any]) -> None:
+        stats = getattr(self.provider_adapter, "model_stats", None)
+        if stats is None:
+            return
+        scores = (consensus_result.get("reasoning_trace") or {}).get("tfidf_scores") or {}
+        for model, score in scores.items():
+            stats.record_quality(model, score)
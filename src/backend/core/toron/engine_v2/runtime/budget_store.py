@@ -0,0 +1,108 @@
+"""
+Budget counter stores for CostGuardrails.
+
+Spend is tracked in fixed clock-aligned windows (``toron:budget:hour:<n>``,
+``toron:budget:day:<n>``, per-tenant variants) so every worker charges the
+same counters. ``reserve`` is the one primitive: check every counter against
+its cap and, only if all fit, add to all of them — atomically, so two
+workers can never both squeeze under the same cap.
+
+``RedisBudgetStore`` does this in a single Lua script; ``LocalBudgetStore``
+is the in-process stand-in used when no Redis URL is configured (and in
+tests). Both return the post-operation totals so callers can keep a cheap
+local view for synchronous checks.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class BudgetEntry:
+    key: str
+    amount: float
+    cap: Optional[float]  # None: count only, never reject
+    ttl: int
+
+
+class LocalBudgetStore:
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._lock = Lock()
+        self._counters: Dict[str, Tuple[float, float]] = {}  # key -> (value, expires_at)
+
+    def _value(self, key: str, now: float) -> float:
+        value, expires_at = self._counters.get(key, (0.0, 0.0))
+        return value if expires_at > now else 0.0
+
+    def reserve_nowait(self, entries: Sequence[BudgetEntry]) -> Tuple[bool, List[float]]:
+        with self._lock:
+            now = self.clock()
+            current = [self._value(e.key, now) for e in entries]
+            for e, value in zip(entries, current):
+                if e.cap is not None and value + e.amount > e.cap:
+                    return False, current
+            totals = []
+            for e, value in zip(entries, current):
+                total = value + e.amount
+                self._counters[e.key] = (total, now + e.ttl)
+                totals.append(total)
+            if len(self._counters) > 4096:
+                self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+            return True, totals
+
+    async def reserve(self, entries: Sequence[BudgetEntry]) -> Tuple[bool, List[float]]:
+        return self.reserve_nowait(entries)
+
+    async def totals(self, keys: Sequence[str]) -> List[float]:
+        with self._lock:
+            now = self.clock()
+            return [self._value(k, now) for k in keys]
+
+
+# KEYS: counters. ARGV: amount, cap (negative = uncapped), ttl per key.
+# Replies carry floats as strings; Redis truncates Lua numbers to integers.
+_RESERVE_LUA = """
+local current = {}
+for i = 1, #KEYS do
+  current[i] = tonumber(redis.call('GET', KEYS[i]) or '0')
+  local amount = tonumber(ARGV[(i - 1) * 3 + 1])
+  local cap = tonumber(ARGV[(i - 1) * 3 + 2])
+  if cap >= 0 and current[i] + amount > cap then
+    local out = {0}
+    for j = 1, #KEYS do
+      out[j + 1] = tostring(current[j] or tonumber(redis.call('GET', KEYS[j]) or '0'))
+    end
+    return out
+  end
+end
+local out = {1}
+for i = 1, #KEYS do
+  local total = redis.call('INCRBYFLOAT', KEYS[i], ARGV[(i - 1) * 3 + 1])
+  redis.call('EXPIRE', KEYS[i], ARGV[(i - 1) * 3 + 3])
+  out[i + 1] = total
+end
+return out
+"""
+
+
+class RedisBudgetStore:
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self._script = redis_client.register_script(_RESERVE_LUA)
+
+    async def reserve(self, entries: Sequence[BudgetEntry]) -> Tuple[bool, List[float]]:
+        args = []
+        for e in entries:
+            args.extend([repr(float(e.amount)), repr(float(e.cap)) if e.cap is not None else "-1", int(e.ttl)])
+        reply = await self._script(keys=[e.key for e in entries], args=args)
+        ok, *totals = reply
+        return bool(int(ok)), [float(t) for t in totals]
+
+    async def totals(self, keys: Sequence[str]) -> List[float]:
+        values = await self.redis.mget(list(keys))
+        return [float(v) if v is not None else 0.0 for v in values]
@@ -1,5 +1,5 @@
 """
-Encrypted Redis Cache Layer — AES-GCM + Brotli.
+Encrypted Redis Cache Layer — AES-GCM + Brotli/zstd via the shared CacheCodec.
 """
 
 import brotli
@@ -8,7 +8,8 @@ from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import os
 import base64
 import json
-import time
+
+from ..performance.cache.cache_codec import CacheCodec
 
 
 class CacheLayer:
@@ -19,6 +20,7 @@ class CacheLayer:
         self.key = base64.b64decode(
             os.getenv("CACHE_AES_KEY", base64.b64encode(os.urandom(32)))
         )
+        self.codec = CacheCodec(self.key)
 
     def _encrypt(self, plaintext: bytes, aad: str):
         aes = AESGCM(self.key)
@@ -34,15 +36,15 @@ class CacheLayer:
         return aes.decrypt(nonce, ciphertext, aad.encode())
 
     async def set(self, key: str, value: dict, aal: str, ttl=86400):
-        raw = json.dumps(value).encode()
-        compressed = brotli.compress(raw)
-        encrypted = self._encrypt(compressed, aal)
-        await self.redis.set(key, encrypted, ex=ttl)
+        await self.redis.set(key, self.codec.encode(value, aal).blob, ex=ttl)
 
     async def get(self, key: str, aal: str):
         encrypted = await self.redis.get(key)
         if not encrypted:
             return None
+        if self.codec.is_encoded(encrypted):
+            return self.codec.decode(encrypted, aal)
+        # Entries written before the shared codec: base64(AES-GCM(brotli(JSON))).
         decrypted = self._decrypt(encrypted.decode(), aal)
         decompressed = brotli.decompress(decrypted)
         return json.loads(decompressed.decode())
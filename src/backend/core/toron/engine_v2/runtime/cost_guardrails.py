@@ -6,16 +6,82 @@ Tracks:
 * cost per provider call
 * total daily cost
 * total hourly cost
-* per-user cost caps
+* per-tenant cost and token caps (tenant id, else user id)
 * emergency stop if cost exceeds budget
 
 Data pulled from:
 
 * Model metadata (input/output cost per million tokens)
 * Token usage from connectors
-  """
 
+Requests are admitted *before* they spend: ``admit`` estimates the debate's
+cost from prompt tokens and ModelStats' expected output per model, then
+atomically reserves it against every budget. If the full model set does not
+fit, cheaper sets are tried (drop the most expensive model, then the single
+cheapest available model) and the request is shed only when nothing fits.
+``settle`` corrects the reservation once the actual cost is known and keeps
+the post-hoc checks: a request whose actual cost exceeds the per-request cap
+is rejected, and settled totals above the hourly or daily cap trigger the
+emergency stop. Requests that skip admission (cache hits, the fast path)
+are booked and checked the same way.
+
+Counters live in a shared ``budget_store`` (Redis when
+``TORON_BUDGET_REDIS_URL`` is set, else an in-process stand-in), so every
+worker draws down the same budget.
+"""
+
+import asyncio
+import os
 import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from ..core.model_stats import ModelStats, estimate_cost
+from .budget_store import BudgetEntry, LocalBudgetStore, RedisBudgetStore
+
+
+# Fixed prompt scaffolding the debate critique round adds per model.
+CRITIQUE_OVERHEAD_TOKENS = 60
+
+HOUR = 3600
+DAY = 86400
+
+
+@dataclass
+class CostEstimate:
+    prompt_tokens: int
+    per_model: Dict[str, float]
+    tokens: int
+
+    @property
+    def total(self) -> float:
+        return sum(self.per_model.values())
+
+
+@dataclass
+class Admission:
+    action: str  # "admit" | "downgrade" | "shed"
+    models: List[str]
+    estimate: float
+    tokens: int
+    tenant: Optional[str] = None
+    reason: str = ""
+    requested: List[str] = field(default_factory=list)
+
+    @property
+    def admitted(self) -> bool:
+        return self.action != "shed"
+
+    def as_dict(self) -> dict:
+        return {
+            "action": self.action,
+            "models": self.models,
+            "requested_models": self.requested,
+            "estimated_cost": round(self.estimate, 6),
+            "estimated_tokens": self.tokens,
+            "tenant": self.tenant,
+            "reason": self.reason,
+        }
 
 
 class CostGuardrails:
@@ -24,46 +90,277 @@ class CostGuardrails:
         hourly_cap=5.00,  # $5/hour max
         daily_cap=40.00,  # $40/day max
         per_request_cap=0.25,  # $0.25 max for a single request
+        tenant_daily_cap=None,  # $/day per tenant, None = uncapped
+        tenant_daily_token_cap=None,  # tokens/day per tenant, None = uncapped
+        store=None,
+        stats: ModelStats | None = None,
+        clock=time.time,
     ):
         self.hourly_cap = hourly_cap
         self.daily_cap = daily_cap
         self.per_request_cap = per_request_cap
+        self.tenant_daily_cap = (
+            tenant_daily_cap if tenant_daily_cap is not None else self._env_float("TORON_TENANT_DAILY_CAP")
+        )
+        self.tenant_daily_token_cap = (
+            tenant_daily_token_cap
+            if tenant_daily_token_cap is not None
+            else self._env_float("TORON_TENANT_DAILY_TOKEN_CAP")
+        )
+        self.clock = clock
+        self.store = store or self._default_store(clock)
+        self.model_stats = stats or ModelStats()
 
+        # Local view of the shared hour/day counters, refreshed by every
+        # store round trip; used for the synchronous checks below.
         self.cost_hour = 0.0
         self.cost_day = 0.0
 
-        self.hour_timestamp = time.time()
-        self.day_timestamp = time.time()
+        now = clock()
+        self.hour_timestamp = now
+        self.day_timestamp = now
+        self._window = self._windows(now)
+        self.decisions = {"admit": 0, "downgrade": 0, "shed": 0}
+        self._pending = set()
+
+    @staticmethod
+    def _env_float(name):
+        value = os.getenv(name)
+        return float(value) if value else None
+
+    @staticmethod
+    def _default_store(clock):
+        url = os.getenv("TORON_BUDGET_REDIS_URL")
+        if url:
+            from redis import asyncio as aioredis
+
+            return RedisBudgetStore(aioredis.from_url(url))
+        return LocalBudgetStore(clock)
+
+    # ---------------------------
+    # WINDOWS / COUNTERS
+    # ---------------------------
+    @staticmethod
+    def _windows(now):
+        return int(now // HOUR), int(now // DAY)
 
     def _reset_if_needed(self):
-        now = time.time()
+        now = self.clock()
+        hour, day = self._windows(now)
 
-        if now - self.hour_timestamp > 3600:
+        if hour != self._window[0]:
             self.cost_hour = 0.0
             self.hour_timestamp = now
 
-        if now - self.day_timestamp > 86400:
+        if day != self._window[1]:
             self.cost_day = 0.0
             self.day_timestamp = now
 
+        self._window = (hour, day)
+
+    def _entries(self, cost, tokens, tenant=None, capped=True):
+        hour, day = self._windows(self.clock())
+        entries = [
+            BudgetEntry(f"toron:budget:hour:{hour}", cost, self.hourly_cap if capped else None, 2 * HOUR),
+            BudgetEntry(f"toron:budget:day:{day}", cost, self.daily_cap if capped else None, 2 * DAY),
+        ]
+        if tenant:
+            entries += [
+                BudgetEntry(
+                    f"toron:budget:tenant:{tenant}:day:{day}",
+                    cost,
+                    self.tenant_daily_cap if capped else None,
+                    2 * DAY,
+                ),
+                BudgetEntry(
+                    f"toron:budget:tenant:{tenant}:tokens:{day}",
+                    tokens,
+                    self.tenant_daily_token_cap if capped else None,
+                    2 * DAY,
+                ),
+            ]
+        return entries
+
+    def _observe(self, totals):
+        self._reset_if_needed()
+        self.cost_hour, self.cost_day = totals[0], totals[1]
+
+    # ---------------------------
+    # ESTIMATION
+    # ---------------------------
+    @staticmethod
+    def prompt_tokens(request_dict) -> int:
+        parts = [request_dict.get("prompt") or ""]
+        for message in request_dict.get("messages") or []:
+            content = message.get("content") if isinstance(message, dict) else None
+            if isinstance(content, str):
+                parts.append(content)
+        words = sum(len(p.split()) for p in parts)
+        # ~0.75 words per token for English text.
+        return int(words * 4 / 3) + 1
+
+    def estimate(self, request_dict, models: Sequence[str]) -> CostEstimate:
+        """Projected debate spend: one answer plus one critique call per model."""
+        prompt_tokens = self.prompt_tokens(request_dict)
+        outputs = {m: self.model_stats.estimate(m).output_tokens for m in dict.fromkeys(models)}
+        all_output = sum(outputs.values())
+
+        per_model = {}
+        tokens = 0
+        for model, out in outputs.items():
+            critique_in = CRITIQUE_OVERHEAD_TOKENS + all_output - out
+            per_model[model] = estimate_cost(model, prompt_tokens, out) + estimate_cost(model, critique_in, out)
+            tokens += prompt_tokens + critique_in + 2 * out
+        return CostEstimate(prompt_tokens, per_model, int(tokens))
+
+    def _candidates(self, request_dict, models, available):
+        """Model sets to try, most capable first, each cheaper than the last."""
+        seen = set()
+        current = list(dict.fromkeys(models))
+        while current:
+            est = self.estimate(request_dict, current)
+            seen.add(tuple(current))
+            yield current, est
+            if len(current) == 1:
+                break
+            priciest = max(current, key=est.per_model.get)
+            current = [m for m in current if m != priciest]
+
+        pool = list(dict.fromkeys([*(available or []), *models]))
+        if pool:
+            costs = {m: self.estimate(request_dict, [m]).total for m in pool}
+            cheapest = min(pool, key=lambda m: costs[m])
+            if (cheapest,) not in seen:
+                yield [cheapest], self.estimate(request_dict, [cheapest])
+
+    # ---------------------------
+    # ADMISSION
+    # ---------------------------
+    async def admit(self, request_dict, models, available=None, tenant=None) -> Admission:
+        """Reserve the projected cost of ``models``, downgrading or shedding if it won't fit."""
+        requested = list(dict.fromkeys(models))
+        limit = self.per_request_cap
+        if request_dict.get("max_cost") is not None:
+            limit = min(limit, float(request_dict["max_cost"]))
+
+        reason = "per_request_cap"
+        cheapest = None
+        for candidate, est in self._candidates(request_dict, requested, available):
+            cheapest = est
+            if est.total > limit:
+                continue
+            ok, totals = await self.store.reserve(self._entries(est.total, est.tokens, tenant))
+            self._observe(totals)
+            if ok:
+                action = "admit" if candidate == requested else "downgrade"
+                self.decisions[action] += 1
+                return Admission(action, candidate, est.total, est.tokens, tenant, requested=requested)
+            reason = self._exhausted(totals, est, tenant)
+
+        self.decisions["shed"] += 1
+        return Admission(
+            "shed",
+            [],
+            cheapest.total if cheapest else 0.0,
+            cheapest.tokens if cheapest else 0,
+            tenant,
+            reason=reason,
+            requested=requested,
+        )
+
+    def _exhausted(self, totals, est, tenant):
+        names = ["hourly_cap", "daily_cap", "tenant_daily_cap", "tenant_daily_token_cap"]
+        for name, entry, total in zip(names, self._entries(est.total, est.tokens, tenant), totals):
+            if entry.cap is not None and total + entry.amount > entry.cap:
+                return name
+        return "budget_exhausted"
+
+    async def settle(self, admission: Admission | None, actual_cost=None):
+        """Replace a reservation with the request's actual cost, when one is known.
+
+        ``None`` keeps the reservation as the best estimate; ``0`` releases it.
+        Raises like ``register_cost`` when the cost breaks the per-request cap
+        or the settled totals break the hourly or daily cap.
+        """
+        if actual_cost is None:
+            return
+        actual_cost = float(actual_cost)
+        if not actual_cost:
+            await self.release(admission)
+            return
+        if admission is None or not admission.admitted:
+            tenant = admission.tenant if admission else None
+            _, totals = await self.store.reserve(self._entries(actual_cost, 0, tenant, capped=False))
+            self._observe(totals)
+        else:
+            delta = actual_cost - admission.estimate
+            if abs(delta) >= 1e-9:
+                _, totals = await self.store.reserve(self._entries(delta, 0, admission.tenant, capped=False))
+                self._observe(totals)
+        self._check_request_cap(actual_cost)
+        self._check_budget()
+
+    async def release(self, admission: Admission | None):
+        """Give back an admitted request's reservation (it failed or errored).
+
+        Never raises on budget state, so it is safe on error and ``finally`` paths.
+        """
+        if admission is None or not admission.admitted or not (admission.estimate or admission.tokens):
+            return
+        entries = self._entries(-admission.estimate, -admission.tokens, admission.tenant, capped=False)
+        _, totals = await self.store.reserve(entries)
+        self._observe(totals)
+
+    # ---------------------------
+    # LEGACY POST-HOC ACCOUNTING
+    # ---------------------------
     def register_cost(self, cost: float):
         self._reset_if_needed()
+        self._check_request_cap(cost)
+        self._charge_nowait(cost)
+        self._check_budget()
+        return True
 
+    def _check_request_cap(self, cost):
         if cost > self.per_request_cap:
             raise Exception(
                 f"Request rejected — cost ${cost:.4f} exceeds per-request cap ${self.per_request_cap}"
             )
 
-        self.cost_hour += cost
-        self.cost_day += cost
-
+    def _check_budget(self):
         if self.cost_hour > self.hourly_cap:
             raise Exception("Emergency Stop: Hourly budget exceeded. Pausing Toron.")
 
         if self.cost_day > self.daily_cap:
             raise Exception("Emergency Stop: Daily budget exceeded. Pausing Toron.")
 
-        return True
+    def _charge_nowait(self, cost):
+        entries = self._entries(cost, 0, capped=False)
+        if hasattr(self.store, "reserve_nowait"):
+            _, totals = self.store.reserve_nowait(entries)
+            self._observe(totals)
+            return
+        # Shared store: update the local view now, the counters in the background.
+        self.cost_hour += cost
+        self.cost_day += cost
+        try:
+            task = asyncio.get_running_loop().create_task(self.store.reserve(entries))
+        except RuntimeError:
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def remaining(self) -> float:
+        """Largest spend the next request can make without tripping a cap."""
+        self._reset_if_needed()
+        return max(
+            0.0,
+            min(
+                self.per_request_cap,
+                self.hourly_cap - self.cost_hour,
+                self.daily_cap - self.cost_day,
+            ),
+        )
 
     # Telemetry/compat helpers
     def record(self, cost: float):
@@ -76,6 +373,9 @@ class CostGuardrails:
             "hourly_cap": self.hourly_cap,
             "daily_cap": self.daily_cap,
             "per_request_cap": self.per_request_cap,
+            "tenant_daily_cap": self.tenant_daily_cap,
+            "tenant_daily_token_cap": self.tenant_daily_token_cap,
+            "decisions": dict(self.decisions),
         }
 
     def health(self):
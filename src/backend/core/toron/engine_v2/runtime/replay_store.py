@@ -1,29 +1,332 @@
 """
 ReplayStore — lightweight request/response recorder.
+
+Recent traffic is kept in a fixed-size in-memory ring. Optionally every
+recorded event is also appended to a segment-rotated on-disk log (length-
+prefixed msgpack/JSON records, gzip-compressed segments) so captures survive
+restarts. ``sample_rate`` keeps capture cheap in production: at 0.01 only one
+request in a hundred is serialized at all.
+
+Disk writes happen on a background thread fed by a bounded queue, so
+``record`` never waits on gzip or the filesystem; when the queue is full the
+on-disk copy is dropped and counted. Records hold raw prompts and answers,
+so each one is encrypted with AES-GCM under a persistent key
+(``TORON_REPLAY_KEY``, falling back to ``TORON_AES_KEY``). Without a key the
+disk log stays off unless plaintext is explicitly allowed
+(``TORON_REPLAY_PLAINTEXT=1``), in which case the directory holds user
+prompts in the clear and must be treated as PII.
 """
 
+import atexit
+import base64
+import gzip
+import json
+import logging
+import os
+import queue
+import random
+import struct
+import threading
 import time
-from typing import Any, Dict, List
+from collections import deque
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+try:  # optional: smaller and faster than JSON
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+_LEN = struct.Struct(">I")
+_AAD = b"toron-replay-v1"
+_NONCE_BYTES = 12
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _replay_key(key: bytes | str | None) -> Optional[bytes]:
+    if key is None:
+        key = os.getenv("TORON_REPLAY_KEY") or os.getenv("TORON_AES_KEY")
+    if not key:
+        return None
+    return base64.b64decode(key) if isinstance(key, str) else key
+
+
+class _SegmentLog:
+    """Append-only log of length-prefixed records split into rotating segments."""
+
+    def __init__(self, directory: str, segment_bytes: int, max_segments: int, compress: bool):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.compress = compress
+        self.suffix = ".log.gz" if compress else ".log"
+
+        existing = self.segments()
+        # Never append to a segment from a previous process; start a new one.
+        self._seq = self._seq_of(existing[-1]) + 1 if existing else 1
+        self._fh = None
+        self._written = 0
+
+    @staticmethod
+    def _seq_of(path: Path) -> int:
+        return int(path.name.split("-")[1].split(".")[0])
+
+    def segments(self) -> List[Path]:
+        return sorted(
+            (p for p in self.directory.glob("replay-*.log*")),
+            key=self._seq_of,
+        )
+
+    def _open(self):
+        path = self.directory / f"replay-{self._seq:08d}{self.suffix}"
+        self._fh = gzip.open(path, "ab", compresslevel=1) if self.compress else open(path, "ab")
+        self._written = 0
+
+    def append(self, payload: bytes):
+        if self._fh is None:
+            self._open()
+        self._fh.write(_LEN.pack(len(payload)) + payload)
+        self._written += _LEN.size + len(payload)
+        if self._written >= self.segment_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._fh.close()
+        self._fh = None
+        self._seq += 1
+        for old in self.segments()[: -self.max_segments or None]:
+            old.unlink(missing_ok=True)
+
+    def flush(self):
+        if self._fh is not None:
+            self._fh.flush()
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def read(self) -> Iterator[bytes]:
+        for path in self.segments():
+            opener = gzip.open if path.name.endswith(".gz") else open
+            try:
+                with opener(path, "rb") as fh:
+                    while True:
+                        header = fh.read(_LEN.size)
+                        if len(header) < _LEN.size:
+                            break
+                        (size,) = _LEN.unpack(header)
+                        payload = fh.read(size)
+                        if len(payload) < size:
+                            break
+                        yield payload
+            except (EOFError, OSError):
+                # Truncated tail of a segment that was still being written.
+                continue
+
+
+class _LogWriter:
+    """Background thread that encrypts and appends records to a ``_SegmentLog``."""
+
+    def __init__(self, log: _SegmentLog, aead: Optional[AESGCM], max_pending: int):
+        self.log = log
+        self.aead = aead
+        self.errors = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="toron-replay-log", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: bytes) -> bool:
+        if not self._thread.is_alive():
+            return False
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            return False
+
+    def flush(self, timeout: float | None = None) -> bool:
+        if not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            try:
+                if isinstance(item, threading.Event):
+                    self.log.flush()
+                    item.set()
+                else:
+                    self.log.append(self._seal(item))
+            except Exception:
+                # Disk trouble must never fail the request being recorded.
+                self.errors += 1
+        try:
+            self.log.close()
+        except Exception:
+            self.errors += 1
+
+    def _seal(self, payload: bytes) -> bytes:
+        if self.aead is None:
+            return payload
+        nonce = os.urandom(_NONCE_BYTES)
+        return b"e" + nonce + self.aead.encrypt(nonce, payload, _AAD)
 
 
 class ReplayStore:
-    def __init__(self):
-        self.events: List[Dict[str, Any]] = []
+    def __init__(
+        self,
+        capacity: int | None = None,
+        sample_rate: float | None = None,
+        directory: str | None = None,
+        segment_bytes: int | None = None,
+        max_segments: int | None = None,
+        compress: bool = True,
+        rng: Callable[[], float] = random.random,
+        key: bytes | str | None = None,
+        allow_plaintext: bool | None = None,
+        max_pending: int = 1024,
+    ):
+        self.capacity = capacity or int(os.getenv("TORON_REPLAY_CAPACITY", "1000"))
+        self.sample_rate = (
+            sample_rate if sample_rate is not None else float(os.getenv("TORON_REPLAY_SAMPLE_RATE", "1.0"))
+        )
+        self.rng = rng
+        self.events: deque = deque(maxlen=self.capacity)
+
+        directory = directory or os.getenv("TORON_REPLAY_DIR")
+        key = _replay_key(key)
+        self._aead = AESGCM(key) if key else None
+        if allow_plaintext is None:
+            allow_plaintext = os.getenv("TORON_REPLAY_PLAINTEXT", "0") == "1"
+        if directory and self._aead is None and not allow_plaintext:
+            logger.warning(
+                "Replay disk log disabled: set TORON_REPLAY_KEY to encrypt it "
+                "(or TORON_REPLAY_PLAINTEXT=1 to store raw prompts)"
+            )
+            directory = None
+
+        self.log = (
+            _SegmentLog(
+                directory,
+                segment_bytes or int(os.getenv("TORON_REPLAY_SEGMENT_BYTES", str(16 * 1024 * 1024))),
+                max_segments or int(os.getenv("TORON_REPLAY_MAX_SEGMENTS", "16")),
+                compress,
+            )
+            if directory
+            else None
+        )
+        self._writer = _LogWriter(self.log, self._aead, max_pending) if self.log is not None else None
+        if self._writer is not None:
+            atexit.register(self.close)
+
+        self._lock = Lock()
+        self.recorded = 0
+        self.sampled_out = 0
+        self.log_dropped = 0
+
+    def record(
+        self,
+        request: Dict[str, Any],
+        response: Dict[str, Any] | None = None,
+        force: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Capture one exchange; returns None when it was sampled out."""
+        if not force and self.sample_rate < 1.0 and self.rng() >= self.sample_rate:
+            self.sampled_out += 1
+            return None
 
-    def record(self, request: Dict[str, Any], response: Dict[str, Any] | None = None):
         entry = {
             "timestamp": time.time(),
             "request": request,
             "response": response or {},
         }
-        self.events.append(entry)
+        with self._lock:
+            self.events.append(entry)
+            self.recorded += 1
+        if self._writer is not None:
+            try:
+                queued = self._writer.submit(self._encode(entry))
+            except Exception:
+                queued = False
+            if not queued:
+                # The ring still holds it; only the on-disk copy is lost.
+                self.log_dropped += 1
         return entry
 
+    @property
+    def log_errors(self) -> int:
+        return self._writer.errors if self._writer is not None else 0
+
+    @staticmethod
+    def _encode(entry: Dict[str, Any]) -> bytes:
+        if msgpack is not None:
+            return b"m" + msgpack.packb(entry, use_bin_type=True, default=str)
+        return b"j" + json.dumps(entry, separators=(",", ":"), default=str).encode()
+
+    def _decode(self, payload: bytes) -> Dict[str, Any]:
+        if payload[:1] == b"e":
+            if self._aead is None:
+                raise ValueError("replay log is encrypted; no TORON_REPLAY_KEY configured")
+            nonce = payload[1:1 + _NONCE_BYTES]
+            payload = self._aead.decrypt(nonce, payload[1 + _NONCE_BYTES:], _AAD)
+        if payload[:1] == b"m":
+            return msgpack.unpackb(payload[1:], raw=False, strict_map_key=False)
+        return json.loads(payload[1:])
+
+    def iter_events(self, from_disk: bool = False) -> Iterator[Dict[str, Any]]:
+        """Stream recorded events oldest-first, from the on-disk log or the ring."""
+        if from_disk and self.log is not None:
+            self.flush()
+            for payload in self.log.read():
+                yield self._decode(payload)
+            return
+        with self._lock:
+            snapshot = list(self.events)
+        yield from snapshot
+
     def emit(self):
-        return list(self.events)
+        with self._lock:
+            return list(self.events)
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Wait until every queued record has been written to disk."""
+        return self._writer.flush(timeout) if self._writer is not None else True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
 
     def health(self):
-        return {"status": "ok", "stored": len(self.events)}
+        return {
+            "status": "ok",
+            "stored": len(self.events),
+            "capacity": self.capacity,
+            "recorded": self.recorded,
+            "sampled_out": self.sampled_out,
+            "sample_rate": self.sample_rate,
+            "segments": len(self.log.segments()) if self.log is not None else 0,
+            "log_errors": self.log_errors,
+            "log_dropped": self.log_dropped,
+            "log_encrypted": self._aead is not None,
+        }
 
     def serialize(self):
         return {
@@ -13,47 +13,106 @@ Exposes:
 """
 
 import time
-from collections import deque
+
+from ..performance.metrics import engine_metrics
+from ..performance.metrics.windowed_histogram import WindowedHistogram
 
 
 class SLOManager:
-    def __init__(self, window_size=5000, target_success_rate=0.98, latency_slo_ms=2500):
+    """
+    Latency quantiles and success rate come from a streaming, time-windowed
+    histogram, so recording and checking are constant-time per request.
+    ``check_slo`` judges the shortest window and also reports p50/p95/p99 and
+    error-budget burn rate (error rate / allowed error rate) for every window.
+    """
+
+    def __init__(
+        self,
+        window_size=5000,
+        target_success_rate=0.98,
+        latency_slo_ms=2500,
+        windows=(300, 3600),
+        slot_seconds=10,
+        export=True,
+        export_interval_seconds=1.0,
+        histogram=None,
+    ):
+        # Kept for callers that still pass a sample-count window; the
+        # estimator is time-windowed.
         self.window_size = window_size
-        self.success_window = deque(maxlen=window_size)
-        self.latency_window = deque(maxlen=window_size)
+        self.windows = tuple(sorted(windows))
+        self.histogram = histogram or WindowedHistogram(self.windows, slot_seconds=slot_seconds)
+        self.export = export
+        # Gauges are scraped every few seconds; refreshing them per request
+        # would cost more than the SLO check itself.
+        self.export_interval_seconds = export_interval_seconds
+        self._last_export = 0.0
 
         self.target_success_rate = target_success_rate
         self.latency_slo_ms = latency_slo_ms
 
     def record_success(self):
-        self.success_window.append(1)
+        self.histogram.record_outcome(True)
 
     def record_failure(self):
-        self.success_window.append(0)
+        self.histogram.record_outcome(False)
 
     def record_latency(self, ms: float):
-        self.latency_window.append(ms)
+        self.histogram.record_latency(ms)
+
+    def success_rate(self, window=None):
+        return self._success_rate(*self.histogram.outcomes(window))
+
+    def latency_p95(self, window=None):
+        return self.histogram.quantiles((0.95,), window)[0.95]
 
-    def success_rate(self):
-        if not self.success_window:
-            return 1.0
-        return sum(self.success_window) / len(self.success_window)
+    def burn_rate(self, window=None):
+        """How fast the error budget is being spent; 1.0 spends it exactly on schedule."""
+        return self._burn_rate(self.success_rate(window))
 
-    def latency_p95(self):
-        if not self.latency_window:
-            return 0
-        sorted_latencies = sorted(self.latency_window)
-        idx = int(0.95 * len(sorted_latencies)) - 1
-        return sorted_latencies[max(idx, 0)]
+    @staticmethod
+    def _success_rate(ok, bad):
+        total = ok + bad
+        return ok / total if total else 1.0
+
+    def _burn_rate(self, success_rate):
+        allowed = 1 - self.target_success_rate
+        error_rate = 1 - success_rate
+        return error_rate / allowed if allowed > 0 else (float("inf") if error_rate else 0.0)
+
+    def window_report(self, window):
+        q = self.histogram.quantiles((0.5, 0.95, 0.99), window)
+        ok, bad = self.histogram.outcomes(window)
+        rate = self._success_rate(ok, bad)
+        return {
+            "requests": ok + bad,
+            "success_rate": round(rate, 4),
+            "p50_latency": round(q[0.5], 2),
+            "p95_latency": round(q[0.95], 2),
+            "p99_latency": round(q[0.99], 2),
+            "burn_rate": round(self._burn_rate(rate), 4),
+        }
 
     def check_slo(self):
         """Return whether Toron is performing inside SLO."""
-        success_good = self.success_rate() >= self.target_success_rate
-        latency_good = self.latency_p95() <= self.latency_slo_ms
+        reports = {w: self.window_report(w) for w in self.windows}
+        primary = reports[self.windows[0]]
+
+        success_good = primary["success_rate"] >= self.target_success_rate
+        latency_good = primary["p95_latency"] <= self.latency_slo_ms
+
+        now = time.monotonic()
+        if self.export and now - self._last_export >= self.export_interval_seconds:
+            self._last_export = now
+            engine_metrics.record_slo(reports)
 
         return {
-            "success_rate": round(self.success_rate(), 4),
-            "p95_latency": round(self.latency_p95(), 2),
+            "success_rate": primary["success_rate"],
+            "p95_latency": primary["p95_latency"],
+            "p50_latency": primary["p50_latency"],
+            "p99_latency": primary["p99_latency"],
+            "burn_rate": primary["burn_rate"],
+            "windows": {f"{w}s": r for w, r in reports.items()},
             "success_ok": success_good,
             "latency_ok": latency_good,
             "slo_pass": success_good and latency_good,
@@ -78,6 +137,7 @@ class SLOManager:
     def serialize(self):
         return {
             "window_size": self.window_size,
+            "windows": list(self.windows),
             "target_success_rate": self.target_success_rate,
             "latency_slo_ms": self.latency_slo_ms,
             "current": self.check_slo(),
@@ -1,17 +1,223 @@
 """
 Stream Executor — SSE / token-by-token streaming pipeline.
+
+Round-1 answers are streamed live from every selected model through
+``CloudProviderAdapter.stream``. Once all streams finish, the collected
+answers run through fact extraction, web search, validation and consensus,
+and the results are appended as trailing ``validation`` / ``consensus``
+events before ``end``.
 """
 
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from ..core.consensus_integrator import ConsensusIntegrator
+from ..core.fact_extractor import FactExtractor
+from ..core.web_search import WebSearch
+from ..core.web_validator import WebValidator
+from .cloudwatch_telemetry import CloudWatchTelemetry
+
+
+class StreamBuffer:
+    """Bounded event buffer between provider streams and a (possibly slow) client.
+
+    ``put`` never blocks, so provider streams are always drained at full speed.
+    When the buffer is full, new tokens are coalesced into the newest pending
+    token event for the same model rather than queued, which keeps the number
+    of buffered events bounded while losing no text.
+    """
+
+    def __init__(self, max_events: int = 256):
+        self.max_events = max_events
+        self._events: Deque[Dict[str, Any]] = deque()
+        self._pending_by_model: Dict[str, Dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.coalesced = 0
+        self.high_watermark = 0
+
+    def put(self, event: Dict[str, Any]) -> None:
+        if self._closed:
+            return
+
+        model = event.get("model")
+        if event.get("type") == "token" and len(self._events) >= self.max_events:
+            pending = self._pending_by_model.get(model)
+            if pending is not None:
+                pending["delta"] += event["delta"]
+                self.coalesced += 1
+                return
+
+        self._events.append(event)
+        if event.get("type") == "token":
+            self._pending_by_model[model] = event
+        self.high_watermark = max(self.high_watermark, len(self._events))
+        self._ready.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """Return the next event, or ``None`` once closed and drained."""
+        while not self._events:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+
+        event = self._events.popleft()
+        if self._pending_by_model.get(event.get("model")) is event:
+            del self._pending_by_model[event.get("model")]
+        return event
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
 class StreamExecutor:
-    def __init__(self, adapter, lifecycle):
+    def __init__(self, adapter, lifecycle, buffer_size: int = 256):
         self.adapter = adapter
         self.lifecycle = lifecycle
+        self.buffer_size = buffer_size
+        self.telemetry = CloudWatchTelemetry()
+
+        self.fact_extractor = FactExtractor(adapter)
+        self.web_search = WebSearch(clients=getattr(lifecycle, "clients", None))
+        self.validator = WebValidator(adapter)
+        self.consensus = ConsensusIntegrator()
 
     async def run(self, request, context):
-        # Not full SSE — starter version
-        yield "BEGIN\n"
+        """Yield the stream as Server-Sent Events frames."""
+        async for event in self.events(request, context):
+            yield self.format_sse(event)
+
+    async def events(self, request, context) -> AsyncIterator[Dict[str, Any]]:
+        """Yield structured stream events.
+
+        Event types, in order: ``begin``, any number of ``token`` (and
+        per-model ``error``), ``validation``, ``consensus``, ``end``.
+        """
+        start = time.time()
+        context["prompt"] = request.get("prompt", "")
+
+        if not self.lifecycle.consent.allowed(request):
+            yield {"type": "error", "error_message": "User consent required."}
+            yield {"type": "end", "status": "error"}
+            return
+
+        models = self.lifecycle.routing.select_models(request) or ["gpt-4o-mini"]
+        context["selected_models"] = models
+        context = self.lifecycle.state.attach_user_preferences(context)
+
+        messages = request.get("messages") or [
+            {"role": "user", "content": context["prompt"]}
+        ]
+
+        yield {"type": "begin", "models": models, "session_id": context.get("session_id")}
+
+        buffer = StreamBuffer(self.buffer_size)
+        model_outputs: Dict[str, str] = {}
+        producers = [
+            asyncio.create_task(self._produce(model, messages, buffer, model_outputs))
+            for model in models
+        ]
+        closer = asyncio.create_task(self._close_when_done(producers, buffer))
+
+        try:
+            while True:
+                event = await buffer.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # Client went away (or we finished): stop pulling from providers.
+            for task in producers:
+                task.cancel()
+            closer.cancel()
+            await asyncio.gather(*producers, closer, return_exceptions=True)
+
+        stream_ms = (time.time() - start) * 1000
+        self.telemetry.metric("StreamTokensLatency", stream_ms)
+        self.telemetry.log(
+            "StreamTokensCompleted",
+            {
+                "models": models,
+                "latency_ms": stream_ms,
+                "coalesced": buffer.coalesced,
+                "buffer_high_watermark": buffer.high_watermark,
+            },
+        )
+
+        result = await self._finalize(request, context, models, model_outputs)
+
+        validation = context.get("validation", {})
+        yield {
+            "type": "validation",
+            "supported": len(validation.get("supported", [])),
+            "contradicted": len(validation.get("contradicted", [])),
+            "unknown": len(validation.get("unknown", [])),
+            "confidence": validation.get("confidence", 0.0),
+        }
+        yield {
+            "type": "consensus",
+            "final_answer": result.get("final_answer", ""),
+            "model_used": result.get("model_used"),
+            "confidence": result.get("confidence", 0.0),
+            "model_consensus_score": result.get("model_consensus_score", 0.0),
+            "web_validation_score": result.get("web_validation_score", 0.0),
+            "models_considered": result.get("models_considered", []),
+        }
+        yield {"type": "end", "status": "ok", "latency_ms": (time.time() - start) * 1000}
+
+    @staticmethod
+    def format_sse(event: Dict[str, Any]) -> str:
+        return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+    async def _produce(self, model: str, messages, buffer: StreamBuffer, outputs: Dict[str, str]):
+        parts: List[str] = []
+        try:
+            async for token in self.adapter.stream(messages, model):
+                parts.append(token)
+                buffer.put({"type": "token", "model": model, "delta": token})
+            outputs[model] = "".join(parts)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            outputs[model] = "".join(parts) or f"[Error: {str(e)}]"
+            buffer.put({"type": "error", "model": model, "error_message": str(e)})
+
+    @staticmethod
+    async def _close_when_done(producers, buffer: StreamBuffer):
+        await asyncio.gather(*producers, return_exceptions=True)
+        buffer.close()
+
+    async def _finalize(self, request, context, models, model_outputs):
+        context["debate_result"] = {
+            "model_outputs": {m: model_outputs.get(m, "") for m in models},
+            "critiques": {},
+            "models_used": models,
+        }
+
+        facts = await self.fact_extractor.extract(context)
+        context["facts"] = facts.get("facts", [])
+
+        web = await self.web_search.run(context)
+        context["web_results"] = web.get("web_results", [])
+
+        context["validation"] = await self.validator.validate(context)
 
-        result = await self.lifecycle.run(request, context)
+        result = await self.consensus.integrate(context)
+        result = await self.lifecycle.validation.evaluate(request, result, context)
 
-        yield f"ANSWER: {result.get('final_answer', '')}\n"
-        yield "END\n"
+        self.lifecycle.state.update_model_reliability(result)
+        self.lifecycle.state.update_preferences(context)
+        return result
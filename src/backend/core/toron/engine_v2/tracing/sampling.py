@@ -0,0 +1,146 @@
+"""Head and tail sampling for Toron traces.
+
+``ToronSampler`` makes the head decision once per trace from the trace id:
+
+* ``head_rate`` of traces are sampled outright and exported as usual;
+* the next ``tail_rate`` are recorded but not exported (RECORD_ONLY) and
+  become candidates for tail sampling;
+* the rest are dropped, so their spans are non-recording and the tracer
+  skips attribute work entirely.
+
+The defaults (10% head, 10% tail) leave most traffic on that non-recording
+path; raise ``tail_rate`` to widen the net for slow or failed requests.
+
+``TailSamplingProcessor`` buffers candidate spans per trace and, when the
+local root span ends, exports the whole trace only if it was slow, errored,
+or carried a low ``confidence`` attribute.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, List
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import Decision, Sampler, SamplingResult
+from opentelemetry.trace import StatusCode
+
+
+_TRACE_ID_MASK = (1 << 64) - 1
+
+
+class ToronSampler(Sampler):
+    def __init__(self, head_rate: float = 0.1, tail_rate: float = 0.1):
+        self.head_rate = max(0.0, min(head_rate, 1.0))
+        self.tail_rate = max(0.0, min(tail_rate, 1.0 - self.head_rate))
+        self._head_bound = round(self.head_rate * (_TRACE_ID_MASK + 1))
+        self._tail_bound = round((self.head_rate + self.tail_rate) * (_TRACE_ID_MASK + 1))
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        parent = trace.get_current_span(parent_context).get_span_context()
+        if parent.is_valid:
+            # Children follow the trace's decision so traces stay whole.
+            if parent.trace_flags.sampled:
+                decision = Decision.RECORD_AND_SAMPLE
+            elif trace.get_current_span(parent_context).is_recording():
+                decision = Decision.RECORD_ONLY
+            else:
+                decision = Decision.DROP
+            return SamplingResult(decision, attributes if decision != Decision.DROP else None, parent.trace_state)
+
+        bucket = trace_id & _TRACE_ID_MASK
+        if bucket < self._head_bound:
+            decision = Decision.RECORD_AND_SAMPLE
+        elif bucket < self._tail_bound:
+            decision = Decision.RECORD_ONLY
+        else:
+            decision = Decision.DROP
+        return SamplingResult(decision, attributes if decision != Decision.DROP else None, trace_state)
+
+    def get_description(self) -> str:
+        return f"ToronSampler{{head={self.head_rate},tail={self.tail_rate}}}"
+
+
+class TailSamplingProcessor(SpanProcessor):
+    def __init__(
+        self,
+        exporter,
+        slow_ms: float = 2500.0,
+        min_confidence: float = 0.5,
+        max_traces: int = 2048,
+        max_spans_per_trace: int = 256,
+    ):
+        self.exporter = exporter
+        self.slow_ms = slow_ms
+        self.min_confidence = min_confidence
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+
+        self._lock = Lock()
+        self._traces: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="toron-tail-export")
+        self._shutdown = False
+        self.stats: Dict[str, int] = {"kept": 0, "discarded": 0, "evicted": 0}
+
+    def on_start(self, span: Span, parent_context=None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        ctx = span.context
+        if ctx.trace_flags.sampled:
+            return  # head-sampled: the regular exporter already has it
+
+        trace_id = ctx.trace_id
+        with self._lock:
+            spans = self._traces.get(trace_id)
+            if spans is None:
+                spans = self._traces[trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+                    self.stats["evicted"] += 1
+            if len(spans) < self.max_spans_per_trace:
+                spans.append(span)
+
+            if span.parent is not None and not span.parent.is_remote:
+                return
+            # Local root ended: the trace is complete in this process.
+            spans = self._traces.pop(trace_id, spans)
+
+        if self._keep(span, spans) and not self._shutdown:
+            self.stats["kept"] += 1
+            self._export_pool.submit(self.exporter.export, spans)
+        else:
+            self.stats["discarded"] += 1
+
+    def _keep(self, root: ReadableSpan, spans: List[ReadableSpan]) -> bool:
+        if root.end_time and root.start_time and (root.end_time - root.start_time) / 1e6 >= self.slow_ms:
+            return True
+        for s in spans:
+            if s.status.status_code == StatusCode.ERROR:
+                return True
+            confidence = (s.attributes or {}).get("confidence")
+            if confidence is not None and confidence < self.min_confidence:
+                return True
+        return False
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._traces)
+
+    def shutdown(self) -> None:
+        """Run every queued export and stop; does not shut the shared exporter down."""
+        self._shutdown = True
+        self._export_pool.shutdown(wait=True)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        # Submit a no-op and wait for it so every queued export has run.
+        if self._shutdown:
+            return True
+        try:
+            self._export_pool.submit(lambda: None).result(timeout=timeout_millis / 1000)
+            return True
+        except Exception:
+            return False
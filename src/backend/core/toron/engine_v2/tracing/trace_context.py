@@ -32,8 +32,14 @@ class TraceContext:
         return extract(carrier)
 
     @staticmethod
-    def annotate_request(span, model_used: str | None = None, cache_hit: bool | None = None, latency_ms: float | None = None):
-        if span is None:
+    def annotate_request(
+        span,
+        model_used: str | None = None,
+        cache_hit: bool | None = None,
+        latency_ms: float | None = None,
+        confidence: float | None = None,
+    ):
+        if span is None or not span.is_recording():
             return
         if model_used:
             span.set_attribute("model_used", model_used)
@@ -41,3 +47,5 @@ class TraceContext:
             span.set_attribute("cache_hit", cache_hit)
         if latency_ms is not None:
             span.set_attribute("latency_ms", latency_ms)
+        if confidence is not None:
+            span.set_attribute("confidence", confidence)
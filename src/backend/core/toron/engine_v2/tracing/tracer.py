@@ -1,9 +1,17 @@
-"""Toron OpenTelemetry tracer provider and helpers."""
+"""Toron OpenTelemetry tracer provider and helpers.
+
+Traces are head-sampled (``TORON_TRACE_HEAD_RATE``); a further slice
+(``TORON_TRACE_TAIL_RATE``) is recorded into a tail buffer and exported only
+when the request turns out slow, failed or low-confidence. Everything else
+gets non-recording spans, and ``span()`` skips attribute work for them —
+pass ``attributes`` as a callable to defer building the dict as well.
+"""
 
 from __future__ import annotations
 
+import os
 from contextlib import contextmanager
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Union
 
 from opentelemetry import trace
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
@@ -12,28 +20,60 @@ from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
 from .instrumentation import setup_instrumentation
+from .sampling import TailSamplingProcessor, ToronSampler
+
+
+Attributes = Union[Dict[str, Any], Callable[[], Dict[str, Any]], None]
 
 
 class ToronTracer:
     """Central tracing entry-point for Toron Engine v2."""
 
-    def __init__(self, service_name: str = "toron-engine-v2", endpoint: Optional[str] = None):
+    def __init__(
+        self,
+        service_name: str = "toron-engine-v2",
+        endpoint: Optional[str] = None,
+        head_rate: Optional[float] = None,
+        tail_rate: Optional[float] = None,
+        slow_ms: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        exporter=None,
+        instrument: bool = True,
+        set_global: bool = True,
+    ):
+        head_rate = head_rate if head_rate is not None else float(os.getenv("TORON_TRACE_HEAD_RATE", "0.1"))
+        tail_rate = tail_rate if tail_rate is not None else float(os.getenv("TORON_TRACE_TAIL_RATE", "0.1"))
+        slow_ms = slow_ms if slow_ms is not None else float(os.getenv("TORON_TRACE_SLOW_MS", "2500"))
+        min_confidence = (
+            min_confidence if min_confidence is not None else float(os.getenv("TORON_TRACE_MIN_CONFIDENCE", "0.5"))
+        )
+
+        exporter = exporter or OTLPSpanExporter(endpoint=endpoint)
+
         resource = Resource.create({SERVICE_NAME: service_name})
-        provider = TracerProvider(resource=resource)
-        exporter = OTLPSpanExporter(endpoint=endpoint)
-        processor = BatchSpanProcessor(exporter)
-        provider.add_span_processor(processor)
-        trace.set_tracer_provider(provider)
-        self.tracer = trace.get_tracer(__name__)
+        self.sampler = ToronSampler(head_rate=head_rate, tail_rate=tail_rate)
+        self.provider = TracerProvider(resource=resource, sampler=self.sampler)
+        # Processors shut down in the order they were added. The tail processor
+        # goes first so its queued exports run before the batch processor
+        # shuts the shared exporter down.
+        self.tail = TailSamplingProcessor(exporter, slow_ms=slow_ms, min_confidence=min_confidence)
+        self.provider.add_span_processor(self.tail)
+        self.provider.add_span_processor(BatchSpanProcessor(exporter))
+        if set_global:
+            trace.set_tracer_provider(self.provider)
+        self.tracer = self.provider.get_tracer(__name__)
 
-        setup_instrumentation()
+        if instrument:
+            setup_instrumentation()
 
     @contextmanager
-    def span(self, name: str, attributes: Dict[str, Any] | None = None):
+    def span(self, name: str, attributes: Attributes = None):
         with self.tracer.start_as_current_span(name) as span:
-            if attributes:
-                for key, value in attributes.items():
-                    span.set_attribute(key, value)
+            # Unsampled spans are no-ops: skip building and setting attributes.
+            if attributes and span.is_recording():
+                if callable(attributes):
+                    attributes = attributes()
+                span.set_attributes({k: v for k, v in attributes.items() if v is not None})
             yield span
 
     def inject(self, carrier: Dict[str, Any]):
@@ -43,5 +83,9 @@ class ToronTracer:
 
     def add_event(self, name: str, attributes: Dict[str, Any] | None = None):
         span = trace.get_current_span()
-        if span:
+        if span and span.is_recording():
             span.add_event(name=name, attributes=attributes or {})
+
+    def shutdown(self):
+        self.tail.shutdown()
+        self.provider.shutdown()
@@ -17,6 +17,7 @@ class TenantPolicy:
     connector_allow_list: List[str] = field(default_factory=list)
     connector_deny_list: List[str] = field(default_factory=list)
     compliance_filters: List[str] = field(default_factory=list)
+    version: int = 1
 
 
 class EnterpriseTenantIsolation:
@@ -27,6 +28,10 @@ class EnterpriseTenantIsolation:
         self._policies: Dict[str, TenantPolicy] = {}
 
     def register(self, policy: TenantPolicy) -> None:
+        previous = self._policies.get(policy.tenant_id)
+        if previous is not None and policy.version <= previous.version:
+            # Re-registration is a policy change; anything keyed on the version is stale.
+            policy.version = previous.version + 1
         self._policies[policy.tenant_id] = policy
         self.logger.info("tenant-registered", tenant_id=policy.tenant_id)
 
@@ -1,6 +1,27 @@
+import asyncio
+import bisect
 import contextlib
 import threading
-from typing import Generator
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, Generator, List, Mapping, Optional, Sequence, Union
+
+from ..utils.ErrorTypes import RateLimitError
+
+DEFAULT_TIER_WEIGHTS: Dict[str, float] = {"free": 1, "student": 2, "pro": 4, "premium": 8, "ultra": 16}
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+try:  # pragma: no cover - optional dependency
+    from prometheus_client import Histogram as _PromHistogram
+
+    _WAIT_SECONDS = _PromHistogram(
+        "ryuzen_gate_wait_seconds",
+        "Time requests spent queued at a concurrency gate",
+        ["gate", "tier"],
+        buckets=WAIT_BUCKETS,
+    )
+except Exception:  # pragma: no cover - fallback
+    _WAIT_SECONDS = None
 
 
 class ConcurrencyGate:
@@ -26,3 +47,199 @@ class ConcurrencyGate:
         # BoundedSemaphore does not expose permits; approximate using private value
         return max(0, self._sem._value)  # type: ignore[attr-defined]
 
+
+class WaitHistogram:
+    """Cumulative queue-wait histogram per tier, in the Prometheus bucket layout."""
+
+    def __init__(self, buckets: Sequence[float] = WAIT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+
+    def observe(self, tier: str, seconds: float) -> None:
+        counts = self._counts.get(tier)
+        if counts is None:
+            counts = self._counts[tier] = [0] * (len(self.buckets) + 1)
+            self._sums[tier] = 0.0
+        counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self._sums[tier] += seconds
+
+    def quantile(self, tier: str, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (``inf`` past the last bucket)."""
+        counts = self._counts.get(tier)
+        if not counts:
+            return 0.0
+        target = q * sum(counts)
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        out: Dict[str, Dict[str, object]] = {}
+        for tier, counts in self._counts.items():
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+            out[tier] = {"buckets": cumulative, "count": running, "sum": self._sums[tier]}
+        return out
+
+
+class _Tier:
+    __slots__ = ("name", "weight", "max_queue", "waiters", "pass_", "rejected", "timed_out")
+
+    def __init__(self, name: str, weight: float, max_queue: int) -> None:
+        self.name = name
+        self.weight = float(weight)
+        self.max_queue = max_queue
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.pass_ = 0.0
+        self.rejected = 0
+        self.timed_out = 0
+
+
+class FairConcurrencyGate:
+    """Asyncio concurrency limit shared fairly between tiers.
+
+    Waiting never blocks the event loop. Each tier queues separately; when a
+    permit frees up it is handed straight to the head of the tier picked by
+    stride scheduling, so under contention tier ``t`` receives permits in
+    proportion to ``weights[t]``. A tier whose queue holds ``max_queue``
+    waiters rejects new requests immediately with ``RateLimitError``. A
+    waiter cancelled (or timed out) after a permit was handed to it passes
+    the permit on, so cancellation never leaks capacity.
+
+    Meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        limit: int = 128,
+        weights: Optional[Mapping[str, float]] = None,
+        max_queue: Union[int, Mapping[str, int]] = 256,
+        timeout: Optional[float] = 30.0,
+        default_tier: str = "free",
+        name: str = "default",
+        buckets: Sequence[float] = WAIT_BUCKETS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limit = limit
+        self.timeout = timeout
+        self.name = name
+        self.clock = clock
+        weights = dict(weights or DEFAULT_TIER_WEIGHTS)
+        self.default_tier = default_tier if default_tier in weights else next(iter(weights))
+        self._tiers: Dict[str, _Tier] = {
+            tier: _Tier(
+                tier,
+                weight,
+                max_queue.get(tier, 256) if isinstance(max_queue, Mapping) else max_queue,
+            )
+            for tier, weight in weights.items()
+        }
+        self._available = limit
+        self._vtime = 0.0
+        self.wait_histogram = WaitHistogram(buckets)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, tier: Optional[str] = None, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        await self.wait(tier, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def wait(self, tier: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        """Take a permit, queueing behind the tier's earlier waiters; pair with ``release``."""
+        queue = self._tiers.get(tier or self.default_tier) or self._tiers[self.default_tier]
+        start = self.clock()
+        if self._available > 0 and not self._has_waiters():
+            self._available -= 1
+            self._observe(queue.name, 0.0)
+            return
+        if len(queue.waiters) >= queue.max_queue:
+            queue.rejected += 1
+            raise RateLimitError(f"Concurrency queue full for tier {queue.name}")
+
+        if not queue.waiters:
+            # A tier that was idle does not get to bank credit from the past.
+            queue.pass_ = max(queue.pass_, self._vtime)
+        waiter = asyncio.get_running_loop().create_future()
+        queue.waiters.append(waiter)
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            # Not ``wait_for``: it swallows a cancellation that races with the handoff.
+            # ``asyncio.wait`` neither cancels ``waiter`` nor hides our own cancellation.
+            await asyncio.wait((waiter,), timeout=timeout)
+            if not waiter.done():
+                raise asyncio.TimeoutError
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The permit arrived as we were cancelled: give it to the next waiter.
+                self.release()
+            else:
+                waiter.cancel()
+                with contextlib.suppress(ValueError):
+                    queue.waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                queue.timed_out += 1
+                raise RateLimitError(f"Timed out waiting for a concurrency permit ({queue.name})") from None
+            raise
+        self._observe(queue.name, self.clock() - start)
+
+    def release(self) -> None:
+        """Return a permit, handing it to the next waiter chosen by weight if any."""
+        while True:
+            queue = self._next_tier()
+            if queue is None:
+                self._available = min(self.limit, self._available + 1)
+                return
+            waiter = queue.waiters.popleft()
+            if waiter.done():
+                continue
+            self._vtime = queue.pass_
+            queue.pass_ += 1.0 / queue.weight
+            waiter.set_result(None)
+            return
+
+    def in_flight(self) -> int:
+        return self.limit - self._available
+
+    def queued(self, tier: Optional[str] = None) -> int:
+        if tier is not None:
+            return len(self._tiers[tier].waiters)
+        return sum(len(q.waiters) for q in self._tiers.values())
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "queued": len(q.waiters),
+                "rejected": q.rejected,
+                "timed_out": q.timed_out,
+                "p99_wait": self.wait_histogram.quantile(name, 0.99),
+            }
+            for name, q in self._tiers.items()
+        }
+
+    def _has_waiters(self) -> bool:
+        return any(q.waiters for q in self._tiers.values())
+
+    def _next_tier(self) -> Optional[_Tier]:
+        best = None
+        for queue in self._tiers.values():
+            while queue.waiters and queue.waiters[0].done():
+                queue.waiters.popleft()
+            if queue.waiters and (best is None or queue.pass_ < best.pass_):
+                best = queue
+        return best
+
+    def _observe(self, tier: str, seconds: float) -> None:
+        self.wait_histogram.observe(tier, seconds)
+        if _WAIT_SECONDS is not None:
+            _WAIT_SECONDS.labels(gate=self.name, tier=tier).observe(seconds)
+
+
+__all__ = ["ConcurrencyGate", "FairConcurrencyGate", "WaitHistogram", "DEFAULT_TIER_WEIGHTS"]
@@ -1,33 +1,145 @@
+"""Process-wide request limits in constant memory.
+
+``GlobalRateLimiter`` is a sliding-window counter: admissions are counted in
+a ring of ``slots`` sub-windows, and the sub-window that is partly outside
+the window is weighted by the fraction still inside it, assuming its
+requests were spread evenly. ``GCRARateLimiter`` enforces the same rate
+as a generic cell rate algorithm, which tracks a single theoretical arrival
+time, so its ``backoff_hint`` is exact.
+"""
+from __future__ import annotations
+
 import threading
 import time
-from collections import deque
-from typing import Deque, Dict
+from typing import Callable, List, Optional
 
 
 class GlobalRateLimiter:
-    def __init__(self, max_requests: int = 10_000, window_seconds: int = 60) -> None:
+    def __init__(
+        self,
+        max_requests: int = 10_000,
+        window_seconds: int = 60,
+        slots: int = 60,
+        time_provider: Callable[[], float] = time.monotonic,
+    ) -> None:
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        self.slots = max(1, slots)
+        self.time_provider = time_provider
+        self._width = window_seconds / self.slots
+        self._per_second = self.slots / window_seconds
         self._lock = threading.Lock()
-        self._events: Deque[float] = deque()
+        # One extra counter holds the sub-window that is sliding out.
+        self._counts: List[int] = [0] * (self.slots + 1)
+        self._slot: Optional[int] = None
+        self._total = 0  # requests in the newest ``slots`` sub-windows
 
     def allow(self) -> bool:
-        now = time.time()
+        now = self.time_provider()
         with self._lock:
-            self._trim(now)
-            if len(self._events) >= self.max_requests:
+            slot = self._slot
+            position = now * self._per_second
+            if slot is None or position >= slot + 1:
+                slot = self._advance(now)
+            counts = self._counts
+            ring = len(counts)
+            if self._total + counts[(slot - self.slots) % ring] * (slot + 1 - position) + 1 > self.max_requests:
                 return False
-            self._events.append(now)
+            counts[slot % ring] += 1
+            self._total += 1
             return True
 
     def backoff_hint(self) -> float:
+        """Seconds until ``allow`` would succeed again if no other request arrives."""
+        now = self.time_provider()
         with self._lock:
-            if not self._events:
+            slot = self._advance(now)
+            limit = self.max_requests - 1
+            if self._estimate(now, slot) <= limit:
                 return 0.0
-            oldest = self._events[0]
-            return max(0.0, (oldest + self.window_seconds) - time.time())
+            ring = len(self._counts)
+            full = self._total
+            for step in range(self.slots + 1):
+                current = slot + step
+                if step:
+                    full -= self._counts[(current - self.slots) % ring]
+                partial = self._counts[(current - self.slots) % ring] if step <= self.slots else 0
+                if full > limit:
+                    continue
+                # Within this sub-window the estimate falls linearly from full + partial to full.
+                frac = 0.0 if full + partial <= limit else 1.0 - (limit - full) / partial
+                return max(0.0, (current + frac) * self._width - now)
+            return self.window_seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (self.slots + 1)
+            self._slot = None
+            self._total = 0
+
+    def _advance(self, now: float) -> int:
+        slot = int(now * self._per_second)
+        if self._slot is None or slot - self._slot > self.slots:
+            self._counts = [0] * (self.slots + 1)
+            self._total = 0
+        else:
+            ring = len(self._counts)
+            for current in range(self._slot + 1, slot + 1):
+                # Slot ``current - slots`` starts sliding out; the one before it is gone
+                # and its counter is reused for ``current``.
+                self._total -= self._counts[(current - self.slots) % ring]
+                self._counts[current % ring] = 0
+        if self._slot is None or slot > self._slot:
+            self._slot = slot
+        return self._slot
+
+    def _estimate(self, now: float, slot: int) -> float:
+        inside = slot + 1 - now * self._per_second
+        return self._total + self._counts[(slot - self.slots) % len(self._counts)] * inside
+
+
+class GCRARateLimiter:
+    """``max_requests`` per ``window_seconds`` with bursts of up to ``burst`` requests.
+
+    Requests are admitted while the theoretical arrival time stays within
+    ``burst`` emission intervals of now; ``backoff_hint`` is the exact wait
+    until the next request conforms.
+    """
+
+    def __init__(
+        self,
+        max_requests: int = 10_000,
+        window_seconds: int = 60,
+        burst: Optional[int] = None,
+        time_provider: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.burst = max_requests if burst is None else burst
+        self.time_provider = time_provider
+        self._interval = window_seconds / max_requests
+        # Slack so float accumulation of the interval never rejects the last request of a burst.
+        self._tolerance = self._interval * self.burst + 1e-9
+        self._lock = threading.Lock()
+        self._tat = float("-inf")
+
+    def allow(self) -> bool:
+        now = self.time_provider()
+        with self._lock:
+            tat = max(self._tat, now) + self._interval
+            if tat - now > self._tolerance:
+                return False
+            self._tat = tat
+            return True
+
+    def backoff_hint(self) -> float:
+        now = self.time_provider()
+        with self._lock:
+            return max(0.0, max(self._tat, now) + self._interval - self._tolerance - now)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tat = float("-inf")
 
-    def _trim(self, now: float) -> None:
-        while self._events and now - self._events[0] > self.window_seconds:
-            self._events.popleft()
 
+__all__ = ["GlobalRateLimiter", "GCRARateLimiter"]
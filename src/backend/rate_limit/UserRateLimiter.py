@@ -1,6 +1,23 @@
+"""Per-user token buckets, sharded and bounded in memory.
+
+Users are spread over independently locked shards. Each shard keeps its
+users' state in access order, so idle users sit at the front and are evicted
+cheaply: once a user has been idle for ``idle_ttl`` (by default the time an
+empty bucket takes to refill completely) their buckets are full again and
+dropping them changes no decision. ``max_users`` additionally caps the table
+under adversarial user-ID cardinality by evicting the least recently seen
+users early, which at worst hands them a fresh bucket.
+"""
+from __future__ import annotations
+
+import math
 import threading
 import time
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+# Entries expired on every insert; the remainder is left for the next insert or ``sweep``.
+EVICT_PER_INSERT = 8
 
 
 class TokenBucket:
@@ -21,23 +38,113 @@ class TokenBucket:
         return False
 
 
+class _Shard:
+    __slots__ = ("lock", "states", "evicted")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # user_id -> [minute tokens, hour tokens, last refill], least recently seen first
+        self.states: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.evicted = 0
+
+
 class UserRateLimiter:
-    def __init__(self, per_minute: int = 120, per_hour: int = 2000) -> None:
+    def __init__(
+        self,
+        per_minute: int = 120,
+        per_hour: int = 2000,
+        shards: int = 64,
+        max_users: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        time_provider: Callable[[], float] = time.monotonic,
+    ) -> None:
         self.per_minute = per_minute
         self.per_hour = per_hour
-        self._lock = threading.Lock()
-        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._minute_rate = per_minute / 60.0
+        self._hour_rate = per_hour / 3600.0
+        self.idle_ttl = 3600.0 if idle_ttl is None else idle_ttl
+        self.time_provider = time_provider
+        count = 1 << max(0, math.ceil(math.log2(max(1, shards))))
+        self._mask = count - 1
+        self._shards = [_Shard() for _ in range(count)]
+        self._shard_cap = math.ceil(max_users / count) if max_users else None
 
     def allow(self, user_id: str, weight: float = 1.0) -> bool:
-        with self._lock:
-            minute_bucket, hour_bucket = self._get_buckets(user_id)
-            return minute_bucket.consume(weight) and hour_bucket.consume(weight)
-
-    def _get_buckets(self, user_id: str) -> Tuple[TokenBucket, TokenBucket]:
-        if user_id not in self._buckets:
-            self._buckets[user_id] = (
-                TokenBucket(self.per_minute, self.per_minute / 60.0),
-                TokenBucket(self.per_hour, self.per_hour / 3600.0),
-            )
-        return self._buckets[user_id]
+        """Take ``weight`` from both of the user's buckets if both can cover it.
+
+        Refill is computed lazily from the time since the user's last call.
+        """
+        now = self.time_provider()
+        shard = self._shards[hash(user_id) & self._mask]
+        with shard.lock:
+            states = shard.states
+            state = states.get(user_id)
+            if state is None:
+                self._evict(shard, now)
+                state = states[user_id] = [float(self.per_minute), float(self.per_hour), now]
+            else:
+                states.move_to_end(user_id)
+                elapsed = now - state[2]
+                if elapsed > 0:
+                    minute = state[0] + elapsed * self._minute_rate
+                    hour = state[1] + elapsed * self._hour_rate
+                    state[0] = minute if minute < self.per_minute else self.per_minute
+                    state[1] = hour if hour < self.per_hour else self.per_hour
+                    state[2] = now
+            if state[0] >= weight and state[1] >= weight:
+                state[0] -= weight
+                state[1] -= weight
+                return True
+            return False
+
+    async def allow_async(self, user_id: str, weight: float = 1.0) -> bool:
+        """``allow`` for coroutines.
+
+        The shard lock is only held for a few dictionary operations and never
+        across an ``await``, so the check runs inline on the event loop.
+        """
+        return self.allow(user_id, weight)
+
+    def sweep(self) -> int:
+        """Evict every user idle for at least ``idle_ttl``; returns how many were dropped."""
+        now = self.time_provider()
+        dropped = 0
+        for shard in self._shards:
+            with shard.lock:
+                dropped += self._evict(shard, now, limit=None)
+        return dropped
+
+    def reset(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.states.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "users": len(self),
+            "shards": len(self._shards),
+            "evicted": sum(shard.evicted for shard in self._shards),
+        }
+
+    def __len__(self) -> int:
+        return sum(len(shard.states) for shard in self._shards)
+
+    def _evict(self, shard: _Shard, now: float, limit: Optional[int] = EVICT_PER_INSERT) -> int:
+        states = shard.states
+        cutoff = now - self.idle_ttl
+        dropped = 0
+        while states and (limit is None or dropped < limit):
+            oldest = next(iter(states.values()))
+            if oldest[2] > cutoff:
+                break
+            states.popitem(last=False)
+            dropped += 1
+        if self._shard_cap is not None:
+            while len(states) >= self._shard_cap:
+                states.popitem(last=False)
+                dropped += 1
+        shard.evicted += dropped
+        return dropped
+
 
+__all__ = ["UserRateLimiter", "TokenBucket"]
@@ -1,11 +1,14 @@
-from .GlobalRateLimiter import GlobalRateLimiter
+from .GlobalRateLimiter import GCRARateLimiter, GlobalRateLimiter
 from .UserRateLimiter import UserRateLimiter
 from .TierLimiter import TierLimiter
-from .ConcurrencyGate import ConcurrencyGate
+from .ConcurrencyGate import ConcurrencyGate, FairConcurrencyGate, WaitHistogram
 
 __all__ = [
     "GlobalRateLimiter",
+    "GCRARateLimiter",
     "UserRateLimiter",
     "TierLimiter",
     "ConcurrencyGate",
+    "FairConcurrencyGate",
+    "WaitHistogram",
 ]
@@ -0,0 +1,166 @@
+"""Single-pass HTML extraction with pluggable parser backends.
+
+One parse yields the visible text (scripts, styles and comments dropped),
+the title and ``<meta>`` tags, and the links of a page. The fastest
+installed backend is used by default: selectolax, then lxml, then a
+streaming extractor on the standard library's tokenizer. BeautifulSoup is
+kept as a backend for comparison.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+
+from .Normalizer import normalize_text
+
+try:  # pragma: no cover - optional dependency
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except Exception:  # pragma: no cover - fallback
+    _SelectolaxParser = None
+
+try:  # pragma: no cover - optional dependency
+    import lxml.html as _lxml_html
+    from lxml import etree as _lxml_etree
+except Exception:  # pragma: no cover - fallback
+    _lxml_html = None
+    _lxml_etree = None
+
+try:  # pragma: no cover - optional dependency
+    from bs4 import BeautifulSoup
+except Exception:  # pragma: no cover - fallback
+    BeautifulSoup = None
+
+_SKIP_TAGS = ("script", "style")
+
+
+@dataclass
+class ExtractedPage:
+    text: str
+    meta: Dict[str, str] = field(default_factory=dict)
+    links: List[str] = field(default_factory=list)
+
+
+def _page(chunks: Iterable[str], title: Optional[str], metas, hrefs, base_url: str) -> ExtractedPage:
+    meta: Dict[str, str] = {}
+    title = (title or "").strip()
+    if title:
+        meta["title"] = title
+    for name, content in metas:
+        if name and content:
+            meta[name.lower()] = normalize_text(content)
+    links = list(dict.fromkeys(urljoin(base_url, href) for href in hrefs if href))
+    return ExtractedPage(text=normalize_text(" ".join(chunks)), meta=meta, links=links)
+
+
+class _StreamingExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.chunks: List[str] = []
+        self.metas: List[tuple] = []
+        self.hrefs: List[str] = []
+        self.title: Optional[str] = None
+        self._skip = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag == "title" and self.title is None:
+            self._in_title = True
+            self.title = ""
+        elif tag == "meta":
+            values = dict(attrs)
+            self.metas.append((values.get("name") or values.get("property"), values.get("content")))
+        elif tag == "a":
+            for key, value in attrs:
+                if key == "href":
+                    self.hrefs.append(value)
+                    break
+
+    def handle_endtag(self, tag) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data) -> None:
+        if self._skip:
+            return
+        self.chunks.append(data)
+        if self._in_title:
+            self.title += data
+
+
+def extract_stdlib(html: str, base_url: str = "") -> ExtractedPage:
+    parser = _StreamingExtractor()
+    parser.feed(html)
+    parser.close()
+    return _page(parser.chunks, parser.title, parser.metas, parser.hrefs, base_url)
+
+
+def extract_selectolax(html: str, base_url: str = "") -> ExtractedPage:  # pragma: no cover - optional dependency
+    tree = _SelectolaxParser(html)
+    title_node = tree.css_first("title")
+    title = title_node.text() if title_node is not None else None
+    metas = [
+        (node.attributes.get("name") or node.attributes.get("property"), node.attributes.get("content"))
+        for node in tree.css("meta")
+    ]
+    hrefs = [node.attributes.get("href") for node in tree.css("a[href]")]
+    tree.strip_tags(list(_SKIP_TAGS))
+    root = tree.root
+    chunks = [root.text(separator=" ")] if root is not None else []
+    return _page(chunks, title, metas, hrefs, base_url)
+
+
+def extract_lxml(html: str, base_url: str = "") -> ExtractedPage:  # pragma: no cover - optional dependency
+    if not html.strip():
+        return ExtractedPage(text="")
+    doc = _lxml_html.document_fromstring(html)
+    title = doc.findtext(".//title")
+    metas = [(el.get("name") or el.get("property"), el.get("content")) for el in doc.iter("meta")]
+    hrefs = [el.get("href") for el in doc.iter("a")]
+    _lxml_etree.strip_elements(doc, _lxml_etree.Comment, *_SKIP_TAGS, with_tail=False)
+    return _page(doc.itertext(), title, metas, hrefs, base_url)
+
+
+def extract_bs4(html: str, base_url: str = "") -> ExtractedPage:
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.string if soup.title and soup.title.string else None
+    metas = [(tag.get("name") or tag.get("property"), tag.get("content")) for tag in soup.find_all("meta")]
+    hrefs = [tag.get("href") for tag in soup.find_all("a", href=True)]
+    for tag in soup(list(_SKIP_TAGS)):
+        tag.extract()
+    return _page([soup.get_text(separator=" ")], title, metas, hrefs, base_url)
+
+
+EXTRACTORS: Dict[str, Callable[[str, str], ExtractedPage]] = {}
+if _SelectolaxParser is not None:  # pragma: no cover - optional dependency
+    EXTRACTORS["selectolax"] = extract_selectolax
+if _lxml_html is not None:  # pragma: no cover - optional dependency
+    EXTRACTORS["lxml"] = extract_lxml
+EXTRACTORS["stdlib"] = extract_stdlib
+if BeautifulSoup is not None:
+    EXTRACTORS["bs4"] = extract_bs4
+
+DEFAULT_BACKEND = next(iter(EXTRACTORS))
+
+
+def extract_page(html: str, base_url: str = "", backend: Optional[str] = None) -> ExtractedPage:
+    """Extract text, meta and links with ``backend`` (default: fastest installed).
+
+    Module-level so it can be shipped to a process pool.
+    """
+    return EXTRACTORS[backend or DEFAULT_BACKEND](html, base_url)
+
+
+__all__ = [
+    "ExtractedPage",
+    "EXTRACTORS",
+    "DEFAULT_BACKEND",
+    "extract_page",
+    "extract_stdlib",
+    "extract_bs4",
+]
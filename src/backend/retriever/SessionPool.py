@@ -1,18 +1,57 @@
 import asyncio
-import time
+import concurrent.futures
 import threading
+import time
+import warnings
 from collections import deque
-from typing import Deque, Dict, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 import httpx
 
+from ..rate_limit.ConcurrencyGate import WaitHistogram
+
+# Handed to a waiter instead of a session when a pool slot (not a client) frees up.
+_SLOT = object()
+
+
+class SessionPoolExhausted(RuntimeError):
+    """Raised when a region is at capacity, the wait timed out and no overflow client is left."""
+
+
+class _Region:
+    __slots__ = ("idle", "in_use", "overflow", "waiters", "stats")
+
+    def __init__(self) -> None:
+        # (session, asynchronous, created_at, last_used), most recently used on the right
+        self.idle: Deque[Tuple[object, bool, float, float]] = deque()
+        self.in_use = 0
+        self.overflow: Dict[int, object] = {}
+        self.waiters: Deque[Tuple[bool, concurrent.futures.Future]] = deque()
+        self.stats = {
+            "acquired": 0,
+            "hits": 0,
+            "created": 0,
+            "waited": 0,
+            "wait_seconds": 0.0,
+            "overflow": 0,
+            "exhausted": 0,
+            "evicted": 0,
+        }
+
 
 class SessionPool:
     """Region-aware pool for httpx sessions.
 
-    Supports both async and sync clients. The pool keeps a bounded number of
-    sessions per region, evicts idle/expired sessions, and provides gentle
-    backoff when capacity is exhausted.
+    Supports both async and sync clients. Each region holds at most
+    ``max_sessions_per_region`` pooled sessions. When they are all in use,
+    callers park on a future and ``release`` hands the returned session (or
+    the freed slot) straight to the oldest waiter. A caller still waiting
+    after ``timeout`` gets one of at most ``max_overflow`` unpooled clients,
+    closed again on release, or ``SessionPoolExhausted``. Idle and expired
+    sessions are closed by a background sweeper rather than on acquire.
+
+    The internal lock only guards bookkeeping and is never held across an
+    ``await``; it lets the to-thread sync fallback share the pool.
     """
 
     def __init__(
@@ -20,156 +59,348 @@ class SessionPool:
         max_sessions_per_region: int = 8,
         ttl_seconds: int = 600,
         idle_seconds: int = 180,
-        backoff_seconds: float = 0.1,
+        backoff_seconds: Optional[float] = None,
         pool_keepalive: float = 15.0,
+        max_overflow: Optional[int] = None,
+        sweep_interval: float = 30.0,
+        client_factory: Optional[Callable[[bool], object]] = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
         self.max_sessions_per_region = max_sessions_per_region
         self.ttl_seconds = ttl_seconds
         self.idle_seconds = idle_seconds
-        self.backoff_seconds = backoff_seconds
+        if backoff_seconds is not None:
+            warnings.warn(
+                "SessionPool(backoff_seconds=...) is deprecated and ignored: waiters are woken by "
+                "release, not polling",
+                DeprecationWarning,
+                stacklevel=2,
+            )
         self.pool_keepalive = pool_keepalive
-        self._pools: Dict[str, Deque[Tuple[object, float, float]]] = {}
-        self._locks: Dict[str, threading.Lock] = {}
-        self._in_use: Dict[str, int] = {}
-        self._global_lock = threading.Lock()
-
-    def _get_lock(self, region: str) -> threading.Lock:
-        with self._global_lock:
-            if region not in self._locks:
-                self._locks[region] = threading.Lock()
-            return self._locks[region]
-
-    def _pool(self, region: str) -> Deque[Tuple[object, float, float]]:
-        with self._global_lock:
-            if region not in self._pools:
-                self._pools[region] = deque()
-                self._in_use[region] = 0
-            return self._pools[region]
+        self.max_overflow = max_sessions_per_region if max_overflow is None else max_overflow
+        self.sweep_interval = sweep_interval
+        self.client_factory = client_factory or self._new_client
+        self.clock = clock
+        self.wait_histogram = WaitHistogram()
+        self._regions: Dict[str, _Region] = {}
+        self._lock = threading.Lock()
+        self._sweeper: Optional[asyncio.Task] = None
 
     async def acquire(self, region: str = "global", asynchronous: bool = True, timeout: float = 5.0) -> object:
         """Acquire an httpx client for a region.
 
-        When the pool is exhausted, this method backs off with jitter until a
-        session becomes available or the timeout elapses.
+        When the region is at capacity this waits, without polling, until a
+        session is released or the timeout elapses.
         """
 
-        end_time = time.time() + max(timeout, 0.1)
-        pool = self._pool(region)
-        lock = self._get_lock(region)
-        attempt = 0
+        self._ensure_sweeper()
+        grant, waiter = self._try_acquire(region, asynchronous)
+        if waiter is None:
+            return self._materialize(region, grant, asynchronous)
 
-        while True:
-            now = time.time()
-            with lock:
-                self._evict_locked(region, now, pool)
-                if pool:
-                    session, created_at, _last_used = pool.popleft()
-                    self._in_use[region] += 1
-                    return session
-                if self._in_use.get(region, 0) < self.max_sessions_per_region:
-                    client = self._new_client(asynchronous)
-                    self._in_use[region] += 1
-                    return client
-
-            # No session available and at capacity
-            if time.time() >= end_time:
-                # fail-open: create a temporary client
-                with lock:
-                    self._in_use[region] += 1
-                return self._new_client(asynchronous)
-
-            attempt += 1
-            sleep_for = min(self.backoff_seconds * (2 ** min(attempt, 4)), 1.5)
-            sleep_for = sleep_for * (0.7 + 0.6 * (asyncio.get_running_loop().time() % 1))
-            await asyncio.sleep(sleep_for)
+        start = self.clock()
+        try:
+            # ``asyncio.wait`` leaves ``waiter`` for ``_abandon`` to settle on timeout or cancellation.
+            handoff = asyncio.wrap_future(waiter)
+            await asyncio.wait((handoff,), timeout=max(timeout, 0.0))
+            if not handoff.done():
+                raise asyncio.TimeoutError
+            grant = handoff.result()
+        except BaseException as exc:
+            grant = self._abandon(region, waiter)
+            if grant is None:
+                if isinstance(exc, asyncio.TimeoutError):
+                    return self._overflow(region, asynchronous, self.clock() - start)
+                raise
+            if not isinstance(exc, asyncio.TimeoutError):
+                # Cancelled after the handoff: pass the session on rather than leak it.
+                self._put_back(region, grant, asynchronous)
+                raise
+        self._record_wait(region, self.clock() - start)
+        return self._materialize(region, grant, asynchronous)
 
     def acquire_sync(self, region: str = "global", timeout: float = 5.0) -> object:
-        """Blocking acquire wrapper for synchronous contexts."""
+        """Blocking acquire for synchronous contexts (worker threads, not the event loop)."""
 
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
+        grant, waiter = self._try_acquire(region, False)
+        if waiter is None:
+            return self._materialize(region, grant, False)
 
-        if loop and loop.is_running():
-            return asyncio.run_coroutine_threadsafe(
-                self.acquire(region=region, asynchronous=False, timeout=timeout), loop
-            ).result()
-        return asyncio.run(self.acquire(region=region, asynchronous=False, timeout=timeout))
+        start = self.clock()
+        try:
+            grant = waiter.result(timeout=max(timeout, 0.0))
+        except concurrent.futures.TimeoutError:
+            grant = self._abandon(region, waiter)
+            if grant is None:
+                return self._overflow(region, False, self.clock() - start)
+        self._record_wait(region, self.clock() - start)
+        return self._materialize(region, grant, False)
 
     def release(self, region: str, session: object) -> None:
-        """Return a session to the pool with updated timestamps."""
+        """Return a session; the oldest waiter for the region receives it directly."""
 
-        now = time.time()
-        pool = self._pool(region)
-        lock = self._get_lock(region)
-        with lock:
-            self._in_use[region] = max(self._in_use.get(region, 1) - 1, 0)
-            pool.append((session, now, now))
+        now = self.clock()
+        asynchronous = hasattr(session, "aclose")
+        close = False
+        with self._lock:
+            state = self._region(region)
+            if state.overflow.pop(id(session), None) is not None:
+                close = True
+            else:
+                created_at = getattr(session, "_pool_created_at", now)
+                if now - created_at > self.ttl_seconds:
+                    close = True
+                    self._free_slot(state)
+                else:
+                    handed = self._hand_session(state, session, asynchronous)
+                    if handed is None:
+                        state.in_use = max(state.in_use - 1, 0)
+                        state.idle.append((session, asynchronous, created_at, now))
+                    else:
+                        close = not handed
+        if close:
+            self._close_session(session)
 
     async def cleanup(self) -> None:
         """Evict idle or expired sessions for all regions."""
 
-        now = time.time()
-        regions = list(self._pools.keys())
-        for region in regions:
-            lock = self._get_lock(region)
-            with lock:
-                pool = self._pools.get(region, deque())
-                self._evict_locked(region, now, pool)
+        for session in self._collect_expired(self.clock()):
+            await self._aclose_session(session)
+
+    def start_sweeper(self) -> asyncio.Task:
+        """Run ``cleanup`` every ``sweep_interval`` seconds on the current event loop."""
+
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever())
+        return self._sweeper
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit rate, wait time and overflow counters per region and in total."""
+
+        with self._lock:
+            regions = {name: dict(state.stats, idle=len(state.idle), in_use=state.in_use, waiting=len(state.waiters))
+                       for name, state in self._regions.items()}
+        totals: Dict[str, float] = {}
+        for stats in regions.values():
+            for key in ("acquired", "hits", "created", "waited", "wait_seconds", "overflow", "exhausted", "evicted"):
+                totals[key] = totals.get(key, 0) + stats[key]
+        for stats in list(regions.values()) + [totals]:
+            stats["hit_rate"] = stats.get("hits", 0) / stats["acquired"] if stats.get("acquired") else 0.0
+        totals["wait_histogram"] = self.wait_histogram.snapshot()
+        return {"regions": regions, "total": totals}
 
     def reset_pool(self) -> None:
         """Close and clear all pools."""
 
-        regions = list(self._pools.keys())
-        for region in regions:
-            lock = self._get_lock(region)
-            with lock:
-                pool = self._pools.get(region, deque())
-                while pool:
-                    session, _c, _l = pool.popleft()
-                    self._close_session(session)
-                self._in_use[region] = 0
-        self._pools.clear()
-        self._locks.clear()
-        self._in_use.clear()
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        with self._lock:
+            regions, self._regions = self._regions, {}
+        for state in regions.values():
+            for _asynchronous, waiter in state.waiters:
+                waiter.cancel()
+            for session, _asynchronous, _created, _used in state.idle:
+                self._close_session(session)
+            for session in state.overflow.values():
+                self._close_session(session)
 
     # -----------------------------
     # Internal helpers
     # -----------------------------
-    def _evict_locked(self, region: str, now: float, pool: Deque[Tuple[object, float, float]]) -> None:
-        fresh_pool: Deque[Tuple[object, float, float]] = deque()
-        while pool:
-            session, created_at, last_used = pool.popleft()
-            if (now - created_at) > self.ttl_seconds or (now - last_used) > self.idle_seconds:
-                self._close_session(session)
-                continue
-            fresh_pool.append((session, created_at, last_used))
-        self._pools[region] = fresh_pool
+    def _region(self, region: str) -> _Region:
+        state = self._regions.get(region)
+        if state is None:
+            state = self._regions[region] = _Region()
+        return state
+
+    def _try_acquire(self, region: str, asynchronous: bool) -> Tuple[object, Optional[concurrent.futures.Future]]:
+        now = self.clock()
+        stale: List[object] = []
+        with self._lock:
+            state = self._region(region)
+            state.stats["acquired"] += 1
+            idle = state.idle
+            # Newest first keeps warm keep-alive connections in use and lets old ones age out.
+            for i in range(len(idle) - 1, -1, -1):
+                session, kind, created_at, last_used = idle[i]
+                if kind != asynchronous:
+                    continue
+                del idle[i]
+                if now - created_at > self.ttl_seconds or now - last_used > self.idle_seconds:
+                    stale.append(session)
+                    state.stats["evicted"] += 1
+                    continue
+                state.in_use += 1
+                state.stats["hits"] += 1
+                grant: Any = session
+                break
+            else:
+                grant = _SLOT
+                if state.in_use + len(idle) >= self.max_sessions_per_region and idle:
+                    # Only sessions of the other kind are idle: recycle one of their slots.
+                    stale.append(idle.popleft()[0])
+                if state.in_use + len(idle) < self.max_sessions_per_region:
+                    state.in_use += 1
+                else:
+                    waiter: concurrent.futures.Future = concurrent.futures.Future()
+                    state.waiters.append((asynchronous, waiter))
+                    state.stats["waited"] += 1
+                    grant = None
+        for session in stale:
+            self._close_session(session)
+        return grant, (waiter if grant is None else None)
+
+    def _materialize(self, region: str, grant: object, asynchronous: bool) -> object:
+        if grant is not _SLOT:
+            return grant
+        try:
+            client = self.client_factory(asynchronous)
+        except BaseException:
+            self._release_slot(region)
+            raise
+        try:
+            client._pool_created_at = self.clock()  # type: ignore[attr-defined]
+        except AttributeError:  # pragma: no cover - slotted clients
+            pass
+        with self._lock:
+            self._region(region).stats["created"] += 1
+        return client
+
+    def _overflow(self, region: str, asynchronous: bool, waited: float) -> object:
+        self._record_wait(region, waited)
+        with self._lock:
+            state = self._region(region)
+            if len(state.overflow) >= self.max_overflow:
+                state.stats["exhausted"] += 1
+                raise SessionPoolExhausted(f"session pool for region {region!r} exhausted")
+            state.stats["overflow"] += 1
+            # Reserve the overflow slot before building the client outside the lock.
+            reservation = object()
+            state.overflow[id(reservation)] = reservation
+        try:
+            client = self.client_factory(asynchronous)
+        except BaseException:
+            with self._lock:
+                state.overflow.pop(id(reservation), None)
+            raise
+        with self._lock:
+            state.overflow.pop(id(reservation), None)
+            state.overflow[id(client)] = client
+        return client
+
+    def _abandon(self, region: str, waiter: concurrent.futures.Future) -> object:
+        """Withdraw a waiter; returns what it was handed if the handoff won the race."""
+
+        with self._lock:
+            if waiter.done() and not waiter.cancelled():
+                return waiter.result()
+            waiter.cancel()
+            state = self._region(region)
+            state.waiters = deque(w for w in state.waiters if w[1] is not waiter)
+        return None
+
+    def _put_back(self, region: str, grant: object, asynchronous: bool) -> None:
+        if grant is _SLOT:
+            self._release_slot(region)
+        else:
+            self.release(region, grant)
+
+    def _release_slot(self, region: str) -> None:
+        with self._lock:
+            self._free_slot(self._region(region))
+
+    def _hand_session(self, state: _Region, session: object, asynchronous: bool) -> Optional[bool]:
+        """Give ``session`` to the oldest waiter (lock held).
+
+        Returns ``None`` if nobody is waiting, ``True`` if the session was
+        handed over and ``False`` if the waiter wants the other kind of
+        client and got the slot instead; the caller then closes the session.
+        """
+
+        while state.waiters:
+            kind, waiter = state.waiters.popleft()
+            if waiter.set_running_or_notify_cancel():
+                waiter.set_result(session if kind == asynchronous else _SLOT)
+                return kind == asynchronous
+        return None
+
+    def _free_slot(self, state: _Region) -> None:
+        """Pass a pool slot to the oldest waiter, or give it back (lock held)."""
+
+        while state.waiters:
+            _kind, waiter = state.waiters.popleft()
+            if waiter.set_running_or_notify_cancel():
+                waiter.set_result(_SLOT)
+                return
+        state.in_use = max(state.in_use - 1, 0)
+
+    def _record_wait(self, region: str, seconds: float) -> None:
+        with self._lock:
+            self._region(region).stats["wait_seconds"] += seconds
+            self.wait_histogram.observe(region, seconds)
+
+    def _collect_expired(self, now: float) -> List[object]:
+        expired: List[object] = []
+        with self._lock:
+            for state in self._regions.values():
+                keep: Deque[Tuple[object, bool, float, float]] = deque()
+                for entry in state.idle:
+                    session, _kind, created_at, last_used = entry
+                    if now - created_at > self.ttl_seconds or now - last_used > self.idle_seconds:
+                        expired.append(session)
+                        state.stats["evicted"] += 1
+                    else:
+                        keep.append(entry)
+                state.idle = keep
+        return expired
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.cleanup()
+            except Exception:
+                # Best-effort sweep
+                pass
+
+    def _ensure_sweeper(self) -> None:
+        if self.sweep_interval and (self._sweeper is None or self._sweeper.done()):
+            self.start_sweeper()
 
     def _new_client(self, asynchronous: bool) -> object:
         common_kwargs = {
             "timeout": httpx.Timeout(10.0, connect=5.0),
             "headers": {"connection": "keep-alive"},
+            "limits": httpx.Limits(keepalive_expiry=self.pool_keepalive),
         }
         if asynchronous:
             return httpx.AsyncClient(http2=True, **common_kwargs)
         return httpx.Client(http2=True, **common_kwargs)
 
+    async def _aclose_session(self, session: object) -> None:
+        try:
+            if hasattr(session, "aclose"):
+                await session.aclose()
+            elif hasattr(session, "close"):
+                session.close()
+        except Exception:
+            # Best-effort close
+            pass
+
     def _close_session(self, session: object) -> None:
         try:
-            if isinstance(session, httpx.AsyncClient):
+            if hasattr(session, "aclose"):
                 try:
                     loop = asyncio.get_running_loop()
                 except RuntimeError:
                     loop = None
                 if loop and loop.is_running():
-                    asyncio.run_coroutine_threadsafe(session.aclose(), loop)
+                    loop.create_task(session.aclose())
                 else:
                     asyncio.run(session.aclose())
-            elif isinstance(session, httpx.Client):
+            elif hasattr(session, "close"):
                 session.close()
         except Exception:
             # Best-effort close
             pass
-
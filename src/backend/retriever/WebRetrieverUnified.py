@@ -1,16 +1,15 @@
 import asyncio
-import json
 import random
-import re
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Any, AsyncGenerator, Dict, List, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 import httpx
 
+from .HTMLExtractor import DEFAULT_BACKEND, ExtractedPage, extract_page
 from .Normalizer import (
     detect_language,
-    normalize_html,
     normalize_json,
     normalize_pdf,
     normalize_text,
@@ -18,10 +17,10 @@ from .Normalizer import (
 )
 from .SessionPool import SessionPool
 
-try:
-    from bs4 import BeautifulSoup  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    BeautifulSoup = None  # type: ignore
+# Bodies of these types are only read up to ``max_body_bytes``; others (PDF, JSON) are read whole.
+TRUNCATABLE_TYPES = ("html", "text/", "xml")
+# The body is re-encoded as plain bytes, so transfer framing headers no longer apply.
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
 
 
 class WebRetrieverUnified:
@@ -31,11 +30,28 @@ class WebRetrieverUnified:
         default_region: str = "global",
         max_retries: int = 3,
         base_timeout: float = 12.0,
+        max_body_bytes: int = 1024 * 1024,
+        extractor: Optional[str] = None,
+        parse_workers: int = 4,
+        parse_executor: Optional[Executor] = None,
+        jitter_seconds: float = 0.0,
+        sync_fallback: bool = False,
     ) -> None:
         self.pool = session_pool or SessionPool()
         self.default_region = default_region
         self.max_retries = max_retries
         self.base_timeout = base_timeout
+        self.max_body_bytes = max_body_bytes
+        self.extractor = extractor or DEFAULT_BACKEND
+        # Parsing is CPU-bound; a bounded pool keeps it off the event loop. Pass a
+        # ProcessPoolExecutor to parse in parallel with a pure-Python backend.
+        # Only an executor created here is shut down by ``close``.
+        self._owns_executor = parse_executor is None
+        self.parse_executor = parse_executor or ThreadPoolExecutor(
+            max_workers=parse_workers, thread_name_prefix="html-extract"
+        )
+        self.jitter_seconds = jitter_seconds
+        self.sync_fallback = sync_fallback
         self.user_agents: List[str] = [
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -45,14 +61,21 @@ class WebRetrieverUnified:
     # -----------------------------
     # Public API
     # -----------------------------
+    def close(self) -> None:
+        """Shut down the parse executor if this retriever created it; safe to call twice."""
+        if self._owns_executor:
+            self.parse_executor.shutdown(wait=True)
+
     async def get(self, url: str, *, region: Optional[str] = None) -> Dict[str, Any]:
         region = region or self._region_from_url(url)
-        jitter = random.uniform(0.01, 0.15)
-        await asyncio.sleep(jitter)
+        if self.jitter_seconds > 0:
+            await asyncio.sleep(random.uniform(0, self.jitter_seconds))
 
         try:
             response = await self._fetch_async(url, region)
         except Exception:
+            if not self.sync_fallback:
+                raise
             response = await asyncio.to_thread(self._fetch_sync, url, region)
 
         return await self._normalize_response(response, url)
@@ -70,29 +93,12 @@ class WebRetrieverUnified:
             self.pool.release(region, client)
 
     async def scrape(self, url: str, *, region: Optional[str] = None) -> Dict[str, Any]:
-        payload = await self.get(url, region=region)
-        links = await self.extract_links(url, region=region)
-        payload["links"] = links
-        return payload
+        # Links come from the same parse as the text; the page is fetched once.
+        return await self.get(url, region=region)
 
     async def extract_links(self, url: str, *, region: Optional[str] = None) -> List[str]:
-        region = region or self._region_from_url(url)
-        response = await self._fetch_async(url, region, allow_redirects=True)
-        content_type = response.headers.get("content-type", "")
-        if "html" not in content_type:
-            return []
-        html = response.text
-        links: List[str] = []
-        if BeautifulSoup:
-            soup = BeautifulSoup(html, "html.parser")
-            for tag in soup.find_all("a", href=True):
-                href = tag.get("href")
-                if href:
-                    links.append(urljoin(url, href))
-        else:
-            for match in re.findall(r"href=\"([^\"]+)\"", html):
-                links.append(urljoin(url, match))
-        return list(dict.fromkeys(links))
+        payload = await self.get(url, region=region)
+        return payload["links"]
 
     async def fetch_and_normalize(self, url: str, *, region: Optional[str] = None) -> Dict[str, Any]:
         return await self.get(url, region=region)
@@ -112,14 +118,15 @@ class WebRetrieverUnified:
         try:
             for attempt in range(self.max_retries):
                 try:
-                    response = await client.get(
+                    async with client.stream(
+                        "GET",
                         url,
                         headers=headers,
                         follow_redirects=allow_redirects,
                         timeout=self.base_timeout * (1 + 0.2 * attempt),
-                    )
-                    response.raise_for_status()
-                    return response
+                    ) as response:
+                        response.raise_for_status()
+                        return await self._read_body(response)
                 except Exception as exc:
                     last_exc = exc
                     await asyncio.sleep(min(0.5 * (2 ** attempt), 3.0))
@@ -154,6 +161,35 @@ class WebRetrieverUnified:
         finally:
             self.pool.release(region, client)
 
+    async def _read_body(self, response: httpx.Response) -> httpx.Response:
+        """Read the streamed body, stopping at ``max_body_bytes`` for text-like types."""
+        content_type = response.headers.get("content-type", "").lower()
+        if not any(kind in content_type for kind in TRUNCATABLE_TYPES):
+            await response.aread()
+            return response
+        chunks: List[bytes] = []
+        size = 0
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_body_bytes:
+                truncated = size > self.max_body_bytes
+                break
+        body = b"".join(chunks)[: self.max_body_bytes]
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROPPED_HEADERS]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=response.request,
+            extensions={**response.extensions, "truncated": truncated},
+        )
+
+    async def _extract_html(self, html: str, url: str) -> ExtractedPage:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_executor, extract_page, html, url, self.extractor)
+
     async def _normalize_response(self, response: httpx.Response, url: str) -> Dict[str, Any]:
         content_type = response.headers.get("content-type", "").lower()
         data: Dict[str, Any] = {
@@ -161,6 +197,7 @@ class WebRetrieverUnified:
             "status": response.status_code,
             "headers": dict(response.headers),
             "content_type": content_type,
+            "truncated": bool(response.extensions.get("truncated")),
         }
 
         if "application/pdf" in content_type:
@@ -174,9 +211,10 @@ class WebRetrieverUnified:
             except Exception:
                 text = normalize_text(response.text)
         elif "html" in content_type:
-            html = response.text
-            text = self._extract_text_from_html(html)
-            data["meta"] = self._parse_meta(html)
+            page = await self._extract_html(response.text, str(response.url))
+            text = page.text
+            data["meta"] = page.meta
+            data["links"] = page.links
         else:
             text = normalize_text(response.text)
 
@@ -186,30 +224,6 @@ class WebRetrieverUnified:
         data["links"] = data.get("links", [])
         return data
 
-    def _extract_text_from_html(self, html: str) -> str:
-        if BeautifulSoup:
-            soup = BeautifulSoup(html, "html.parser")
-            for script in soup(["script", "style"]):
-                script.extract()
-            text = soup.get_text(separator=" ")
-            return normalize_text(text)
-        return normalize_html(html)
-
-    def _parse_meta(self, html: str) -> Dict[str, Any]:
-        meta: Dict[str, Any] = {}
-        if BeautifulSoup:
-            soup = BeautifulSoup(html, "html.parser")
-            title = soup.title.string.strip() if soup.title and soup.title.string else None
-            if title:
-                meta["title"] = title
-            for tag in soup.find_all("meta"):
-                name = tag.get("name") or tag.get("property")
-                if name:
-                    content = tag.get("content")
-                    if content:
-                        meta[name.lower()] = normalize_text(content)
-        return meta
-
     def _headers(self) -> Dict[str, str]:
         return {
             "user-agent": random.choice(self.user_agents),
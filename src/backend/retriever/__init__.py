@@ -1,5 +1,6 @@
 from .WebRetrieverUnified import WebRetrieverUnified
-from .SessionPool import SessionPool
+from .SessionPool import SessionPool, SessionPoolExhausted
+from .HTMLExtractor import ExtractedPage, extract_page
 from .Normalizer import (
     normalize_html,
     normalize_pdf,
@@ -13,6 +14,9 @@ from .Normalizer import (
 __all__ = [
     "WebRetrieverUnified",
     "SessionPool",
+    "SessionPoolExhausted",
+    "ExtractedPage",
+    "extract_page",
     "normalize_html",
     "normalize_pdf",
     "normalize_json",
@@ -4,6 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+from src.backend.safety.MarkerAutomaton import MarkerAutomaton
 from src.backend.utils.Logging import SafeLogger
 
 
@@ -27,15 +28,18 @@ class AbuseIntentClassifier:
             "malware": {"payload", "exploit", "ransomware", "shellcode", "sqlmap"},
             "harassment": {"insult", "slur", "abuse", "dox", "hate"},
         }
+        self._automaton = MarkerAutomaton(term for terms in self._lexicon.values() for term in sorted(terms))
 
-    def classify(self, prompt: str, metadata: Optional[Dict[str, str]] = None) -> AbuseClassification:
+    def classify(
+        self, prompt: str, metadata: Optional[Dict[str, str]] = None, log: bool = True
+    ) -> AbuseClassification:
         """Return a coarse intent classification without persisting prompt content."""
 
-        lowered = prompt.lower()
+        found = self._automaton.found(prompt.lower())
         hits: List[str] = []
         category_scores: Dict[str, float] = {}
         for category, terms in self._lexicon.items():
-            count = sum(term in lowered for term in terms)
+            count = len(found & terms)
             score = min(1.0, count * 0.2)
             if score:
                 hits.append(category)
@@ -45,13 +49,14 @@ class AbuseIntentClassifier:
         severity = category_scores[dominant_category]
         severity = max(severity, self.base_threshold if hits else 0.0)
 
-        tenant = (metadata or {}).get("tenant_id", "unknown")
-        self.logger.info(
-            "abuse-intent",
-            tenant_id=tenant,
-            category=dominant_category,
-            severity=round(severity, 3),
-        )
+        if log:
+            tenant = (metadata or {}).get("tenant_id", "unknown")
+            self.logger.info(
+                "abuse-intent",
+                tenant_id=tenant,
+                category=dominant_category,
+                severity=round(severity, 3),
+            )
         return AbuseClassification(category=dominant_category, severity=round(severity, 3), reasons=hits)
 
 
@@ -28,6 +28,7 @@ class HallucinationDriftMonitor:
         context_anchors: List[str],
         generated: str,
         metadata: Optional[Dict[str, str]] = None,
+        log: bool = True,
     ) -> DriftSignal:
         """Calculate drift score by counting missing anchors."""
 
@@ -38,15 +39,16 @@ class HallucinationDriftMonitor:
         drift_score = round(min(1.0, anchor_penalty + length_penalty), 3)
         flagged = drift_score >= self.drift_threshold
 
-        tenant = (metadata or {}).get("tenant_id", "unknown")
-        self.logger.info(
-            "hallucination-drift",
-            tenant_id=tenant,
-            anchors=len(context_anchors),
-            missed=len(missed),
-            drift=drift_score,
-            flagged=flagged,
-        )
+        if log:
+            tenant = (metadata or {}).get("tenant_id", "unknown")
+            self.logger.info(
+                "hallucination-drift",
+                tenant_id=tenant,
+                anchors=len(context_anchors),
+                missed=len(missed),
+                drift=drift_score,
+                flagged=flagged,
+            )
         return DriftSignal(drift_score=drift_score, anchors_missed=missed, flagged=flagged)
 
 
@@ -0,0 +1,50 @@
+"""Precompiled multi-marker matcher for the safety detectors."""
+from __future__ import annotations
+
+from typing import Iterable, List, Set
+
+try:  # pragma: no cover - optional dependency
+    import ahocorasick
+except Exception:  # pragma: no cover - fallback
+    ahocorasick = None
+
+# Below this many markers CPython's substring search (one C scan per marker)
+# beats walking an Aho-Corasick automaton; measured on 4 KB prompts.
+AUTOMATON_MIN_MARKERS = 24
+
+
+class MarkerAutomaton:
+    """Finds which of a fixed set of substrings occur in a text.
+
+    Large marker sets are compiled once into an Aho-Corasick automaton
+    (``pyahocorasick``) and matched in a single scan; small sets, or
+    environments without the extension, fall back to a precompiled tuple
+    of substring checks. Either way ``find`` equals
+    ``[m for m in markers if m in text]``.
+    """
+
+    def __init__(self, markers: Iterable[str]) -> None:
+        self.markers: List[str] = list(dict.fromkeys(m for m in markers if m))
+        self._scan = tuple(self.markers)
+        self._automaton = None
+        if ahocorasick is not None and len(self.markers) >= AUTOMATON_MIN_MARKERS:
+            automaton = ahocorasick.Automaton()
+            for marker in self.markers:
+                automaton.add_word(marker, marker)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def found(self, text: str) -> Set[str]:
+        if not text:
+            return set()
+        if self._automaton is not None:
+            return {marker for _, marker in self._automaton.iter(text)}
+        return {m for m in self._scan if m in text}
+
+    def find(self, text: str) -> List[str]:
+        """Markers present in ``text``, in their original order."""
+        hits = self.found(text)
+        return [m for m in self.markers if m in hits]
+
+
+__all__ = ["MarkerAutomaton", "AUTOMATON_MIN_MARKERS"]
@@ -30,6 +30,7 @@ class OutputRiskScorer:
         poisoning_score: float,
         abuse_severity: float,
         metadata: Optional[Dict[str, str]] = None,
+        log: bool = True,
     ) -> RiskScore:
         """Compute a risk score before generation occurs."""
 
@@ -46,14 +47,15 @@ class OutputRiskScorer:
             risk_band = "medium"
             safety_shaping = True
 
-        tenant = (metadata or {}).get("tenant_id", "unknown")
-        self.logger.info(
-            "output-risk",
-            tenant_id=tenant,
-            risk=composite,
-            band=risk_band,
-            shaped=safety_shaping,
-        )
+        if log:
+            tenant = (metadata or {}).get("tenant_id", "unknown")
+            self.logger.info(
+                "output-risk",
+                tenant_id=tenant,
+                risk=composite,
+                band=risk_band,
+                shaped=safety_shaping,
+            )
         return RiskScore(value=composite, risk_band=risk_band, safety_shaping=safety_shaping)
 
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+from src.backend.safety.MarkerAutomaton import MarkerAutomaton
 from src.backend.utils.Logging import SafeLogger
 
 
@@ -34,24 +35,25 @@ class PromptPoisoningDetector:
             "sudo",
             "system override",
         ]
+        self._automaton = MarkerAutomaton(self._markers)
 
-    def evaluate(self, prompt: str, metadata: Optional[Dict[str, str]] = None) -> PoisoningResult:
+    def evaluate(self, prompt: str, metadata: Optional[Dict[str, str]] = None, log: bool = True) -> PoisoningResult:
         """Return a poisoning score without persisting prompt content."""
 
-        lowered = prompt.lower()
-        hits = [marker for marker in self._markers if marker in lowered]
+        hits = self._automaton.find(prompt.lower())
         entropy_score = min(1.0, len(prompt) / 8000)
         marker_score = min(1.0, len(hits) * 0.2)
         composite_score = round(min(1.0, entropy_score * 0.25 + marker_score), 3)
         suspicious = composite_score >= self.threshold
 
-        tenant = (metadata or {}).get("tenant_id", "unknown")
-        self.logger.info(
-            "poisoning-scan",
-            tenant_id=tenant,
-            marker_count=len(hits),
-            suspicious=suspicious,
-        )
+        if log:
+            tenant = (metadata or {}).get("tenant_id", "unknown")
+            self.logger.info(
+                "poisoning-scan",
+                tenant_id=tenant,
+                marker_count=len(hits),
+                suspicious=suspicious,
+            )
         reason = "markers detected" if hits else "entropy-only"
         return PoisoningResult(suspicious=suspicious, score=composite_score, markers=hits, reason=reason)
 
@@ -1,9 +1,13 @@
 """Enterprise safety orchestrator for Toron Phase 9."""
 from __future__ import annotations
 
+import asyncio
+import copy
+import hashlib
 import time
-from dataclasses import dataclass
-from typing import List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from src.backend.audit.EncryptedAuditTrail import AuditEvent, EncryptedAuditTrail
 from src.backend.enterprise.TenantIsolation import EnterpriseTenantIsolation, TenantPolicy
@@ -26,6 +30,52 @@ class SafetyOutcome:
     tenant_policy: TenantPolicy
     safe_mode: bool
     reasoning_budget: str
+    detector_latency_ms: Dict[str, float] = field(default_factory=dict)
+    cache_hit: bool = False
+
+
+Verdicts = Tuple[PoisoningResult, AbuseClassification, RiskScore, DriftSignal]
+
+
+class VerdictCache:
+    """Bounded LRU of detector verdicts keyed by tenant, policy version and content hash.
+
+    Verdicts are copied in and out so callers can mutate their ``markers`` or
+    ``reasons`` without touching the cached entry.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int, str], Verdicts]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(tenant_id: str, policy_version: int, prompt: str, anchors: List[str]) -> Tuple[str, int, str]:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(prompt.encode("utf-8", "surrogatepass"))
+        for anchor in anchors:
+            digest.update(b"\x00")
+            digest.update(anchor.encode("utf-8", "surrogatepass"))
+        return tenant_id, policy_version, digest.hexdigest()
+
+    def get(self, key: Tuple[str, int, str]) -> Optional[Verdicts]:
+        verdicts = self._entries.get(key)
+        if verdicts is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(verdicts)
+
+    def put(self, key: Tuple[str, int, str], verdicts: Verdicts) -> None:
+        self._entries[key] = copy.deepcopy(verdicts)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class SafetyOrchestrator:
@@ -40,6 +90,8 @@ class SafetyOrchestrator:
         router: Optional[MultiCloudFailoverRouter] = None,
         audit_trail: Optional[EncryptedAuditTrail] = None,
         tenant_isolation: Optional[EnterpriseTenantIsolation] = None,
+        verdict_cache: Optional[VerdictCache] = None,
+        offload_min_chars: int = 32_768,
     ) -> None:
         self.poisoning_detector = poisoning_detector or PromptPoisoningDetector()
         self.abuse_classifier = abuse_classifier or AbuseIntentClassifier()
@@ -49,6 +101,13 @@ class SafetyOrchestrator:
         self.audit_trail = audit_trail or EncryptedAuditTrail()
         self.tenant_isolation = tenant_isolation or EnterpriseTenantIsolation()
         self.logger = SafeLogger("ryuzen-safety-orchestrator")
+        self.verdict_cache = verdict_cache or VerdictCache()
+        # The detectors are pure Python (tens of µs on typical prompts), so a
+        # thread hop costs more than it saves; only prompts above this size
+        # (~1.5 ms of detector work) are moved off the event loop.
+        self.offload_min_chars = offload_min_chars
+        # detector name -> [calls, total_ms, max_ms]
+        self._latency: Dict[str, List[float]] = {}
 
     def run(
         self,
@@ -68,6 +127,102 @@ class SafetyOrchestrator:
 
         # hallucination drift uses anchors + prompt as placeholder for generated context
         drift = self.drift_monitor.evaluate(context_anchors or [], sanitized_prompt, {"tenant_id": tenant_id})
+        return self._decide(
+            sanitized_prompt,
+            tenant_id,
+            policy,
+            (poisoning, abuse, risk, drift),
+            preferred_providers,
+            expected_latency_ms,
+        )
+
+    async def run_async(
+        self,
+        prompt: str,
+        tenant_id: str,
+        context_anchors: Optional[List[str]] = None,
+        preferred_providers: Optional[List[str]] = None,
+        expected_latency_ms: float = 0.0,
+    ) -> SafetyOutcome:
+        """``run`` with verdicts memoized and per-detector latency recorded.
+
+        Verdicts are cached per tenant policy version and content hash, so
+        retries and templated prompts skip the detectors entirely. On a miss
+        the detectors run inline; prompts of ``offload_min_chars`` or more
+        are evaluated in one worker thread so they do not stall the loop.
+        Detector logs are folded into the single ``safety-outcome`` line
+        together with their latencies.
+        """
+
+        sanitized_prompt = prompt.replace("\n", " ").strip()
+        anchors = context_anchors or []
+        policy = self.tenant_isolation.get_policy(tenant_id)
+        key = VerdictCache.key(tenant_id, policy.version, sanitized_prompt, anchors)
+        verdicts = self.verdict_cache.get(key)
+        latency: Dict[str, float] = {}
+        cache_hit = verdicts is not None
+        if verdicts is None:
+            if len(sanitized_prompt) >= self.offload_min_chars:
+                verdicts, elapsed = await asyncio.to_thread(self._detect, sanitized_prompt, anchors, tenant_id)
+            else:
+                verdicts, elapsed = self._detect(sanitized_prompt, anchors, tenant_id)
+            for name, elapsed_ms in elapsed.items():
+                self._record_latency(latency, name, elapsed_ms)
+            self.verdict_cache.put(key, verdicts)
+        return self._decide(
+            sanitized_prompt,
+            tenant_id,
+            policy,
+            verdicts,
+            preferred_providers,
+            expected_latency_ms,
+            latency=latency,
+            cache_hit=cache_hit,
+        )
+
+    def _detect(self, prompt: str, anchors: List[str], tenant_id: str) -> Tuple[Verdicts, Dict[str, float]]:
+        metadata = {"tenant_id": tenant_id}
+        elapsed: Dict[str, float] = {}
+
+        def timed(name: str, fn: Callable[..., Any], *args: Any) -> Any:
+            start = time.perf_counter()
+            result = fn(*args, log=False)
+            elapsed[name] = (time.perf_counter() - start) * 1000
+            return result
+
+        poisoning = timed("poisoning", self.poisoning_detector.evaluate, prompt, metadata)
+        abuse = timed("abuse", self.abuse_classifier.classify, prompt, metadata)
+        drift = timed("drift", self.drift_monitor.evaluate, anchors, prompt, metadata)
+        risk = timed("risk", self.risk_scorer.score_inputs, prompt, poisoning.score, abuse.severity, metadata)
+        return (poisoning, abuse, risk, drift), elapsed
+
+    def _record_latency(self, latency: Dict[str, float], name: str, elapsed_ms: float) -> None:
+        latency[name] = round(elapsed_ms, 3)
+        stats = self._latency.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed_ms
+        stats[2] = max(stats[2], elapsed_ms)
+
+    def detector_latency(self) -> Dict[str, Dict[str, float]]:
+        """Per-detector call count, mean and max latency (ms) for ``run_async``."""
+        return {
+            name: {"calls": int(calls), "mean_ms": round(total / calls, 3), "max_ms": round(peak, 3)}
+            for name, (calls, total, peak) in self._latency.items()
+            if calls
+        }
+
+    def _decide(
+        self,
+        sanitized_prompt: str,
+        tenant_id: str,
+        policy: TenantPolicy,
+        verdicts: Verdicts,
+        preferred_providers: Optional[List[str]],
+        expected_latency_ms: float,
+        latency: Optional[Dict[str, float]] = None,
+        cache_hit: bool = False,
+    ) -> SafetyOutcome:
+        poisoning, abuse, risk, drift = verdicts
         adjusted_risk = self.tenant_isolation.enforce_risk(tenant_id, risk.value)
         safe_mode = adjusted_risk >= 0.35 or drift.flagged or poisoning.suspicious
 
@@ -99,7 +254,12 @@ class SafetyOrchestrator:
             tenant_policy=policy,
             safe_mode=safe_mode,
             reasoning_budget=reasoning_budget,
+            detector_latency_ms=dict(latency or {}),
+            cache_hit=cache_hit,
         )
+        extra: Dict[str, Any] = {}
+        if latency is not None:
+            extra = {"cache_hit": cache_hit, "detector_ms": outcome.detector_latency_ms}
         self.logger.info(
             "safety-outcome",
             tenant_id=tenant_id,
@@ -107,6 +267,7 @@ class SafetyOrchestrator:
             drift=drift.drift_score,
             provider=routing.provider,
             safe_mode=safe_mode,
+            **extra,
         )
         return outcome
 
@@ -128,7 +289,7 @@ class SafetyOrchestrator:
             tenant_id=tenant_id,
             route_taken=route_taken,
         )
-        self.audit_trail.record(event)
+        self.audit_trail.submit(event)
 
 
-__all__ = ["SafetyOrchestrator", "SafetyOutcome"]
+__all__ = ["SafetyOrchestrator", "SafetyOutcome", "VerdictCache"]
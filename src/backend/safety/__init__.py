@@ -1,18 +1,21 @@
 from .AbuseIntentClassifier import AbuseClassification, AbuseIntentClassifier
 from .HallucinationDriftMonitor import DriftSignal, HallucinationDriftMonitor
+from .MarkerAutomaton import MarkerAutomaton
 from .OutputRiskScorer import OutputRiskScorer, RiskScore
 from .PromptPoisoningDetector import PoisoningResult, PromptPoisoningDetector
-from .SafetyOrchestrator import SafetyOrchestrator, SafetyOutcome
+from .SafetyOrchestrator import SafetyOrchestrator, SafetyOutcome, VerdictCache
 
 __all__ = [
     "AbuseClassification",
     "AbuseIntentClassifier",
     "DriftSignal",
     "HallucinationDriftMonitor",
+    "MarkerAutomaton",
     "OutputRiskScorer",
     "RiskScore",
     "PoisoningResult",
     "PromptPoisoningDetector",
     "SafetyOrchestrator",
     "SafetyOutcome",
+    "VerdictCache",
 ]
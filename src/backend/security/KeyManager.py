@@ -1,6 +1,7 @@
 """Key management for AES-256-GCM with in-memory rotation."""
 from __future__ import annotations
 
+import hashlib
 import os
 import secrets
 import uuid
@@ -14,11 +15,14 @@ from .SecureMemory import wipe_buffer
 
 
 class KeyManager:
-    def __init__(self) -> None:
+    def __init__(self, key_material: Optional[bytes] = None) -> None:
         self._keys: Dict[str, bytes] = {}
         self._active_key_id: Optional[str] = None
         self._kek = os.urandom(32)
-        self.generate_key()
+        if key_material is None:
+            self.generate_key()
+        else:
+            self.load_key(key_material)
 
     @property
     def active_key_id(self) -> str:
@@ -32,6 +36,20 @@ class KeyManager:
         self._active_key_id = key_id
         return key_id, key
 
+    def load_key(self, key_material: bytes, activate: bool = True) -> str:
+        """Register persistent key material under an id derived from it.
+
+        The id is stable across processes, so data encrypted under it can be
+        read back by any ``KeyManager`` loaded with the same material.
+        """
+        if len(key_material) != 32:
+            raise SecurityError("Key material must be 32 bytes")
+        key_id = hashlib.sha256(b"ryuzen-kid:" + key_material).hexdigest()[:32]
+        self._keys[key_id] = bytes(key_material)
+        if activate:
+            self._active_key_id = key_id
+        return key_id
+
     def rotate_key(self) -> Tuple[str, bytes]:
         return self.generate_key()
 
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import io
-from typing import Any
+import itertools
+from typing import Any, Iterable, Iterator, List
 
 try:  # pragma: no cover - optional dependency
     from PIL import Image
@@ -43,10 +44,13 @@ def strip_pdf_metadata(pdf_bytes: bytes) -> bytes:
     return output.getvalue()
 
 
+DOCUMENT_MARKERS = [b"Author", b"Creator", b"Producer", b"CreationDate", b"ModDate"]
+HIDDEN_LAYER_REPLACEMENTS = [(b"<x:xmpmeta", b"<xmp-stripped"), (b"%%EOF", b"")]
+
+
 def strip_document_metadata(doc_bytes: bytes) -> bytes:
-    markers = [b"Author", b"Creator", b"Producer", b"CreationDate", b"ModDate"]
     filtered = doc_bytes
-    for marker in markers:
+    for marker in DOCUMENT_MARKERS:
         filtered = filtered.replace(marker, b"[REDACTED]")
     return filtered
 
@@ -58,15 +62,84 @@ def strip_office_metadata(docx_bytes: bytes, xlsx_bytes: bytes | None = None) ->
 
 
 def remove_hidden_layers(pdf_bytes: bytes) -> bytes:
-    filtered = pdf_bytes.replace(b"<x:xmpmeta", b"<xmp-stripped")
-    filtered = filtered.replace(b"%%EOF", b"")
+    filtered = pdf_bytes
+    for old, new in HIDDEN_LAYER_REPLACEMENTS:
+        filtered = filtered.replace(old, new)
     return filtered
 
 
+class _StreamReplace:
+    """Incremental ``bytes.replace``: holds back just enough to finish a split match."""
+
+    def __init__(self, old: bytes, new: bytes):
+        self.old = old
+        self.new = new
+        self.carry = b""
+
+    def feed(self, data: bytes) -> bytes:
+        buf = self.carry + data
+        # A match starting at or after ``limit`` might continue in the next chunk.
+        limit = len(buf) - len(self.old) + 1
+        out: List[bytes] = []
+        pos = 0
+        while True:
+            i = buf.find(self.old, pos)
+            if i == -1 or i >= limit:
+                break
+            out.append(buf[pos:i])
+            out.append(self.new)
+            pos = i + len(self.old)
+        cut = max(pos, limit)
+        out.append(buf[pos:cut])
+        self.carry = buf[cut:]
+        return b"".join(out)
+
+    def flush(self) -> bytes:
+        tail, self.carry = self.carry.replace(self.old, self.new), b""
+        return tail
+
+
+def stream_strip_metadata(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Streaming ``strip_document_metadata(remove_hidden_layers(strip_pdf_metadata(...)))``.
+
+    The marker replacements run chunk by chunk. Rewriting a PDF needs the
+    whole file, so when PyPDF2 is installed and the stream is a PDF it is
+    buffered and cleaned in one piece.
+    """
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= 5:
+            break
+    if PyPDF2 is not None and head.startswith(b"%PDF"):
+        whole = head + b"".join(chunks)
+        yield strip_document_metadata(remove_hidden_layers(strip_pdf_metadata(whole)))
+        return
+
+    stages: List[_StreamReplace] = [_StreamReplace(old, new) for old, new in HIDDEN_LAYER_REPLACEMENTS]
+    stages += [_StreamReplace(marker, b"[REDACTED]") for marker in DOCUMENT_MARKERS]
+
+    def push(data: bytes, index: int = 0) -> bytes:
+        for stage in stages[index:]:
+            data = stage.feed(data)
+        return data
+
+    for chunk in itertools.chain([head], chunks):
+        out = push(chunk)
+        if out:
+            yield out
+    for i, stage in enumerate(stages):
+        tail = push(stage.flush(), i + 1)
+        if tail:
+            yield tail
+
+
 __all__ = [
     "strip_exif",
     "strip_pdf_metadata",
     "strip_document_metadata",
     "strip_office_metadata",
     "remove_hidden_layers",
+    "stream_strip_metadata",
 ]
@@ -1,14 +1,21 @@
-"""NER masking engine using spaCy when available."""
+"""NER masking engine using spaCy when available.
+
+The spaCy model is loaded once per process, with every component that entity
+recognition does not need excluded, and shared by all engines. Batches go
+through ``nlp.pipe`` so tokenisation and the NER model run over many
+documents at a time.
+"""
 from __future__ import annotations
 
-from typing import Dict, List
+import bisect
+import re
+import threading
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
-try:  # pragma: no cover - optional dependency
-    import spacy
-    _NLP = spacy.load("en_core_web_sm")
-except Exception:  # pragma: no cover - fallback
-    _NLP = None
+DEFAULT_MODEL = "en_core_web_sm"
 
+# Components shipped with the stock pipelines that NER does not depend on.
+UNUSED_COMPONENTS = ("parser", "tagger", "morphologizer", "attribute_ruler", "lemmatizer", "senter", "textcat")
 
 ENTITY_TOKENS = {
     "PERSON": "[REDACTED_PERSON]",
@@ -20,23 +27,166 @@ ENTITY_TOKENS = {
     "FAC": "[REDACTED_FAC]",
 }
 
+_WORD = re.compile(r"\S+")
+# Greedy, so a match ends just after the last whitespace before the bound.
+_THROUGH_LAST_SPACE = re.compile(r".*\s", re.S)
+
+_NLP = None
+_NLP_LOADED = False
+_LOCK = threading.Lock()
+_SHARED: Optional["NERMaskingEngine"] = None
+
+
+def load_nlp(model: str = DEFAULT_MODEL):
+    """Return the process-wide spaCy pipeline, loading it on first use (``None`` if unavailable)."""
+    global _NLP, _NLP_LOADED
+    if _NLP_LOADED:
+        return _NLP
+    with _LOCK:
+        if not _NLP_LOADED:
+            try:  # pragma: no cover - optional dependency
+                import spacy
+
+                _NLP = spacy.load(model, exclude=list(UNUSED_COMPONENTS))
+            except Exception:  # pragma: no cover - fallback
+                _NLP = None
+            _NLP_LOADED = True
+    return _NLP
+
+
+def _assemble(text: str, spans: Iterable[Tuple[int, int, str]]) -> str:
+    """Replace non-overlapping, ordered ``(start, end, label)`` spans in one pass."""
+    pieces: List[str] = []
+    pos = 0
+    for start, end, label in spans:
+        if start < pos:
+            continue
+        pieces.append(text[pos:start])
+        pieces.append(ENTITY_TOKENS.get(label, "[REDACTED]"))
+        pos = end
+    if not pieces:
+        return text
+    pieces.append(text[pos:])
+    return "".join(pieces)
+
 
 class NERMaskingEngine:
-    def __init__(self) -> None:
-        self.nlp = _NLP
+    def __init__(self, nlp=None, batch_size: int = 64, n_process: int = 1) -> None:
+        self.nlp = nlp if nlp is not None else load_nlp()
+        self.batch_size = batch_size
+        self.n_process = n_process
 
     def mask(self, text: str) -> str:
         if not text:
             return text
         if self.nlp is None:
             return self._heuristic_mask(text)
-        doc = self.nlp(text)
-        masked_text = text
-        for ent in reversed(doc.ents):
-            token = ENTITY_TOKENS.get(ent.label_, "[REDACTED]")
-            start, end = ent.start_char, ent.end_char
-            masked_text = masked_text[:start] + token + masked_text[end:]
-        return masked_text
+        return self._mask_doc(text, self.nlp(text))
+
+    def mask_batch(
+        self,
+        texts: Sequence[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[str]:
+        """Mask many documents with one ``nlp.pipe`` pass; order is preserved."""
+        out = list(texts)
+        todo = [i for i, text in enumerate(texts) if text]
+        if not todo:
+            return out
+        if self.nlp is None:
+            for i in todo:
+                out[i] = self._heuristic_mask(texts[i])
+            return out
+        docs = self.nlp.pipe(
+            (texts[i] for i in todo),
+            batch_size=batch_size or self.batch_size,
+            n_process=n_process or self.n_process,
+        )
+        for i, doc in zip(todo, docs):
+            out[i] = self._mask_doc(texts[i], doc)
+        return out
+
+    def entity_spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """Ordered ``(start, end, label)`` spans that ``mask`` would replace."""
+        if self.nlp is None:
+            return [
+                (m.start(), m.end(), "PERSON")
+                for m in _WORD.finditer(text)
+                if m.group().istitle() and len(m.group()) > 2
+            ]
+        return [(ent.start_char, ent.end_char, ent.label_) for ent in self.nlp(text).ents]
+
+    def mask_stream(self, chunks: Iterable[str], window: int = 65536, overlap: int = 4096) -> Iterator[str]:
+        """Mask a stream of text chunks in overlapping windows.
+
+        Each window is cut at whitespace at least ``overlap`` characters
+        before its end and outside every entity; the tail is carried into
+        the next window, and up to ``overlap`` characters of the text before
+        it are passed in front as left context for the model. A window with
+        no usable whitespace is cut ``overlap`` characters before its end,
+        outside any entity, so memory stays bounded by ``window + overlap``.
+        Spans are kept intact, but unlike ``mask`` the heuristic fallback
+        keeps the original whitespace (the pipeline normalises it afterwards).
+        """
+        pending: List[str] = []
+        size = 0
+        context = ""
+        for chunk in chunks:
+            if not chunk:
+                continue
+            pending.append(chunk)
+            size += len(chunk)
+            if size < window:
+                continue
+            text = context + "".join(pending)
+            spans = [sp for sp in self.entity_spans(text) if sp[0] >= len(context)]
+            cut = self._stream_cut(text, spans, len(context), overlap)
+            if cut is None:
+                pending = [text[len(context):]]
+                continue
+            yield _assemble(text[:cut], [sp for sp in spans if sp[1] <= cut])[len(context):]
+            context = text[max(0, cut - overlap):cut]
+            pending = [text[cut:]]
+            size = len(text) - cut
+        text = context + "".join(pending)
+        if len(text) > len(context):
+            spans = [sp for sp in self.entity_spans(text) if sp[0] >= len(context)]
+            yield _assemble(text, spans)[len(context):]
+
+    @staticmethod
+    def _stream_cut(text: str, spans, start: int, overlap: int) -> Optional[int]:
+        """Cut ``overlap`` back from the end, after whitespace if possible, splitting no span."""
+        limit = len(text) - overlap
+        ends = [e for _, e, _ in spans]
+
+        def outside(cut: int) -> int:
+            # Move ``cut`` back to the start of any span it falls inside.
+            while cut > start:
+                i = bisect.bisect_left(ends, cut)
+                if i < len(spans) and spans[i][0] < cut and spans[i][1] > cut:
+                    cut = spans[i][0]
+                    continue
+                break
+            return cut
+
+        bound = limit
+        while bound > start:
+            # Cut just after a whitespace character so no word is split.
+            match = _THROUGH_LAST_SPACE.match(text, start, bound)
+            if match is None:
+                break
+            cut = outside(match.end())
+            if cut == match.end():
+                return cut
+            bound = cut
+        # No whitespace to cut at (base64, minified text): cut inside the word.
+        cut = outside(limit)
+        return cut if cut > start else None
+
+    @staticmethod
+    def _mask_doc(text: str, doc) -> str:
+        return _assemble(text, ((ent.start_char, ent.end_char, ent.label_) for ent in doc.ents))
 
     def _heuristic_mask(self, text: str) -> str:
         words = text.split()
@@ -49,4 +199,15 @@ class NERMaskingEngine:
         return " ".join(masked)
 
 
-__all__ = ["NERMaskingEngine", "ENTITY_TOKENS"]
+def shared_engine() -> NERMaskingEngine:
+    """Process-wide engine over the shared model; built once and reused."""
+    global _SHARED
+    if _SHARED is None:
+        nlp = load_nlp()
+        with _LOCK:
+            if _SHARED is None:
+                _SHARED = NERMaskingEngine(nlp=nlp)
+    return _SHARED
+
+
+__all__ = ["NERMaskingEngine", "ENTITY_TOKENS", "load_nlp", "shared_engine"]
@@ -0,0 +1,412 @@
+"""Single-pass PII scanner over the regex library.
+
+The reference behaviour is the original sequential redaction: each pattern,
+in priority order, is ``re.sub``-ed over the output of the previous one, so
+later patterns see earlier placeholders. The scanner reproduces that output
+byte for byte while scanning most of a document only once:
+
+1. The pattern library is analysed when the scanner is built. *Separators*
+   are punctuation characters no pattern can consume (or peek at through a
+   lookaround); *triggers* are characters at least one of which every match
+   of some pattern must contain (digits, ``@`` and ``:`` for the default
+   library).
+2. One combined alternation, ``(?P<sep>...)|(?P<hit>...)``, runs over the
+   whole text. Separators split it into chunks that cannot influence each
+   other; a chunk without a trigger character cannot match anything and is
+   copied through untouched.
+3. Each hot chunk is resolved by priority: pattern ``k`` searches the
+   chunk as rewritten by patterns ``0..k-1``, with the real
+   neighbouring separators attached so word boundaries and anchors behave as
+   in the full text. Matches are mapped back to original offsets, giving the
+   span list.
+4. The output is assembled from original slices and placeholders with a
+   single ``join``.
+
+A plain alternation of the patterns themselves is *not* equivalent to the
+sequential substitutions (earlier placeholders change what later patterns
+see, and leftmost-first matching ignores priority), which is why priority is
+resolved per chunk. If a pattern library defeats the analysis — a pattern
+that can consume ``[``/``]``, match inside a placeholder or match the empty
+string — the scanner falls back to the sequential reference.
+"""
+from __future__ import annotations
+
+import bisect
+import re
+import string
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from re import _parser as _sre_parse  # Python >= 3.11
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse as _sre_parse  # type: ignore
+
+Span = Tuple[int, int, str]
+
+_CATEGORY_CLASSES = {
+    "CATEGORY_DIGIT": r"\d",
+    "CATEGORY_NOT_DIGIT": r"\D",
+    "CATEGORY_SPACE": r"\s",
+    "CATEGORY_NOT_SPACE": r"\S",
+    "CATEGORY_WORD": r"\w",
+    "CATEGORY_NOT_WORD": r"\W",
+}
+
+_PROBE_CHARS = "".join(chr(c) for c in range(0x20, 0x7F)) + "\t\n\r\xa0\xe9"
+# Ordinary prose; trigger classes that fire on it are ranked as unselective.
+_REFERENCE_PROSE = "The well-known fox (quick, brown) jumped over a lazy dog. Then it rested.\n"
+
+
+# -----------------------------
+# PATTERN ANALYSIS
+# -----------------------------
+def _class_body(items) -> Optional[str]:
+    """Regex character-class body for a parsed ``IN`` set, ``None`` if negated/unknown."""
+    out = []
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            out.append(re.escape(chr(av)))
+        elif name == "RANGE":
+            out.append(f"{re.escape(chr(av[0]))}-{re.escape(chr(av[1]))}")
+        elif name == "CATEGORY":
+            category = _CATEGORY_CLASSES.get(str(av).replace("UNI_", "").replace("LOC_", ""))
+            if category is None:
+                return None
+            out.append(category)
+        else:  # NEGATE and anything exotic
+            return None
+    return "".join(out)
+
+
+def _can_consume(items, ch: str, flags: int) -> bool:
+    """Conservatively decide whether a parsed pattern could ever match or peek at ``ch``."""
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            if re.fullmatch(re.escape(chr(av)), ch, flags):
+                return True
+        elif name == "NOT_LITERAL":
+            if not re.fullmatch(re.escape(chr(av)), ch, flags):
+                return True
+        elif name == "IN":
+            negated = bool(av) and str(av[0][0]) == "NEGATE"
+            body = _class_body(av[1:] if negated else av)
+            if body is None or bool(re.fullmatch(f"[{body}]", ch, flags)) != negated:
+                return True
+        elif name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+            if _can_consume(av[2], ch, flags):
+                return True
+        elif name == "SUBPATTERN":
+            if _can_consume(av[-1], ch, flags):
+                return True
+        elif name == "BRANCH":
+            if any(_can_consume(branch, ch, flags) for branch in av[1]):
+                return True
+        elif name in ("ASSERT", "ASSERT_NOT"):
+            if _can_consume(av[1], ch, flags):
+                return True
+        elif name == "ATOMIC_GROUP":
+            if _can_consume(av, ch, flags):
+                return True
+        elif name == "AT":
+            continue
+        else:  # ANY, back-references, conditionals, anything unknown
+            return True
+    return False
+
+
+def _required_class(items, flags: int) -> Optional[str]:
+    """Most selective class body that every match of ``items`` must contain a character of."""
+    best = None
+    best_score = None
+    for op, av in items:
+        name = str(op)
+        body = None
+        if name == "LITERAL":
+            body = re.escape(chr(av))
+        elif name == "IN":
+            body = _class_body(av)
+        elif name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") and av[0] >= 1:
+            body = _required_class(av[2], flags)
+        elif name == "SUBPATTERN":
+            body = _required_class(av[-1], flags)
+        elif name == "ATOMIC_GROUP":
+            body = _required_class(av, flags)
+        elif name == "BRANCH":
+            bodies = [_required_class(branch, flags) for branch in av[1]]
+            if all(bodies):
+                body = "".join(bodies)
+        if body is None:
+            continue
+        probe = re.compile(f"[{body}]", flags)
+        score = (
+            len(probe.findall(_REFERENCE_PROSE)) * len(_PROBE_CHARS)
+            + sum(1 for ch in _PROBE_CHARS if probe.match(ch))
+        )
+        if best_score is None or score < best_score:
+            best, best_score = body, score
+    return best
+
+
+# -----------------------------
+# SCANNER
+# -----------------------------
+class PIIScanner:
+    """Redacts every pattern of a priority-ordered ``(name, compiled)`` list."""
+
+    PLACEHOLDER = "[REDACTED_{name}]"
+
+    def __init__(self, patterns: Sequence[Tuple[str, "re.Pattern[str]"]]):
+        self.patterns = list(patterns)
+        self.placeholders = {name: self.PLACEHOLDER.format(name=name) for name, _ in self.patterns}
+        self._trees = self._parsed()
+        self.separators = self._separators()
+        self.triggers = self._triggers()
+        self.exact = self._check_exact()
+        self._combined = self._compile_combined() if self.exact else None
+
+    def _parsed(self):
+        out = []
+        for _, pattern in self.patterns:
+            try:
+                out.append(_sre_parse.parse(pattern.pattern, pattern.flags))
+            except Exception:
+                out.append(None)
+        return out
+
+    def _separators(self) -> str:
+        if any(tree is None for tree in self._trees):
+            return ""
+        return "".join(
+            ch
+            for ch in string.punctuation
+            if not any(_can_consume(t, ch, p.flags) for t, (_, p) in zip(self._trees, self.patterns))
+        )
+
+    def _triggers(self) -> Optional[str]:
+        bodies = []
+        for tree, (_, pattern) in zip(self._trees, self.patterns):
+            body = _required_class(tree, pattern.flags) if tree is not None else None
+            if body is None:
+                return None
+            bodies.append(body)
+        return "".join(dict.fromkeys(bodies))
+
+    def _check_exact(self) -> bool:
+        if "[" not in self.separators or "]" not in self.separators:
+            return False
+        for tree, (_, pattern) in zip(self._trees, self.patterns):
+            if tree.getwidth()[0] == 0:
+                return False
+            if any(pattern.search(ph) for ph in self.placeholders.values()):
+                return False
+        return True
+
+    def _compile_combined(self) -> "re.Pattern[str]":
+        sep = "[" + re.escape(self.separators) + "]+"
+        rest = "[^" + re.escape(self.separators) + "]"
+        # A hit swallows the rest of its chunk: one match object per hot chunk.
+        hit = (f"[{self.triggers}]" if self.triggers else rest) + rest + "*"
+        # Case-folding only ever widens the trigger set, which is safe.
+        flags = re.IGNORECASE if any(p.flags & re.IGNORECASE for _, p in self.patterns) else 0
+        return re.compile(f"(?P<sep>{sep})|(?P<hit>{hit})", flags)
+
+    # -----------------------------
+    # SCAN
+    # -----------------------------
+    def hot_regions(self, text: str, start: int = 0) -> Iterator[Tuple[int, int]]:
+        """Yield ``(start, end)`` of the separator-bounded chunks that may hold a match.
+
+        ``text[:start]`` is context only: it is never redacted, but the
+        character before ``start`` is what the first chunk sees on its left.
+        """
+        chunk = start
+        hot = False
+        for m in self._combined.finditer(text, start):
+            if m.lastgroup == "sep":
+                if hot:
+                    yield chunk, m.start()
+                chunk = m.end()
+                hot = False
+            else:
+                hot = True
+        if hot:
+            yield chunk, len(text)
+
+    def _resolve(self, text: str, a: int, b: int) -> List[Span]:
+        """Priority-resolve spans in ``text[a:b]`` exactly as the sequential subs would."""
+        left = text[a - 1] if a > 0 else ""
+        right = text[b] if b < len(text) else ""
+        claimed: List[Span] = []
+        cur = left + text[a:b] + right
+        # Start of each unredacted segment of ``cur`` and its original offset.
+        seg_cur = [0]
+        seg_orig = [a - len(left)]
+
+        for name, pattern in self.patterns:
+            found = []
+            for m in pattern.finditer(cur, len(left)):
+                i = bisect.bisect_right(seg_cur, m.start()) - 1
+                shift = seg_orig[i] - seg_cur[i]
+                found.append((m.start() + shift, m.end() + shift, name))
+            if not found:
+                continue
+            claimed = sorted(claimed + found)
+
+            # Rebuild the region as the sequential pipeline would now see it.
+            pieces = [left]
+            seg_cur, seg_orig = [0], [a - len(left)]
+            size = len(left)
+            pos = a
+            for s, e, claim in claimed:
+                placeholder = self.placeholders[claim]
+                pieces.append(text[pos:s])
+                pieces.append(placeholder)
+                size += (s - pos) + len(placeholder)
+                seg_cur.append(size)
+                seg_orig.append(e)
+                pos = e
+            pieces.append(text[pos:b])
+            pieces.append(right)
+            cur = "".join(pieces)
+        return claimed
+
+    def spans(self, text: str, start: int = 0) -> List[Span]:
+        """Every redacted ``(start, end, name)`` in original-text coordinates."""
+        if not self.exact:
+            raise RuntimeError("pattern library is not compatible with the single-pass scanner")
+        out: List[Span] = []
+        for a, b in self.hot_regions(text, start):
+            out.extend(self._resolve(text, a, b))
+        return out
+
+    def _assemble(self, text: str, spans: Sequence[Span], start: int = 0, end: Optional[int] = None) -> str:
+        end = len(text) if end is None else end
+        pieces: List[str] = []
+        pos = start
+        for s, e, name in spans:
+            pieces.append(text[pos:s])
+            pieces.append(self.placeholders[name])
+            pos = e
+        if not pieces:
+            return text[start:end]
+        pieces.append(text[pos:end])
+        return "".join(pieces)
+
+    def redact(self, text: str) -> str:
+        if not text:
+            return text
+        if not self.exact:
+            return self.redact_sequential(text)
+        return self._assemble(text, self.spans(text))
+
+    def redact_stream(self, chunks: Iterable[str], window: int = 65536, overlap: int = 4096) -> Iterator[str]:
+        """Redact a stream of text chunks, yielding output as soon as it is final.
+
+        The concatenated output equals ``redact("".join(chunks))``. Text is
+        cut at the last separator of each ``window``-sized buffer, which is
+        exact since nothing matches across a separator. A buffer with no
+        separator is cut ``overlap`` characters before its end, outside any
+        span; that is exact as long as matches are shorter than ``overlap``.
+        Peak memory is about ``window + overlap`` characters.
+        """
+        if not self.exact:
+            yield self.redact_sequential("".join(chunks))
+            return
+        pending: List[str] = []
+        size = 0
+        context = ""  # last emitted character, left context for the buffer
+        for chunk in chunks:
+            if not chunk:
+                continue
+            pending.append(chunk)
+            size += len(chunk)
+            if size < window:
+                continue
+            text = context + "".join(pending)
+            out, cut = self._stream_cut(text, len(context), overlap)
+            if cut is not None:
+                if out:
+                    yield out
+                context = text[cut - 1]
+                pending = [text[cut:]]
+                size = len(text) - cut
+            else:
+                pending = [text[len(context):]]
+        text = context + "".join(pending)
+        if len(text) > len(context):
+            yield self._assemble(text, self.spans(text, len(context)), len(context))
+
+    def _stream_cut(self, text: str, start: int, overlap: int) -> Tuple[str, Optional[int]]:
+        sep = max(text.rfind(ch, start) for ch in self.separators)
+        if sep >= start:
+            cut = sep + 1
+            return self._assemble(text, self.spans(text[:cut], start), start, cut), cut
+        spans = self.spans(text, start)
+        cut = len(text) - overlap
+        # Walk back to a position outside (and not touching) every span.
+        for s, e, _ in reversed(spans):
+            if e < cut:
+                break
+            if s <= cut:
+                cut = s - 1
+        if cut <= start:
+            return "", None
+        return self._assemble(text, [sp for sp in spans if sp[1] <= cut], start, cut), cut
+
+    def redact_sequential(self, text: str) -> str:
+        """Reference implementation: one ``sub`` per pattern, in priority order."""
+        for name, pattern in self.patterns:
+            text = pattern.sub(self.placeholders[name], text)
+        return text
+
+
+_DEFAULT: Optional[PIIScanner] = None
+
+
+def default_scanner() -> PIIScanner:
+    global _DEFAULT
+    if _DEFAULT is None:
+        from .PIIRegexLibrary import COMPILED_PATTERNS
+
+        _DEFAULT = PIIScanner(COMPILED_PATTERNS)
+    return _DEFAULT
+
+
+# -----------------------------
+# SAMPLE DOCUMENTS
+# -----------------------------
+_PROSE = (
+    "The committee reviewed the quarterly summary and agreed to revisit the open items. ",
+    "Nobody raised concerns about the rollout plan; the schedule stays as drafted. ",
+    "Is the vendor still on track? The answer, for now, is yes! ",
+    "Several teams asked for clearer guidance on retention, archiving and access reviews. ",
+    "\"We will circulate notes by Friday,\" the chair said. ",
+)
+_PII = (
+    "Reach me at 555-123-4567 after lunch. ",
+    "Send the form to jane.roe@example.com today. ",
+    "Her SSN is 123-45-6789 per the intake sheet. ",
+    "Billing card 4111 1111 1111 1111 was declined. ",
+    "The clinic at 42 Elm Street called back. ",
+    "Login from 192.168.10.24 flagged; ",
+    "Born 04/12/1987, MRN 00482913. ",
+)
+
+
+def sample_document(size: int, pii_every: int = 12, seed: int = 7) -> str:
+    """Deterministic prose with one PII sentence roughly every ``pii_every`` sentences."""
+    import random
+
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    while total < size:
+        sentence = rng.choice(_PII) if rng.randrange(pii_every) == 0 else rng.choice(_PROSE)
+        parts.append(sentence)
+        total += len(sentence)
+    return "".join(parts)[:size]
+
+
+__all__ = ["PIIScanner", "default_scanner", "sample_document"]
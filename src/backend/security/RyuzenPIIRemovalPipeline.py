@@ -1,8 +1,10 @@
 """Multi-stage PII removal pipeline for Ryuzen."""
 from __future__ import annotations
 
+import codecs
 import datetime as _dt
-from typing import Any, Dict, Optional, Union
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
 from ..utils.JSONSafe import safe_serialize
 from ..utils.Normalize import canonicalize_spacing, normalize_whitespace
@@ -10,10 +12,11 @@ from ..utils.RegionBucket import ip_to_region
 from ..utils.TimeBucket import bucket_timestamp
 from ..utils.Logging import SafeLogger
 from ..utils.ErrorTypes import SanitizationError
-from .PIIRegexLibrary import COMPILED_PATTERNS
-from .NERMaskingEngine import NERMaskingEngine
+from .PIIScanner import default_scanner
+from .NERMaskingEngine import NERMaskingEngine, shared_engine
 from .MetadataCleaner import (
     remove_hidden_layers,
+    stream_strip_metadata,
     strip_document_metadata,
     strip_exif,
     strip_office_metadata,
@@ -27,10 +30,7 @@ logger = SafeLogger("pii-pipeline")
 class RyuzenPIIRemovalPipeline:
     @staticmethod
     def _regex_stage(text: str) -> str:
-        cleaned = text
-        for name, pattern in COMPILED_PATTERNS:
-            cleaned = pattern.sub(f"[REDACTED_{name}]", cleaned)
-        return cleaned
+        return default_scanner().redact(text)
 
     @staticmethod
     def _ner_stage(text: str, engine: NERMaskingEngine) -> str:
@@ -56,6 +56,10 @@ class RyuzenPIIRemovalPipeline:
 
     @staticmethod
     def _hash_stage(text: str, metadata: Optional[Dict[str, Any]]) -> str:
+        return text + RyuzenPIIRemovalPipeline._telemetry_suffix(len(text), metadata)
+
+    @staticmethod
+    def _telemetry_suffix(length: int, metadata: Optional[Dict[str, Any]]) -> str:
         metadata = metadata or {}
         salt = generate_rotating_salt()
         user = metadata.get("user_id", "anon")
@@ -73,27 +77,133 @@ class RyuzenPIIRemovalPipeline:
             "region": region,
             "user_hash": user_hash,
             "tenant_hash": tenant_hash,
-            "length": len(text),
+            "length": length,
         }
-        return f"{text}\n<!--telemetry:{safe_serialize(envelope)}-->"
+        return f"\n<!--telemetry:{safe_serialize(envelope)}-->"
 
     @staticmethod
     def _sanitize_output(text: str) -> str:
         return text.replace("<", "&lt;").replace(">", "&gt;")
 
+    @staticmethod
+    def _prepare(text_or_bytes: Union[str, bytes]) -> str:
+        stage0 = RyuzenPIIRemovalPipeline._metadata_stage(text_or_bytes)
+        text = stage0.decode("utf-8", errors="ignore") if isinstance(stage0, bytes) else str(stage0)
+        return RyuzenPIIRemovalPipeline._regex_stage(text)
+
+    @staticmethod
+    def _finish(masked: str, metadata: Optional[Dict[str, Any]]) -> str:
+        stage3 = RyuzenPIIRemovalPipeline._placeholder_stage(masked)
+        stage4 = RyuzenPIIRemovalPipeline._normalize_stage(stage3)
+        stage5 = RyuzenPIIRemovalPipeline._hash_stage(stage4, metadata)
+        return RyuzenPIIRemovalPipeline._sanitize_output(stage5)
+
     @staticmethod
     def run(text_or_bytes: Union[str, bytes], metadata: Optional[Dict[str, Any]] = None) -> str:
         try:
-            ner_engine = NERMaskingEngine()
-            stage0 = RyuzenPIIRemovalPipeline._metadata_stage(text_or_bytes)
-            text = stage0.decode("utf-8", errors="ignore") if isinstance(stage0, bytes) else str(stage0)
-            stage1 = RyuzenPIIRemovalPipeline._regex_stage(text)
-            stage2 = RyuzenPIIRemovalPipeline._ner_stage(stage1, ner_engine)
-            stage3 = RyuzenPIIRemovalPipeline._placeholder_stage(stage2)
-            stage4 = RyuzenPIIRemovalPipeline._normalize_stage(stage3)
-            stage5 = RyuzenPIIRemovalPipeline._hash_stage(stage4, metadata)
-            stage6 = RyuzenPIIRemovalPipeline._sanitize_output(stage5)
-            return stage6
+            stage1 = RyuzenPIIRemovalPipeline._prepare(text_or_bytes)
+            stage2 = RyuzenPIIRemovalPipeline._ner_stage(stage1, shared_engine())
+            return RyuzenPIIRemovalPipeline._finish(stage2, metadata)
+        except Exception as exc:  # pragma: no cover
+            logger.error("pii_pipeline_failure", error=str(exc))
+            raise SanitizationError("PII pipeline failed") from exc
+
+    @staticmethod
+    def run_batch(
+        texts: Sequence[Union[str, bytes]],
+        metadata: Union[None, Dict[str, Any], Sequence[Optional[Dict[str, Any]]]] = None,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[str]:
+        """Sanitize many documents, running NER over them as one ``nlp.pipe`` batch.
+
+        ``metadata`` is either shared by every document or a list aligned with
+        ``texts``.
+        """
+        if metadata is None or isinstance(metadata, dict):
+            metadata = [metadata] * len(texts)
+        if len(metadata) != len(texts):
+            raise SanitizationError("metadata must be a dict or match texts in length")
+        try:
+            prepared = [RyuzenPIIRemovalPipeline._prepare(item) for item in texts]
+            masked = shared_engine().mask_batch(prepared, batch_size=batch_size, n_process=n_process)
+            return [RyuzenPIIRemovalPipeline._finish(text, meta) for text, meta in zip(masked, metadata)]
+        except Exception as exc:  # pragma: no cover
+            logger.error("pii_pipeline_failure", error=str(exc))
+            raise SanitizationError("PII pipeline failed") from exc
+
+    @staticmethod
+    def _iter_source(source: Any, read_size: int) -> Iterator[Union[str, bytes]]:
+        if isinstance(source, (str, bytes, bytearray)):
+            for start in range(0, len(source), read_size):
+                yield source[start : start + read_size]
+        elif hasattr(source, "read"):
+            while True:
+                block = source.read(read_size)
+                if not block:
+                    break
+                yield block
+        else:
+            yield from source
+
+    @staticmethod
+    def _decode_stream(chunks: Iterable[Union[str, bytes]]) -> Iterator[str]:
+        chunks = iter(chunks)
+        first = next((c for c in chunks if c), None)
+        if first is None:
+            return
+        chunks = itertools.chain([first], chunks)
+        if isinstance(first, str):
+            yield from chunks
+            return
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        for block in stream_strip_metadata(bytes(c) for c in chunks):
+            text = decoder.decode(block)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    @staticmethod
+    def run_stream(
+        source: Any,
+        metadata: Optional[Dict[str, Any]] = None,
+        window: int = 65536,
+        overlap: int = 4096,
+        read_size: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Sanitize a large document incrementally, yielding output chunks.
+
+        ``source`` is a str/bytes object, a file-like object with ``read`` or
+        an iterable of str/bytes chunks. Each stage keeps at most ``window``
+        plus ``overlap`` characters: the regex and NER stages carry the tail
+        of every window into the next one so no match is split, and the
+        remaining stages work between whitespace. The concatenated output
+        equals ``run`` on the whole document, telemetry envelope last.
+        """
+        try:
+            text = RyuzenPIIRemovalPipeline._decode_stream(
+                RyuzenPIIRemovalPipeline._iter_source(source, read_size or window)
+            )
+            redacted = default_scanner().redact_stream(text, window, overlap)
+            masked = shared_engine().mask_stream(redacted, window, overlap)
+            length = 0
+            in_word = False  # the previous piece was cut inside a word
+            for piece in masked:
+                words = RyuzenPIIRemovalPipeline._normalize_stage(
+                    RyuzenPIIRemovalPipeline._placeholder_stage(piece)
+                )
+                if not words:
+                    in_word = False
+                    continue
+                if length and not (in_word and not piece[0].isspace()):
+                    words = " " + words
+                in_word = not piece[-1].isspace()
+                length += len(words)
+                yield RyuzenPIIRemovalPipeline._sanitize_output(words)
+            suffix = RyuzenPIIRemovalPipeline._telemetry_suffix(length, metadata)
+            yield RyuzenPIIRemovalPipeline._sanitize_output(suffix)
         except Exception as exc:  # pragma: no cover
             logger.error("pii_pipeline_failure", error=str(exc))
             raise SanitizationError("PII pipeline failed") from exc
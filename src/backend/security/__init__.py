@@ -3,7 +3,8 @@ from .KeyManager import KeyManager
 from .SecureMemory import secure_buffer, wipe_buffer, scrub_dict, scrub_text, secure_memory
 from .RyuzenPIIRemovalPipeline import RyuzenPIIRemovalPipeline
 from .PIIRegexLibrary import PII_PATTERNS, COMPILED_PATTERNS
-from .NERMaskingEngine import NERMaskingEngine
+from .PIIScanner import PIIScanner
+from .NERMaskingEngine import NERMaskingEngine, shared_engine
 from .MetadataCleaner import (
     strip_exif,
     strip_pdf_metadata,
@@ -32,7 +33,9 @@ __all__ = [
     "RyuzenPIIRemovalPipeline",
     "PII_PATTERNS",
     "COMPILED_PATTERNS",
+    "PIIScanner",
     "NERMaskingEngine",
+    "shared_engine",
     "strip_exif",
     "strip_pdf_metadata",
     "strip_document_metadata",
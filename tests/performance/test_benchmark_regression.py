@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+from src.backend.core.toron.engine_v2.performance.benchmark import baseline
+from src.backend.core.toron.engine_v2.performance.benchmark.benchmark_runner import BenchmarkRunner
+from src.backend.core.toron.engine_v2.performance.benchmark.fakes import LatencyModel
+
+
+pytestmark = pytest.mark.performance
+
+BASELINE = os.getenv("TORON_BENCH_BASELINE")
+
+
+@pytest.mark.skipif(not BASELINE, reason="set TORON_BENCH_BASELINE to gate on a stored baseline")
+def test_engine_hot_paths_within_baseline():
+    runner = BenchmarkRunner.with_fakes(provider_latency=LatencyModel(mean_ms=50.0, seed=1))
+    results = asyncio.run(runner.run_suite())
+
+    tolerance = float(os.getenv("TORON_BENCH_TOLERANCE", "0.15"))
+    regressions = baseline.compare(baseline.load_baseline(BASELINE), results, tolerance=tolerance)
+
+    assert not regressions, "\n".join(str(r) for r in regressions)
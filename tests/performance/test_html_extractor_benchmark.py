@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import pytest
+
+from src.backend.retriever.HTMLExtractor import DEFAULT_BACKEND, EXTRACTORS
+
+
+pytestmark = pytest.mark.performance
+
+FIXTURES = sorted((Path(__file__).parent.parent / "fixtures" / "html").glob("*.html"))
+
+
+def benchmark(
+    paths: Sequence[Path],
+    backends: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+) -> Dict[str, Dict[str, float]]:
+    """Best-of-``repeat`` extraction throughput per backend over saved HTML files."""
+    pages = [Path(path).read_text(encoding="utf-8") for path in paths]
+    size = sum(len(page.encode("utf-8")) for page in pages)
+    results: Dict[str, Dict[str, float]] = {}
+    for name in backends or list(EXTRACTORS):
+        extractor = EXTRACTORS[name]
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in pages:
+                extractor(page, "")
+            best = min(best, time.perf_counter() - start)
+        results[name] = {
+            "pages_per_sec": len(pages) / best,
+            "mb_per_sec": size / best / (1024 * 1024),
+        }
+    return results
+
+
+def test_default_backend_outpaces_beautifulsoup():
+    pytest.importorskip("bs4")
+    results = benchmark(FIXTURES, backends=[DEFAULT_BACKEND, "bs4"], repeat=5)
+
+    assert results[DEFAULT_BACKEND]["pages_per_sec"] > results["bs4"]["pages_per_sec"] * 1.5
+
+
+if __name__ == "__main__":  # pragma: no cover - manual run: PYTHONPATH=. python tests/performance/...
+    import sys
+
+    fixtures = sorted(Path(sys.argv[1]).glob("*.html")) if len(sys.argv) > 1 else FIXTURES
+    for name, row in benchmark(fixtures).items():
+        print(f"{name:>10}  {row['pages_per_sec']:8.1f} pages/s  {row['mb_per_sec']:6.2f} MB/s")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, Optional, Sequence
+
+import pytest
+
+from src.backend.security.PIIScanner import PIIScanner, default_scanner, sample_document
+
+
+pytestmark = pytest.mark.performance
+
+SIZES = (1024, 100 * 1024) + ((10 * 1024 * 1024,) if os.getenv("PII_BENCH_FULL") else ())
+
+
+def benchmark(
+    sizes: Sequence[int] = (1024, 100 * 1024, 10 * 1024 * 1024),
+    pii_every: int = 12,
+    repeat: int = 3,
+    scanner: Optional[PIIScanner] = None,
+) -> Dict[int, Dict[str, float]]:
+    """Best-of-``repeat`` wall time of sequential vs single-pass redaction per document size."""
+    scanner = scanner or default_scanner()
+    results: Dict[int, Dict[str, float]] = {}
+    for size in sizes:
+        doc = sample_document(size, pii_every)
+        timings = {}
+        outputs = {}
+        for label, fn in (("sequential", scanner.redact_sequential), ("single_pass", scanner.redact)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                outputs[label] = fn(doc)
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+        results[size] = {
+            "sequential_ms": timings["sequential"] * 1000,
+            "single_pass_ms": timings["single_pass"] * 1000,
+            "speedup": timings["sequential"] / max(timings["single_pass"], 1e-9),
+            "identical": float(outputs["sequential"] == outputs["single_pass"]),
+        }
+    return results
+
+
+def test_benchmark_reports_identical_output():
+    results = benchmark(sizes=(1024, 16 * 1024), repeat=1)
+
+    assert all(row["identical"] for row in results.values())
+    assert all(row["single_pass_ms"] > 0 for row in results.values())
+
+
+def test_single_pass_scanner_beats_sequential_subs():
+    results = benchmark(sizes=SIZES)
+
+    for size, row in results.items():
+        assert row["identical"], size
+    # Small documents are dominated by fixed overhead; gate on the larger ones.
+    assert all(row["speedup"] > 1.0 for size, row in results.items() if size >= 100 * 1024)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual run: PYTHONPATH=. python tests/performance/...
+    for size, row in benchmark().items():
+        print(
+            f"{size:>10} B  sequential {row['sequential_ms']:9.2f} ms  "
+            f"single-pass {row['single_pass_ms']:9.2f} ms  x{row['speedup']:.2f}"
+            f"  identical={bool(row['identical'])}"
+        )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict, Optional
+
+import pytest
+
+from src.backend.rate_limit.UserRateLimiter import TokenBucket, UserRateLimiter
+
+
+pytestmark = pytest.mark.performance
+
+USERS = 1_000_000 if os.getenv("RATE_LIMIT_BENCH_FULL") else 100_000
+
+
+class SingleLockLimiter:
+    """The pre-sharding table: one lock, TokenBucket pairs, users never forgotten."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, tuple] = {}
+
+    def allow(self, user_id: str, weight: float = 1.0) -> bool:
+        with self._lock:
+            if user_id not in self._buckets:
+                self._buckets[user_id] = (TokenBucket(120, 2.0), TokenBucket(2000, 2000 / 3600.0))
+            minute, hour = self._buckets[user_id]
+            return minute.consume(weight) and hour.consume(weight)
+
+
+def benchmark(users: int = 1_000_000, calls_per_user: int = 2, max_users: Optional[int] = 100_000) -> Dict[str, Dict[str, float]]:
+    """Throughput and traced memory with ``users`` distinct IDs.
+
+    Compares the sharded limiter (uncapped and capped at ``max_users``) with
+    ``SingleLockLimiter``.
+    """
+    ids = [f"user-{i:07d}" for i in range(users)]
+    factories = {
+        "single_lock": SingleLockLimiter,
+        "sharded": UserRateLimiter,
+        "sharded_capped": lambda: UserRateLimiter(max_users=max_users),
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for label, factory in factories.items():
+        limiter = factory()
+        start = time.perf_counter()
+        for _ in range(calls_per_user):
+            for user_id in ids:
+                limiter.allow(user_id)
+        elapsed = time.perf_counter() - start
+        del limiter
+
+        tracemalloc.start()
+        limiter = factory()
+        for user_id in ids:
+            limiter.allow(user_id)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del limiter
+
+        results[label] = {
+            "calls_per_sec": users * calls_per_user / elapsed,
+            "memory_mb": memory / (1024 * 1024),
+        }
+    return results
+
+
+def test_sharded_limiter_memory_and_throughput():
+    results = benchmark(users=USERS, calls_per_user=2, max_users=USERS // 10)
+
+    assert results["sharded"]["memory_mb"] < results["single_lock"]["memory_mb"]
+    assert results["sharded_capped"]["memory_mb"] < results["sharded"]["memory_mb"] / 4
+    assert results["sharded"]["calls_per_sec"] > results["single_lock"]["calls_per_sec"] * 0.8
+
+
+if __name__ == "__main__":  # pragma: no cover - manual run: PYTHONPATH=. python tests/performance/...
+    for label, row in benchmark().items():
+        print(f"{label:>15}  {row['calls_per_sec']:>12,.0f} calls/s  {row['memory_mb']:8.1f} MB")
@@ -0,0 +1,208 @@
+"""Batched, background audit writing."""
+
+import base64
+import json
+import os
+import struct
+import threading
+
+import pytest
+
+from src.backend.audit import (
+    AuditBackpressureError,
+    AuditEvent,
+    AuditWriter,
+    EncryptedAuditTrail,
+    read_frames,
+    read_segments,
+)
+from src.backend.security.KeyManager import KeyManager
+from src.backend.utils.ErrorTypes import SecurityError
+
+AUDIT_KEY = os.urandom(32)
+
+
+@pytest.fixture(autouse=True)
+def audit_key(monkeypatch):
+    monkeypatch.setenv("RYUZEN_AUDIT_KEY", base64.b64encode(AUDIT_KEY).decode())
+
+
+def _event(i, tenant="acme"):
+    return AuditEvent(
+        timestamp=1_700_000_000.0 + i,
+        model="rt-v1.6-base",
+        latency_ms=12.3456,
+        risk_score=0.1,
+        drift_score=0.2,
+        tenant_id=tenant,
+        route_taken=["aws", f"hop-{i}"],
+    )
+
+
+def test_events_are_batched_into_frames(tmp_path):
+    trail = EncryptedAuditTrail(directory=tmp_path, batch_size=10, flush_interval_ms=10_000, fsync=False)
+    for i in range(25):
+        trail.submit(_event(i))
+    trail.close()
+
+    frames = [batch for path in trail.writer.segments() for batch in read_frames(path, trail.writer.key_manager)]
+    assert [len(batch) for batch in frames] == [10, 10, 5]
+
+    entries = list(read_segments(tmp_path, trail.writer.key_manager))
+    assert [e["route"][1] for e in entries] == [f"hop-{i}" for i in range(25)]
+    assert entries[0]["latency_ms"] == 12.346
+    assert len(trail.latest()) == 0  # nothing was encrypted on the request path
+
+
+def test_interval_flushes_partial_batch(tmp_path):
+    writer = AuditWriter(tmp_path, batch_size=1000, flush_interval_ms=20, fsync=False)
+    writer.enqueue({"n": 1})
+
+    for _ in range(100):
+        if writer.stats()["written"]:
+            break
+        threading.Event().wait(0.01)
+
+    assert writer.stats()["frames"] == 1
+    writer.close()
+
+
+def test_flush_makes_queued_entries_readable(tmp_path):
+    writer = AuditWriter(tmp_path, batch_size=1000, flush_interval_ms=60_000)
+    for i in range(7):
+        writer.enqueue({"n": i})
+
+    assert writer.flush(timeout=5)
+    assert [e["n"] for e in read_segments(tmp_path, writer.key_manager)] == list(range(7))
+    writer.close()
+
+
+def test_segments_rotate_and_are_pruned(tmp_path):
+    writer = AuditWriter(tmp_path, batch_size=1, segment_bytes=400, max_segments=3, fsync=False)
+    for i in range(20):
+        writer.enqueue({"n": i, "pad": "x" * 100})
+    writer.close()
+
+    segments = writer.segments()
+    assert len(segments) == 3
+    assert writer.stats()["segments"] > 3
+    tail = [e["n"] for e in read_segments(tmp_path, writer.key_manager)]
+    assert tail == list(range(20 - len(tail), 20))
+
+
+def test_new_writer_starts_a_new_segment(tmp_path):
+    keys = KeyManager()
+    first = AuditWriter(tmp_path, key_manager=keys, fsync=False)
+    first.enqueue({"n": 0})
+    first.close()
+    second = AuditWriter(tmp_path, key_manager=keys, fsync=False)
+    second.enqueue({"n": 1})
+    second.close()
+
+    assert len(second.segments()) == 2
+    assert [e["n"] for e in read_segments(tmp_path, keys)] == [0, 1]
+
+
+def test_segments_are_readable_with_the_persistent_key_after_restart(tmp_path):
+    writer = AuditWriter(tmp_path, fsync=False)
+    writer.enqueue({"n": 0})
+    writer.close()
+    restarted = EncryptedAuditTrail(directory=tmp_path, fsync=False)
+    restarted.submit(_event(1))
+    restarted.close()
+
+    entries = list(read_segments(tmp_path, KeyManager(AUDIT_KEY)))
+    assert [entries[0]["n"], entries[1]["route"][1]] == [0, "hop-1"]
+    with pytest.raises(SecurityError):
+        list(read_segments(tmp_path, KeyManager()))
+
+
+def test_missing_audit_key_is_refused(tmp_path, monkeypatch):
+    monkeypatch.delenv("RYUZEN_AUDIT_KEY")
+
+    with pytest.raises(SecurityError):
+        EncryptedAuditTrail(directory=tmp_path)
+
+
+def test_bounded_queue_applies_backpressure(tmp_path):
+    writer = AuditWriter(tmp_path, batch_size=1, max_queue=2, fsync=False)
+    gate = threading.Event()
+    original = writer._write
+    writer._write = lambda batch: (gate.wait(), original(batch))
+
+    with pytest.raises(AuditBackpressureError):
+        for i in range(50):
+            writer.enqueue({"n": i})
+    assert writer.stats()["rejected"] == 1
+
+    gate.set()
+    writer.close()
+    assert writer.stats()["written"] == i
+
+
+def test_enqueue_fails_fast_after_a_write_error(tmp_path):
+    writer = AuditWriter(tmp_path, batch_size=1, fsync=False)
+    writer._file.close()  # the next frame write raises
+    writer.enqueue({"n": 0})
+    for _ in range(100):
+        if writer.stats()["lost"]:
+            break
+        threading.Event().wait(0.01)
+
+    with pytest.raises(SecurityError):
+        writer.enqueue({"n": 1})
+    assert writer.stats()["lost"] == 1
+    assert writer.stats()["queued"] == 0
+    with pytest.raises(SecurityError):
+        writer.close()
+
+
+def test_key_rotation_and_tampering(tmp_path):
+    trail = EncryptedAuditTrail(directory=tmp_path, batch_size=1, fsync=False)
+    trail.submit(_event(0))
+    trail.flush()
+    trail.rotate_key()
+    trail.submit(_event(1))
+    trail.close()
+
+    path = trail.writer.segments()[0]
+    data_keys = {json.loads(b[12 : 12 + struct.unpack(">I", b[4:8])[0]])["dek"] for b in _raw_frames(path)}
+    assert len(data_keys) == 2
+    assert len(list(read_segments(tmp_path, KeyManager(AUDIT_KEY)))) == 2
+
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(SecurityError):
+        list(read_frames(path, trail.writer.key_manager))
+
+
+def test_torn_tail_frame_is_ignored(tmp_path):
+    writer = AuditWriter(tmp_path, batch_size=1, fsync=False)
+    writer.enqueue({"n": 0})
+    writer.enqueue({"n": 1})
+    writer.close()
+
+    path = writer.segments()[0]
+    path.write_bytes(path.read_bytes()[:-5])
+    assert [e["n"] for e in read_segments(tmp_path, writer.key_manager)] == [0]
+
+
+def test_submit_without_directory_records_inline():
+    trail = EncryptedAuditTrail(max_in_memory=3)
+    for i in range(5):
+        trail.submit(_event(i))
+
+    assert trail.writer is None
+    assert len(trail.export_for_offline_review()) == 3
+    assert trail.flush()
+
+
+def _raw_frames(path):
+    data = path.read_bytes()
+    pos = 0
+    while pos < len(data):
+        header_len, body_len = struct.unpack(">II", data[pos + 4 : pos + 12])
+        end = pos + 12 + header_len + body_len
+        yield data[pos:end]
+        pos = end
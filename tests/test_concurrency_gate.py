@@ -0,0 +1,179 @@
+"""Async, tier-weighted concurrency gate."""
+
+import asyncio
+import random
+
+import pytest
+
+from src.backend.rate_limit import FairConcurrencyGate
+from src.backend.utils.ErrorTypes import RateLimitError
+
+
+@pytest.fixture
+def without_asyncio_timeout(monkeypatch):
+    """Run on the Python 3.10 asyncio surface, which has no ``asyncio.timeout``."""
+    monkeypatch.delattr(asyncio, "timeout", raising=False)
+
+
+async def _settle(rounds=5):
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+def test_permits_are_handed_out_by_weight():
+    async def scenario():
+        gate = FairConcurrencyGate(limit=1, weights={"free": 1, "premium": 3})
+        await gate.wait("free")
+        order = []
+
+        async def request(tier):
+            async with gate.acquire(tier):
+                order.append(tier)
+
+        tasks = [asyncio.create_task(request(t)) for t in ["free"] * 8 + ["premium"] * 8]
+        await _settle()
+        gate.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    order = asyncio.run(scenario())
+    # While both tiers are backlogged premium gets three permits for every free one.
+    assert order[:8].count("premium") == 6
+    assert sorted(order) == ["free"] * 8 + ["premium"] * 8
+
+
+def test_full_tier_queue_rejects_immediately():
+    async def scenario():
+        gate = FairConcurrencyGate(limit=1, max_queue={"free": 2, "premium": 5})
+        await gate.wait("free")
+        waiters = [asyncio.create_task(gate.wait("free")) for _ in range(2)]
+        await _settle()
+        with pytest.raises(RateLimitError):
+            await gate.wait("free")
+        premium = asyncio.create_task(gate.wait("premium"))
+        await _settle()
+        assert gate.queued("premium") == 1
+        for task in waiters + [premium]:
+            task.cancel()
+        await asyncio.gather(*waiters, premium, return_exceptions=True)
+        return gate
+
+    gate = asyncio.run(scenario())
+    assert gate.stats()["free"]["rejected"] == 1
+    assert gate.queued() == 0
+    assert gate.in_flight() == 1
+
+
+@pytest.mark.usefixtures("without_asyncio_timeout")
+def test_cancel_after_handoff_passes_permit_on():
+    async def scenario():
+        gate = FairConcurrencyGate(limit=1)
+        await gate.wait()
+        first = asyncio.create_task(gate.wait())
+        second = asyncio.create_task(gate.wait())
+        await _settle()
+        gate.release()  # hands the permit to ``first`` ...
+        first.cancel()  # ... which is cancelled before it runs
+        await asyncio.gather(first, return_exceptions=True)
+        await asyncio.wait_for(second, 1)
+        gate.release()
+        return gate, first
+
+    gate, first = asyncio.run(scenario())
+    assert first.cancelled()
+    assert gate.in_flight() == 0
+
+
+@pytest.mark.usefixtures("without_asyncio_timeout")
+def test_timeout_raises_and_leaves_queue():
+    async def scenario():
+        gate = FairConcurrencyGate(limit=1, timeout=0.01)
+        await gate.wait()
+        with pytest.raises(RateLimitError):
+            await gate.wait("pro")
+        return gate
+
+    gate = asyncio.run(scenario())
+    assert gate.queued() == 0
+    assert gate.stats()["pro"]["timed_out"] == 1
+
+
+def test_wait_histogram_snapshot():
+    async def scenario():
+        gate = FairConcurrencyGate(limit=2)
+        async with gate.acquire("pro"):
+            async with gate.acquire("pro"):
+                pass
+        return gate.wait_histogram.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["pro"]["count"] == 2
+    assert snapshot["pro"]["buckets"]["+Inf"] == 2
+    assert snapshot["pro"]["buckets"]["0.001"] == 2
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _simulate(weights, tier_of, ticks=400, seed=11):
+    """Discrete-time overload: 2 permits/tick of capacity against ~3.3 requests/tick."""
+    clock = Clock()
+    gate = FairConcurrencyGate(limit=8, weights=weights, max_queue=64, timeout=None, clock=clock)
+    rng = random.Random(seed)
+    holding = []
+    waits = {"free": [], "premium": []}
+    rejected = {"free": 0, "premium": 0}
+
+    async def request(tier):
+        start = clock()
+        try:
+            async with gate.acquire(tier_of(tier)):
+                waits[tier].append(clock() - start)
+                done = asyncio.Event()
+                holding.append((clock() + 4, done))
+                await done.wait()
+        except RateLimitError:
+            rejected[tier] += 1
+
+    async def run():
+        tasks = []
+        for _ in range(ticks):
+            clock.now += 1
+            for release_at, done in [h for h in holding if h[0] <= clock.now]:
+                holding.remove((release_at, done))
+                done.set()
+            arrivals = ["free"] * rng.randint(1, 5) + ["premium"] * (rng.random() < 0.3)
+            rng.shuffle(arrivals)
+            tasks += [asyncio.create_task(request(tier)) for tier in arrivals]
+            await _settle(10)
+        for _, done in holding:
+            done.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(run())
+    return waits, rejected
+
+
+def _p99(values):
+    values = sorted(values)
+    return values[int(0.99 * (len(values) - 1))]
+
+
+def test_premium_tail_latency_is_bounded_under_overload():
+    fair_waits, fair_rejected = _simulate({"free": 1, "premium": 8}, lambda tier: tier)
+    fifo_waits, _ = _simulate({"free": 1}, lambda tier: "free")
+
+    # Premium demand (0.3/tick) is well within its share, so it barely queues ...
+    assert _p99(fair_waits["premium"]) <= 4
+    assert fair_rejected["premium"] == 0
+    # ... while a single FIFO queue makes it wait behind the free-tier backlog.
+    assert _p99(fifo_waits["premium"]) >= 5 * _p99(fair_waits["premium"])
+    # The overload is shed from the free tier.
+    assert fair_rejected["free"] > 0
@@ -0,0 +1,147 @@
+"""Constant-memory global rate limiters against the exact sliding log."""
+
+import random
+from collections import deque
+
+import pytest
+
+from src.backend.rate_limit import GCRARateLimiter, GlobalRateLimiter
+from src.backend.rate_limit.global_rate_limiter import GlobalRateLimiter as APIGlobalRateLimiter
+
+
+class SlidingLog:
+    """The previous deque implementation: one timestamp per admitted request."""
+
+    def __init__(self, max_requests, window_seconds, clock):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.events = deque()
+
+    def allow(self):
+        now = self.clock()
+        while self.events and now - self.events[0] > self.window_seconds:
+            self.events.popleft()
+        if len(self.events) >= self.max_requests:
+            return False
+        self.events.append(now)
+        return True
+
+
+def bursty_arrivals(seed, duration=3_600.0, base_rate=8.0):
+    """Poisson background traffic with occasional dense bursts."""
+    rng = random.Random(seed)
+    now = 0.0
+    while now < duration:
+        if rng.random() < 0.002:
+            for _ in range(rng.randint(50, 400)):
+                now += rng.expovariate(2_000.0)
+                yield now
+        now += rng.expovariate(base_rate)
+        yield now
+
+
+def max_in_any_window(times, window):
+    """Largest number of timestamps within any closed interval of length ``window``."""
+    best = 0
+    start = 0
+    for end, ts in enumerate(times):
+        while ts - times[start] > window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_sliding_counter_tracks_exact_log_under_bursts(fake_clock, seed):
+    counter = GlobalRateLimiter(max_requests=300, window_seconds=60, time_provider=fake_clock)
+    exact = SlidingLog(300, 60, fake_clock)
+    admitted = []
+    in_window = deque()
+    errors = []
+    exact_admitted = 0
+
+    for ts in bursty_arrivals(seed):
+        fake_clock.advance(ts - fake_clock())
+        while in_window and ts - in_window[0] > 60:
+            in_window.popleft()
+        errors.append(abs(counter._estimate(ts, counter._advance(ts)) - len(in_window)))
+        if counter.allow():
+            admitted.append(ts)
+            in_window.append(ts)
+        exact_admitted += exact.allow()
+
+    # The estimate of the counter's own window stays close to the true count ...
+    assert sum(errors) / len(errors) < 1.0
+    assert max(errors) < 300 * 0.05
+    # ... so it admits what the exact log admits and overshoots a real window only slightly.
+    assert len(admitted) == pytest.approx(exact_admitted, rel=0.01)
+    assert max_in_any_window(admitted, 60) <= 300 * 1.02
+
+
+def test_sliding_counter_memory_is_constant(fake_clock):
+    counter = GlobalRateLimiter(max_requests=10_000, window_seconds=60, slots=30, time_provider=fake_clock)
+    for _ in range(50_000):
+        fake_clock.advance(0.001)
+        counter.allow()
+
+    assert len(counter._counts) == 31
+
+
+def test_sliding_counter_backoff_hint(fake_clock):
+    counter = GlobalRateLimiter(max_requests=100, window_seconds=10, slots=10, time_provider=fake_clock)
+    for _ in range(60):
+        fake_clock.advance(0.05)
+        counter.allow()
+    fake_clock.advance(2.0)
+    while counter.allow():
+        fake_clock.advance(0.01)
+
+    wait = counter.backoff_hint()
+    assert wait > 0
+    fake_clock.advance(wait - 0.01)
+    assert not counter.allow()
+    fake_clock.advance(0.02)
+    assert counter.backoff_hint() == 0.0
+    assert counter.allow()
+
+
+def test_sliding_counter_idle_gap_clears_state(fake_clock):
+    counter = GlobalRateLimiter(max_requests=5, window_seconds=1, time_provider=fake_clock)
+    assert sum(counter.allow() for _ in range(10)) == 5
+    fake_clock.advance(5)
+    assert sum(counter.allow() for _ in range(10)) == 5
+
+
+def test_gcra_backoff_hint_is_exact(fake_clock):
+    limiter = GCRARateLimiter(max_requests=10, window_seconds=1, time_provider=fake_clock)
+
+    assert sum(limiter.allow() for _ in range(20)) == 10
+    wait = limiter.backoff_hint()
+    assert wait == pytest.approx(0.1)
+    fake_clock.advance(wait * 0.99)
+    assert not limiter.allow()
+    fake_clock.advance(wait * 0.02)
+    assert limiter.backoff_hint() == 0.0
+    assert limiter.allow()
+    assert not limiter.allow()
+
+
+def test_gcra_long_run_rate(fake_clock):
+    limiter = GCRARateLimiter(max_requests=50, window_seconds=10, burst=5, time_provider=fake_clock)
+    admitted = 0
+    for _ in range(100_000):
+        fake_clock.advance(0.001)
+        admitted += limiter.allow()
+
+    assert admitted == pytest.approx(50 * 10 + 5, abs=1)
+
+
+def test_api_limiter_raises_when_saturated():
+    limiter = APIGlobalRateLimiter(max_requests=3, window_seconds=60)
+    for _ in range(3):
+        limiter.check()
+    with pytest.raises(RuntimeError):
+        limiter.check()
+    limiter.reset()
+    limiter.check()
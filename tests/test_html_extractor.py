@@ -0,0 +1,119 @@
+"""HTML extraction backends and the retriever's streamed, off-loop parsing path."""
+
+import asyncio
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.backend.retriever import SessionPool, WebRetrieverUnified
+from src.backend.retriever.HTMLExtractor import EXTRACTORS, extract_page
+
+
+web_retriever = importlib.import_module("src.backend.retriever.WebRetrieverUnified")
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "html").glob("*.html"))
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda p: p.name)
+@pytest.mark.parametrize("backend", [name for name in EXTRACTORS if name != "bs4"])
+def test_backends_match_beautifulsoup(path, backend):
+    pytest.importorskip("bs4")
+    html = path.read_text(encoding="utf-8")
+    expected = extract_page(html, "https://example.com/a/", backend="bs4")
+    page = extract_page(html, "https://example.com/a/", backend=backend)
+
+    assert page.text == expected.text
+    assert page.meta == expected.meta
+    assert page.links == expected.links
+
+
+def test_script_style_and_comments_are_dropped():
+    html = (
+        "<html><head><title> Caf&eacute; </title><meta property='og:type' content='article'>"
+        "<style>p{color:red}</style></head><body><!-- hidden --><p>Hello<b>world</b></p>"
+        "<script>var x = '<p>nope</p>';</script><a href='/next'>n</a><a href='/next'>again</a></body></html>"
+    )
+    page = extract_page(html, "https://example.com/docs/")
+
+    assert page.text == "Café Hello world n again"
+    assert page.meta == {"title": "Café", "og:type": "article"}
+    assert page.links == ["https://example.com/next"]
+
+
+def _retriever(handler, **kwargs):
+    def factory(asynchronous):
+        transport = httpx.MockTransport(handler)
+        return httpx.AsyncClient(transport=transport) if asynchronous else httpx.Client(transport=transport)
+
+    pool = SessionPool(client_factory=factory, sweep_interval=0)
+    return WebRetrieverUnified(session_pool=pool, max_retries=1, **kwargs)
+
+
+def test_body_is_truncated_while_streaming():
+    served = []
+
+    async def body():
+        for index in range(64):
+            served.append(index)
+            yield b"<p>" + b"x" * 1020 + b"</p>"
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, content=body())
+
+    async def scenario():
+        return await _retriever(handler, max_body_bytes=4096).get("https://example.com/big")
+
+    payload = asyncio.run(scenario())
+    assert payload["truncated"] is True
+    assert len(served) < 64
+    assert 0 < len(payload["text"]) <= 4096
+
+
+def test_html_is_parsed_off_the_event_loop_and_fetched_once(monkeypatch):
+    requests = []
+    parsed_on = []
+
+    def handler(request):
+        requests.append(request.url)
+        html = "<html><head><title>T</title></head><body><p>Body</p><a href='b'>b</a></body></html>"
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=html)
+
+    def recording_extract(*args):
+        parsed_on.append(threading.current_thread().name)
+        return extract_page(*args)
+
+    monkeypatch.setattr(web_retriever, "extract_page", recording_extract)
+
+    async def scenario():
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="parse")
+        try:
+            return await _retriever(handler, parse_executor=executor).scrape("https://example.com/dir/page")
+        finally:
+            executor.shutdown()
+
+    payload = asyncio.run(scenario())
+    assert len(requests) == 1
+    assert parsed_on and parsed_on[0].startswith("parse")
+    assert payload["text"] == "T Body b"
+    assert payload["meta"] == {"title": "T"}
+    assert payload["links"] == ["https://example.com/dir/b"]
+    assert payload["truncated"] is False
+
+
+def test_close_shuts_down_only_an_owned_parse_executor():
+    owned = _retriever(lambda request: httpx.Response(204))
+    shared = ThreadPoolExecutor(max_workers=1)
+    borrowed = _retriever(lambda request: httpx.Response(204), parse_executor=shared)
+
+    owned.close()
+    borrowed.close()
+    owned.close()
+
+    with pytest.raises(RuntimeError):
+        owned.parse_executor.submit(int)
+    assert shared.submit(int).result() == 0
+    shared.shutdown()
@@ -0,0 +1,88 @@
+"""Batched NER masking and the shared engine used by the PII pipeline."""
+
+import importlib
+from types import SimpleNamespace
+
+from src.backend.security.NERMaskingEngine import NERMaskingEngine, shared_engine
+from src.backend.security.RyuzenPIIRemovalPipeline import RyuzenPIIRemovalPipeline
+
+# The package re-exports the class under the module's name.
+ner_module = importlib.import_module("src.backend.security.NERMaskingEngine")
+
+
+class FakeNLP:
+    """Tags capitalised words listed in ``people`` as PERSON, ``places`` as GPE."""
+
+    def __init__(self, people=("Alice", "Bob"), places=("Paris",)):
+        self.labels = {**{p: "PERSON" for p in people}, **{p: "GPE" for p in places}}
+        self.calls = 0
+        self.pipe_calls = []
+
+    def _doc(self, text):
+        ents = []
+        pos = 0
+        for word in text.split(" "):
+            label = self.labels.get(word.strip(".,"))
+            if label:
+                ents.append(SimpleNamespace(start_char=pos, end_char=pos + len(word.strip(".,")), label_=label))
+            pos += len(word) + 1
+        return SimpleNamespace(ents=ents)
+
+    def __call__(self, text):
+        self.calls += 1
+        return self._doc(text)
+
+    def pipe(self, texts, batch_size=1, n_process=1):
+        texts = list(texts)
+        self.pipe_calls.append((len(texts), batch_size, n_process))
+        return (self._doc(t) for t in texts)
+
+
+def test_mask_replaces_entities_in_one_pass():
+    engine = NERMaskingEngine(nlp=FakeNLP())
+
+    masked = engine.mask("Alice met Bob in Paris.")
+
+    assert masked == "[REDACTED_PERSON] met [REDACTED_PERSON] in [REDACTED_GPE]."
+
+
+def test_mask_batch_uses_pipe_and_preserves_order():
+    nlp = FakeNLP()
+    engine = NERMaskingEngine(nlp=nlp, batch_size=8, n_process=2)
+    texts = ["Alice here", "", "nobody", "Bob in Paris"]
+
+    masked = engine.mask_batch(texts)
+
+    assert masked == ["[REDACTED_PERSON] here", "", "nobody", "[REDACTED_PERSON] in [REDACTED_GPE]"]
+    assert nlp.pipe_calls == [(3, 8, 2)]
+    assert nlp.calls == 0
+    assert masked == [engine.mask(t) for t in texts]
+
+
+def test_mask_batch_overrides_batch_settings():
+    nlp = FakeNLP()
+    engine = NERMaskingEngine(nlp=nlp)
+
+    engine.mask_batch(["Alice"], batch_size=256, n_process=4)
+
+    assert nlp.pipe_calls == [(1, 256, 4)]
+
+
+def test_shared_engine_is_built_once(monkeypatch):
+    monkeypatch.setattr(ner_module, "_SHARED", None)
+
+    assert shared_engine() is shared_engine()
+
+
+def test_run_batch_matches_run(monkeypatch):
+    monkeypatch.setattr(ner_module, "_SHARED", NERMaskingEngine(nlp=FakeNLP()))
+    texts = ["Alice called 555-123-4567", b"Bob lives in Paris", "plain text"]
+    metadata = [{"user_id": "u1"}, None, {"tenant_id": "t"}]
+
+    batch = RyuzenPIIRemovalPipeline.run_batch(texts, metadata, batch_size=2)
+    single = [RyuzenPIIRemovalPipeline.run(t, m) for t, m in zip(texts, metadata)]
+
+    # The telemetry envelope carries a random salt; compare the sanitized body.
+    strip = lambda out: out.split("\n&lt;!--telemetry:")[0]
+    assert [strip(b) for b in batch] == [strip(s) for s in single]
+    assert strip(batch[0]) == "[REDACTED_PERSON] called [REDACTED_PHONE]"
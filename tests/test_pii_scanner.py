@@ -0,0 +1,97 @@
+"""Golden-corpus equivalence tests for the single-pass PII scanner."""
+
+import random
+import re
+
+import pytest
+
+from src.backend.security.PIIRegexLibrary import COMPILED_PATTERNS
+from src.backend.security.PIIScanner import PIIScanner, default_scanner, sample_document
+from src.backend.security.RyuzenPIIRemovalPipeline import RyuzenPIIRemovalPipeline
+
+
+GOLDEN = [
+    "",
+    "nothing to see here",
+    "Call 555-123-4567 or mail a@b.com; SSN 123-45-6789!",
+    "1 123-45-6789",
+    "123-45-6789123-45-6789",
+    "000-12-3456 and 666-12-3456 are not SSNs",
+    "card: 4111 1111 1111 1111, exp 12/25",
+    "4111-1111-1111-1111;4111111111111111",
+    "born 12/31/1999 or 1-2-99",
+    "DL A1234567 passport C12345678 and 123456789",
+    "ip 192.168.0.1 or 10.0.0.255. v6 fe80::1 and 2001:db8::ff00:42:8329",
+    "1.2.3.4",
+    "at 40.7128, -74.0060 near 221 Baker Street, London",
+    "IBAN GB82WEST12345698765432 mrn 00482913",
+    "[REDACTED_SSN] literal placeholder 123-45-6789]",
+    "x[555-123-4567]y!",
+    "a@b.com@c.org",
+    "(555) 123-4567 +44 20 7946 0958",
+    "12 ; 34 56 ! 78 90",
+    "mixed\nlines 123\n456-7890\r\n12 Main St\n",
+    "unicode ٣٤٥-٦٧-٨٩٠١ and café 42 rue Lepic",
+    "trailing digits 1234567",
+    "42",
+]
+
+
+def test_default_library_supports_exact_single_pass():
+    scanner = default_scanner()
+
+    assert scanner.exact
+    assert "[" in scanner.separators and "]" in scanner.separators
+
+
+@pytest.mark.parametrize("text", GOLDEN)
+def test_golden_corpus_matches_sequential_subs(text):
+    scanner = default_scanner()
+
+    assert scanner.redact(text) == scanner.redact_sequential(text)
+
+
+def test_random_corpus_matches_sequential_subs():
+    scanner = default_scanner()
+    rng = random.Random(2024)
+    alphabet = list("abcXYZ 0123456789-.:,/@+()\n\t_'") + list('!;[]#"?')
+    alphabet += [g for g in GOLDEN if g]
+
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+        assert scanner.redact(text) == scanner.redact_sequential(text), text
+
+
+@pytest.mark.parametrize("pii_every", [1, 3, 12])
+def test_documents_match_sequential_subs(pii_every):
+    scanner = default_scanner()
+    doc = sample_document(50_000, pii_every, seed=pii_every)
+
+    assert scanner.redact(doc) == scanner.redact_sequential(doc)
+
+
+def test_spans_are_ordered_and_map_to_original_text():
+    scanner = default_scanner()
+    text = "mail a@b.com; call 555-123-4567 now"
+
+    spans = scanner.spans(text)
+
+    assert [name for _, _, name in spans] == ["EMAIL", "PHONE"]
+    assert [text[s:e] for s, e, _ in spans] == ["a@b.com", "555-123-4567"]
+
+
+def test_pipeline_regex_stage_uses_scanner():
+    text = "Call 555-123-4567 or mail a@b.com; SSN 123-45-6789!"
+
+    assert RyuzenPIIRemovalPipeline._regex_stage(text) == (
+        "Call [REDACTED_PHONE] or mail [REDACTED_EMAIL]; SSN [REDACTED_SSN]!"
+    )
+
+
+def test_incompatible_library_falls_back_to_sequential():
+    patterns = COMPILED_PATTERNS + [("BRACKETED", re.compile(r"\[\w+\]"))]
+    scanner = PIIScanner(patterns)
+    text = "see [REDACTED] and 123-45-6789"
+
+    assert not scanner.exact
+    assert scanner.redact(text) == scanner.redact_sequential(text)
@@ -0,0 +1,151 @@
+"""Streaming PII sanitization must match the whole-document pipeline."""
+
+import base64
+import importlib
+import io
+import random
+import re
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.security.NERMaskingEngine import NERMaskingEngine
+from src.backend.security.PIIScanner import default_scanner, sample_document
+from src.backend.security.RyuzenPIIRemovalPipeline import RyuzenPIIRemovalPipeline
+
+ner_module = importlib.import_module("src.backend.security.NERMaskingEngine")
+
+TELEMETRY = "\n&lt;!--telemetry:"
+
+
+class FakeNLP:
+    """Tags a few known multi-word names so entities can straddle chunk edges."""
+
+    NAMES = {"Jane Roe": "PERSON", "Acme Corp": "ORG", "New York": "GPE"}
+
+    def __call__(self, text):
+        ents = []
+        for name, label in self.NAMES.items():
+            start = text.find(name)
+            while start != -1:
+                ents.append(SimpleNamespace(start_char=start, end_char=start + len(name), label_=label))
+                start = text.find(name, start + 1)
+        return SimpleNamespace(ents=sorted(ents, key=lambda e: e.start_char))
+
+
+def _body(output):
+    return output.split(TELEMETRY)[0]
+
+
+def _chunks(text, seed, largest=97):
+    rng = random.Random(seed)
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, largest)
+        yield text[pos : pos + size]
+        pos += size
+
+
+def _document(size, seed):
+    doc = sample_document(size, pii_every=3, seed=seed)
+    return doc.replace("the chair", "Jane Roe of Acme Corp in New York")
+
+
+@pytest.fixture(params=["heuristic", "model"])
+def engine(request, monkeypatch):
+    nlp = FakeNLP() if request.param == "model" else None
+    shared = NERMaskingEngine(nlp=nlp)
+    shared.nlp = nlp  # force the heuristic path even where spaCy is installed
+    monkeypatch.setattr(ner_module, "_SHARED", shared)
+    return shared
+
+
+@pytest.mark.parametrize("window,overlap", [(256, 64), (2048, 512), (65536, 4096)])
+def test_stream_matches_run(engine, window, overlap):
+    doc = _document(40_000, seed=window)
+
+    streamed = "".join(RyuzenPIIRemovalPipeline.run_stream(_chunks(doc, window), window=window, overlap=overlap))
+
+    assert _body(streamed) == _body(RyuzenPIIRemovalPipeline.run(doc))
+
+
+def test_stream_reports_final_length(engine):
+    doc = _document(5_000, seed=1)
+
+    streamed = "".join(RyuzenPIIRemovalPipeline.run_stream(doc, window=512, overlap=128))
+    length = int(re.search(r'"length": (\d+)', streamed).group(1))
+
+    assert length == len(_body(streamed).replace("&lt;", "<").replace("&gt;", ">"))
+
+
+def test_stream_accepts_bytes_and_file_objects(engine):
+    doc = ("Author: Jane Roe\n" + _document(8_000, seed=2) + " café ✓ %%EOF").encode("utf-8")
+
+    expected = _body(RyuzenPIIRemovalPipeline.run(doc))
+    # Tiny reads split markers and multi-byte characters across chunk edges.
+    from_file = "".join(RyuzenPIIRemovalPipeline.run_stream(io.BytesIO(doc), window=300, overlap=64, read_size=7))
+    from_chunks = "".join(RyuzenPIIRemovalPipeline.run_stream(_chunks(doc, 3, largest=5), window=300, overlap=64))
+
+    assert _body(from_file) == expected
+    assert _body(from_chunks) == expected
+
+
+def test_scanner_stream_without_separators():
+    scanner = default_scanner()
+    doc = sample_document(30_000, pii_every=2, seed=5)
+    for ch in scanner.separators:
+        doc = doc.replace(ch, "")
+
+    streamed = "".join(scanner.redact_stream(_chunks(doc, 5), window=1024, overlap=256))
+
+    assert streamed == scanner.redact(doc)
+
+
+def test_stream_memory_is_bounded_by_window(monkeypatch):
+    monkeypatch.setattr(ner_module, "_SHARED", NERMaskingEngine(nlp=FakeNLP()))
+    chunk = _document(4096, seed=9)
+
+    def source():
+        for _ in range(256):  # 1 MB, generated lazily
+            yield chunk
+
+    tracemalloc.start()
+    try:
+        for _ in RyuzenPIIRemovalPipeline.run_stream(source(), window=16_384, overlap=1024):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 400_000
+
+
+def test_whitespace_free_stream_is_cut_and_bounded(engine):
+    blob = base64.b64encode(random.Random(4).randbytes(768 * 1024)).decode()  # 1 MB, no whitespace
+
+    def source():
+        for start in range(0, len(blob), 4096):
+            yield blob[start : start + 4096]
+
+    tracemalloc.start()
+    began = time.perf_counter()
+    try:
+        size = sum(len(piece) for piece in engine.mask_stream(source(), window=16_384, overlap=1024))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert size == len(blob)
+    assert time.perf_counter() - began < 2.0
+    assert peak < 400_000
+
+
+def test_stream_matches_run_without_whitespace(engine):
+    rng = random.Random(6)
+    doc = base64.b64encode(rng.randbytes(30_000)).decode() + " Jane Roe " + base64.b64encode(rng.randbytes(9_000)).decode()
+
+    streamed = "".join(RyuzenPIIRemovalPipeline.run_stream(_chunks(doc, 8), window=2048, overlap=512))
+
+    assert _body(streamed) == _body(RyuzenPIIRemovalPipeline.run(doc))
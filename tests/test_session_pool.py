@@ -0,0 +1,159 @@
+"""Retriever session pool: direct handoff, bounded overflow and background eviction."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.backend.retriever import SessionPool, SessionPoolExhausted
+
+
+@pytest.fixture
+def without_asyncio_timeout(monkeypatch):
+    """Run on the Python 3.10 asyncio surface, which has no ``asyncio.timeout``."""
+    monkeypatch.delattr(asyncio, "timeout", raising=False)
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pool(**kwargs):
+    kwargs.setdefault("sweep_interval", 0)
+    return SessionPool(client_factory=lambda asynchronous: FakeAsyncClient() if asynchronous else FakeClient(), **kwargs)
+
+
+def test_released_sessions_are_reused():
+    async def scenario():
+        pool = _pool(max_sessions_per_region=2)
+        first = await pool.acquire("eu")
+        pool.release("eu", first)
+        second = await pool.acquire("eu")
+        pool.release("eu", second)
+        return pool, first, second
+
+    pool, first, second = asyncio.run(scenario())
+    stats = pool.metrics()["regions"]["eu"]
+    assert first is second
+    assert stats["created"] == 1 and stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["idle"] == 1 and stats["in_use"] == 0
+
+
+def test_waiter_is_handed_the_released_session():
+    async def scenario():
+        pool = _pool(max_sessions_per_region=1)
+        held = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire(timeout=5))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        pool.release("global", held)
+        got = await asyncio.wait_for(waiter, 0.01)
+        return pool, held, got
+
+    pool, held, got = asyncio.run(scenario())
+    stats = pool.metrics()["total"]
+    assert got is held
+    assert stats["waited"] == 1 and stats["overflow"] == 0
+    assert 0.04 < stats["wait_seconds"] < 1.0
+    assert stats["wait_histogram"]["global"]["count"] == 1
+
+
+@pytest.mark.usefixtures("without_asyncio_timeout")
+def test_overflow_is_capped_and_never_pooled():
+    async def scenario():
+        pool = _pool(max_sessions_per_region=1, max_overflow=1)
+        pooled = await pool.acquire(timeout=0)
+        extra = await pool.acquire(timeout=0.01)
+        with pytest.raises(SessionPoolExhausted):
+            await pool.acquire(timeout=0.01)
+        pool.release("global", extra)
+        await asyncio.sleep(0)
+        return pool, pooled, extra
+
+    pool, pooled, extra = asyncio.run(scenario())
+    stats = pool.metrics()["regions"]["global"]
+    assert extra is not pooled and extra.closed
+    assert stats["overflow"] == 1 and stats["exhausted"] == 1
+    assert stats["idle"] == 0 and stats["in_use"] == 1
+
+
+@pytest.mark.usefixtures("without_asyncio_timeout")
+def test_cancelled_waiter_passes_the_session_on():
+    async def scenario():
+        pool = _pool(max_sessions_per_region=1)
+        held = await pool.acquire()
+        first = asyncio.create_task(pool.acquire())
+        second = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        pool.release("global", held)  # handed to ``first`` ...
+        first.cancel()  # ... which is cancelled before it resumes
+        await asyncio.gather(first, return_exceptions=True)
+        got = await asyncio.wait_for(second, 1)
+        return pool, held, got, first
+
+    pool, held, got, first = asyncio.run(scenario())
+    assert first.cancelled()
+    assert got is held
+    assert pool.metrics()["regions"]["global"]["in_use"] == 1
+
+
+def test_sync_waiter_in_a_thread_gets_a_slot_from_an_async_release():
+    async def scenario():
+        pool = _pool(max_sessions_per_region=1)
+        held = await pool.acquire()
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(client=pool.acquire_sync(timeout=5)))
+        thread.start()
+        await asyncio.sleep(0.05)
+        pool.release("global", held)
+        await asyncio.to_thread(thread.join)
+        return pool, held, result["client"]
+
+    pool, held, client = asyncio.run(scenario())
+    assert isinstance(client, FakeClient)
+    assert held.closed  # an async client cannot serve a sync caller, so its slot was passed on
+    assert pool.metrics()["regions"]["global"]["in_use"] == 1
+
+
+def test_background_sweeper_evicts_idle_sessions():
+    clock = Clock()
+
+    async def scenario():
+        pool = _pool(idle_seconds=10, sweep_interval=0.01, clock=clock)
+        sessions = [await pool.acquire() for _ in range(3)]
+        for session in sessions:
+            pool.release("global", session)
+        clock.now += 11
+        await asyncio.sleep(0.05)
+        return pool, sessions
+
+    pool, sessions = asyncio.run(scenario())
+    stats = pool.metrics()["regions"]["global"]
+    assert all(session.closed for session in sessions)
+    assert stats["evicted"] == 3 and stats["idle"] == 0
+
+
+def test_backoff_seconds_is_deprecated():
+    with pytest.warns(DeprecationWarning, match="backoff_seconds"):
+        SessionPool(backoff_seconds=0.1)
@@ -0,0 +1,90 @@
+"""Sharded, memory-bounded per-user rate limiter."""
+
+import asyncio
+import random
+import threading
+
+from src.backend.rate_limit import UserRateLimiter
+
+
+def test_minute_and_hour_buckets(fake_clock):
+    limiter = UserRateLimiter(per_minute=3, per_hour=4, time_provider=fake_clock)
+
+    assert [limiter.allow("alice") for _ in range(4)] == [True, True, True, False]
+    fake_clock.advance(20)  # one minute token back
+    assert limiter.allow("alice")
+    fake_clock.advance(60)  # minute bucket full again, hour bucket is empty
+    assert not limiter.allow("alice")
+    assert limiter.allow("bob")
+
+
+def test_denied_call_does_not_spend_the_other_bucket(fake_clock):
+    limiter = UserRateLimiter(per_minute=2, per_hour=100, time_provider=fake_clock)
+
+    limiter.allow("alice", weight=2)
+    assert not limiter.allow("alice")
+    fake_clock.advance(60)
+    assert limiter.allow("alice", weight=2)
+
+
+def test_idle_eviction_never_changes_a_decision(fake_clock):
+    limiter = UserRateLimiter(per_minute=5, per_hour=20, shards=4, time_provider=fake_clock)
+    reference = UserRateLimiter(per_minute=5, per_hour=20, idle_ttl=float("inf"), time_provider=fake_clock)
+    rng = random.Random(7)
+
+    for _ in range(20_000):
+        fake_clock.advance(rng.choice([0.0, 0.5, 3.0, 400.0]))
+        user = f"user-{rng.randrange(200)}"
+        assert limiter.allow(user) == reference.allow(user)
+        if rng.random() < 0.001:
+            limiter.sweep()
+
+    assert limiter.stats()["evicted"] > 0
+    assert len(limiter) < len(reference)
+
+
+def test_sweep_drops_only_idle_users(fake_clock):
+    limiter = UserRateLimiter(idle_ttl=100, time_provider=fake_clock)
+    for i in range(50):
+        limiter.allow(f"old-{i}")
+    fake_clock.advance(60)
+    limiter.allow("recent")
+    fake_clock.advance(50)
+
+    assert limiter.sweep() == 50
+    assert len(limiter) == 1
+
+
+def test_max_users_bounds_the_table(fake_clock):
+    limiter = UserRateLimiter(shards=1, max_users=100, time_provider=fake_clock)
+
+    for i in range(10_000):
+        limiter.allow(f"user-{i}")
+
+    assert len(limiter) == 100
+    assert limiter.stats()["evicted"] == 9_900
+
+
+def test_concurrent_callers_never_overspend(fake_clock):
+    limiter = UserRateLimiter(per_minute=500, per_hour=10_000, time_provider=fake_clock)
+    allowed = []
+
+    def worker():
+        allowed.append(sum(limiter.allow("shared") for _ in range(200)))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(allowed) == 500
+
+
+def test_allow_async(fake_clock):
+    limiter = UserRateLimiter(per_minute=2, time_provider=fake_clock)
+
+    async def scenario():
+        return await asyncio.gather(*(limiter.allow_async("alice") for _ in range(3)))
+
+    assert asyncio.run(scenario()) == [True, True, False]
@@ -0,0 +1,149 @@
+"""
+Tests for the async ALOEMemory client against an in-process DynamoDB stand-in.
+"""
+
+import asyncio
+import copy
+import json
+import re
+
+from src.backend.core.toron.engine_v2.aloe.aloe_memory import ALOEMemory
+
+
+class ConditionalCheckFailedException(Exception):
+    pass
+
+
+class FakeDynamoDB:
+    """Implements the GetItem/UpdateItem/BatchGetItem subset ALOEMemory uses."""
+
+    def __init__(self, batch_limit=2):
+        self.items = {}
+        self.calls = []
+        self.batch_limit = batch_limit
+
+    async def get_item(self, TableName, Key, ProjectionExpression=None):
+        self.calls.append("get_item" if ProjectionExpression is None else "get_version")
+        item = self.items.get(Key["user_id"]["S"])
+        if item is None:
+            return {}
+        if ProjectionExpression:
+            item = {k: v for k, v in item.items() if k in ProjectionExpression.split(",")}
+        return {"Item": copy.deepcopy(item)}
+
+    async def update_item(self, TableName, Key, UpdateExpression, ExpressionAttributeValues,
+                          ConditionExpression=None, ExpressionAttributeNames=None, ReturnValues=None):
+        self.calls.append("update_item")
+        names = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues
+        uid = Key["user_id"]["S"]
+        item = copy.deepcopy(self.items.get(uid, {"user_id": {"S": uid}}))
+
+        if ConditionExpression:
+            fn, attr = re.match(r"(\w+)\((.+)\)", ConditionExpression).groups()
+            exists = names.get(attr, attr) in item
+            if exists != (fn == "attribute_exists"):
+                raise ConditionalCheckFailedException()
+
+        set_part, _, add_part = UpdateExpression.partition(" ADD ")
+        for assignment in set_part.removeprefix("SET ").split(", "):
+            path, value = assignment.split(" = ")
+            parts = [names.get(p, p) for p in path.split(".")]
+            if len(parts) == 1:
+                item[parts[0]] = values[value]
+            else:
+                item[parts[0]]["M"][parts[1]] = values[value]
+        if add_part:
+            attr, value = add_part.split(" ")
+            current = int(item.get(attr, {"N": "0"})["N"])
+            item[attr] = {"N": str(current + int(values[value]["N"]))}
+
+        self.items[uid] = item
+        return {"Attributes": copy.deepcopy(item)}
+
+    async def batch_get_item(self, RequestItems):
+        self.calls.append("batch_get_item")
+        (table, request), = RequestItems.items()
+        keys = request["Keys"]
+        served, rest = keys[: self.batch_limit], keys[self.batch_limit:]
+        found = [copy.deepcopy(self.items[k["user_id"]["S"]]) for k in served if k["user_id"]["S"] in self.items]
+        resp = {"Responses": {table: found}}
+        if rest:
+            resp["UnprocessedKeys"] = {table: {"Keys": rest}}
+        return resp
+
+
+def _memory(db, ttl=60):
+    return ALOEMemory(table_name="memory", client=db, cache_ttl_seconds=ttl)
+
+
+def test_update_preferences_is_a_single_partial_update():
+    db = FakeDynamoDB()
+    memory = _memory(db)
+
+    async def run():
+        await memory.save("u1", {"skills": ["python"], "preferences": {"tone": "brief"}})
+        db.calls.clear()
+        return await memory.update_preferences("u1", {"lang": "fr"})
+
+    result = asyncio.run(run())
+
+    assert db.calls == ["update_item"]
+    assert result == {"skills": ["python"], "preferences": {"tone": "brief", "lang": "fr"}}
+    assert db.items["u1"]["version"] == {"N": "2"}
+
+
+def test_first_preference_write_keeps_legacy_inline_preferences():
+    db = FakeDynamoDB()
+    db.items["old"] = {
+        "user_id": {"S": "old"},
+        "memory_json": {"S": json.dumps({"notes": 1, "preferences": {"tone": "formal"}})},
+    }
+    memory = _memory(db)
+
+    result = asyncio.run(memory.update_preferences("old", {"lang": "de"}))
+
+    assert result == {"notes": 1, "preferences": {"tone": "formal", "lang": "de"}}
+
+
+def test_stale_reads_refetch_the_item_in_one_call():
+    db = FakeDynamoDB()
+    memory = _memory(db, ttl=0)
+
+    async def run():
+        await memory.save("u1", {"skills": []})
+        memory.invalidate("u1")
+        db.calls.clear()
+        await memory.load("u1")              # miss: full read
+        db.items["u1"]["memory_json"] = {"S": json.dumps({"skills": ["go"]})}
+        return await memory.load("u1")       # stale: one full read, no version probe
+
+    assert asyncio.run(run()) == {"skills": ["go"]}
+    assert db.calls == ["get_item", "get_item"]
+    assert memory.stats == {"hits": 0, "misses": 2}
+
+    cached = _memory(FakeDynamoDB())
+    asyncio.run(cached.save("u2", {"a": 1}))
+    cached._client.calls.clear()
+    assert asyncio.run(cached.load("u2")) == {"a": 1}
+    assert cached._client.calls == []
+
+
+def test_load_many_batches_and_retries_unprocessed_keys():
+    db = FakeDynamoDB(batch_limit=2)
+    memory = _memory(db)
+
+    async def run():
+        for i in range(4):
+            await memory.save(f"u{i}", {"n": i})
+        memory.invalidate("u0")
+        memory.invalidate("u1")
+        memory.invalidate("u2")
+        db.calls.clear()
+        return await memory.load_many(["u0", "u1", "u2", "u3", "ghost"])
+
+    result = asyncio.run(run())
+
+    assert result == {"u0": {"n": 0}, "u1": {"n": 1}, "u2": {"n": 2}, "u3": {"n": 3}, "ghost": {}}
+    # u3 came from cache; u0/u1/u2/ghost took two BatchGetItem calls.
+    assert db.calls == ["batch_get_item", "batch_get_item"]
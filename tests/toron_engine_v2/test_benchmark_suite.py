@@ -0,0 +1,65 @@
+"""Tests for the benchmark suite, fake latency models and baseline comparator."""
+
+import asyncio
+from statistics import mean
+
+from src.backend.core.toron.engine_v2.performance.benchmark import baseline
+from src.backend.core.toron.engine_v2.performance.benchmark.benchmark_runner import (
+    SUITE,
+    BenchmarkRunner,
+    percentile,
+)
+from src.backend.core.toron.engine_v2.performance.benchmark.fakes import LatencyModel
+
+
+def test_latency_models_keep_their_mean():
+    for kind in ("constant", "uniform", "lognormal", "exponential"):
+        model = LatencyModel(kind=kind, mean_ms=40.0, spread=0.5, seed=7)
+        samples = [model.sample_ms() for _ in range(20_000)]
+        assert abs(mean(samples) - 40.0) < 2.0, kind
+        assert min(samples) >= 0
+
+
+def test_percentile_interpolates():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 99) == 0.0
+
+
+def test_compare_flags_only_real_regressions():
+    base = {
+        "cache.get": {"p50_ms": 0.01, "p99_ms": 0.02, "ops_per_sec": 50_000, "peak_alloc_bytes": 2_000},
+        "router.resolve": {"p50_ms": 100.0, "p99_ms": 200.0, "ops_per_sec": 120, "peak_alloc_bytes": 500_000},
+    }
+    current = {
+        # Doubled, but below the absolute noise floor.
+        "cache.get": {"p50_ms": 0.02, "p99_ms": 0.04, "ops_per_sec": 50_000, "peak_alloc_bytes": 4_000},
+        "router.resolve": {"p50_ms": 130.0, "p99_ms": 210.0, "ops_per_sec": 90, "peak_alloc_bytes": 500_000},
+        "new.benchmark": {"p50_ms": 1.0},
+    }
+
+    regressions = baseline.compare(base, current, tolerance=0.15)
+    flagged = sorted((r.benchmark, r.metric) for r in regressions)
+    assert flagged == [("router.resolve", "ops_per_sec"), ("router.resolve", "p50_ms")]
+
+    relaxed = baseline.compare(base, current, tolerance=0.15, overrides={"router.resolve.p50_ms": 0.5, "ops_per_sec": 0.3})
+    assert relaxed == []
+
+
+def test_suite_runs_against_fakes_and_round_trips_baseline(tmp_path):
+    runner = BenchmarkRunner.with_fakes(provider_latency=LatencyModel(kind="constant", mean_ms=1.0))
+
+    results = asyncio.run(runner.run_suite(iterations=8, concurrency=4, alloc_samples=2))
+
+    assert list(results) == list(SUITE)
+    for stats in results.values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+        assert stats["ops_per_sec"] > 0
+    # Provider-bound paths wait on the fake connector; cache hits do not.
+    assert results["router.resolve"]["p50_ms"] >= 1.0
+    assert results["cache.get"]["p50_ms"] < results["router.resolve"]["p50_ms"]
+
+    path = baseline.save_baseline(tmp_path / "baseline.json", results)
+    assert baseline.compare(baseline.load_baseline(path), results) == []
@@ -0,0 +1,155 @@
+"""
+Tests for tag-indexed invalidation in MultiLayerCache / CacheInvalidator.
+"""
+
+import asyncio
+
+from src.backend.core.toron.engine_v2.performance.cache.cache_config import CacheConfig
+from src.backend.core.toron.engine_v2.performance.cache.cache_invalidator import CacheInvalidator
+from src.backend.core.toron.engine_v2.performance.cache.multi_layer_cache import MultiLayerCache
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [self.redis._apply(name, *a, **kw) for name, a, kw in self.ops]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+        self.round_trips = 0
+        self.scans = 0
+
+    def _apply(self, name, *args, **kwargs):
+        if name == "set":
+            self.data[args[0]] = args[1]
+            return True
+        if name == "sadd":
+            self.sets.setdefault(args[0], set()).update(args[1:])
+            return len(args) - 1
+        if name == "srem":
+            members = self.sets.get(args[0], set())
+            members.difference_update(args[1:])
+            return len(args) - 1
+        if name == "smembers":
+            return set(self.sets.get(args[0], set()))
+        if name == "exists":
+            return int(args[0] in self.data)
+        if name == "delete":
+            for key in args:
+                self.data.pop(key, None)
+                self.sets.pop(key, None)
+            return len(args)
+        if name == "expire":
+            return True
+        raise AttributeError(name)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key)
+
+    async def smembers(self, key):
+        self.round_trips += 1
+        return self._apply("smembers", key)
+
+    async def delete(self, *keys):
+        self.round_trips += 1
+        return self._apply("delete", *keys)
+
+    async def scan_iter(self, match=None):
+        self.scans += 1
+        for key in list(self.data):
+            yield key
+
+
+class FakeSession:
+    def client(self, service, **kwargs):
+        raise RuntimeError("no S3 in this test")
+
+
+def _setup():
+    redis = FakeRedis()
+    cache = MultiLayerCache(CacheConfig(), redis_client=redis, boto_session=FakeSession())
+    return cache, redis, CacheInvalidator(cache)
+
+
+def _answer(model):
+    return {"final_answer": "x", "model_used": model, "models_considered": [model, "gpt-4o-mini"]}
+
+
+def test_invalidate_user_drops_only_that_users_entries_without_scan():
+    cache, redis, invalidator = _setup()
+
+    async def run():
+        await cache.set({"prompt": "a", "user_id": "u1"}, _answer("gpt-4o"), ttl=60)
+        await cache.set({"prompt": "b", "user_id": "u1"}, _answer("gpt-4o"), ttl=60)
+        await cache.set({"prompt": "a", "user_id": "u2"}, _answer("gpt-4o"), ttl=60)
+        await cache.flush()
+
+        before = redis.round_trips
+        removed = await invalidator.invalidate_user("u1")
+        trips = redis.round_trips - before
+
+        return removed, trips, [
+            await cache.get({"prompt": "a", "user_id": "u1"}),
+            await cache.get({"prompt": "b", "user_id": "u1"}),
+            await cache.get({"prompt": "a", "user_id": "u2"}),
+        ]
+
+    removed, trips, values = asyncio.run(run())
+
+    assert removed == 2
+    assert trips == 2  # SMEMBERS + one pipelined delete
+    assert redis.scans == 0
+    assert values[0] is None and values[1] is None
+    assert values[2]["model_used"] == "gpt-4o"
+
+
+def test_invalidate_model_clears_l1_by_tag():
+    cache, redis, invalidator = _setup()
+
+    async def run():
+        await cache.set({"prompt": "a"}, _answer("claude-3-haiku"), ttl=60)
+        await cache.set({"prompt": "b"}, _answer("gemini-pro"), ttl=60)
+        await invalidator.invalidate_model("claude-3-haiku")
+        return await cache.l1.get(cache._make_key({"prompt": "a"})), await cache.get({"prompt": "b"})
+
+    gone, kept = asyncio.run(run())
+
+    assert gone is None
+    assert kept["model_used"] == "gemini-pro"
+    assert cache.l1.snapshot()["size"] == 1
+
+
+def test_invalidate_stale_prunes_dangling_tag_members():
+    cache, redis, invalidator = _setup()
+
+    async def run():
+        await cache.set({"prompt": "a", "user_id": "u1"}, _answer("gpt-4o"), ttl=60)
+        await cache.set({"prompt": "b", "user_id": "u1"}, _answer("gpt-4o"), ttl=60)
+        await cache.flush()
+        # Simulate Redis expiring one entry.
+        redis.data.pop(cache._make_key({"prompt": "a", "user_id": "u1"}))
+        return await invalidator.invalidate_stale()
+
+    removed = asyncio.run(run())
+
+    assert removed == 3  # user:u1, model:gpt-4o, model:gpt-4o-mini
+    assert redis.scans == 0
+    assert redis.sets[cache._tag_key("user:u1")] == {cache._make_key({"prompt": "b", "user_id": "u1"})}
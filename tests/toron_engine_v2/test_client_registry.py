@@ -0,0 +1,106 @@
+"""
+Tests for the shared, keep-alive ClientRegistry.
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.backend.core.toron.engine_v2.bootstrap.client_registry import (
+    ClientRegistry,
+    origin_of,
+)
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_registry_reuses_one_pool_per_origin():
+    registry = ClientRegistry(http2=False)
+
+    assert registry.client("https://api.openai.com/v1/chat") is registry.client(
+        "https://api.openai.com/v1/models"
+    )
+    assert registry.client("https://api.openai.com") is not registry.client(
+        "https://api.anthropic.com"
+    )
+
+
+def test_registry_counts_new_and_reused_connections():
+    server, base = _serve()
+    registry = ClientRegistry(http2=False)
+
+    async def run():
+        client = registry.client(base)
+        for _ in range(3):
+            r = await client.get(f"{base}/x")
+            assert r.text == "ok"
+        await registry.aclose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    stats = registry.stats()[origin_of(base)]
+    assert stats == {"new": 1, "reused": 2}
+
+
+def test_warm_opens_connections_ahead_of_traffic():
+    server, base = _serve()
+    registry = ClientRegistry(http2=False)
+
+    async def run():
+        await registry.warm([base], connections_per_origin=1)
+        await registry.client(base).get(f"{base}/x")
+        await registry.aclose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert registry.stats()[origin_of(base)] == {"new": 1, "reused": 1}
+
+
+def test_pools_follow_the_running_event_loop():
+    server, base = _serve()
+    registry = ClientRegistry(http2=False)
+    client = registry.client(base)
+
+    async def run():
+        r = await client.get(f"{base}/x")
+        return r.text
+
+    try:
+        # One asyncio.run per request, as ToronEngine.run_sync does.
+        assert asyncio.run(run()) == "ok"
+        assert asyncio.run(run()) == "ok"
+    finally:
+        server.shutdown()
+
+    assert registry.client(base) is client
+    # Each loop opened its own connection and closed it on shutdown.
+    assert registry.stats()[origin_of(base)] == {"new": 2, "reused": 0}
+    assert client._transport.pools.loops() == 0
@@ -0,0 +1,55 @@
+"""
+Tests for the vectorized TF-IDF consensus scorer.
+"""
+
+import asyncio
+import random
+
+from src.backend.core.toron.engine_v2.core.consensus_integrator import ConsensusIntegrator
+
+
+WORDS = [
+    "tides", "Moon's", "gravity", "ocean", "Earth", "orbit", "water", "bulge",
+    "the", "and", "With", "BEING", "x_y", "abcd-efgh", "über", "Straße", "ÉCOLE",
+    "1969", "apollo", "of", "a", "spring", "neap", "lunar", "solar",
+]
+
+
+def _random_outputs(rng, n_models, length):
+    return {
+        f"model-{i}": " ".join(rng.choice(WORDS) for _ in range(length))
+        for i in range(n_models)
+    }
+
+
+def test_vectorized_scores_match_loop_scorer():
+    rng = random.Random(7)
+    integrator = ConsensusIntegrator()
+
+    for _ in range(50):
+        outputs = _random_outputs(rng, rng.randint(1, 6), rng.randint(0, 80))
+        assert integrator._tfidf(outputs) == integrator._tfidf_loop(outputs)
+
+
+def test_empty_and_identical_answers():
+    integrator = ConsensusIntegrator()
+
+    assert integrator._tfidf({"a": "", "b": "of the"}) == {"a": 0.0, "b": 0.0}
+    same = {"a": "tides follow the moon", "b": "tides follow the moon"}
+    assert integrator._tfidf(same) == integrator._tfidf_loop(same) == {"a": 0.0, "b": 0.0}
+
+
+def test_centroid_scoring_prefers_the_agreeing_answer():
+    integrator = ConsensusIntegrator(scoring="centroid")
+    outputs = {
+        "a": "lunar gravity raises ocean tides twice daily",
+        "b": "ocean tides come from lunar gravity pulling water",
+        "c": "quantum chromodynamics explains hadron confinement",
+    }
+
+    result = asyncio.run(integrator.integrate({"debate_result": {"model_outputs": outputs}}))
+
+    assert result["model_used"] in ("a", "b")
+    assert result["reasoning_trace"]["scoring"] == "centroid"
+    scores = result["reasoning_trace"]["tfidf_scores"]
+    assert scores["c"] < min(scores["a"], scores["b"])
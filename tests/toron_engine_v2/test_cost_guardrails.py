@@ -0,0 +1,275 @@
+"""
+Tests for pre-flight cost estimation and admission control in CostGuardrails.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from src.backend.core.toron.engine_v2.core.model_stats import ModelStats
+from src.backend.core.toron.engine_v2.routing.query_optimizer import QueryOptimizer
+from src.backend.core.toron.engine_v2.routing.router import Router
+from src.backend.core.toron.engine_v2.runtime.budget_store import LocalBudgetStore
+from src.backend.core.toron.engine_v2.runtime.cost_guardrails import CostGuardrails
+from src.backend.core.toron.engine_v2.tracing.tracer import ToronTracer
+
+
+REQUEST = {"prompt": "compare the economic effects of tariffs " * 20}
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _guard(**kwargs):
+    clock = kwargs.pop("clock", Clock())
+    kwargs.setdefault("store", LocalBudgetStore(clock))
+    return CostGuardrails(stats=ModelStats(prior_output_tokens=400), clock=clock, **kwargs)
+
+
+def test_estimate_grows_with_prompt_and_model_set():
+    guard = _guard()
+    short = guard.estimate({"prompt": "hi"}, ["gpt-4o"])
+    long = guard.estimate(REQUEST, ["gpt-4o"])
+    pair = guard.estimate(REQUEST, ["gpt-4o", "gpt-4o-mini"])
+
+    assert long.total > short.total
+    assert long.prompt_tokens > short.prompt_tokens
+    # A second model adds its own calls and lengthens the other's critique input.
+    assert pair.per_model["gpt-4o"] > long.per_model["gpt-4o"]
+    assert pair.tokens > long.tokens
+
+
+def test_admit_reserves_projected_cost():
+    guard = _guard()
+
+    admission = asyncio.run(guard.admit(REQUEST, ["gpt-4o-mini"]))
+
+    assert admission.action == "admit"
+    assert admission.models == ["gpt-4o-mini"]
+    assert abs(guard.cost_hour - admission.estimate) < 1e-12
+    assert abs(guard.cost_day - admission.estimate) < 1e-12
+
+
+def test_downgrades_to_a_set_that_fits_the_per_request_cap():
+    guard = _guard()
+    full = guard.estimate(REQUEST, ["claude-3-opus", "gpt-4o-mini"]).total
+    mini = guard.estimate(REQUEST, ["gpt-4o-mini"]).total
+    guard.per_request_cap = (full + mini) / 2
+
+    admission = asyncio.run(guard.admit(REQUEST, ["claude-3-opus", "gpt-4o-mini"]))
+
+    assert admission.action == "downgrade"
+    assert admission.models == ["gpt-4o-mini"]
+    assert admission.requested == ["claude-3-opus", "gpt-4o-mini"]
+
+
+def test_downgrade_can_swap_in_cheapest_available_model():
+    guard = _guard()
+    guard.per_request_cap = guard.estimate(REQUEST, ["gemini-1.5-flash"]).total * 1.01
+
+    admission = asyncio.run(
+        guard.admit(REQUEST, ["gpt-4o"], available=["gpt-4o", "gemini-1.5-flash", "gpt-4o-mini"])
+    )
+
+    assert admission.action == "downgrade"
+    assert admission.models == ["gemini-1.5-flash"]
+
+
+def test_sheds_when_hourly_budget_is_spent_and_recovers_next_hour():
+    clock = Clock()
+    guard = _guard(clock=clock)
+    cost = guard.estimate(REQUEST, ["gpt-4o"]).total
+    guard.hourly_cap = cost * 1.5
+
+    first = asyncio.run(guard.admit(REQUEST, ["gpt-4o"]))
+    second = asyncio.run(guard.admit(REQUEST, ["gpt-4o"]))
+
+    assert first.action == "admit"
+    assert second.action == "shed"
+    assert second.reason == "hourly_cap"
+    assert guard.decisions == {"admit": 1, "downgrade": 0, "shed": 1}
+
+    clock.now += 3600
+    assert asyncio.run(guard.admit(REQUEST, ["gpt-4o"])).action == "admit"
+
+
+def test_tenant_budgets_are_independent():
+    guard = _guard()
+    guard.tenant_daily_cap = guard.estimate(REQUEST, ["gpt-4o-mini"]).total * 1.5
+
+    assert asyncio.run(guard.admit(REQUEST, ["gpt-4o-mini"], tenant="acme")).admitted
+    shed = asyncio.run(guard.admit(REQUEST, ["gpt-4o-mini"], tenant="acme"))
+    other = asyncio.run(guard.admit(REQUEST, ["gpt-4o-mini"], tenant="globex"))
+
+    assert shed.action == "shed" and shed.reason == "tenant_daily_cap"
+    assert other.action == "admit"
+
+
+def test_tenant_token_budget():
+    guard = _guard(tenant_daily_token_cap=100)
+
+    admission = asyncio.run(guard.admit(REQUEST, ["gpt-4o-mini"], tenant="acme"))
+
+    assert admission.action == "shed"
+    assert admission.reason == "tenant_daily_token_cap"
+
+
+def test_workers_sharing_a_store_never_overspend():
+    clock = Clock()
+    store = LocalBudgetStore(clock)
+    workers = [_guard(store=store, clock=clock) for _ in range(4)]
+    cost = workers[0].estimate(REQUEST, ["gpt-4o"]).total
+    for w in workers:
+        w.hourly_cap = cost * 10.5
+
+    async def run():
+        return await asyncio.gather(*(w.admit(REQUEST, ["gpt-4o"]) for w in workers for _ in range(10)))
+
+    admitted = [a for a in asyncio.run(run()) if a.admitted]
+
+    assert len(admitted) == 10
+    total = asyncio.run(store.totals([workers[0]._entries(0, 0)[0].key]))[0]
+    assert total <= workers[0].hourly_cap
+
+
+def test_settle_replaces_reservation_with_actual_cost():
+    guard = _guard()
+    admission = asyncio.run(guard.admit(REQUEST, ["gpt-4o"]))
+
+    asyncio.run(guard.settle(admission, actual_cost=0.001))
+
+    assert abs(guard.cost_hour - 0.001) < 1e-12
+    # Unknown actual cost keeps the reservation.
+    second = asyncio.run(guard.admit(REQUEST, ["gpt-4o"]))
+    asyncio.run(guard.settle(second, actual_cost=None))
+    assert abs(guard.cost_hour - (0.001 + second.estimate)) < 1e-12
+
+
+def test_settle_enforces_caps_for_unadmitted_requests():
+    guard = _guard(hourly_cap=0.01, per_request_cap=0.008)
+
+    # Cache hits and the fast path never went through admit().
+    asyncio.run(guard.settle(None, actual_cost=0.006))
+    with pytest.raises(Exception, match="per-request cap"):
+        asyncio.run(guard.settle(None, actual_cost=0.009))
+    with pytest.raises(Exception, match="Hourly budget exceeded"):
+        asyncio.run(guard.settle(None, actual_cost=0.006))
+
+
+def test_settle_stops_when_actual_cost_overruns_the_reservation():
+    guard = _guard(daily_cap=0.02, hourly_cap=1.0, per_request_cap=1.0)
+    admission = asyncio.run(guard.admit(REQUEST, ["gpt-4o"]))
+    assert admission.admitted
+
+    with pytest.raises(Exception, match="Daily budget exceeded"):
+        asyncio.run(guard.settle(admission, actual_cost=0.05))
+
+
+def test_settle_to_zero_releases_the_reservation():
+    guard = _guard()
+    admission = asyncio.run(guard.admit({**REQUEST, "tenant_id": "acme"}, ["gpt-4o"]))
+    assert guard.cost_hour > 0
+
+    asyncio.run(guard.settle(admission, actual_cost=0.0))
+
+    assert abs(guard.cost_hour) < 1e-12 and abs(guard.cost_day) < 1e-12
+
+
+class _FailingRouter:
+    def __init__(self, guard, fail):
+        self.guard = guard
+        self.fail = fail
+
+    async def resolve(self, request, context):
+        context["admission"] = await self.guard.admit(request, ["gpt-4o"])
+        if self.fail == "raise":
+            raise RuntimeError("provider outage")
+        return {"status": "error", "error": "All providers failed"}
+
+
+@pytest.mark.parametrize("fail", ["raise", "error"])
+def test_failed_requests_give_their_reservation_back(fail):
+    toron_engine = pytest.importorskip("src.backend.core.toron.engine_v2.api.toron_engine")
+    guard = _guard()
+    engine = toron_engine.ToronEngine.__new__(toron_engine.ToronEngine)
+    engine.tracer = ToronTracer(exporter=InMemorySpanExporter(), instrument=False, set_global=False)
+    engine.policy = SimpleNamespace(validate=lambda request: None)
+    engine.router = _FailingRouter(guard, fail)
+    engine.cost = guard
+    engine.slo = SimpleNamespace(
+        record_latency=lambda ms: None, record_failure=lambda: None, check_slo=lambda: {"slo_pass": True}
+    )
+    engine.errors = SimpleNamespace(shape=lambda error: {"status": "error"})
+    engine.replay = SimpleNamespace(record=lambda request, response: None)
+    engine.telemetry = SimpleNamespace(log=lambda *args: None)
+
+    for _ in range(3):
+        assert asyncio.run(engine.process({"prompt": "explain tides"}))["status"] == "error"
+
+    assert abs(guard.cost_hour) < 1e-12
+    assert guard.decisions["admit"] == 3
+
+
+def test_register_cost_still_enforces_caps():
+    guard = _guard(hourly_cap=0.01)
+    guard.register_cost(0.006)
+
+    try:
+        guard.register_cost(0.006)
+    except Exception as exc:
+        assert "Hourly budget exceeded" in str(exc)
+    else:
+        raise AssertionError("hourly cap not enforced")
+    assert guard.remaining() == 0.0
+
+
+class _Cache:
+    async def get(self, request):
+        return None
+
+    async def set(self, request, value, ttl=3600):
+        pass
+
+
+class _Adapter:
+    connectors = {}
+
+    async def list_all_models(self):
+        return [{"model_id": "gpt-4o"}]
+
+
+class _Debate:
+    def __init__(self):
+        self.runs = 0
+
+    async def run(self, context):
+        self.runs += 1
+        return {"model_outputs": {m: "answer" for m in context["selected_models"]}}
+
+
+class _Consensus:
+    async def integrate(self, context):
+        return {"final_answer": "answer", "confidence": 0.9}
+
+
+def test_router_sheds_before_calling_providers():
+    guard = _guard(hourly_cap=0.0)
+    debate = _Debate()
+    tracer = ToronTracer(exporter=InMemorySpanExporter(), instrument=False, set_global=False)
+    router = Router(_Cache(), tracer, QueryOptimizer(), debate, _Consensus(), _Adapter(), guardrails=guard)
+    context = {"session_id": "s1"}
+
+    result = asyncio.run(router.resolve({"prompt": "explain tides", "tenant_id": "acme"}, context))
+
+    assert result["status"] == "error"
+    assert result["admission"]["reason"] == "hourly_cap"
+    assert context["admission"].tenant == "acme"
+    assert debate.runs == 0
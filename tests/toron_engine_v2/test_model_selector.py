@@ -0,0 +1,137 @@
+"""
+Tests for live-stat, constraint-aware model selection.
+"""
+
+import asyncio
+
+import pytest
+
+from src.backend.core.toron.engine_v2.core.cloud_provider_adapter import CloudProviderAdapter
+from src.backend.core.toron.engine_v2.core.model_stats import ModelStats, estimate_cost
+from src.backend.core.toron.engine_v2.routing.model_selector import ModelSelector
+from src.backend.core.toron.engine_v2.routing.query_optimizer import QueryOptimizer
+from src.backend.core.toron.engine_v2.routing.router import Router
+from src.backend.core.toron.engine_v2.runtime.cost_guardrails import CostGuardrails
+
+
+def _stats():
+    stats = ModelStats(alpha=0.5)
+    for _ in range(5):
+        stats.record_call("gpt-4o", 2400, True, {"prompt_tokens": 100, "completion_tokens": 400})
+        stats.record_call("gpt-4o-mini", 400, True, {"prompt_tokens": 100, "completion_tokens": 400})
+        stats.record_call("claude-3-5-haiku-20241022", 600, True, {"input_tokens": 100, "output_tokens": 400})
+    stats.record_quality("gpt-4o", 0.95)
+    stats.record_quality("gpt-4o-mini", 0.6)
+    stats.record_quality("claude-3-5-haiku-20241022", 0.7)
+    return stats
+
+
+MODELS = ["gpt-4o", "gpt-4o-mini", "claude-3-5-haiku-20241022"]
+
+
+def test_latency_slo_excludes_slow_models():
+    selector = ModelSelector(_stats())
+
+    assert selector.select(MODELS, 100, max_models=1) == ["gpt-4o"]
+    assert selector.select(MODELS, 100, latency_slo_ms=1000, max_models=1) == [
+        "claude-3-5-haiku-20241022"
+    ]
+
+
+def test_budget_limits_combined_spend():
+    selector = ModelSelector(_stats())
+    haiku = estimate_cost("claude-3-5-haiku-20241022", 100, 400)
+    mini = estimate_cost("gpt-4o-mini", 100, 400)
+
+    chosen = selector.select(MODELS, 100, budget_usd=haiku + mini, max_models=3)
+
+    assert chosen == ["claude-3-5-haiku-20241022", "gpt-4o-mini"]
+
+
+def test_failing_models_are_skipped_and_guardrail_budget_applies():
+    stats = _stats()
+    for _ in range(5):
+        stats.record_call("gpt-4o", 100, False)
+    guard = CostGuardrails(hourly_cap=1.0, daily_cap=1.0, per_request_cap=0.0)
+    selector = ModelSelector(stats, guardrails=guard)
+
+    # Nothing fits a zero budget: fall back to the single cheapest model.
+    assert selector.select(MODELS, 100, max_models=3) == ["gpt-4o-mini"]
+
+
+def test_excluded_model_recovers_as_failures_decay():
+    now = [0.0]
+    stats = ModelStats(alpha=0.5, failure_half_life_s=60, clock=lambda: now[0])
+    for _ in range(5):
+        stats.record_call("gpt-4o", 100, False)
+    selector = ModelSelector(stats)
+
+    assert selector.select(["gpt-4o", "gpt-4o-mini"], 100) == ["gpt-4o-mini"]
+    now[0] += 120
+    assert stats.estimate("gpt-4o").failure_rate < 0.25
+    assert "gpt-4o" in selector.select(["gpt-4o", "gpt-4o-mini"], 100, max_models=2)
+
+
+class _Config:
+    model_timeout_seconds = 2
+    provider_priority = ["openai", "anthropic", "bedrock"]
+
+
+class _Connector:
+    honours_temperature = True
+
+    def __init__(self, fail):
+        self.fail = fail
+
+    async def infer(self, messages, model, **kwargs):
+        if self.fail:
+            raise RuntimeError("model not found")
+        return {"content": "ok"}, {"usage": {"prompt_tokens": 10, "completion_tokens": 20}}
+
+
+def test_failover_counts_a_model_failure_only_when_no_provider_serves_it():
+    adapter = CloudProviderAdapter(
+        {"openai": _Connector(True), "anthropic": _Connector(True), "bedrock": _Connector(False)}, _Config()
+    )
+    messages = [{"role": "user", "content": "hi"}]
+
+    for _ in range(5):
+        asyncio.run(adapter.dispatch(messages, "llama3-70b-8192"))
+    assert adapter.model_stats.estimate("llama3-70b-8192").failure_rate == 0.0
+
+    adapter.connectors["bedrock"].fail = True
+    with pytest.raises(Exception, match="All providers failed"):
+        asyncio.run(adapter.dispatch(messages, "llama3-70b-8192"))
+    assert adapter.model_stats.estimate("llama3-70b-8192").samples == 6
+
+
+def test_optimizer_uses_selector_with_request_constraints():
+    optimizer = QueryOptimizer(selector=ModelSelector(_stats()), max_models=2)
+
+    chosen = optimizer.select_models({"prompt": "explain tides", "latency_slo_ms": 1000}, MODELS)
+
+    # gpt-4o is too slow; gpt-4o-mini gets the intent-preference bonus.
+    assert chosen == ["gpt-4o-mini", "claude-3-5-haiku-20241022"]
+
+
+class _Adapter:
+    def __init__(self):
+        self.calls = 0
+        self.connectors = {}
+
+    async def list_all_models(self):
+        self.calls += 1
+        return [{"model_id": "gpt-4o-mini"}, {"model_id": "gpt-4o-mini"}]
+
+
+def test_router_refreshes_catalogue_on_ttl():
+    adapter = _Adapter()
+    router = Router(None, None, QueryOptimizer(), None, None, adapter, catalogue_ttl_seconds=0)
+
+    async def run():
+        first = await router._select_models({"prompt": "hi"})
+        await router._select_models({"prompt": "hi"})
+        return first
+
+    assert asyncio.run(run()) == ["gpt-4o-mini"]
+    assert adapter.calls == 2
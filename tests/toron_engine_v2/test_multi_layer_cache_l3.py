@@ -0,0 +1,244 @@
+"""
+Tests for the MultiLayerCache L3 tier: pooled client, negative cache and write-behind.
+"""
+
+import asyncio
+
+from src.backend.core.toron.engine_v2.performance.cache.cache_config import CacheConfig
+from src.backend.core.toron.engine_v2.performance.cache.multi_layer_cache import MultiLayerCache
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+
+    def set(self, key, value, ex=None):
+        self.redis.data[key] = value
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        return []
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class NoSuchKey(Exception):
+    pass
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+
+    async def read(self):
+        return self.data
+
+
+class FakeS3:
+    def __init__(self, put_delay=0.0):
+        self.objects = {}
+        self.gets = 0
+        self.puts = 0
+        self.put_delay = put_delay
+
+    async def get_object(self, Bucket, Key):
+        self.gets += 1
+        if Key not in self.objects:
+            raise NoSuchKey(Key)
+        return {"Body": FakeBody(self.objects[Key])}
+
+    async def put_object(self, Bucket, Key, Body, Expires):
+        await asyncio.sleep(self.put_delay)
+        self.puts += 1
+        self.objects[Key] = Body
+
+
+class FakeSession:
+    def __init__(self, s3):
+        self.s3 = s3
+        self.clients_opened = 0
+        self.clients_closed = 0
+
+    def client(self, service, **kwargs):
+        session = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                session.clients_opened += 1
+                return session.s3
+
+            async def __aexit__(self, *exc):
+                session.clients_closed += 1
+                return False
+
+        return _Ctx()
+
+
+def _cache(s3, **overrides):
+    config = CacheConfig(**overrides)
+    return MultiLayerCache(config, redis_client=FakeRedis(), boto_session=FakeSession(s3))
+
+
+def test_known_absent_keys_skip_s3_and_client_is_reused():
+    s3 = FakeS3()
+    cache = _cache(s3)
+
+    async def run():
+        await cache.start()
+        for _ in range(5):
+            assert await cache.get({"prompt": "new"}) is None
+        await cache.aclose()
+
+    asyncio.run(run())
+
+    assert s3.gets == 1
+    assert cache.boto_session.clients_opened == 1
+    assert cache.metrics.snapshot()["l3_negative_hits"] == 4
+
+
+def test_s3_client_is_reopened_per_event_loop_and_closed_with_it():
+    s3 = FakeS3()
+    cache = _cache(s3)
+
+    async def run(prompt):
+        return await cache.get({"prompt": prompt})
+
+    assert asyncio.run(run("first")) is None
+    assert asyncio.run(run("second")) is None
+    assert s3.gets == 2
+    assert cache.boto_session.clients_opened == 2
+    assert cache.boto_session.clients_closed == 2
+
+
+def test_l3_writes_are_write_behind_and_clear_negative_entries():
+    s3 = FakeS3(put_delay=0.05)
+    cache = _cache(s3)
+    request = {"prompt": "cold"}
+
+    async def run():
+        assert await cache.get(request) is None
+        await cache.set(request, {"answer": 42}, ttl=7200)
+        # set() returned before the slow upload finished.
+        assert s3.puts == 0
+        await cache.flush()
+
+        # Drop L1/L2 so the read has to come from S3.
+        cache.l1 = type(cache.l1)(8)
+        cache.redis.data.clear()
+        value = await cache.get(request)
+        await cache.aclose()
+        return value
+
+    assert asyncio.run(run()) == {"answer": 42}
+    assert s3.puts == 1
+    assert cache.metrics.snapshot()["l3_writes_written"] == 1
+    assert cache.metrics.snapshot()["l3_hits"] == 1
+
+
+def test_full_write_queue_drops_cold_copy():
+    s3 = FakeS3(put_delay=0.05)
+    cache = _cache(s3, l3_write_queue_size=1)
+
+    async def run():
+        for i in range(4):
+            await cache.set({"prompt": i}, {"answer": i}, ttl=7200)
+        await cache.aclose()
+
+    asyncio.run(run())
+
+    snapshot = cache.metrics.snapshot()
+    assert snapshot["l3_writes_dropped"] >= 1
+    assert snapshot["l3_writes_written"] + snapshot["l3_writes_dropped"] == 4
+
+
+def test_value_is_serialized_once_and_compressed_above_threshold():
+    s3 = FakeS3()
+    cache = _cache(s3, compress_threshold_bytes=256)
+    big = {"final_answer": "tides are caused by the moon " * 200, "model_used": "gpt-4o"}
+
+    async def run():
+        await cache.set({"prompt": "big"}, big, ttl=7200)
+        await cache.set({"prompt": "small"}, {"final_answer": "ok"}, ttl=60)
+        await cache.flush()
+        cache.l1 = type(cache.l1)(8)
+        values = await cache.get({"prompt": "big"}), await cache.get({"prompt": "small"})
+        await cache.aclose()
+        return values
+
+    big_back, small_back = asyncio.run(run())
+    snapshot = cache.metrics.snapshot()
+
+    assert big_back == big and small_back == {"final_answer": "ok"}
+    assert snapshot["serialized_values"] == 2
+    assert snapshot["compressed_values"] == 1
+    assert snapshot["compression_ratio"] > 5
+    assert snapshot["l2_writes_written"] == 2
+    # Redis and S3 hold the same blob.
+    key = cache._make_key({"prompt": "big"})
+    assert s3.objects[f"toron/cache/{key}"] == cache.redis.data[key]
+
+
+def test_legacy_base64_entries_still_decode():
+    cache = _cache(FakeS3())
+    request = {"prompt": "old"}
+    key = cache._make_key(request)
+    cache.redis.data[key] = cache.encryptor.encrypt({"final_answer": "legacy"}, key)
+
+    assert asyncio.run(cache.get(request)) == {"final_answer": "legacy"}
+
+
+class SlowPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append((key, value))
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        await asyncio.sleep(0.005)
+        self.redis.data.update(self.ops)
+        return []
+
+
+class SlowRedis(FakeRedis):
+    def pipeline(self, transaction=True):
+        return SlowPipeline(self)
+
+
+def test_writes_survive_a_short_lived_event_loop():
+    s3 = FakeS3(put_delay=0.005)
+    cache = MultiLayerCache(CacheConfig(), redis_client=SlowRedis(), boto_session=FakeSession(s3))
+    requests = [{"prompt": f"run-sync {i}"} for i in range(3)]
+
+    for i, request in enumerate(requests):
+        asyncio.run(cache.set(request, {"answer": i}, ttl=7200))
+
+    keys = [cache._make_key(request) for request in requests]
+    assert all(key in cache.redis.data for key in keys)
+    assert sorted(s3.objects) == sorted(f"toron/cache/{key}" for key in keys)
+    assert cache.stats()["l2"]["pending_writes"] == 0
+    assert cache.boto_session.clients_opened == cache.boto_session.clients_closed
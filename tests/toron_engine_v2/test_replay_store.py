@@ -0,0 +1,110 @@
+"""
+Tests for the bounded, sampled, disk-spilling ReplayStore.
+"""
+
+import os
+import time
+
+from src.backend.core.toron.engine_v2.runtime.replay_store import ReplayStore
+
+
+KEY = os.urandom(32)
+
+
+def test_ring_is_bounded_and_keeps_newest():
+    store = ReplayStore(capacity=3, sample_rate=1.0)
+    for i in range(10):
+        store.record({"prompt": i}, {"answer": i})
+
+    assert [e["request"]["prompt"] for e in store.iter_events()] == [7, 8, 9]
+    assert store.health()["recorded"] == 10
+
+
+def test_sampling_skips_most_traffic_unless_forced():
+    draws = iter([0.5, 0.005, 0.9, 0.2])
+    store = ReplayStore(capacity=10, sample_rate=0.01, rng=lambda: next(draws))
+
+    results = [store.record({"prompt": i}) for i in range(4)]
+    forced = store.record({"prompt": "debug"}, force=True)
+
+    assert [r is not None for r in results] == [False, True, False, False]
+    assert forced is not None
+    assert store.health()["sampled_out"] == 3
+    assert len(store.emit()) == 2
+
+
+def test_disk_log_rotates_segments_and_survives_restart(tmp_path):
+    store = ReplayStore(capacity=2, sample_rate=1.0, directory=str(tmp_path), segment_bytes=200, max_segments=3, key=KEY)
+    for i in range(40):
+        store.record({"prompt": f"question {i}"}, {"answer": "x" * 20})
+    store.close()
+
+    segments = sorted(p.name for p in tmp_path.iterdir())
+    assert 1 < len(segments) <= 4
+    assert all(name.endswith(".log.gz") for name in segments)
+
+    reopened = ReplayStore(capacity=2, sample_rate=1.0, directory=str(tmp_path), segment_bytes=200, max_segments=3, key=KEY)
+    replayed = [e["request"]["prompt"] for e in reopened.iter_events(from_disk=True)]
+
+    # Oldest segments were rotated away; what remains is the newest, in order.
+    assert replayed and replayed[-1] == "question 39"
+    assert replayed == [f"question {i}" for i in range(40 - len(replayed), 40)]
+    assert reopened.emit() == []
+
+
+def test_iter_from_disk_includes_unflushed_active_segment(tmp_path):
+    store = ReplayStore(capacity=2, sample_rate=1.0, directory=str(tmp_path), key=KEY)
+    for i in range(5):
+        store.record({"prompt": i})
+
+    assert [e["request"]["prompt"] for e in store.iter_events(from_disk=True)] == [0, 1, 2, 3, 4]
+    store.close()
+
+
+def test_disk_log_is_encrypted_and_needs_the_key(tmp_path):
+    import gzip
+
+    store = ReplayStore(capacity=2, sample_rate=1.0, directory=str(tmp_path), key=KEY)
+    store.record({"prompt": "my card is 4111 1111 1111 1111"})
+    store.close()
+
+    raw = b"".join(gzip.open(p).read() for p in tmp_path.iterdir())
+    assert b"4111" not in raw
+    assert store.health()["log_encrypted"] is True
+
+    reopened = ReplayStore(capacity=2, sample_rate=1.0, directory=str(tmp_path), key=KEY)
+    assert [e["request"]["prompt"] for e in reopened.iter_events(from_disk=True)] == [
+        "my card is 4111 1111 1111 1111"
+    ]
+
+
+def test_disk_log_is_off_without_a_key_unless_plaintext_is_allowed(tmp_path, monkeypatch):
+    monkeypatch.delenv("TORON_REPLAY_KEY", raising=False)
+    monkeypatch.delenv("TORON_AES_KEY", raising=False)
+
+    assert ReplayStore(directory=str(tmp_path / "a")).log is None
+    plain = ReplayStore(sample_rate=1.0, directory=str(tmp_path / "b"), allow_plaintext=True)
+    plain.record({"prompt": "hello"})
+    assert [e["request"]["prompt"] for e in plain.iter_events(from_disk=True)] == ["hello"]
+    plain.close()
+
+
+def test_record_does_not_wait_for_disk(tmp_path):
+    store = ReplayStore(capacity=8, sample_rate=1.0, directory=str(tmp_path), key=KEY, max_pending=2)
+    slow_append = store.log.append
+
+    def append(payload):
+        time.sleep(0.2)
+        slow_append(payload)
+
+    store.log.append = append
+    start = time.perf_counter()
+    for i in range(5):
+        store.record({"prompt": i})
+    elapsed = time.perf_counter() - start
+    store.close()
+
+    assert elapsed < 0.1
+    assert len(store.emit()) == 5
+    # One record is being written, two wait in the queue, the rest are dropped.
+    assert store.health()["log_dropped"] >= 2
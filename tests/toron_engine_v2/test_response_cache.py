@@ -0,0 +1,177 @@
+"""
+Tests for the dispatch-level response cache in CloudProviderAdapter.
+"""
+
+import asyncio
+
+from src.backend.core.toron.engine_v2.core.cloud_provider_adapter import (
+    CloudProviderAdapter,
+)
+from src.backend.core.toron.engine_v2.core.response_cache import ResponseCache
+
+
+class DummyConfig:
+    model_timeout_seconds = 2
+    provider_priority = ["openai"]
+
+
+class CountingConnector:
+    honours_temperature = True
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def infer(self, messages, model, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"content": f"answer {self.calls}"}, {"provider": "openai", "model": model}
+
+    async def list_models(self):
+        return []
+
+    async def health_check(self):
+        return True
+
+
+MESSAGES = [{"role": "user", "content": "Is the sky blue?"}]
+
+
+def test_deterministic_calls_are_cached_per_call_site():
+    connector = CountingConnector()
+    adapter = CloudProviderAdapter({"openai": connector}, DummyConfig())
+
+    async def run():
+        first = await adapter.dispatch(MESSAGES, "m", call_site="validator", temperature=0.0)
+        # Whitespace differences normalize to the same key.
+        second = await adapter.dispatch(
+            [{"role": "user", "content": "  Is the sky blue?\n"}],
+            "m",
+            call_site="validator",
+            temperature=0.0,
+        )
+        return first, second
+
+    (r1, m1), (r2, m2) = asyncio.run(run())
+
+    assert connector.calls == 1
+    assert r1 == r2
+    assert "cache" not in m1 and m2["cache"] == "hit"
+    assert adapter.response_cache.stats()["validator"]["hit_rate"] == 0.5
+
+
+def test_sampled_calls_bypass_cache_unless_forced():
+    connector = CountingConnector()
+    adapter = CloudProviderAdapter({"openai": connector}, DummyConfig())
+
+    async def run():
+        await adapter.dispatch(MESSAGES, "m")
+        await adapter.dispatch(MESSAGES, "m")
+        await adapter.dispatch(MESSAGES, "m", cache=True)
+        await adapter.dispatch(MESSAGES, "m", cache=True)
+
+    asyncio.run(run())
+
+    assert connector.calls == 3
+    assert adapter.response_cache.stats()["unknown"]["bypassed"] == 2
+
+
+def test_concurrent_identical_calls_are_single_flighted():
+    connector = CountingConnector(delay=0.05)
+    adapter = CloudProviderAdapter({"openai": connector}, DummyConfig())
+
+    async def run():
+        return await asyncio.gather(
+            *(adapter.dispatch(MESSAGES, "m", call_site="facts", temperature=0) for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+
+    assert connector.calls == 1
+    assert len({r[0]["content"] for r in results}) == 1
+    assert adapter.response_cache.stats()["facts"]["coalesced"] == 4
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(ttl_seconds=0, max_entries=8)
+    connector = CountingConnector()
+    adapter = CloudProviderAdapter({"openai": connector}, DummyConfig(), response_cache=cache)
+
+    async def run():
+        await adapter.dispatch(MESSAGES, "m", temperature=0.0)
+        await asyncio.sleep(0.01)
+        await adapter.dispatch(MESSAGES, "m", temperature=0.0)
+
+    asyncio.run(run())
+
+    assert connector.calls == 2
+
+
+class SamplingConnector(CountingConnector):
+    honours_temperature = False
+
+
+def test_results_from_providers_ignoring_temperature_are_not_stored():
+    connector = SamplingConnector()
+    adapter = CloudProviderAdapter({"openai": connector}, DummyConfig())
+
+    async def run():
+        await adapter.dispatch(MESSAGES, "m", temperature=0.0)
+        await adapter.dispatch(MESSAGES, "m", temperature=0.0)
+
+    asyncio.run(run())
+
+    assert connector.calls == 2
+    assert adapter.response_cache.snapshot()["entries"] == 0
+
+
+def test_callers_get_copies_of_cached_and_shared_responses():
+    connector = CountingConnector(delay=0.02)
+    adapter = CloudProviderAdapter({"openai": connector}, DummyConfig())
+
+    async def run():
+        first, second = await asyncio.gather(
+            adapter.dispatch(MESSAGES, "m", temperature=0),
+            adapter.dispatch(MESSAGES, "m", temperature=0),
+        )
+        first[0]["content"] = "mutated by caller"
+        second[0]["content"] = "mutated by waiter"
+        third = await adapter.dispatch(MESSAGES, "m", temperature=0)
+        third[1]["extra"] = True
+        fourth = await adapter.dispatch(MESSAGES, "m", temperature=0)
+        return fourth
+
+    response, metadata = asyncio.run(run())
+
+    assert connector.calls == 1
+    assert response == {"content": "answer 1"}
+    assert "extra" not in metadata
+
+
+def test_waiters_take_over_when_the_leading_call_is_cancelled():
+    cache = ResponseCache(ttl_seconds=60, max_entries=8)
+    calls = []
+
+    async def slow():
+        calls.append("leader")
+        await asyncio.sleep(10)
+
+    async def fast():
+        calls.append("waiter")
+        return {"content": "ok"}, {}
+
+    async def run():
+        leader = asyncio.create_task(cache.get_or_call("k", slow))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_call("k", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await waiter
+        assert leader.cancelled()
+        return result
+
+    (response, _), outcome = asyncio.run(run())
+
+    assert calls == ["leader", "waiter"]
+    assert response == {"content": "ok"}
+    assert outcome == "miss"
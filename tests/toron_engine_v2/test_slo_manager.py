@@ -0,0 +1,77 @@
+"""
+Tests for the streaming, time-windowed SLO estimator.
+"""
+
+import random
+
+from prometheus_client import REGISTRY
+
+from src.backend.core.toron.engine_v2.performance.metrics.windowed_histogram import WindowedHistogram
+from src.backend.core.toron.engine_v2.runtime.slo_manager import SLOManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _manager(clock, **kwargs):
+    histogram = WindowedHistogram((60, 600), slot_seconds=10, clock=clock)
+    return SLOManager(windows=(60, 600), histogram=histogram, **kwargs)
+
+
+def test_quantiles_match_exact_within_relative_error():
+    rng = random.Random(3)
+    slo = _manager(FakeClock())
+    samples = [rng.lognormvariate(6, 0.8) for _ in range(20_000)]
+    for ms in samples:
+        slo.record_latency(ms)
+
+    ordered = sorted(samples)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * len(ordered)) - 1]
+        estimate = slo.histogram.quantiles((q,))[q]
+        assert abs(estimate - exact) / exact < 0.03
+
+
+def test_old_slots_rotate_out_of_short_window_only():
+    clock = FakeClock()
+    slo = _manager(clock)
+
+    for _ in range(100):
+        slo.record_latency(4000)
+        slo.record_failure()
+    clock.now += 120
+    for _ in range(100):
+        slo.record_latency(100)
+        slo.record_success()
+
+    check = slo.check_slo()
+
+    assert check["slo_pass"] is True
+    assert check["windows"]["60s"]["requests"] == 100
+    assert check["windows"]["600s"]["requests"] == 200
+    assert check["windows"]["600s"]["success_rate"] == 0.5
+    # 50% errors against a 2% budget burns it 25x too fast.
+    assert check["windows"]["600s"]["burn_rate"] == 25.0
+
+    clock.now += 10_000
+    assert slo.check_slo()["windows"]["600s"]["requests"] == 0
+
+
+def test_check_slo_flags_violations_and_exports_gauges():
+    slo = _manager(FakeClock(), latency_slo_ms=500)
+    for _ in range(50):
+        slo.record_latency(900)
+        slo.record_success()
+
+    check = slo.check_slo()
+
+    assert check["latency_ok"] is False and check["success_ok"] is True
+    assert abs(check["p95_latency"] - 900) / 900 < 0.02
+    exported = REGISTRY.get_sample_value("toron_slo_latency_ms", {"window": "60s", "quantile": "p95"})
+    assert exported == check["p95_latency"]
+    assert REGISTRY.get_sample_value("toron_slo_error_budget_burn_rate", {"window": "600s"}) == 0.0
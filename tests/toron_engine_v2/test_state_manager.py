@@ -0,0 +1,90 @@
+"""
+Tests for the SQLite-backed ALOE StateManager.
+"""
+
+import asyncio
+import json
+
+from src.backend.core.toron.engine_v2.aloe.state_manager import StateManager
+
+
+def _env(monkeypatch, tmp_path):
+    monkeypatch.setenv("TORON_MODEL_STATE", str(tmp_path / "model_reliability.json"))
+    monkeypatch.setenv("TORON_USER_PREFS", str(tmp_path / "user_preferences.json"))
+    monkeypatch.delenv("TORON_STATE_DB", raising=False)
+
+
+def test_updates_are_batched_and_persist_across_instances(monkeypatch, tmp_path):
+    _env(monkeypatch, tmp_path)
+    state = StateManager(flush_interval_seconds=3600, flush_batch=100)
+
+    for i in range(10):
+        ctx = state.attach_user_preferences({"user_id": f"u{i}"})
+        ctx["user_prefs"]["tone"] = "brief"
+        state.update_preferences(ctx)
+    state.update_model_reliability({"model_used": "gpt-4o", "confidence": 1.0})
+
+    assert state.dirty_count() == 11  # nothing written yet
+    state.close()
+
+    reopened = StateManager()
+    assert reopened.attach_user_preferences({"user_id": "u3"})["user_prefs"] == {"tone": "brief"}
+    assert reopened.model_state["gpt-4o"] == 0.6
+    assert (tmp_path / "toron_state.db").exists()
+    assert not (tmp_path / "user_preferences.json").exists()
+    reopened.close()
+
+
+def test_unchanged_preferences_are_not_rewritten(monkeypatch, tmp_path):
+    _env(monkeypatch, tmp_path)
+    state = StateManager(flush_interval_seconds=3600)
+
+    ctx = state.attach_user_preferences({"user_id": "u1"})
+    state.update_preferences(ctx)
+
+    assert state.dirty_count() == 0
+    state.close()
+
+
+def test_concurrent_workers_fold_reliability_updates(monkeypatch, tmp_path):
+    _env(monkeypatch, tmp_path)
+    a = StateManager(flush_interval_seconds=3600)
+    b = StateManager(flush_interval_seconds=3600)
+
+    a.update_model_reliability({"model_used": "m", "confidence": 1.0})
+    b.update_model_reliability({"model_used": "m", "confidence": 1.0})
+    a.flush()
+    b.flush()
+
+    # b's observation is applied on top of a's, not over it.
+    assert b.model_state["m"] == round((0.5 * 0.8 + 0.2) * 0.8 + 0.2, 4)
+    a.close()
+    b.close()
+
+
+def test_legacy_json_is_imported_once(monkeypatch, tmp_path):
+    _env(monkeypatch, tmp_path)
+    (tmp_path / "model_reliability.json").write_text(json.dumps({"claude": 0.9}))
+    (tmp_path / "user_preferences.json").write_text(json.dumps({"u1": {"lang": "fr"}}))
+
+    state = StateManager()
+
+    assert state.model_state == {"claude": 0.9}
+    assert state.attach_user_preferences({"user_id": "u1"})["user_prefs"] == {"lang": "fr"}
+    state.close()
+
+
+def test_flush_runs_off_the_event_loop(monkeypatch, tmp_path):
+    _env(monkeypatch, tmp_path)
+    state = StateManager(flush_interval_seconds=0)
+
+    async def run():
+        state.update_preferences({"user_id": "u1", "user_prefs": {"a": 1}})
+        assert state._flush_future is not None
+        await state.aflush()
+
+    asyncio.run(run())
+
+    assert state.dirty_count() == 0
+    state.close()
+    assert StateManager().attach_user_preferences({"user_id": "u1"})["user_prefs"] == {"a": 1}
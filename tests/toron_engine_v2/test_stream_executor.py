@@ -0,0 +1,121 @@
+"""
+Tests for token streaming through CloudProviderAdapter + StreamExecutor.
+"""
+
+import asyncio
+
+from src.backend.core.toron.engine_v2.aloe.lifecycle_manager import LifecycleManager
+from src.backend.core.toron.engine_v2.core.cloud_provider_adapter import (
+    CloudProviderAdapter,
+)
+from src.backend.core.toron.engine_v2.core.health_monitor import HealthMonitor
+from src.backend.core.toron.engine_v2.runtime.stream_executor import (
+    StreamBuffer,
+    StreamExecutor,
+)
+
+
+class DummyConfig:
+    model_timeout_seconds = 2
+    provider_priority = ["openai", "aws-bedrock"]
+    enterprise_model_list = ["gpt-4o"]
+
+
+class BrokenStreamConnector:
+    """Fails before emitting any token."""
+
+    async def infer(self, messages, model):
+        raise Exception("down")
+
+    async def stream(self, messages, model, **kwargs):
+        raise Exception("stream refused")
+        yield  # pragma: no cover
+
+    async def list_models(self):
+        return []
+
+    async def health_check(self):
+        return False
+
+
+class TokenConnector:
+    """Streams a short answer word by word."""
+
+    async def infer(self, messages, model):
+        return {"content": "ok"}, {"provider": "aws-bedrock", "model": model}
+
+    async def stream(self, messages, model, **kwargs):
+        for word in ["short", " answer", f" from {model}"]:
+            await asyncio.sleep(0)
+            yield word
+
+    async def list_models(self):
+        return [{"model_id": "test-model"}]
+
+    async def health_check(self):
+        return True
+
+
+def _adapter():
+    connectors = {"openai": BrokenStreamConnector(), "aws-bedrock": TokenConnector()}
+    hm = HealthMonitor(list(connectors.keys()), failure_threshold=1, cooldown_seconds=60)
+    return CloudProviderAdapter(connectors, DummyConfig(), health_monitor=hm), hm
+
+
+def test_adapter_stream_fails_over_before_first_token():
+    adapter, hm = _adapter()
+
+    async def collect():
+        return [t async for t in adapter.stream([{"role": "user", "content": "hi"}], "m")]
+
+    tokens = asyncio.run(collect())
+
+    assert "".join(tokens) == "short answer from m"
+    assert hm.snapshot()["openai"]["healthy"] is False
+
+
+def test_stream_buffer_coalesces_when_full():
+    buffer = StreamBuffer(max_events=2)
+    for i in range(5):
+        buffer.put({"type": "token", "model": "a", "delta": str(i)})
+    buffer.close()
+
+    async def drain():
+        out = []
+        while (event := await buffer.get()) is not None:
+            out.append(event["delta"])
+        return out
+
+    deltas = asyncio.run(drain())
+
+    assert len(deltas) == 2
+    assert "".join(deltas) == "01234"
+    assert buffer.coalesced == 3
+
+
+def test_stream_executor_emits_tokens_then_trailing_metadata(tmp_path, monkeypatch):
+    monkeypatch.setenv("TORON_MODEL_STATE", str(tmp_path / "models.json"))
+    monkeypatch.setenv("TORON_USER_PREFS", str(tmp_path / "prefs.json"))
+    adapter, _ = _adapter()
+    executor = StreamExecutor(adapter, LifecycleManager(DummyConfig(), adapter))
+
+    async def no_web(context):
+        return {"web_results": []}
+
+    monkeypatch.setattr(executor.web_search, "run", no_web)
+
+    async def collect():
+        request = {"prompt": "hi", "tier": "free"}
+        return [e async for e in executor.events(request, {"session_id": "s"})]
+
+    events = asyncio.run(collect())
+    types = [e["type"] for e in events]
+
+    assert types[0] == "begin"
+    assert types[-3:] == ["validation", "consensus", "end"]
+    streamed = {}
+    for e in events:
+        if e["type"] == "token":
+            streamed[e["model"]] = streamed.get(e["model"], "") + e["delta"]
+    assert set(streamed) == set(events[0]["models"])
+    assert events[-2]["final_answer"] in streamed.values()
@@ -0,0 +1,139 @@
+"""Head/tail sampling behaviour of ToronTracer."""
+
+import time
+
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode
+
+from src.backend.core.toron.engine_v2.tracing.sampling import ToronSampler
+from src.backend.core.toron.engine_v2.tracing.tracer import ToronTracer
+
+
+def _tracer(**kwargs):
+    exporter = InMemorySpanExporter()
+    tracer = ToronTracer(exporter=exporter, instrument=False, set_global=False, **kwargs)
+    return tracer, exporter
+
+
+def _flush(tracer):
+    tracer.provider.force_flush()
+
+
+def test_head_sampled_traces_are_exported_whole():
+    tracer, exporter = _tracer(head_rate=1.0, tail_rate=0.0)
+    with tracer.span("root", {"request_id": "r1"}):
+        with tracer.span("child"):
+            pass
+    _flush(tracer)
+
+    spans = exporter.get_finished_spans()
+    assert sorted(s.name for s in spans) == ["child", "root"]
+    assert spans[0].context.trace_id == spans[1].context.trace_id
+    assert tracer.tail.stats == {"kept": 0, "discarded": 0, "evicted": 0}
+
+
+def test_tail_keeps_only_slow_error_and_low_confidence_traces():
+    tracer, exporter = _tracer(head_rate=0.0, tail_rate=1.0, slow_ms=20, min_confidence=0.5)
+
+    with tracer.span("normal") as span:
+        span.set_attribute("confidence", 0.9)
+        with tracer.span("normal.child"):
+            pass
+
+    with tracer.span("slow"):
+        time.sleep(0.03)
+
+    with tracer.span("failed") as span:
+        span.set_status(Status(StatusCode.ERROR, "boom"))
+
+    with tracer.span("unsure"):
+        with tracer.span("unsure.child") as child:
+            child.set_attribute("confidence", 0.2)
+
+    _flush(tracer)
+    names = sorted(s.name for s in exporter.get_finished_spans())
+    assert names == ["failed", "slow", "unsure", "unsure.child"]
+    assert tracer.tail.stats["kept"] == 3
+    assert tracer.tail.stats["discarded"] == 1
+    assert tracer.tail.pending() == 0
+
+
+def test_dropped_traces_skip_attribute_work():
+    tracer, exporter = _tracer(head_rate=0.0, tail_rate=0.0)
+    calls = []
+
+    def attrs():
+        calls.append(1)
+        return {"request_id": "r1"}
+
+    with tracer.span("root", attrs) as span:
+        assert not span.is_recording()
+        with tracer.span("child", attrs):
+            pass
+    _flush(tracer)
+
+    assert calls == []
+    assert exporter.get_finished_spans() == ()
+
+
+def test_sampler_split_follows_rates():
+    sampler = ToronSampler(head_rate=0.1, tail_rate=0.3)
+    counts = {}
+    step = (1 << 64) // 10_000
+    for i in range(10_000):
+        decision = sampler.should_sample(None, i * step, "x").decision
+        counts[decision] = counts.get(decision, 0) + 1
+
+    for got, want in zip(sorted(counts.values()), [1000, 3000, 6000]):
+        assert abs(got - want) <= 1
+
+
+def test_default_rates_leave_most_traces_non_recording():
+    sampler = ToronSampler()
+    step = (1 << 64) // 1000
+    recording = sum(
+        sampler.should_sample(None, i * step, "x").decision.is_recording() for i in range(1000)
+    )
+
+    assert sampler.tail_rate < 1.0 - sampler.head_rate
+    assert abs(recording - 200) <= 1
+
+
+class SlowExporter(InMemorySpanExporter):
+    def __init__(self):
+        super().__init__()
+        self.is_shut_down = False
+
+    def export(self, spans):
+        time.sleep(0.05)
+        if self.is_shut_down:
+            raise RuntimeError("exporter already shut down")
+        return super().export(spans)
+
+    def shutdown(self):
+        self.is_shut_down = True
+
+
+def test_shutdown_runs_tail_exports_before_the_exporter_stops():
+    exporter = SlowExporter()
+    tracer = ToronTracer(
+        exporter=exporter, instrument=False, set_global=False, head_rate=0.0, tail_rate=1.0
+    )
+    failures = []
+    original = exporter.export
+
+    def export(spans):
+        try:
+            return original(spans)
+        except RuntimeError as exc:
+            failures.append(exc)
+            raise
+
+    exporter.export = export
+    with tracer.span("failed") as span:
+        span.set_status(Status(StatusCode.ERROR, "boom"))
+    tracer.shutdown()
+
+    assert failures == []
+    assert [s.name for s in exporter.get_finished_spans()] == ["failed"]
+    assert exporter.is_shut_down